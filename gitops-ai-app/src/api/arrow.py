@@ -0,0 +1,119 @@
+"""
+Arrow Encoding - Presentation Tier
+Columnar batch requests and responses as Arrow IPC streams
+"""
+from typing import Any, Dict, List, Optional
+
+from starlette.responses import Response
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # optional - /predict/batch/arrow answers 501 without it
+    pa = None
+    pc = None
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+
+def available() -> bool:
+    """Whether pyarrow is installed"""
+    return pa is not None
+
+
+def _is_text(type_: Any) -> bool:
+    if pa.types.is_dictionary(type_):
+        type_ = type_.value_type
+    return pa.types.is_string(type_) or pa.types.is_large_string(type_)
+
+
+def _first(mask: Any) -> Optional[int]:
+    """Index of the first true value of a boolean column, or None"""
+    row = pc.index(mask, True).as_py()
+    return None if row < 0 else row
+
+
+def read_texts(
+    body: bytes,
+    column: str = "text",
+    max_rows: Optional[int] = None,
+    max_length: Optional[int] = None
+) -> List[str]:
+    """
+    Stripped texts from one string column of an Arrow IPC stream, checked
+    row by row like a JSON ``text`` field.
+
+    The column may be ``string``, ``large_string`` or dictionary-encoded
+    strings; other columns are ignored.
+
+    Raises:
+        ValueError: If the body is not an Arrow IPC stream, or the column is
+            missing, not strings, is empty or exceeds ``max_rows``, or a row
+            is null, blank or longer than ``max_length`` characters
+    """
+    try:
+        table = pa.ipc.open_stream(body).read_all()
+    except pa.ArrowException as e:
+        raise ValueError(f"Invalid Arrow IPC stream: {str(e)}")
+
+    if column not in table.column_names:
+        raise ValueError(f"Column {column!r} not found; columns are {table.column_names}")
+    texts = table.column(column)
+    if not _is_text(texts.type):
+        raise ValueError(f"Column {column!r} must hold strings, not {texts.type}")
+    if len(texts) == 0:
+        raise ValueError("Expected at least one row")
+    if max_rows is not None and len(texts) > max_rows:
+        raise ValueError(f"Expected at most {max_rows} rows, got {len(texts)}")
+    if texts.null_count:
+        raise ValueError(f"Column {column!r} is null at row {_first(pc.is_null(texts))}")
+
+    if pa.types.is_dictionary(texts.type):
+        texts = texts.cast(texts.type.value_type)
+    texts = pc.utf8_trim_whitespace(texts)
+    lengths = pc.utf8_length(texts)
+    row = _first(pc.equal(lengths, 0))
+    if row is not None:
+        raise ValueError(f"Column {column!r} is empty or whitespace only at row {row}")
+    if max_length is not None:
+        row = _first(pc.greater(lengths, max_length))
+        if row is not None:
+            raise ValueError(f"Column {column!r} exceeds {max_length} characters at row {row}")
+    return texts.to_pylist()
+
+
+def write_texts(texts: List[str], column: str = "text") -> bytes:
+    """Arrow IPC request body for ``texts`` (client side, tests and benchmarks)"""
+    return _write(pa.record_batch({column: pa.array(texts, pa.string())}))
+
+
+def write_results(columns: Dict[str, List[Any]], metadata: Optional[Dict[str, str]] = None) -> bytes:
+    """
+    Arrow IPC stream of one record batch with ``label`` (dictionary-encoded
+    string), ``confidence`` and ``sentiment_score`` (float64) columns, plus
+    ``windows`` (int32) when present in ``columns``.
+
+    Args:
+        columns: Output of ``InferenceService.run_batch_columns``
+        metadata: Schema metadata, e.g. model and request id
+    """
+    arrays = {
+        'label': pa.array(columns['label'], pa.string()).dictionary_encode(),
+        'confidence': pa.array(columns['confidence'], pa.float64()),
+        'sentiment_score': pa.array(columns['sentiment_score'], pa.float64()),
+    }
+    if 'windows' in columns:
+        arrays['windows'] = pa.array(columns['windows'], pa.int32())
+    return _write(pa.record_batch(arrays, metadata=metadata))
+
+
+def _write(batch: Any) -> bytes:
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+class ArrowResponse(Response):
+    """Response whose body is an already encoded Arrow IPC stream"""
+    media_type = ARROW_STREAM_MEDIA_TYPE
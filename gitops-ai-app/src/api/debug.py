@@ -0,0 +1,72 @@
+"""
+Debug Endpoints - Presentation Tier
+On-demand sampling profiles of the live process, off unless PROFILING_ENABLED
+"""
+import asyncio
+import hmac
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query
+from starlette.responses import PlainTextResponse
+
+from config import settings
+from utils.profiling import SamplingProfiler
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# One profile at a time; concurrent samplers would distort each other
+_profile_lock = asyncio.Lock()
+
+
+def _check_access(token: Optional[str]) -> None:
+    """404 while profiling is disabled, 403 without the configured token (or with none configured)"""
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not settings.PROFILING_TOKEN:
+        raise HTTPException(status_code=403, detail="Profiling needs PROFILING_TOKEN to be set")
+    if not hmac.compare_digest((token or "").encode(), settings.PROFILING_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid debug token")
+
+
+@router.get("/debug/profile", response_class=PlainTextResponse, include_in_schema=False)
+async def profile(
+    seconds: float = Query(10.0, gt=0, description="How long to sample live traffic"),
+    interval_ms: Optional[float] = Query(None, ge=1, le=1000, description="Sampling interval"),
+    idle: bool = Query(False, description="Include threads waiting for work"),
+    x_debug_token: Optional[str] = Header(None)
+) -> PlainTextResponse:
+    """
+    Sample every thread's stack for ``seconds`` while the server keeps
+    serving, and return collapsed stacks (``frame;frame count`` per line)
+    for flamegraph.pl or speedscope.
+    """
+    _check_access(x_debug_token)
+
+    if seconds > settings.PROFILING_MAX_SECONDS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"seconds must be at most {settings.PROFILING_MAX_SECONDS}"
+        )
+    if _profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+
+    interval = (interval_ms or settings.PROFILING_INTERVAL_MS) / 1000
+    async with _profile_lock:
+        profiler = SamplingProfiler(interval=interval, include_idle=idle)
+        logger.info(f"Profiling for {seconds}s at {interval * 1000:.0f}ms intervals")
+        profiler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.stop()
+
+    return PlainTextResponse(
+        profiler.collapsed(),
+        headers={
+            "X-Profile-Samples": str(profiler.samples),
+            "X-Profile-Seconds": f"{profiler.duration:.3f}"
+        }
+    )
@@ -0,0 +1,207 @@
+"""
+Bulk Job Endpoints - Presentation Tier
+Submit, monitor, cancel and resume background scoring jobs over JSONL/CSV files
+"""
+import logging
+from typing import Any, Dict, Iterator, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import BaseModel, Field
+from starlette.responses import StreamingResponse
+
+from config import settings
+from services.jobs import JobManager, JobNotFoundError, JobStateError
+from api.predict import (
+    AGGREGATION_DESCRIPTION,
+    LONG_DOCUMENT_DESCRIPTION,
+    MODEL_FIELD_DESCRIPTION,
+    Aggregation,
+    _aggregation,
+)
+from api.streaming import NDJSON_MEDIA_TYPE
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+JobFormat = Literal["jsonl", "csv"]
+FORMAT_DESCRIPTION = "Input format; inferred from the file extension when omitted"
+TEXT_FIELD_DESCRIPTION = "JSON key or CSV column holding the text"
+ID_FIELD_DESCRIPTION = "JSON key or CSV column echoed back as the result id"
+
+
+class JobRequest(BaseModel):
+    """Bulk job over a file already on the server"""
+    input_path: str = Field(..., min_length=1, max_length=1024, description="Path inside JOBS_INPUT_DIR")
+    format: Optional[JobFormat] = Field(None, description=FORMAT_DESCRIPTION)
+    text_field: str = Field("text", min_length=1, max_length=200, description=TEXT_FIELD_DESCRIPTION)
+    id_field: Optional[str] = Field("id", max_length=200, description=ID_FIELD_DESCRIPTION)
+    model: Optional[str] = Field(None, max_length=200, description=MODEL_FIELD_DESCRIPTION)
+    long_document: bool = Field(False, description=LONG_DOCUMENT_DESCRIPTION)
+    aggregation: Optional[Aggregation] = Field(None, description=AGGREGATION_DESCRIPTION)
+
+
+# Dependency to get the job manager
+def get_job_manager():
+    from main import get_job_manager as get_jobs
+    manager = get_jobs()
+    if manager is None:
+        raise HTTPException(status_code=404, detail="Bulk jobs are disabled")
+    return manager
+
+
+def _check_model(manager: JobManager, model: Optional[str]) -> None:
+    """404 up front rather than a job that fails on its first chunk"""
+    if model and model not in {m['name'] for m in manager.service.list_models()}:
+        raise HTTPException(status_code=404, detail=f"Model {model!r} is not available")
+
+
+def _get_job(manager: JobManager, job_id: str):
+    try:
+        return manager.get(job_id)
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+def _read_results(path: str, size: int, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """
+    The first ``size`` bytes of a results file: up to the last checkpoint,
+    never a chunk that is still being written
+    """
+    with open(path, "rb") as handle:
+        while size > 0:
+            chunk = handle.read(min(chunk_size, size))
+            if not chunk:
+                return
+            size -= len(chunk)
+            yield chunk
+
+
+@router.post("/jobs", status_code=202)
+async def submit_job(
+    payload: JobRequest,
+    manager: JobManager = Depends(get_job_manager)
+) -> Dict[str, Any]:
+    """
+    Score a JSONL or CSV file from JOBS_INPUT_DIR in the background.
+
+    JSONL lines are JSON strings or objects with a **text_field** key; CSV
+    files need a header row with a **text_field** column. Poll
+    /jobs/{id} for progress and fetch /jobs/{id}/results for the output.
+    """
+    _check_model(manager, payload.model)
+    try:
+        job = manager.submit(
+            payload.input_path,
+            payload.format,
+            text_field=payload.text_field,
+            id_field=payload.id_field,
+            model=payload.model,
+            aggregation=_aggregation(payload)
+        )
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return job.info()
+
+
+@router.post("/jobs/upload", status_code=202)
+async def upload_job(
+    request: Request,
+    format: JobFormat = Query(..., description="Input format of the request body"),
+    text_field: str = Query("text", min_length=1, max_length=200, description=TEXT_FIELD_DESCRIPTION),
+    id_field: Optional[str] = Query("id", max_length=200, description=ID_FIELD_DESCRIPTION),
+    model: Optional[str] = Query(None, max_length=200, description=MODEL_FIELD_DESCRIPTION),
+    long_document: bool = Query(False, description=LONG_DOCUMENT_DESCRIPTION),
+    aggregation: Optional[Aggregation] = Query(None, description=AGGREGATION_DESCRIPTION),
+    manager: JobManager = Depends(get_job_manager)
+) -> Dict[str, Any]:
+    """
+    Upload a JSONL or CSV file as the raw request body (e.g.
+    ``curl --data-binary @reviews.jsonl``) and score it in the background.
+    The body is streamed to disk, never held in memory.
+    """
+    _check_model(manager, model)
+    if long_document:
+        aggregation = aggregation or settings.LONG_DOC_AGGREGATION
+    else:
+        aggregation = None
+    try:
+        job = await manager.upload(
+            request.stream(),
+            format,
+            max_bytes=settings.JOBS_MAX_UPLOAD_BYTES,
+            text_field=text_field,
+            id_field=id_field,
+            model=model,
+            aggregation=aggregation
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    return job.info()
+
+
+@router.get("/jobs")
+async def list_jobs(manager: JobManager = Depends(get_job_manager)) -> Dict[str, Any]:
+    """All jobs, newest first"""
+    return {"jobs": [job.info() for job in manager.jobs()]}
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str, manager: JobManager = Depends(get_job_manager)) -> Dict[str, Any]:
+    """Job status and progress: percent done, items/sec and ETA while running"""
+    return _get_job(manager, job_id).info()
+
+
+@router.get("/jobs/{job_id}/results")
+async def job_results(job_id: str, manager: JobManager = Depends(get_job_manager)) -> StreamingResponse:
+    """
+    Results as NDJSON in input order, one line per input record with its
+    **index**, **id** and either a prediction or an **error**. While the
+    job runs this returns the chunks written so far.
+    """
+    job = _get_job(manager, job_id)
+    return StreamingResponse(
+        _read_results(job.output_path, job.output_offset),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={'Content-Disposition': f'attachment; filename="{job.id}.jsonl"'}
+    )
+
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str, manager: JobManager = Depends(get_job_manager)) -> Dict[str, Any]:
+    """Stop a job at its last checkpoint; results written so far are kept"""
+    try:
+        job = await manager.cancel(job_id)
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except JobStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return job.info()
+
+
+@router.delete("/jobs/{job_id}")
+async def delete_job(job_id: str, manager: JobManager = Depends(get_job_manager)) -> Dict[str, Any]:
+    """Remove a finished job with its results and uploaded input; cancel running jobs first"""
+    try:
+        await manager.delete(job_id)
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except JobStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"id": job_id, "status": "deleted"}
+
+
+@router.post("/jobs/{job_id}/resume", status_code=202)
+async def resume_job(job_id: str, manager: JobManager = Depends(get_job_manager)) -> Dict[str, Any]:
+    """Continue a cancelled or failed job from its last checkpoint"""
+    try:
+        job = manager.resume(job_id)
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except JobStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return job.info()
@@ -0,0 +1,96 @@
+"""
+HTTP Metrics Middleware - Presentation Tier
+Pure ASGI request metrics labelled by route template, with Server-Timing
+"""
+import functools
+import time
+from typing import Any, Awaitable, Callable, TypeVar
+
+from prometheus_client import Counter, Histogram
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from utils.timing import STAGE_SERIALIZE, mark_handler_done, record_stage, start_request
+
+# Label for requests that matched no route, so scanners cannot grow the label set
+UNMATCHED_ROUTE = "<unmatched>"
+HTTP_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+REQUEST_COUNT = Counter(
+    'http_requests_total',
+    'Total HTTP requests',
+    ['method', 'endpoint', 'status']
+)
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds',
+    'HTTP request latency',
+    ['method', 'endpoint']
+)
+
+F = TypeVar('F', bound=Callable[..., Awaitable[Any]])
+
+
+def route_template(scope: Scope) -> str:
+    """Path template of the matched route, e.g. ``/api/v1/predict``"""
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def timed_endpoint(endpoint: F) -> F:
+    """
+    Mark when an endpoint returns, so the middleware can attribute the
+    time until the response starts (response model validation and JSON
+    encoding) to the serialization stage.
+    """
+    @functools.wraps(endpoint)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        result = await endpoint(*args, **kwargs)
+        mark_handler_done()
+        return result
+    return wrapper  # type: ignore[return-value]
+
+
+class MetricsMiddleware:
+    """
+    Records request count and latency per method, route template and
+    status, and adds a ``Server-Timing`` header with the request's stage
+    breakdown.
+
+    Unlike ``@app.middleware("http")`` this does not wrap the request and
+    response in extra objects or run the app in a separate task; it only
+    intercepts ``http.response.start``.
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = True) -> None:
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = start_request()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                now = time.perf_counter()
+                if timings.handler_done is not None:
+                    record_stage(STAGE_SERIALIZE, now - timings.handler_done)
+                if self.server_timing:
+                    headers = list(message.get("headers", ()))
+                    headers.append((b"server-timing", timings.server_timing(now - timings.started).encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            endpoint = route_template(scope)
+            method = scope["method"] if scope["method"] in HTTP_METHODS else "OTHER"
+            REQUEST_COUNT.labels(method=method, endpoint=endpoint, status=status_code).inc()
+            REQUEST_LATENCY.labels(method=method, endpoint=endpoint).observe(
+                time.perf_counter() - timings.started
+            )
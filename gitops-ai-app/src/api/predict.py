@@ -2,15 +2,29 @@
 Prediction API Endpoint - Presentation Tier
 Handles /predict endpoint for inference requests
 """
+import asyncio
+import json
 import logging
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional
 from datetime import datetime
 
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
-from pydantic import BaseModel, Field, validator
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Header, Query, Request
+from pydantic import BaseModel, Field, ValidationError, validator
 from prometheus_client import Counter, Histogram
+from starlette.requests import ClientDisconnect
 
+from config import settings
+from models.artifacts import VERSION_MAX_LENGTH, is_valid_version
+from services.admission import OverloadedError
+from services.deadlines import Deadline, DeadlineExceeded, deadline_after
 from services.inference_service import InferenceService
+from services.model_registry import ModelNotFoundError
+from utils.timing import STAGE_SERIALIZE, timed_stage
+from api import arrow
+from api.arrow import ARROW_STREAM_MEDIA_TYPE, ArrowResponse
+from api.metrics import timed_endpoint
+from api.responses import FastJSONResponse
+from api.streaming import DuplexStreamingResponse, NDJSON_MEDIA_TYPE, iter_lines, encode_record
 
 logger = logging.getLogger(__name__)
 
@@ -29,10 +43,29 @@ PREDICTION_LATENCY = Histogram(
 )
 
 
+MODEL_FIELD_DESCRIPTION = "Model to use (see /models); the default model when omitted"
+LONG_DOCUMENT_DESCRIPTION = (
+    "Score the whole text as overlapping token windows instead of truncating "
+    "it to MAX_SEQUENCE_LENGTH tokens"
+)
+AGGREGATION_DESCRIPTION = (
+    "How window scores combine in long-document mode: mean, max_confidence or "
+    "length_weighted; LONG_DOC_AGGREGATION when omitted"
+)
+Aggregation = Literal["mean", "max_confidence", "length_weighted"]
+
+
+# Longest text accepted per prediction (JSON field or Arrow row)
+TEXT_MAX_LENGTH = 10000
+
+
 # Request/Response Models
 class TextInput(BaseModel):
     """Single text input for prediction"""
-    text: str = Field(..., min_length=1, max_length=10000, description="Text to analyze")
+    text: str = Field(..., min_length=1, max_length=TEXT_MAX_LENGTH, description="Text to analyze")
+    model: Optional[str] = Field(None, max_length=200, description=MODEL_FIELD_DESCRIPTION)
+    long_document: bool = Field(False, description=LONG_DOCUMENT_DESCRIPTION)
+    aggregation: Optional[Aggregation] = Field(None, description=AGGREGATION_DESCRIPTION)
     
     @validator('text')
     def text_must_not_be_empty(cls, v):
@@ -44,6 +77,9 @@ class TextInput(BaseModel):
 class BatchTextInput(BaseModel):
     """Batch text input for multiple predictions"""
     texts: List[str] = Field(..., min_items=1, max_items=100, description="List of texts to analyze")
+    model: Optional[str] = Field(None, max_length=200, description=MODEL_FIELD_DESCRIPTION)
+    long_document: bool = Field(False, description=LONG_DOCUMENT_DESCRIPTION)
+    aggregation: Optional[Aggregation] = Field(None, description=AGGREGATION_DESCRIPTION)
     
 
 class PredictionResult(BaseModel):
@@ -53,6 +89,7 @@ class PredictionResult(BaseModel):
     confidence: float
     sentiment_score: float
     processing_time_ms: float
+    windows: Optional[int] = Field(None, description="Token windows scored (present in long-document mode only)")
 
 
 class PredictionResponse(BaseModel):
@@ -74,22 +111,89 @@ class BatchPredictionResponse(BaseModel):
     request_id: str
 
 
+def _overloaded(error: OverloadedError, model: str, count: int = 1) -> HTTPException:
+    """429 response telling the client when to retry"""
+    PREDICTION_COUNT.labels(status='rejected', model=model).inc(count)
+    return HTTPException(
+        status_code=429,
+        detail=str(error),
+        headers={'Retry-After': str(error.retry_after)}
+    )
+
+
+def _model_not_found(error: ModelNotFoundError) -> HTTPException:
+    """404 for a model the registry may not serve"""
+    return HTTPException(status_code=404, detail=str(error))
+
+
+def _deadline_exceeded(error: DeadlineExceeded, model: str, count: int = 1) -> HTTPException:
+    """504 response for work dropped or cut off at its deadline"""
+    PREDICTION_COUNT.labels(status='deadline_exceeded', model=model).inc(count)
+    return HTTPException(status_code=504, detail=str(error))
+
+
+def _aggregation(payload: Any) -> Optional[str]:
+    """Service aggregation argument: None unless long-document mode was requested"""
+    if not payload.long_document:
+        return None
+    return payload.aggregation or settings.LONG_DOC_AGGREGATION
+
+
+def _request_deadline(timeout_ms: Optional[float], default_seconds: float) -> Deadline:
+    """
+    Absolute deadline for a request.
+    
+    The client's X-Request-Timeout-Ms budget can shorten the server default
+    but never extend it.
+    """
+    if timeout_ms is not None and timeout_ms / 1000 < default_seconds:
+        return deadline_after(timeout_ms / 1000, client=True)
+    return deadline_after(default_seconds)
+
+
+TIMEOUT_HEADER_DESCRIPTION = (
+    "Client time budget in milliseconds; work still queued when it runs out "
+    "is dropped and the request fails with 504"
+)
+
+
+def _batch_item(text: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    """PredictionResult as a plain dict; ``windows`` only in long-document mode"""
+    item = {
+        'text': text[:100] + "..." if len(text) > 100 else text,
+        'label': str(result['label']),
+        'confidence': float(result['confidence']),
+        'sentiment_score': float(result['sentiment_score']),
+        'processing_time_ms': float(result.get('processing_time_ms', 0))
+    }
+    if result.get('windows') is not None:
+        item['windows'] = result['windows']
+    return item
+
+
 # Dependency to get inference service
 def get_inference_service():
     from main import get_inference_service as get_svc
     return get_svc()
 
 
-@router.post("/predict", response_model=PredictionResponse)
+# exclude_none keeps "windows" out of responses outside long-document mode
+@router.post("/predict", response_model=PredictionResponse, response_model_exclude_none=True)
+@timed_endpoint
 async def predict(
     payload: TextInput,
     background_tasks: BackgroundTasks,
-    inference_service: InferenceService = Depends(get_inference_service)
+    inference_service: InferenceService = Depends(get_inference_service),
+    timeout_ms: Optional[float] = Header(
+        None, alias="X-Request-Timeout-Ms", gt=0, description=TIMEOUT_HEADER_DESCRIPTION
+    )
 ) -> PredictionResponse:
     """
     Perform sentiment analysis on input text.
     
     - **text**: The text to analyze (1-10000 characters)
+    - **long_document**: Score every part of a long text instead of its first
+      MAX_SEQUENCE_LENGTH tokens
     
     Returns prediction with label, confidence, and sentiment score.
     """
@@ -98,22 +202,26 @@ async def predict(
     
     request_id = str(uuid.uuid4())
     start_time = time.time()
+    deadline = _request_deadline(timeout_ms, settings.INFERENCE_TIMEOUT)
+    model_name = inference_service.model_label(payload.model) if inference_service else 'unknown'
     
     try:
         logger.info(f"Processing prediction request {request_id}")
         
         # Call inference service
-        result = await inference_service.run(payload.text)
+        result = await inference_service.run(
+            payload.text, deadline=deadline, model=payload.model, aggregation=_aggregation(payload)
+        )
         
         processing_time = (time.time() - start_time) * 1000
         
         # Record metrics
         PREDICTION_COUNT.labels(
             status='success',
-            model=inference_service.model_name
+            model=model_name
         ).inc()
         PREDICTION_LATENCY.labels(
-            model=inference_service.model_name
+            model=model_name
         ).observe(processing_time / 1000)
         
         prediction_result = PredictionResult(
@@ -121,22 +229,31 @@ async def predict(
             label=result['label'],
             confidence=result['confidence'],
             sentiment_score=result['sentiment_score'],
-            processing_time_ms=processing_time
+            processing_time_ms=processing_time,
+            windows=result.get('windows')
         )
         
         return PredictionResponse(
             success=True,
             result=prediction_result,
-            model=inference_service.model_name,
+            model=model_name,
             timestamp=datetime.utcnow().isoformat(),
             request_id=request_id
         )
         
+    except ModelNotFoundError as e:
+        raise _model_not_found(e)
+    except OverloadedError as e:
+        logger.warning(f"Prediction request {request_id} rejected: {str(e)}")
+        raise _overloaded(e, model_name)
+    except DeadlineExceeded as e:
+        logger.warning(f"Prediction request {request_id} timed out: {str(e)}")
+        raise _deadline_exceeded(e, model_name)
     except Exception as e:
         logger.error(f"Prediction failed for request {request_id}: {str(e)}")
         PREDICTION_COUNT.labels(
             status='error',
-            model=inference_service.model_name if inference_service else 'unknown'
+            model=model_name
         ).inc()
         raise HTTPException(
             status_code=500,
@@ -145,14 +262,20 @@ async def predict(
 
 
 @router.post("/predict/batch", response_model=BatchPredictionResponse)
+@timed_endpoint
 async def predict_batch(
     payload: BatchTextInput,
-    inference_service: InferenceService = Depends(get_inference_service)
-) -> BatchPredictionResponse:
+    inference_service: InferenceService = Depends(get_inference_service),
+    timeout_ms: Optional[float] = Header(
+        None, alias="X-Request-Timeout-Ms", gt=0, description=TIMEOUT_HEADER_DESCRIPTION
+    )
+) -> FastJSONResponse:
     """
     Perform batch sentiment analysis on multiple texts.
     
     - **texts**: List of texts to analyze (1-100 items)
+    - **long_document**: Score every part of each long text; windows of all
+      texts are batched together
     
     Returns predictions for all texts with processing times.
     """
@@ -161,40 +284,45 @@ async def predict_batch(
     
     request_id = str(uuid.uuid4())
     start_time = time.time()
+    deadline = _request_deadline(timeout_ms, settings.INFERENCE_TIMEOUT * 2)
+    model_name = inference_service.model_label(payload.model) if inference_service else 'unknown'
     
     try:
         logger.info(f"Processing batch prediction request {request_id} with {len(payload.texts)} texts")
         
         # Call batch inference
-        results = await inference_service.run_batch(payload.texts)
+        results = await inference_service.run_batch(
+            payload.texts, deadline=deadline, model=payload.model, aggregation=_aggregation(payload)
+        )
         
         total_processing_time = (time.time() - start_time) * 1000
         
-        prediction_results = [
-            PredictionResult(
-                text=text[:100] + "..." if len(text) > 100 else text,
-                label=result['label'],
-                confidence=result['confidence'],
-                sentiment_score=result['sentiment_score'],
-                processing_time_ms=result.get('processing_time_ms', 0)
-            )
-            for text, result in zip(payload.texts, results)
-        ]
-        
         PREDICTION_COUNT.labels(
             status='success',
-            model=inference_service.model_name
+            model=model_name
         ).inc(len(payload.texts))
         
-        return BatchPredictionResponse(
-            success=True,
-            results=prediction_results,
-            model=inference_service.model_name,
-            total_processing_time_ms=total_processing_time,
-            timestamp=datetime.utcnow().isoformat(),
-            request_id=request_id
-        )
+        # Built as plain dicts matching BatchPredictionResponse and encoded
+        # once, instead of one PredictionResult per item re-validated by
+        # response_model
+        with timed_stage(STAGE_SERIALIZE):
+            return FastJSONResponse({
+                'success': True,
+                'results': [_batch_item(text, result) for text, result in zip(payload.texts, results)],
+                'model': model_name,
+                'total_processing_time_ms': total_processing_time,
+                'timestamp': datetime.utcnow().isoformat(),
+                'request_id': request_id
+            })
         
+    except ModelNotFoundError as e:
+        raise _model_not_found(e)
+    except OverloadedError as e:
+        logger.warning(f"Batch prediction request {request_id} rejected: {str(e)}")
+        raise _overloaded(e, model_name, len(payload.texts))
+    except DeadlineExceeded as e:
+        logger.warning(f"Batch prediction request {request_id} timed out: {str(e)}")
+        raise _deadline_exceeded(e, model_name, len(payload.texts))
     except Exception as e:
         logger.error(f"Batch prediction failed for request {request_id}: {str(e)}")
         raise HTTPException(
@@ -203,17 +331,328 @@ async def predict_batch(
         )
 
 
+async def _read_body(request: Request, max_bytes: int) -> bytes:
+    """Whole request body, refusing more than ``max_bytes`` with 413"""
+    too_large = HTTPException(status_code=413, detail=f"Request body exceeds {max_bytes} bytes")
+    content_length = request.headers.get('content-length')
+    if content_length is not None and content_length.isdigit() and int(content_length) > max_bytes:
+        raise too_large
+    
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_bytes:
+            raise too_large
+    return bytes(body)
+
+
+@router.post(
+    "/predict/batch/arrow",
+    response_class=ArrowResponse,
+    responses={200: {
+        'content': {ARROW_STREAM_MEDIA_TYPE: {}},
+        'description': "Arrow IPC stream with label, confidence and sentiment_score columns"
+    }},
+    openapi_extra={'requestBody': {
+        'required': True,
+        'content': {ARROW_STREAM_MEDIA_TYPE: {'schema': {'type': 'string', 'format': 'binary'}}}
+    }}
+)
+@timed_endpoint
+async def predict_batch_arrow(
+    request: Request,
+    column: str = Query("text", min_length=1, max_length=200, description="String column holding the texts"),
+    model: Optional[str] = Query(None, max_length=200, description=MODEL_FIELD_DESCRIPTION),
+    long_document: bool = Query(False, description=LONG_DOCUMENT_DESCRIPTION),
+    aggregation: Optional[Aggregation] = Query(None, description=AGGREGATION_DESCRIPTION),
+    inference_service: InferenceService = Depends(get_inference_service),
+    timeout_ms: Optional[float] = Header(
+        None, alias="X-Request-Timeout-Ms", gt=0, description=TIMEOUT_HEADER_DESCRIPTION
+    )
+) -> ArrowResponse:
+    """
+    Batch sentiment analysis over Arrow IPC streams, for large internal
+    callers.
+    
+    The body is an Arrow IPC stream with a string **column** (``text`` by
+    default; up to ARROW_BATCH_MAX_ROWS rows, each non-blank and at most
+    10000 characters, as for JSON). The response is an Arrow IPC
+    stream with **label**, **confidence** and **sentiment_score** columns
+    (and **windows** in long-document mode) in input row order; the model,
+    request id and total processing time are in the schema metadata.
+    Texts go to the model without a JSON document or a result dictionary
+    per row.
+    """
+    import time
+    import uuid
+    
+    if not arrow.available():
+        raise HTTPException(status_code=501, detail="Arrow support requires pyarrow, which is not installed")
+    
+    request_id = str(uuid.uuid4())
+    start_time = time.time()
+    deadline = _request_deadline(timeout_ms, settings.INFERENCE_TIMEOUT * 2)
+    model_name = inference_service.model_label(model) if inference_service else 'unknown'
+    
+    body = await _read_body(request, settings.ARROW_BATCH_MAX_BYTES)
+    try:
+        texts = arrow.read_texts(body, column, settings.ARROW_BATCH_MAX_ROWS, TEXT_MAX_LENGTH)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    del body
+    
+    try:
+        logger.info(f"Processing Arrow batch prediction request {request_id} with {len(texts)} texts")
+        
+        model_name, columns = await inference_service.run_batch_columns(
+            texts,
+            deadline=deadline,
+            model=model,
+            aggregation=(aggregation or settings.LONG_DOC_AGGREGATION) if long_document else None
+        )
+        
+        PREDICTION_COUNT.labels(
+            status='success',
+            model=model_name
+        ).inc(len(texts))
+        
+        with timed_stage(STAGE_SERIALIZE):
+            return ArrowResponse(
+                arrow.write_results(columns, {
+                    'model': model_name,
+                    'request_id': request_id,
+                    'total_processing_time_ms': str((time.time() - start_time) * 1000)
+                }),
+                headers={'X-Request-ID': request_id}
+            )
+        
+    except ModelNotFoundError as e:
+        raise _model_not_found(e)
+    except OverloadedError as e:
+        logger.warning(f"Arrow batch prediction request {request_id} rejected: {str(e)}")
+        raise _overloaded(e, model_name, len(texts))
+    except DeadlineExceeded as e:
+        logger.warning(f"Arrow batch prediction request {request_id} timed out: {str(e)}")
+        raise _deadline_exceeded(e, model_name, len(texts))
+    except Exception as e:
+        logger.error(f"Arrow batch prediction failed for request {request_id}: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Batch prediction failed: {str(e)}"
+        )
+
+
+def _parse_stream_record(line: bytes) -> Dict[str, Any]:
+    """Parse one NDJSON input line into a validated record"""
+    data = json.loads(line)
+    record_id = None
+    
+    if isinstance(data, dict):
+        record_id = data.get('id')
+        data = data.get('text')
+    if not isinstance(data, str):
+        raise ValueError("Expected a JSON string or an object with a 'text' field")
+    
+    return {'id': record_id, 'text': TextInput(text=data).text}
+
+
+async def _run_batch_with_backoff(
+    inference_service: InferenceService,
+    texts: List[str],
+    model: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Run a stream batch, waiting out admission rejections.
+    
+    Stream input is only read as fast as batches complete, so sleeping here
+    pushes back on the client instead of failing records. Gives up after
+    INFERENCE_TIMEOUT seconds of rejections.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.INFERENCE_TIMEOUT
+    kwargs = {'model': model} if model else {}
+    while True:
+        try:
+            return await inference_service.run_batch(texts, **kwargs)
+        except OverloadedError as e:
+            if loop.time() + e.retry_after > deadline:
+                raise
+            await asyncio.sleep(e.retry_after)
+
+
+async def _stream_predictions(
+    request: Request,
+    inference_service: InferenceService,
+    request_id: str,
+    model: Optional[str] = None
+) -> AsyncIterator[bytes]:
+    """Read NDJSON records, score them in model-sized batches, emit NDJSON results"""
+    model_name = inference_service.model_label(model)
+    pending: List[Dict[str, Any]] = []
+    valid_count = 0
+    index = 0
+    total = 0
+    
+    async def flush() -> AsyncIterator[bytes]:
+        nonlocal valid_count
+        valid = [record for record in pending if 'error' not in record]
+        results: List[Dict[str, Any]] = []
+        batch_error = None
+        
+        if valid:
+            try:
+                results = await _run_batch_with_backoff(inference_service, [r['text'] for r in valid], model)
+                PREDICTION_COUNT.labels(
+                    status='success',
+                    model=model_name
+                ).inc(len(valid))
+            except Exception as e:
+                logger.error(f"Stream batch failed for request {request_id}: {str(e)}")
+                PREDICTION_COUNT.labels(
+                    status='error',
+                    model=model_name
+                ).inc(len(valid))
+                batch_error = f"Prediction failed: {str(e)}"
+        
+        scored = iter(results)
+        for record in pending:
+            output: Dict[str, Any] = {'index': record['index']}
+            if record.get('id') is not None:
+                output['id'] = record['id']
+            
+            if 'error' in record:
+                output['error'] = record['error']
+            elif batch_error:
+                output['error'] = batch_error
+            else:
+                result = next(scored)
+                output['label'] = result['label']
+                output['confidence'] = result['confidence']
+                output['sentiment_score'] = result['sentiment_score']
+            
+            yield encode_record(output)
+        
+        pending.clear()
+        valid_count = 0
+    
+    try:
+        async for line in iter_lines(request.stream(), settings.STREAM_MAX_LINE_BYTES):
+            if line is None:
+                pending.append({'index': index, 'error': 'Line exceeds maximum length'})
+            else:
+                try:
+                    record = _parse_stream_record(line)
+                    record['index'] = index
+                    valid_count += 1
+                except (ValueError, ValidationError) as e:
+                    record = {'index': index, 'error': f"Invalid record: {str(e)}"}
+                pending.append(record)
+            index += 1
+            
+            if valid_count >= settings.BATCH_SIZE or len(pending) >= settings.BATCH_SIZE * 4:
+                total += len(pending)
+                async for chunk in flush():
+                    yield chunk
+        
+        if pending:
+            total += len(pending)
+            async for chunk in flush():
+                yield chunk
+        
+        logger.info(f"Stream prediction request {request_id} completed with {total} records")
+        
+    except ClientDisconnect:
+        logger.warning(f"Client disconnected from stream request {request_id} after {total} records")
+
+
+@router.post("/predict/stream")
+async def predict_stream(
+    request: Request,
+    inference_service: InferenceService = Depends(get_inference_service),
+    model: Optional[str] = Query(None, max_length=200, description=MODEL_FIELD_DESCRIPTION)
+):
+    """
+    Stream sentiment analysis over newline-delimited JSON.
+    
+    Each input line is either a JSON string or an object with a **text**
+    field (and an optional **id** that is echoed back). Results are
+    streamed back as NDJSON in input order while the body is still being
+    uploaded; input is only read as fast as the client consumes output.
+    Invalid lines produce an error record instead of failing the stream.
+    """
+    import uuid
+    
+    if not inference_service or not inference_service.is_ready():
+        raise HTTPException(status_code=503, detail="Inference service is not ready")
+    if model and model not in {m['name'] for m in inference_service.list_models()}:
+        raise HTTPException(status_code=404, detail=f"Model {model!r} is not available")
+    
+    request_id = str(uuid.uuid4())
+    logger.info(f"Processing stream prediction request {request_id}")
+    
+    return DuplexStreamingResponse(
+        _stream_predictions(request, inference_service, request_id, model),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={'X-Request-ID': request_id}
+    )
+
+
+class ModelSwapRequest(BaseModel):
+    """Model version to load and switch to"""
+    model: Optional[str] = Field(None, max_length=200, description=MODEL_FIELD_DESCRIPTION)
+    version: Optional[str] = Field(
+        None, max_length=VERSION_MAX_LENGTH, description="Artifact version (CURRENT when omitted)"
+    )
+
+
 @router.get("/models")
 async def list_models(
     inference_service: InferenceService = Depends(get_inference_service)
 ):
-    """List available models and their status"""
+    """List servable models, their status, version and memory use"""
+    models = inference_service.list_models()
+    for model in models:
+        model['type'] = 'sentiment-analysis'
     return {
-        "models": [
-            {
-                "name": inference_service.model_name,
-                "status": "loaded" if inference_service.is_ready() else "loading",
-                "type": "sentiment-analysis"
-            }
-        ]
+        "default": inference_service.model_name,
+        "models": models,
+        **inference_service.registry_usage()
     }
+
+
+async def _swap_in_background(inference_service: InferenceService, model: Optional[str], version: Optional[str]) -> None:
+    try:
+        await inference_service.swap_model(model, version)
+    except Exception as e:
+        logger.error(f"Model swap to {model or inference_service.model_name}@{version} failed: {str(e)}")
+
+
+@router.post("/models/swap", status_code=202)
+async def swap_model(
+    payload: ModelSwapRequest,
+    background_tasks: BackgroundTasks,
+    inference_service: InferenceService = Depends(get_inference_service)
+):
+    """
+    Load a model version in the background and atomically switch new
+    requests to it. Requests already running finish on the old version;
+    poll /models to see when the swap has happened. Every worker of the
+    server swaps, each within MODEL_SWAP_POLL_SECONDS.
+    """
+    model_name = payload.model or inference_service.model_name
+    if model_name not in {m['name'] for m in inference_service.list_models()}:
+        raise HTTPException(status_code=404, detail=f"Model {model_name!r} is not available")
+    if payload.version is not None and not is_valid_version(payload.version):
+        raise HTTPException(
+            status_code=400,
+            detail="Version must be letters, digits, '.', '_' or '-' and not start with '.'"
+        )
+    if not inference_service.swaps_reach_all_workers:
+        # Only this worker would switch; the others would keep the old version
+        raise HTTPException(
+            status_code=409,
+            detail="Swaps across several workers need a shared MODEL_SWAP_STATE_FILE; run python -m prefork"
+        )
+    
+    background_tasks.add_task(_swap_in_background, inference_service, payload.model, payload.version)
+    return {"status": "swapping", "model": model_name, "version": payload.version}
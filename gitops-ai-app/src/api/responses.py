@@ -0,0 +1,35 @@
+"""
+Response Encoding - Presentation Tier
+JSON responses encoded straight to bytes, bypassing response_model re-validation
+"""
+import json
+from typing import Any
+
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional - falls back to the stdlib encoder
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response for content that is already plain dicts, lists, strings
+    and numbers.
+
+    Returning a Response makes FastAPI skip validating and re-serializing
+    the result through ``response_model``. The route's ``response_model``
+    still documents the schema in OpenAPI, so the handler must build
+    content matching it.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
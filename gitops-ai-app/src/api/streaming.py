@@ -0,0 +1,81 @@
+"""
+NDJSON Streaming Helpers - Presentation Tier
+Incremental request parsing and response streaming for bulk scoring
+"""
+import json
+import logging
+from typing import AsyncIterator, Optional
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for handlers that keep reading the request body
+    while the response is being sent.
+
+    The stock StreamingResponse listens for disconnects by calling
+    ``receive()`` concurrently, which would steal request body chunks
+    from the body iterator. Here the body iterator owns ``receive``;
+    a disconnect surfaces as ``ClientDisconnect`` from ``request.stream()``.
+    Each ``send`` waits on transport flow control, so a slow reader
+    pauses the iterator and therefore pauses reading of the input.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+
+        if self.background is not None:
+            await self.background()
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes],
+    max_line_bytes: int
+) -> AsyncIterator[Optional[bytes]]:
+    """
+    Split a byte stream into lines without buffering the whole body.
+
+    Blank lines are skipped. A line longer than ``max_line_bytes`` is
+    discarded and reported once as ``None`` so the caller can emit an
+    error record for it and carry on with the next line.
+    """
+    buffer = bytearray()
+    discarding = False
+
+    async for chunk in chunks:
+        buffer.extend(chunk)
+
+        while True:
+            newline = buffer.find(b"\n")
+            if newline < 0:
+                break
+
+            line = bytes(buffer[:newline]).strip()
+            del buffer[:newline + 1]
+
+            if discarding:
+                discarding = False
+                continue
+            if line:
+                yield line
+
+        if not discarding and len(buffer) > max_line_bytes:
+            discarding = True
+            yield None
+        if discarding:
+            buffer.clear()
+
+    line = bytes(buffer).strip()
+    if line and not discarding:
+        yield line
+
+
+def encode_record(record: dict) -> bytes:
+    """Serialize one output record as an NDJSON line"""
+    return json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
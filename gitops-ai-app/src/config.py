@@ -3,7 +3,7 @@ Application Configuration
 Environment-based configuration management
 """
 import os
-from typing import Optional
+from typing import List, Optional
 from functools import lru_cache
 
 
@@ -23,15 +23,108 @@ class Settings:
     # Model
     MODEL_NAME: str = os.getenv("MODEL_NAME", "distilbert-base-uncased-finetuned-sst-2-english")
     MODEL_CACHE_DIR: str = os.getenv("MODEL_CACHE_DIR", "/app/models")
+    # Artifact store version to load (CURRENT when unset)
+    MODEL_VERSION: Optional[str] = os.getenv("MODEL_VERSION") or None
+    # Never download; load only from the artifact store or the local HF cache
+    MODEL_OFFLINE: bool = os.getenv("MODEL_OFFLINE", "false").lower() == "true"
+    # Artifact check before loading: "checksum", "size" or "none"
+    MODEL_ARTIFACT_VERIFY: str = os.getenv("MODEL_ARTIFACT_VERIFY", "checksum").lower()
+    # Max tokens the model sees; longer inputs are truncated by the tokenizer
     MAX_SEQUENCE_LENGTH: int = int(os.getenv("MAX_SEQUENCE_LENGTH", "512"))
+    # Character cap applied while cleaning, only to bound tokenizer work; it
+    # defaults to 8 chars per token so it never cuts what the model would see
+    PREPROCESS_MAX_CHARS: int = int(os.getenv("PREPROCESS_MAX_CHARS", str(MAX_SEQUENCE_LENGTH * 8)))
+    # Model runtime: "transformers" (direct PyTorch forward), "pipeline" (HF
+    # pipeline), "onnx" (ONNX Runtime) or "mock"
+    MODEL_BACKEND: str = os.getenv("MODEL_BACKEND", "transformers").lower()
+    ONNX_QUANTIZE: bool = os.getenv("ONNX_QUANTIZE", "false").lower() == "true"
+    ONNX_INTRA_OP_THREADS: int = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))
+    # Weighted lexicon for the fallback model (built-in lexicon when unset)
+    LEXICON_PATH: Optional[str] = os.getenv("LEXICON_PATH") or None
+    # Further models selectable per request, evicted LRU under a weight memory budget
+    MODEL_NAMES: List[str] = [n.strip() for n in os.getenv("MODEL_NAMES", "").split(",") if n.strip()]
+    # Per worker process: every worker holds its own registry
+    MODEL_MEMORY_BUDGET_MB: int = int(os.getenv("MODEL_MEMORY_BUDGET_MB", "1024"))
+    # File through which the workers of one server share hot swaps (python -m
+    # prefork creates one); without it uvicorn --workers refuses swaps
+    MODEL_SWAP_STATE_FILE: Optional[str] = os.getenv("MODEL_SWAP_STATE_FILE") or None
+    # How often each worker checks the swap state file for swaps made by others
+    MODEL_SWAP_POLL_SECONDS: float = float(os.getenv("MODEL_SWAP_POLL_SECONDS", "1.0"))
     
     # Inference
     BATCH_SIZE: int = int(os.getenv("BATCH_SIZE", "32"))
     INFERENCE_TIMEOUT: int = int(os.getenv("INFERENCE_TIMEOUT", "30"))
+    STREAM_MAX_LINE_BYTES: int = int(os.getenv("STREAM_MAX_LINE_BYTES", "1048576"))
+    # Arrow IPC batch endpoint (needs pyarrow); larger batches than the JSON endpoint
+    ARROW_BATCH_MAX_ROWS: int = int(os.getenv("ARROW_BATCH_MAX_ROWS", "10000"))
+    ARROW_BATCH_MAX_BYTES: int = int(os.getenv("ARROW_BATCH_MAX_BYTES", str(64 * 1024 ** 2)))
+    
+    # Long-document mode: overlapping token windows instead of truncation
+    LONG_DOC_MAX_WINDOWS: int = int(os.getenv("LONG_DOC_MAX_WINDOWS", "16"))
+    LONG_DOC_STRIDE: int = int(os.getenv("LONG_DOC_STRIDE", "64"))
+    # Default aggregation: "mean", "max_confidence" or "length_weighted"
+    LONG_DOC_AGGREGATION: str = os.getenv("LONG_DOC_AGGREGATION", "mean").lower()
+    
+    # Bulk jobs: background scoring of JSONL/CSV files, checkpointed under JOBS_DIR
+    JOBS_ENABLED: bool = os.getenv("JOBS_ENABLED", "true").lower() == "true"
+    JOBS_DIR: str = os.getenv("JOBS_DIR", "/app/jobs")
+    # Root for jobs over existing local files; unset allows uploads only
+    JOBS_INPUT_DIR: Optional[str] = os.getenv("JOBS_INPUT_DIR") or None
+    JOBS_CHUNK_SIZE: int = int(os.getenv("JOBS_CHUNK_SIZE", "256"))
+    JOBS_MAX_CONCURRENT: int = int(os.getenv("JOBS_MAX_CONCURRENT", "1"))
+    JOBS_MAX_UPLOAD_BYTES: int = int(os.getenv("JOBS_MAX_UPLOAD_BYTES", str(1024 ** 3)))
+    # How often each worker checks JOBS_DIR for cancellations and for jobs left by exited workers
+    JOBS_POLL_SECONDS: float = float(os.getenv("JOBS_POLL_SECONDS", "1.0"))
+    # Finished jobs (results and uploads) are deleted this long after they finish; 0 keeps them
+    JOBS_RETENTION_HOURS: float = float(os.getenv("JOBS_RETENTION_HOURS", "24"))
+    
+    # Warm-up: synthetic inputs run through the model before /ready turns green
+    WARMUP_ENABLED: bool = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+    WARMUP_SEQUENCE_LENGTHS: List[int] = [
+        int(n) for n in os.getenv("WARMUP_SEQUENCE_LENGTHS", "16,64,128,512").split(",") if n.strip()
+    ]
+    WARMUP_BATCH_SIZE: int = int(os.getenv("WARMUP_BATCH_SIZE", os.getenv("BATCH_SIZE", "32")))
+    WARMUP_ROUNDS: int = int(os.getenv("WARMUP_ROUNDS", "1"))
+    
+    # Execution backend: "thread" runs the model in-process, "process" in a worker pool
+    INFERENCE_BACKEND: str = os.getenv("INFERENCE_BACKEND", "thread").lower()
+    INFERENCE_PROCESSES: int = int(os.getenv("INFERENCE_PROCESSES", os.getenv("WORKERS", "4")))
+    
+    # Micro-batching (coalesces concurrent single predictions)
+    MICRO_BATCH_ENABLED: bool = os.getenv("MICRO_BATCH_ENABLED", "true").lower() == "true"
+    MICRO_BATCH_MAX_SIZE: int = int(os.getenv("MICRO_BATCH_MAX_SIZE", os.getenv("BATCH_SIZE", "32")))
+    MICRO_BATCH_MAX_WAIT_MS: float = float(os.getenv("MICRO_BATCH_MAX_WAIT_MS", "5"))
+    
+    # Admission control (adaptive concurrency limit; 429 when saturated)
+    ADMISSION_CONTROL_ENABLED: bool = os.getenv("ADMISSION_CONTROL_ENABLED", "true").lower() == "true"
+    ADMISSION_INITIAL_LIMIT: int = int(os.getenv("ADMISSION_INITIAL_LIMIT", "64"))
+    ADMISSION_MIN_LIMIT: int = int(os.getenv("ADMISSION_MIN_LIMIT", "4"))
+    ADMISSION_MAX_LIMIT: int = int(os.getenv("ADMISSION_MAX_LIMIT", "1024"))
+    ADMISSION_LATENCY_TARGET_MS: float = float(os.getenv("ADMISSION_LATENCY_TARGET_MS", "1000"))
+    ADMISSION_MAX_QUEUE: int = int(os.getenv("ADMISSION_MAX_QUEUE", "128"))
+    ADMISSION_QUEUE_TIMEOUT_MS: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_MS", "1000"))
+    
+    # Prediction cache
+    PREDICTION_CACHE_ENABLED: bool = os.getenv("PREDICTION_CACHE_ENABLED", "true").lower() == "true"
+    PREDICTION_CACHE_MAX_ENTRIES: int = int(os.getenv("PREDICTION_CACHE_MAX_ENTRIES", "10000"))
+    PREDICTION_CACHE_MAX_BYTES: int = int(os.getenv("PREDICTION_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+    PREDICTION_CACHE_TTL_SECONDS: float = float(os.getenv("PREDICTION_CACHE_TTL_SECONDS", "300"))
+    
+    # Identical texts in flight at the same time share one prediction
+    INFLIGHT_COALESCING_ENABLED: bool = os.getenv("INFLIGHT_COALESCING_ENABLED", "true").lower() == "true"
     
     # Metrics
     METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
     METRICS_PORT: int = int(os.getenv("METRICS_PORT", "9090"))
+    # Per-stage request breakdown in a Server-Timing response header
+    SERVER_TIMING_ENABLED: bool = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+    
+    # On-demand sampling profiler at /debug/profile (404 unless enabled)
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    # Required X-Debug-Token header value; while empty every profile request is refused
+    PROFILING_TOKEN: str = os.getenv("PROFILING_TOKEN", "")
+    PROFILING_MAX_SECONDS: float = float(os.getenv("PROFILING_MAX_SECONDS", "60"))
+    PROFILING_INTERVAL_MS: float = float(os.getenv("PROFILING_INTERVAL_MS", "10"))
     
     # Health Check
     HEALTH_CHECK_PATH: str = os.getenv("HEALTH_CHECK_PATH", "/health")
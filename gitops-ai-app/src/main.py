@@ -3,19 +3,22 @@ FastAPI Entry Point - Presentation Tier
 Handles HTTP requests and routing
 """
 import logging
-import time
 from contextlib import asynccontextmanager
 from typing import Dict, Any
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 from starlette.responses import Response
 
 from config import settings
+from api.debug import router as debug_router
+from api.jobs import router as jobs_router
+from api.metrics import MetricsMiddleware
 from api.predict import router as predict_router
 from services.inference_service import InferenceService
+from services.jobs import JobManager
 
 # Configure logging
 logging.basicConfig(
@@ -24,37 +27,45 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Prometheus metrics
-REQUEST_COUNT = Counter(
-    'http_requests_total',
-    'Total HTTP requests',
-    ['method', 'endpoint', 'status']
-)
-REQUEST_LATENCY = Histogram(
-    'http_request_duration_seconds',
-    'HTTP request latency',
-    ['method', 'endpoint']
-)
-
 # Global inference service instance
 inference_service: InferenceService = None
+# Bulk job runner (None when JOBS_ENABLED is false)
+job_manager: JobManager = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
-    global inference_service
+    global inference_service, job_manager
     
     # Startup
     logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
+    if settings.PROFILING_ENABLED and not settings.PROFILING_TOKEN:
+        logger.error("PROFILING_ENABLED is set without PROFILING_TOKEN; /debug/profile refuses every request")
     inference_service = InferenceService()
     await inference_service.initialize()
     logger.info("Inference service initialized successfully")
     
+    if settings.JOBS_ENABLED:
+        job_manager = JobManager(
+            inference_service,
+            jobs_dir=settings.JOBS_DIR,
+            input_dir=settings.JOBS_INPUT_DIR,
+            chunk_size=settings.JOBS_CHUNK_SIZE,
+            max_concurrent=settings.JOBS_MAX_CONCURRENT,
+            max_line_bytes=settings.STREAM_MAX_LINE_BYTES,
+            poll_seconds=settings.JOBS_POLL_SECONDS,
+            retention_seconds=settings.JOBS_RETENTION_HOURS * 3600
+        )
+        # Resumes jobs interrupted by the last shutdown that no other worker has taken
+        await job_manager.start()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down application")
+    if job_manager:
+        await job_manager.stop()
     if inference_service:
         await inference_service.cleanup()
 
@@ -78,31 +89,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-
-@app.middleware("http")
-async def metrics_middleware(request: Request, call_next):
-    """Middleware to collect request metrics"""
-    start_time = time.time()
-    
-    response = await call_next(request)
-    
-    # Record metrics
-    duration = time.time() - start_time
-    REQUEST_COUNT.labels(
-        method=request.method,
-        endpoint=request.url.path,
-        status=response.status_code
-    ).inc()
-    REQUEST_LATENCY.labels(
-        method=request.method,
-        endpoint=request.url.path
-    ).observe(duration)
-    
-    return response
+# Request metrics by route template, plus Server-Timing (pure ASGI)
+app.add_middleware(MetricsMiddleware, server_timing=settings.SERVER_TIMING_ENABLED)
 
 
 # Include routers
 app.include_router(predict_router, prefix="/api/v1", tags=["inference"])
+app.include_router(jobs_router, prefix="/api/v1", tags=["jobs"])
+app.include_router(debug_router, tags=["debug"])
 
 
 @app.get("/health", tags=["health"])
@@ -157,6 +151,12 @@ def get_inference_service() -> InferenceService:
     return inference_service
 
 
+def get_job_manager() -> JobManager:
+    """Dependency injection for the bulk job manager"""
+    global job_manager
+    return job_manager
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
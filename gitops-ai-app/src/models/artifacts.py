@@ -0,0 +1,286 @@
+"""
+Model Artifact Store - Application Tier
+Versioned, checksum-verified model directories under MODEL_CACHE_DIR
+
+Layout::
+
+    <MODEL_CACHE_DIR>/artifacts/<model-slug>/
+        CURRENT                  # version served by default
+        <version>/
+            manifest.json        # name, version, per-file sha256 and size
+            config.json, model.safetensors, tokenizer files, ...
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ARTIFACTS_SUBDIR = "artifacts"
+MANIFEST_FILE = "manifest.json"
+CURRENT_FILE = "CURRENT"
+MANIFEST_FORMAT = 1
+
+# Version labels are single path components: no separators, no leading dot
+# (which also rules out "..", ".staging-*" and ".current-*")
+VERSION_PATTERN = re.compile(r"^[A-Za-z0-9_-][A-Za-z0-9._-]*$")
+VERSION_MAX_LENGTH = 100
+
+# Verification modes, from most to least thorough
+VERIFY_CHECKSUM = "checksum"
+VERIFY_SIZE = "size"
+VERIFY_NONE = "none"
+
+
+class ArtifactError(Exception):
+    """Raised for missing, incomplete or corrupted artifacts"""
+
+
+def model_slug(model_name: str) -> str:
+    """Filesystem-safe directory name for a model id"""
+    return model_name.strip("/").replace("/", "--")
+
+
+def is_valid_version(version: str) -> bool:
+    """Whether ``version`` is a safe version label (a plain directory name)"""
+    return len(version) <= VERSION_MAX_LENGTH and VERSION_PATTERN.match(version) is not None
+
+
+def _check_version(model_name: str, version: str) -> None:
+    if not is_valid_version(version):
+        raise ArtifactError(f"Invalid version {version!r} for {model_name}")
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file, streamed without loading it into memory"""
+    with open(path, "rb") as handle:
+        return hashlib.file_digest(handle, "sha256").hexdigest()
+
+
+@dataclass
+class Artifact:
+    """One published model version"""
+    model_name: str
+    version: str
+    path: str
+    manifest: Dict[str, Any]
+
+    @property
+    def files(self) -> Dict[str, Dict[str, Any]]:
+        return self.manifest["files"]
+
+    @property
+    def has_safetensors(self) -> bool:
+        """Whether weights can be memory-mapped instead of unpickled"""
+        return any(name.endswith(".safetensors") for name in self.files)
+
+
+class ArtifactStore:
+    """
+    Local store of immutable, versioned model directories.
+
+    Versions are published atomically (staged in the model directory, then
+    renamed into place) and never modified afterwards; ``CURRENT`` names the
+    version loaded when none is pinned. Each version's manifest records the
+    SHA-256 and size of every file so a load can verify the directory
+    before trusting it.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    @classmethod
+    def for_cache_dir(cls, cache_dir: str) -> "ArtifactStore":
+        """Store rooted in the model cache directory"""
+        return cls(os.path.join(cache_dir, ARTIFACTS_SUBDIR))
+
+    def _model_dir(self, model_name: str) -> str:
+        return os.path.join(self.root, model_slug(model_name))
+
+    def current_version(self, model_name: str) -> Optional[str]:
+        """Version named by CURRENT, if any"""
+        try:
+            with open(os.path.join(self._model_dir(model_name), CURRENT_FILE), encoding="utf-8") as handle:
+                return handle.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def versions(self, model_name: str) -> List[str]:
+        """Published versions of a model, oldest first"""
+        model_dir = self._model_dir(model_name)
+        if not os.path.isdir(model_dir):
+            return []
+
+        found = []
+        for entry in os.listdir(model_dir):
+            manifest = self._read_manifest(os.path.join(model_dir, entry))
+            if manifest is not None:
+                found.append((manifest.get("created_at", ""), entry))
+        return [version for _, version in sorted(found)]
+
+    @staticmethod
+    def _read_manifest(version_dir: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(version_dir, MANIFEST_FILE), encoding="utf-8") as handle:
+                return json.load(handle)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+    def resolve(self, model_name: str, version: Optional[str] = None) -> Optional[Artifact]:
+        """
+        Find a published version.
+
+        Args:
+            model_name: Model id
+            version: Version to load; defaults to CURRENT
+
+        Returns:
+            The artifact, or None when the model has no published version
+
+        Raises:
+            ArtifactError: If a pinned or CURRENT version is invalid or missing
+        """
+        pinned = version is not None
+        version = version or self.current_version(model_name)
+        if version is None:
+            return None
+        _check_version(model_name, version)
+
+        path = os.path.join(self._model_dir(model_name), version)
+        manifest = self._read_manifest(path)
+        if manifest is None:
+            source = "pinned" if pinned else CURRENT_FILE
+            raise ArtifactError(f"Version {version} of {model_name} ({source}) has no manifest in {path}")
+        return Artifact(model_name=model_name, version=version, path=path, manifest=manifest)
+
+    def verify(self, artifact: Artifact, mode: str = VERIFY_CHECKSUM) -> None:
+        """
+        Check every manifest file is present and intact.
+
+        Raises:
+            ArtifactError: On a missing file, size or checksum mismatch
+        """
+        if mode == VERIFY_NONE:
+            return
+
+        for name, expected in artifact.files.items():
+            path = os.path.join(artifact.path, name)
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                raise ArtifactError(f"{artifact.model_name}@{artifact.version}: missing file {name}")
+            if size != expected["size"]:
+                raise ArtifactError(
+                    f"{artifact.model_name}@{artifact.version}: {name} is {size} bytes, expected {expected['size']}"
+                )
+            if mode == VERIFY_CHECKSUM and file_sha256(path) != expected["sha256"]:
+                raise ArtifactError(f"{artifact.model_name}@{artifact.version}: checksum mismatch for {name}")
+
+        logger.info(f"Verified {artifact.model_name}@{artifact.version} ({mode}, {len(artifact.files)} files)")
+
+    def publish(
+        self,
+        model_name: str,
+        source_dir: str,
+        version: Optional[str] = None,
+        make_current: bool = True
+    ) -> Artifact:
+        """
+        Copy a model directory into the store as a new immutable version.
+
+        Args:
+            model_name: Model id the files belong to
+            source_dir: Directory with config, weights and tokenizer files
+            version: Version label; defaults to a content hash, so
+                republishing identical files is a no-op
+            make_current: Point CURRENT at the new version
+
+        Returns:
+            The published artifact
+        """
+        if version is not None:
+            _check_version(model_name, version)
+        model_dir = self._model_dir(model_name)
+        os.makedirs(model_dir, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".staging-", dir=model_dir)
+
+        try:
+            files: Dict[str, Dict[str, Any]] = {}
+            for dirpath, dirnames, filenames in os.walk(source_dir):
+                dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+                for filename in sorted(filenames):
+                    if filename.startswith(".") or filename == MANIFEST_FILE:
+                        continue
+                    source = os.path.join(dirpath, filename)
+                    name = os.path.relpath(source, source_dir).replace(os.sep, "/")
+                    target = os.path.join(staging, name)
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    shutil.copyfile(source, target)
+                    files[name] = {"sha256": file_sha256(target), "size": os.path.getsize(target)}
+
+            if not files:
+                raise ArtifactError(f"No model files found in {source_dir}")
+
+            if version is None:
+                content = hashlib.sha256()
+                for name in sorted(files):
+                    content.update(f"{name}\0{files[name]['sha256']}\n".encode())
+                version = content.hexdigest()[:12]
+
+            manifest = {
+                "format": MANIFEST_FORMAT,
+                "model_name": model_name,
+                "version": version,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "files": files,
+            }
+            with open(os.path.join(staging, MANIFEST_FILE), "w", encoding="utf-8") as handle:
+                json.dump(manifest, handle, indent=2, sort_keys=True)
+
+            final = os.path.join(model_dir, version)
+            existing = self._read_manifest(final)
+            if existing is not None:
+                if existing["files"] != files:
+                    raise ArtifactError(f"Version {version} of {model_name} already exists with different files")
+                shutil.rmtree(staging)
+                manifest = existing
+                logger.info(f"{model_name}@{version} already published")
+            else:
+                os.rename(staging, final)
+                logger.info(f"Published {model_name}@{version} ({len(files)} files)")
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        if make_current:
+            self.set_current(model_name, version)
+        return Artifact(model_name=model_name, version=version, path=final, manifest=manifest)
+
+    def set_current(self, model_name: str, version: str) -> None:
+        """Atomically point CURRENT at a published version"""
+        _check_version(model_name, version)
+        model_dir = self._model_dir(model_name)
+        if self._read_manifest(os.path.join(model_dir, version)) is None:
+            raise ArtifactError(f"Version {version} of {model_name} is not published")
+
+        fd, tmp_path = tempfile.mkstemp(prefix=".current-", dir=model_dir)
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(version + "\n")
+        os.replace(tmp_path, os.path.join(model_dir, CURRENT_FILE))
+
+    def prune(self, model_name: str, keep: int = 2) -> List[str]:
+        """Delete all but the newest ``keep`` versions (never CURRENT)"""
+        current = self.current_version(model_name)
+        versions = self.versions(model_name)
+        stale = [v for v in versions[:max(0, len(versions) - keep)] if v != current]
+        for version in stale:
+            shutil.rmtree(os.path.join(self._model_dir(model_name), version))
+            logger.info(f"Pruned {model_name}@{version}")
+        return stale
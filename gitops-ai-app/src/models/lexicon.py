@@ -0,0 +1,162 @@
+"""
+Lexicon Scorer - Application Tier
+Weighted keyword sentiment scorer used as the fallback model
+"""
+import logging
+import string
+from typing import Dict, Any, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEXICON: Dict[str, float] = {
+    **{word: 1.0 for word in (
+        'good', 'great', 'excellent', 'amazing', 'wonderful',
+        'fantastic', 'love', 'happy', 'best', 'awesome',
+        'beautiful', 'perfect', 'brilliant', 'outstanding'
+    )},
+    **{word: -1.0 for word in (
+        'bad', 'terrible', 'awful', 'horrible', 'hate',
+        'worst', 'disappointing', 'poor', 'sad', 'angry',
+        'ugly', 'disgusting', 'pathetic', 'failure'
+    )},
+}
+
+# Separator used to score a whole batch as one string; it survives the
+# translate table so the batch can be split back into its texts
+_BATCH_SEPARATOR = '\x00'
+
+# Maps ASCII punctuation and whitespace to spaces so str.split() yields words
+_WORD_TABLE = str.maketrans({
+    char: ' ' for char in string.punctuation + string.whitespace
+})
+
+NEUTRAL = {'label': 'NEUTRAL', 'confidence': 0.5, 'score': 0.0}
+
+
+def _normalize(word: str) -> str:
+    """
+    Lexicon key for ``word`` as texts are tokenized: lowercased, with
+    surrounding punctuation dropped.
+
+    Raises:
+        ValueError: If ``word`` is not exactly one token (e.g. "well-made",
+            "can't" or "not bad"), since such an entry could never match
+    """
+    tokens = word.lower().translate(_WORD_TABLE).split()
+    if len(tokens) != 1:
+        raise ValueError(
+            f"lexicon entry {word!r} is not a single word; "
+            f"texts are split on punctuation and whitespace into {tokens}"
+        )
+    return tokens[0]
+
+
+class LexiconScorer:
+    """
+    Keyword sentiment scorer over a weighted lexicon.
+
+    Each distinct lexicon word present in a text contributes its weight
+    once; the share of positive weight decides the label and confidence:
+    ``confidence = 0.5 + 0.5 * max(pos, neg) / (pos + neg)``.
+
+    Words are found with a single ``str.translate`` pass plus ``split``
+    and matched by set intersection, so cost grows with text length only,
+    not with lexicon size. ``score_batch`` lowercases and tokenizes the
+    whole batch as one string.
+    """
+
+    def __init__(self, weights: Dict[str, float]):
+        """
+        Raises:
+            ValueError: If a key is not a single word once tokenized
+        """
+        self.weights = {_normalize(word): float(w) for word, w in weights.items() if w}
+        self._vocabulary = frozenset(self.weights)
+
+    @classmethod
+    def default(cls) -> "LexiconScorer":
+        """Scorer over the built-in lexicon"""
+        return cls(DEFAULT_LEXICON)
+
+    @classmethod
+    def from_file(cls, path: str) -> "LexiconScorer":
+        """
+        Load a lexicon file with one ``<word> <weight>`` entry per line
+        (tab or space separated).
+
+        Blank lines and lines starting with ``#`` are ignored. Positive
+        weights mark positive words, negative weights negative ones.
+        Words are tokenized like texts, so entries with inner punctuation
+        ("well-made", "can't") are rejected.
+
+        Raises:
+            ValueError: On a malformed line or an entry that is not a single word
+        """
+        weights: Dict[str, float] = {}
+        with open(path, encoding='utf-8') as handle:
+            for line_no, line in enumerate(handle, start=1):
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+
+                parts = line.split()
+                if len(parts) != 2:
+                    raise ValueError(f"{path}:{line_no}: expected '<word> <weight>'")
+                try:
+                    weight = float(parts[1])
+                except ValueError:
+                    raise ValueError(f"{path}:{line_no}: invalid weight {parts[1]!r}")
+                try:
+                    weights[_normalize(parts[0])] = weight
+                except ValueError as e:
+                    raise ValueError(f"{path}:{line_no}: {str(e)}")
+
+        logger.info(f"Loaded lexicon with {len(weights)} entries from {path}")
+        return cls(weights)
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "LexiconScorer":
+        """Load from ``path`` when given, otherwise use the built-in lexicon"""
+        return cls.from_file(path) if path else cls.default()
+
+    def _score_words(self, words: Iterable[str]) -> Dict[str, Any]:
+        """Score the distinct words of one lowercased text"""
+        matched = self._vocabulary.intersection(words)
+        if not matched:
+            return dict(NEUTRAL)
+
+        weights = self.weights
+        positive = 0.0
+        negative = 0.0
+        for word in matched:
+            weight = weights[word]
+            if weight > 0:
+                positive += weight
+            else:
+                negative -= weight
+
+        pos_ratio = positive / (positive + negative)
+
+        if pos_ratio > 0.5:
+            confidence = 0.5 + (pos_ratio * 0.5)
+            return {'label': 'POSITIVE', 'confidence': confidence, 'score': confidence}
+
+        confidence = 0.5 + ((1 - pos_ratio) * 0.5)
+        return {'label': 'NEGATIVE', 'confidence': confidence, 'score': -confidence}
+
+    def score(self, text: str) -> Dict[str, Any]:
+        """Score a single text"""
+        return self._score_words(text.lower().translate(_WORD_TABLE).split())
+
+    def score_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Score a list of texts in one lowercase/tokenize pass"""
+        if not texts:
+            return []
+
+        joined = _BATCH_SEPARATOR.join(texts)
+        if joined.count(_BATCH_SEPARATOR) != len(texts) - 1:
+            # A text contains the separator itself; score individually
+            return [self.score(text) for text in texts]
+
+        lowered = joined.lower().translate(_WORD_TABLE).split(_BATCH_SEPARATOR)
+        return [self._score_words(text.split()) for text in lowered]
@@ -3,48 +3,578 @@ Sentiment Model - Application Tier
 ML model wrapper for sentiment analysis
 """
 import logging
-from typing import Dict, Any, List, Optional
+import os
+import time
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+from models.artifacts import VERIFY_CHECKSUM, ArtifactError, ArtifactStore, model_slug
+from models.lexicon import LexiconScorer
 
 logger = logging.getLogger(__name__)
 
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_QUANTIZED_MODEL_FILE = "model.int8.onnx"
+
+# How long-document window scores combine into one document score
+AGGREGATE_MEAN = "mean"
+AGGREGATE_MAX_CONFIDENCE = "max_confidence"
+AGGREGATE_LENGTH_WEIGHTED = "length_weighted"
+AGGREGATIONS = (AGGREGATE_MEAN, AGGREGATE_MAX_CONFIDENCE, AGGREGATE_LENGTH_WEIGHTED)
+
+
+def onnx_model_dir(cache_dir: str, model_name: str) -> str:
+    """Directory holding the exported ONNX artifacts for a model"""
+    return os.path.join(cache_dir, "onnx", model_slug(model_name))
+
+
+def spread_indexes(count: int, limit: int) -> List[int]:
+    """Up to ``limit`` indexes evenly spaced over ``range(count)``, first and last included"""
+    if count <= limit:
+        return list(range(count))
+    if limit <= 1:
+        return [0]
+    return [round(i * (count - 1) / (limit - 1)) for i in range(limit)]
+
+
+def token_windows(
+    tokenizer: Any,
+    texts: List[str],
+    max_length: int,
+    stride: int,
+    max_windows: int
+) -> Tuple[List[List[int]], List[int]]:
+    """
+    Split each text into overlapping token windows of ``max_length`` with
+    a fast tokenizer.
+    
+    Args:
+        tokenizer: Fast tokenizer (supports ``return_overflowing_tokens``)
+        texts: Preprocessed texts
+        max_length: Tokens per window, special tokens included
+        stride: Tokens shared by consecutive windows
+        max_windows: Per-text cap; longer texts keep evenly spaced windows
+        
+    Returns:
+        Window token ids, and the index of the text each window belongs to
+    """
+    room = max_length - tokenizer.num_special_tokens_to_add()
+    encoded = tokenizer(
+        texts,
+        truncation=True,
+        max_length=max_length,
+        stride=max(0, min(stride, room // 2)),
+        return_overflowing_tokens=True
+    )
+    
+    per_text: List[List[List[int]]] = [[] for _ in texts]
+    for ids, owner in zip(encoded['input_ids'], encoded['overflow_to_sample_mapping']):
+        per_text[owner].append(ids)
+    
+    window_ids: List[List[int]] = []
+    owners: List[int] = []
+    for owner, windows in enumerate(per_text):
+        for i in spread_indexes(len(windows), max(1, max_windows)):
+            window_ids.append(windows[i])
+            owners.append(owner)
+    return window_ids, owners
+
+
+def aggregate_windows(
+    probs: Any,
+    owners: List[int],
+    weights: List[int],
+    count: int,
+    aggregation: str,
+    id2label: Dict[int, str]
+) -> List[Dict[str, Any]]:
+    """
+    Combine window class probabilities into one prediction per document.
+    
+    Args:
+        probs: numpy array of shape (windows, labels)
+        owners: Document index of each window
+        weights: Content tokens of each window, for ``length_weighted``
+        count: Number of documents
+        aggregation: One of ``AGGREGATIONS``
+        id2label: Label name per class index
+        
+    Returns:
+        One ``{'label', 'score', 'windows'}`` dict per document
+    """
+    import numpy as np
+    
+    owner_index = np.asarray(owners)
+    counts = np.bincount(owner_index, minlength=count)
+    
+    if aggregation == AGGREGATE_MAX_CONFIDENCE:
+        # Each document takes the label of its most confident window
+        confidence = probs.max(axis=-1)
+        best: Dict[int, int] = {}
+        for window, owner in enumerate(owners):
+            if owner not in best or confidence[window] > confidence[best[owner]]:
+                best[owner] = window
+        doc_probs = probs[[best[i] for i in range(count)]]
+    else:
+        if aggregation == AGGREGATE_LENGTH_WEIGHTED:
+            window_weights = np.asarray(weights, dtype=probs.dtype)
+        else:
+            window_weights = np.ones(len(owners), dtype=probs.dtype)
+        sums = np.zeros((count, probs.shape[-1]), dtype=probs.dtype)
+        np.add.at(sums, owner_index, probs * window_weights[:, None])
+        totals = np.bincount(owner_index, weights=window_weights, minlength=count)
+        doc_probs = sums / totals[:, None]
+    
+    label_ids = doc_probs.argmax(axis=-1)
+    return [
+        {'label': id2label[int(label_id)], 'score': float(doc_probs[row, label_id]), 'windows': int(windows)}
+        for row, (label_id, windows) in enumerate(zip(label_ids, counts))
+    ]
+
+
+def to_prediction(label: str, confidence: float) -> Dict[str, Any]:
+    """Prediction dictionary with a signed sentiment score (-1 to 1)"""
+    if label.upper() == 'POSITIVE':
+        sentiment_score = confidence
+    elif label.upper() == 'NEGATIVE':
+        sentiment_score = -confidence
+    else:
+        sentiment_score = 0.0
+    return {'label': label, 'confidence': confidence, 'score': sentiment_score}
+
+
+def resolve_model_source(
+    model_name: str,
+    cache_dir: str,
+    version: Optional[str] = None,
+    offline: bool = False,
+    verify: str = VERIFY_CHECKSUM
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Decide where ``from_pretrained`` loads a model from.
+    
+    In order: a local directory given as the model name; a verified
+    version from the artifact store under ``cache_dir``; the HuggingFace
+    cache in ``cache_dir`` (download allowed unless ``offline``).
+    
+    Returns:
+        Source path or model id, and ``from_pretrained`` keyword arguments
+    
+    Raises:
+        ArtifactError: If a published artifact is missing or fails verification
+    """
+    if os.path.isdir(model_name):
+        return model_name, {'local_files_only': True}
+    
+    store = ArtifactStore.for_cache_dir(cache_dir)
+    artifact = store.resolve(model_name, version)
+    if artifact is not None:
+        store.verify(artifact, verify)
+        kwargs: Dict[str, Any] = {'local_files_only': True}
+        if artifact.has_safetensors:
+            # Memory-map weights instead of unpickling a full copy
+            kwargs['use_safetensors'] = True
+        logger.info(f"Loading {model_name}@{artifact.version} from artifact store")
+        return artifact.path, kwargs
+    
+    if version is not None:
+        logger.warning(f"Version {version} of {model_name} is not in the artifact store; using the HF cache")
+    return model_name, {'cache_dir': cache_dir, 'local_files_only': offline}
+
+
+class OnnxSentimentBackend:
+    """
+    ONNX Runtime backend with the same call interface as the HF
+    text-classification pipeline: ``backend(texts, batch_size=n)``
+    returns one ``{'label', 'score'}`` dict per text, and the fast
+    tokenizer is exposed as ``backend.tokenizer``.
+    
+    ``documents`` is the long-document mode, with the same windows and
+    aggregation as ``TorchSentimentBackend.documents``.
+    """
+    
+    def __init__(
+        self,
+        model_dir: str,
+        quantized: bool = False,
+        max_length: int = 512,
+        intra_op_threads: int = 0
+    ):
+        import numpy as np
+        import onnxruntime as ort
+        from transformers import AutoConfig, AutoTokenizer
+        
+        self._np = np
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir, local_files_only=True)
+        config = AutoConfig.from_pretrained(model_dir, local_files_only=True)
+        self.max_length = min(
+            limit for limit in (
+                max_length,
+                getattr(self.tokenizer, 'model_max_length', None),
+                getattr(config, 'max_position_embeddings', None)
+            ) if limit
+        )
+        self.id2label = {int(k): v for k, v in config.id2label.items()}
+        self.pad_id = self.tokenizer.pad_token_id if self.tokenizer.pad_token_id is not None else 0
+        
+        model_file = ONNX_QUANTIZED_MODEL_FILE if quantized else ONNX_MODEL_FILE
+        self.model_path = os.path.join(model_dir, model_file)
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads > 0:
+            options.intra_op_num_threads = intra_op_threads
+        
+        self.session = ort.InferenceSession(
+            self.model_path,
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+    
+    def __call__(
+        self,
+        texts: Union[str, List[str]],
+        batch_size: Optional[int] = None,
+        **kwargs: Any
+    ) -> List[Dict[str, Any]]:
+        if isinstance(texts, str):
+            texts = [texts]
+        step = batch_size or len(texts) or 1
+        outputs: List[Dict[str, Any]] = []
+        
+        for start in range(0, len(texts), step):
+            encoded = self.tokenizer(
+                texts[start:start + step],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="np"
+            )
+            probs = self._run(encoded)
+            best = probs.argmax(axis=-1)
+            
+            outputs.extend(
+                {'label': self.id2label[int(label_id)], 'score': float(probs[row, label_id])}
+                for row, label_id in enumerate(best)
+            )
+        
+        return outputs
+    
+    def _run(self, encoded: Dict[str, Any]) -> Any:
+        """Class probabilities (softmax) for one encoded sub-batch"""
+        np = self._np
+        feeds = {
+            name: np.asarray(value).astype(np.int64)
+            for name, value in encoded.items()
+            if name in self._input_names
+        }
+        logits = self.session.run(None, feeds)[0]
+        logits = logits - logits.max(axis=-1, keepdims=True)
+        probs = np.exp(logits)
+        return probs / probs.sum(axis=-1, keepdims=True)
+    
+    def probabilities(self, ids: List[List[int]], batch_size: Optional[int] = None) -> Any:
+        """Class probabilities for token ids in input order, run as length-sorted sub-batches"""
+        np = self._np
+        order = sorted(range(len(ids)), key=lambda i: len(ids[i]))
+        step = batch_size or len(ids)
+        probs = None
+        
+        for start in range(0, len(order), step):
+            chunk = [ids[i] for i in order[start:start + step]]
+            width = max(len(seq) for seq in chunk)
+            input_ids = np.full((len(chunk), width), self.pad_id, dtype=np.int64)
+            mask = np.zeros((len(chunk), width), dtype=np.int64)
+            for row, seq in enumerate(chunk):
+                input_ids[row, :len(seq)] = seq
+                mask[row, :len(seq)] = 1
+            chunk_probs = self._run({
+                'input_ids': input_ids,
+                'attention_mask': mask,
+                'token_type_ids': np.zeros_like(input_ids)
+            })
+            if probs is None:
+                probs = np.empty((len(ids), chunk_probs.shape[-1]), dtype=chunk_probs.dtype)
+            probs[order[start:start + step]] = chunk_probs
+        return probs
+    
+    def documents(
+        self,
+        texts: List[str],
+        aggregation: str = AGGREGATE_MEAN,
+        stride: int = 64,
+        max_windows: int = 16,
+        batch_size: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Score each text over all its windows; windows of every text are
+        packed into the same sub-batches.
+        
+        Returns:
+            One ``{'label', 'score', 'windows'}`` dict per text
+        """
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation {aggregation!r}; expected one of {AGGREGATIONS}")
+        if not texts:
+            return []
+        
+        window_ids, owners = token_windows(self.tokenizer, texts, self.max_length, stride, max_windows)
+        specials = self.tokenizer.num_special_tokens_to_add()
+        return aggregate_windows(
+            self.probabilities(window_ids, batch_size),
+            owners,
+            [max(1, len(ids) - specials) for ids in window_ids],
+            len(texts),
+            aggregation,
+            self.id2label
+        )
+
+
+class TorchSentimentBackend:
+    """
+    Direct PyTorch forward pass with the HF pipeline's call interface.
+    
+    Each call tokenizes all texts once with the fast tokenizer, truncating
+    at ``max_length`` tokens. It then pads length-sorted sub-batches itself
+    and runs the model under ``torch.inference_mode``. Labels and scores
+    come from one softmax/argmax per sub-batch. Because it sorts and splits
+    the texts itself, ``SentimentModel.predict_batch`` hands it whole
+    requests (``sorts_by_length``).
+    
+    ``documents`` is the long-document mode: overlapping windows instead of
+    truncation, aggregated per text.
+    """
+    
+    sorts_by_length = True
+    
+    def __init__(self, model: Any, tokenizer: Any, max_length: int = 512):
+        import torch
+        
+        self._torch = torch
+        self.model = model.eval()
+        self.tokenizer = tokenizer
+        config = model.config
+        self.max_length = min(
+            limit for limit in (
+                max_length,
+                getattr(tokenizer, 'model_max_length', None),
+                getattr(config, 'max_position_embeddings', None)
+            ) if limit
+        )
+        self.id2label = {int(k): v for k, v in config.id2label.items()}
+        self.pad_id = tokenizer.pad_token_id if tokenizer.pad_token_id is not None else 0
+        self.pad_left = getattr(tokenizer, 'padding_side', 'right') == 'left'
+        # Same scoring function the text-classification pipeline picks
+        self.sigmoid = config.num_labels == 1 or config.problem_type == "multi_label_classification"
+    
+    def encode(self, texts: List[str]) -> List[List[int]]:
+        """Token ids with special tokens, truncated to ``max_length``"""
+        return self.tokenizer(texts, truncation=True, max_length=self.max_length)['input_ids']
+    
+    def windows(
+        self,
+        texts: List[str],
+        stride: int,
+        max_windows: int
+    ) -> Tuple[List[List[int]], List[int]]:
+        """Overlapping token windows of ``max_length`` (see ``token_windows``)"""
+        return token_windows(self.tokenizer, texts, self.max_length, stride, max_windows)
+    
+    def forward(self, ids: List[List[int]]) -> Any:
+        """Class probabilities for one padded sub-batch, shape (len(ids), labels)"""
+        torch = self._torch
+        width = max(len(seq) for seq in ids)
+        pad, ones = [self.pad_id] * width, [1] * width
+        zeros = [0] * width
+        if self.pad_left:
+            input_ids = [pad[len(seq):] + seq for seq in ids]
+            mask = [zeros[len(seq):] + ones[:len(seq)] for seq in ids]
+        else:
+            input_ids = [seq + pad[len(seq):] for seq in ids]
+            mask = [ones[:len(seq)] + zeros[len(seq):] for seq in ids]
+        
+        with torch.inference_mode():
+            logits = self.model(
+                input_ids=torch.tensor(input_ids, dtype=torch.long),
+                attention_mask=torch.tensor(mask, dtype=torch.long)
+            ).logits
+            return logits.sigmoid() if self.sigmoid else logits.softmax(dim=-1)
+    
+    def probabilities(self, ids: List[List[int]], batch_size: Optional[int] = None) -> Any:
+        """Class probabilities in input order, run as length-sorted sub-batches"""
+        torch = self._torch
+        order = sorted(range(len(ids)), key=lambda i: len(ids[i]))
+        step = batch_size or len(ids)
+        chunks = [
+            self.forward([ids[i] for i in order[start:start + step]])
+            for start in range(0, len(order), step)
+        ]
+        probs = torch.empty((len(ids), chunks[0].shape[-1]), dtype=chunks[0].dtype)
+        probs[torch.tensor(order)] = torch.cat(chunks)
+        return probs
+    
+    def documents(
+        self,
+        texts: List[str],
+        aggregation: str = AGGREGATE_MEAN,
+        stride: int = 64,
+        max_windows: int = 16,
+        batch_size: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Score each text over all its windows; windows of every text are
+        packed into the same sub-batches.
+        
+        Returns:
+            One ``{'label', 'score', 'windows'}`` dict per text
+        """
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation {aggregation!r}; expected one of {AGGREGATIONS}")
+        if not texts:
+            return []
+        
+        window_ids, owners = self.windows(texts, stride, max_windows)
+        specials = self.tokenizer.num_special_tokens_to_add()
+        return aggregate_windows(
+            self.probabilities(window_ids, batch_size).numpy(),
+            owners,
+            [max(1, len(ids) - specials) for ids in window_ids],
+            len(texts),
+            aggregation,
+            self.id2label
+        )
+    
+    def __call__(
+        self,
+        texts: Union[str, List[str]],
+        batch_size: Optional[int] = None,
+        **kwargs: Any
+    ) -> List[Dict[str, Any]]:
+        if isinstance(texts, str):
+            texts = [texts]
+        if not texts:
+            return []
+        
+        scores, label_ids = self.probabilities(self.encode(texts), batch_size).max(dim=-1)
+        return [
+            {'label': self.id2label[label_id], 'score': score}
+            for label_id, score in zip(label_ids.tolist(), scores.tolist())
+        ]
+
 
 class SentimentModel:
     """
     Wrapper for sentiment analysis model.
-    Supports both HuggingFace transformers and fallback mock model.
+    Supports HuggingFace transformers, ONNX Runtime and a fallback
+    lexicon-based mock model.
+    
+    Backends are pipeline-compatible callables stored in ``_pipeline``:
+    - ``transformers``: direct PyTorch fp32 forward pass, tokenizing once
+      (``TorchSentimentBackend``)
+    - ``pipeline``: the HF text-classification pipeline, kept as a reference
+    - ``onnx``: ONNX Runtime session over an exported model, optionally
+      dynamically quantized to int8 (see ``tools.export_onnx``)
+    - ``mock``: lexicon scorer only, never touches transformers
     """
     
-    def __init__(self, model_name: str, cache_dir: str = "/app/models"):
+    def __init__(
+        self,
+        model_name: str,
+        cache_dir: str = "/app/models",
+        batch_size: int = 32,
+        backend: str = "transformers",
+        quantize: bool = False,
+        max_length: int = 512,
+        intra_op_threads: int = 0,
+        lexicon_path: Optional[str] = None,
+        version: Optional[str] = None,
+        offline: bool = False,
+        verify: str = VERIFY_CHECKSUM
+    ):
         self.model_name = model_name
         self.cache_dir = cache_dir
+        self.batch_size = max(1, batch_size)
+        self.backend = backend
+        self.quantize = quantize
+        self.max_length = max_length
+        self.intra_op_threads = intra_op_threads
+        self.version = version
+        self.offline = offline
+        self.verify = verify
         self._model = None
         self._tokenizer = None
         self._pipeline = None
+        # Long-document scorer (``documents`` of a backend); None for the mock
+        self._documents = None
         self._is_loaded = False
         self._use_mock = False
+        self._lexicon = LexiconScorer.load(lexicon_path)
+        # Seconds spent importing the ML runtime and loading weights
+        self.load_timings: Dict[str, float] = {'import': 0.0, 'load': 0.0}
         
         self._load_model()
     
     def _load_model(self) -> None:
-        """Load the sentiment analysis model"""
+        """Load the sentiment analysis model for the configured backend"""
+        if self.backend == "mock":
+            logger.info("Using lexicon mock model")
+            self._use_mock = True
+            self._is_loaded = True
+            return
+        
         try:
-            # Try to load HuggingFace transformers pipeline
-            from transformers import pipeline
+            logger.info(f"Loading model: {self.model_name} (backend={self.backend})")
             
-            logger.info(f"Loading model: {self.model_name}")
+            start = time.perf_counter()
+            if self.backend == "onnx":
+                import onnxruntime  # noqa: F401
+            else:
+                import torch  # noqa: F401
+                from transformers import AutoModelForSequenceClassification, AutoTokenizer
+                if self.backend == "pipeline":
+                    from transformers import pipeline
+            self.load_timings['import'] = time.perf_counter() - start
             
-            self._pipeline = pipeline(
-                "sentiment-analysis",
-                model=self.model_name,
-                tokenizer=self.model_name,
-                device=-1  # CPU, use 0 for GPU
-            )
+            start = time.perf_counter()
+            if self.backend == "onnx":
+                self._pipeline = OnnxSentimentBackend(
+                    onnx_model_dir(self.cache_dir, self.model_name),
+                    quantized=self.quantize,
+                    max_length=self.max_length,
+                    intra_op_threads=self.intra_op_threads
+                )
+                self._documents = self._pipeline.documents
+            else:
+                source, kwargs = resolve_model_source(
+                    self.model_name, self.cache_dir, self.version, self.offline, self.verify
+                )
+                self._tokenizer = AutoTokenizer.from_pretrained(source, **kwargs)
+                self._model = AutoModelForSequenceClassification.from_pretrained(source, **kwargs)
+                direct = TorchSentimentBackend(self._model, self._tokenizer, self.max_length)
+                if self.backend == "pipeline":
+                    self._pipeline = pipeline(
+                        "sentiment-analysis",
+                        model=self._model,
+                        tokenizer=self._tokenizer,
+                        device=-1,  # CPU, use 0 for GPU
+                        truncation=True,
+                        max_length=direct.max_length
+                    )
+                else:
+                    self._pipeline = direct
+                # The HF pipeline only truncates; windows run on the same model directly
+                self._documents = direct.documents
+            
+            self.load_timings['load'] = time.perf_counter() - start
             
             self._is_loaded = True
             logger.info(f"Model {self.model_name} loaded successfully")
             
+        except ArtifactError:
+            # A corrupted or missing pinned artifact must not be served as the mock
+            raise
+            
         except ImportError:
-            logger.warning("Transformers not available, using mock model")
+            logger.warning(f"Dependencies for the {self.backend} backend not available, using mock model")
             self._use_mock = True
             self._is_loaded = True
             
@@ -58,6 +588,15 @@ class SentimentModel:
         """Check if model is loaded and ready"""
         return self._is_loaded
     
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the model weights"""
+        if self._use_mock or self._pipeline is None:
+            return 0
+        if isinstance(self._pipeline, OnnxSentimentBackend):
+            return os.path.getsize(self._pipeline.model_path)
+        tensors = list(self._model.parameters()) + list(self._model.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors)
+    
     def predict(self, text: str) -> Dict[str, Any]:
         """
         Predict sentiment for a single text.
@@ -73,24 +612,7 @@ class SentimentModel:
         
         try:
             result = self._pipeline(text)[0]
-            
-            # Normalize to consistent format
-            label = result['label']
-            score = result['score']
-            
-            # Convert to sentiment score (-1 to 1)
-            if label.upper() == 'POSITIVE':
-                sentiment_score = score
-            elif label.upper() == 'NEGATIVE':
-                sentiment_score = -score
-            else:
-                sentiment_score = 0.0
-            
-            return {
-                'label': label,
-                'confidence': score,
-                'score': sentiment_score
-            }
+            return to_prediction(result['label'], result['score'])
             
         except Exception as e:
             logger.error(f"Prediction failed: {str(e)}")
@@ -100,6 +622,10 @@ class SentimentModel:
         """
         Predict sentiment for a batch of texts.
         
+        Texts are sorted by tokenized length and run in sub-batches of
+        ``batch_size`` so short texts are not padded up to the longest
+        one in the request. Results are returned in input order.
+        
         Args:
             texts: List of preprocessed texts
             
@@ -107,28 +633,25 @@ class SentimentModel:
             List of prediction dictionaries
         """
         if self._use_mock:
-            return [self._mock_predict(text) for text in texts]
+            return self._lexicon.score_batch(texts)
         
         try:
-            results = self._pipeline(texts)
+            predictions: List[Optional[Dict[str, Any]]] = [None] * len(texts)
             
-            predictions = []
-            for result in results:
-                label = result['label']
-                score = result['score']
-                
-                if label.upper() == 'POSITIVE':
-                    sentiment_score = score
-                elif label.upper() == 'NEGATIVE':
-                    sentiment_score = -score
-                else:
-                    sentiment_score = 0.0
+            if getattr(self._pipeline, 'sorts_by_length', False):
+                # The backend tokenizes once and buckets on its own token ids
+                buckets = [list(range(len(texts)))]
+                batch_size = self.batch_size
+            else:
+                buckets = self._length_buckets(texts)
+                batch_size = None
+            
+            for indices in buckets:
+                chunk = [texts[i] for i in indices]
+                results = self._pipeline(chunk, batch_size=batch_size or len(chunk))
                 
-                predictions.append({
-                    'label': label,
-                    'confidence': score,
-                    'score': sentiment_score
-                })
+                for i, result in zip(indices, results):
+                    predictions[i] = to_prediction(result['label'], result['score'])
             
             return predictions
             
@@ -136,45 +659,77 @@ class SentimentModel:
             logger.error(f"Batch prediction failed: {str(e)}")
             raise
     
+    def predict_documents(
+        self,
+        texts: List[str],
+        aggregation: str = AGGREGATE_MEAN,
+        max_windows: int = 16,
+        stride: int = 64
+    ) -> List[Dict[str, Any]]:
+        """
+        Predict sentiment for long texts from overlapping token windows
+        instead of truncating them.
+        
+        Windows from all texts run together as packed sub-batches of
+        ``batch_size``, so cost grows linearly with total length up to
+        ``max_windows`` per text.
+        
+        Args:
+            texts: List of preprocessed texts
+            aggregation: ``mean`` of window probabilities, the
+                ``max_confidence`` window, or ``length_weighted`` mean
+            max_windows: Windows scored per text at most; longer texts
+                keep evenly spaced windows
+            stride: Tokens shared by consecutive windows
+            
+        Returns:
+            List of prediction dictionaries, each with a ``windows`` count
+        
+        Raises:
+            ValueError: If ``aggregation`` is unknown
+        """
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation {aggregation!r}; expected one of {AGGREGATIONS}")
+        
+        if self._use_mock:
+            # The lexicon reads whole texts
+            return [dict(result, windows=1) for result in self.predict_batch(texts)]
+        
+        try:
+            return [
+                dict(to_prediction(result['label'], result['score']), windows=result['windows'])
+                for result in self._documents(texts, aggregation, stride, max_windows, self.batch_size)
+            ]
+        except Exception as e:
+            logger.error(f"Document prediction failed: {str(e)}")
+            raise
+    
+    def _token_lengths(self, texts: List[str]) -> List[int]:
+        """Tokenized length of each text, falling back to character length"""
+        tokenizer = getattr(self._pipeline, 'tokenizer', None)
+        if tokenizer is not None:
+            try:
+                encoded = tokenizer(texts, add_special_tokens=False)['input_ids']
+                return [len(ids) for ids in encoded]
+            except Exception as e:
+                logger.debug(f"Tokenizer length probe failed, using char lengths: {str(e)}")
+        return [len(text) for text in texts]
+    
+    def _length_buckets(self, texts: List[str]) -> List[List[int]]:
+        """Split input positions into length-sorted sub-batches of batch_size"""
+        if len(texts) <= 1:
+            return [list(range(len(texts)))]
+        
+        lengths = self._token_lengths(texts)
+        order = sorted(range(len(texts)), key=lengths.__getitem__)
+        return [
+            order[start:start + self.batch_size]
+            for start in range(0, len(order), self.batch_size)
+        ]
+    
     def _mock_predict(self, text: str) -> Dict[str, Any]:
         """
         Mock prediction for testing without transformers.
-        Uses simple keyword-based sentiment analysis.
+        Uses weighted lexicon keyword scoring.
         """
-        text_lower = text.lower()
-        
-        positive_words = ['good', 'great', 'excellent', 'amazing', 'wonderful', 
-                         'fantastic', 'love', 'happy', 'best', 'awesome',
-                         'beautiful', 'perfect', 'brilliant', 'outstanding']
-        negative_words = ['bad', 'terrible', 'awful', 'horrible', 'hate',
-                         'worst', 'disappointing', 'poor', 'sad', 'angry',
-                         'ugly', 'disgusting', 'pathetic', 'failure']
-        
-        pos_count = sum(1 for word in positive_words if word in text_lower)
-        neg_count = sum(1 for word in negative_words if word in text_lower)
-        
-        total = pos_count + neg_count
-        
-        if total == 0:
-            return {
-                'label': 'NEUTRAL',
-                'confidence': 0.5,
-                'score': 0.0
-            }
-        
-        pos_ratio = pos_count / total
-        
-        if pos_ratio > 0.5:
-            confidence = 0.5 + (pos_ratio * 0.5)
-            return {
-                'label': 'POSITIVE',
-                'confidence': confidence,
-                'score': confidence
-            }
-        else:
-            confidence = 0.5 + ((1 - pos_ratio) * 0.5)
-            return {
-                'label': 'NEGATIVE',
-                'confidence': confidence,
-                'score': -confidence
-            }
+        return self._lexicon.score(text)
@@ -0,0 +1,190 @@
+"""
+Pre-fork Server Entry Point - Presentation Tier
+Loads the default model once, then forks uvicorn workers that share its
+weights instead of each loading a copy
+
+Usage:
+    python -m prefork    # WORKERS workers on HOST:PORT
+"""
+import ctypes
+import gc
+import logging
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import time
+from typing import Dict, Optional
+
+import uvicorn
+from uvicorn.config import Config
+
+from config import settings
+from services.inference_service import preload_model
+from utils.memory import process_memory
+
+logger = logging.getLogger(__name__)
+
+# Exit code of a worker whose lifespan startup failed (as uvicorn's)
+STARTUP_FAILURE = 3
+
+# A worker that dies sooner than this after starting is restarted with a delay
+RESTART_BACKOFF_SECONDS = 1.0
+
+HANDLED_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+
+# prctl option that signals a process when its parent exits (linux/prctl.h)
+PR_SET_PDEATHSIG = 1
+
+
+def _exit_with_parent() -> None:
+    """Have the kernel send SIGTERM to this worker if the master dies, even by SIGKILL (Linux)"""
+    try:
+        ctypes.CDLL(None, use_errno=True).prctl(PR_SET_PDEATHSIG, signal.SIGTERM)
+    except (OSError, AttributeError):
+        pass
+
+
+def _release_free_heap() -> None:
+    """Return heap memory freed while loading to the OS instead of every worker inheriting it (glibc)"""
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+class PreforkServer:
+    """
+    Master process of pre-fork serving.
+
+    ``uvicorn --workers`` spawns fresh interpreters, so every worker
+    imports the app and loads the model weights again. Here the master
+    imports the app and loads the default model before forking, and the
+    workers inherit both. Weights are only read after loading, so their
+    pages stay shared copy-on-write between all workers and the pod holds
+    one copy. ``gc.freeze()`` keeps the workers' garbage collectors from
+    writing to (and so copying) the objects inherited from the master.
+
+    The master serves nothing itself. It restarts workers that die,
+    forwards SIGTERM/SIGINT so workers shut down gracefully, and gives up
+    if a worker fails during startup. Unless MODEL_SWAP_STATE_FILE is set,
+    it creates one for this run so a hot swap reaches every worker.
+    """
+
+    def __init__(self, config: Config, workers: int):
+        self.config = config
+        self.workers = max(1, workers)
+        self.children: Dict[int, float] = {}
+        self.should_exit = False
+        self.exit_code = 0
+        self._socket = None
+
+    def run(self) -> int:
+        """Preload, fork the workers and supervise them until shutdown"""
+        state_dir = None
+        if not settings.MODEL_SWAP_STATE_FILE:
+            state_dir = tempfile.mkdtemp(prefix="prefork-")
+            settings.MODEL_SWAP_STATE_FILE = os.path.join(state_dir, "swaps.json")
+        try:
+            return self._run()
+        finally:
+            if state_dir is not None:
+                shutil.rmtree(state_dir, ignore_errors=True)
+
+    def _run(self) -> int:
+        started = time.perf_counter()
+        self.config.load()
+        model = preload_model()
+        if model is not None:
+            logger.info(
+                f"Preloaded {model.model_name} ({model.memory_bytes() / 2**20:.0f} MiB of weights) "
+                f"in {time.perf_counter() - started:.1f}s"
+            )
+        gc.collect()
+        _release_free_heap()
+        self._log_memory("Master before fork")
+        self._socket = self.config.bind_socket()
+        gc.freeze()
+
+        for sig in HANDLED_SIGNALS:
+            signal.signal(sig, self._handle_exit)
+        for _ in range(self.workers):
+            self._spawn()
+
+        while self.children:
+            pid, status = os.wait()
+            uptime = time.monotonic() - self.children.pop(pid, time.monotonic())
+            code = os.waitstatus_to_exitcode(status)
+            if self.should_exit:
+                continue
+            if code == STARTUP_FAILURE:
+                logger.error(f"Worker {pid} failed to start; shutting down")
+                self.exit_code = STARTUP_FAILURE
+                self._handle_exit(signal.SIGTERM, None)
+                continue
+            logger.warning(f"Worker {pid} exited with code {code}; restarting it")
+            if uptime < RESTART_BACKOFF_SECONDS:
+                time.sleep(RESTART_BACKOFF_SECONDS)
+            self._spawn()
+
+        logger.info(f"Stopping master process [{os.getpid()}]")
+        return self.exit_code
+
+    def _spawn(self) -> None:
+        master = os.getpid()
+        pid = os.fork()
+        if pid == 0:
+            _exit_with_parent()
+            # The master may have died before prctl took effect
+            os._exit(self._serve() if os.getppid() == master else 1)
+        self.children[pid] = time.monotonic()
+        logger.info(f"Started worker process [{pid}]")
+
+    def _serve(self) -> int:
+        """Worker: run uvicorn on the inherited socket; returns the exit code"""
+        for sig in HANDLED_SIGNALS:
+            signal.signal(sig, signal.SIG_DFL)
+        try:
+            server = uvicorn.Server(self.config)
+            server.run(sockets=[self._socket])
+            return 0 if server.started else STARTUP_FAILURE
+        except BaseException as e:
+            logger.error(f"Worker {os.getpid()} crashed: {str(e)}")
+            return 1
+        finally:
+            logging.shutdown()
+
+    def _handle_exit(self, sig: int, frame: Optional[object]) -> None:
+        """Shut every worker down gracefully"""
+        self.should_exit = True
+        # SIGTERM even for SIGINT: after a Ctrl+C the workers already got
+        # one SIGINT, and uvicorn force-exits on a second
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    @staticmethod
+    def _log_memory(label: str) -> None:
+        try:
+            memory = process_memory()
+        except OSError:
+            return
+        logger.info(f"{label}: RSS {memory['rss'] / 2**20:.0f} MiB, USS {memory['uss'] / 2**20:.0f} MiB")
+
+
+def main() -> int:
+    config = Config(
+        "main:app",
+        host=settings.HOST,
+        port=settings.PORT,
+        workers=settings.WORKERS,
+        log_level=settings.LOG_LEVEL.lower()
+    )
+    return PreforkServer(config, settings.WORKERS).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""
+Admission Control - Application Tier
+Adaptive concurrency limit and bounded wait queue in front of inference
+"""
+import logging
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Deque, Optional
+
+from prometheus_client import Counter, Gauge
+
+from services.deadlines import DeadlineExceeded
+from utils.timing import STAGE_ADMISSION, record_stage
+
+logger = logging.getLogger(__name__)
+
+# Metrics
+ADMISSION_LIMIT = Gauge(
+    'admission_concurrency_limit',
+    'Current adaptive limit on concurrent inference requests'
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    'admission_in_flight',
+    'Inference requests currently admitted'
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    'admission_queue_depth',
+    'Requests waiting for an admission slot'
+)
+ADMISSION_REJECTED = Counter(
+    'admission_rejected_total',
+    'Requests rejected by admission control',
+    ['reason']
+)
+
+# Bounds for the Retry-After hint (seconds)
+MIN_RETRY_AFTER = 1
+MAX_RETRY_AFTER = 30
+
+
+class OverloadedError(Exception):
+    """Raised when a request is shed by admission control"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Service overloaded ({reason}), retry after {retry_after}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    AIMD concurrency limiter with a bounded FIFO wait queue.
+
+    Up to ``limit`` requests run at once. Further requests wait in a queue
+    of at most ``max_queue`` entries for at most ``queue_timeout_ms``;
+    anything beyond that fails fast with ``OverloadedError``.
+
+    The limit adapts to observed latency: each completed request under
+    ``latency_target_ms`` while the limiter is at least half used adds
+    ``1 / limit`` (about +1 per limit's worth of requests), and a request
+    that ran over the target or timed out multiplies the limit by
+    ``backoff``. Only requests that started after the previous decrease can
+    trigger another, so one slow burst backs off once rather than once per
+    request.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 64,
+        min_limit: int = 1,
+        max_limit: int = 1024,
+        latency_target_ms: float = 1000.0,
+        max_queue: int = 128,
+        queue_timeout_ms: float = 1000.0,
+        backoff: float = 0.9,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self._limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.latency_target = latency_target_ms / 1000
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout_ms / 1000
+        self.backoff = backoff
+        self._clock = clock
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_decrease = float('-inf')
+        self._latency_ewma = 0.0
+        ADMISSION_LIMIT.set(self.limit)
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit"""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait: time to drain the queue"""
+        drain = self._latency_ewma * (len(self._waiters) + 1) / max(self.limit, 1)
+        return min(MAX_RETRY_AFTER, max(MIN_RETRY_AFTER, math.ceil(drain)))
+
+    def _reject(self, reason: str) -> None:
+        ADMISSION_REJECTED.labels(reason=reason).inc()
+        raise OverloadedError(reason, self.retry_after())
+
+    def _update_gauges(self) -> None:
+        ADMISSION_IN_FLIGHT.set(self._in_flight)
+        ADMISSION_QUEUE_DEPTH.set(len(self._waiters))
+
+    async def _acquire(self) -> None:
+        """Take a slot, waiting in the queue if allowed"""
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            self._update_gauges()
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self._reject('queue_full')
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._update_gauges()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we gave up; pass it on
+                self._release_slot()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+                self._update_gauges()
+            if isinstance(e, asyncio.TimeoutError):
+                self._reject('queue_timeout')
+            raise
+
+    def _release_slot(self) -> None:
+        """Free a slot and hand free capacity to queued requests in order"""
+        self._in_flight -= 1
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self._in_flight += 1
+        self._update_gauges()
+
+    def _on_sample(self, started: float, latency: float, dropped: bool) -> None:
+        """Adjust the limit from one completed request"""
+        self._latency_ewma = latency if self._latency_ewma == 0 else (
+            0.8 * self._latency_ewma + 0.2 * latency
+        )
+
+        if dropped or latency > self.latency_target:
+            if started >= self._last_decrease:
+                self._limit = max(self.min_limit, self._limit * self.backoff)
+                self._last_decrease = self._clock()
+                logger.warning(f"Admission limit decreased to {self.limit} (latency {latency * 1000:.0f}ms)")
+        elif self._in_flight * 2 >= self._limit:
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+        ADMISSION_LIMIT.set(self.limit)
+
+    @asynccontextmanager
+    async def admit(self, cost: int = 1) -> AsyncIterator[None]:
+        """
+        Hold one slot for the duration of the block.
+
+        Args:
+            cost: Model batches the request needs; its latency is divided by
+                this before comparing with the target so batch requests are
+                judged like single ones
+
+        Work cut off by a server-default deadline (or an inference timeout)
+        counts as overload and shrinks the limit. Work cut off by a deadline
+        the client shortened releases its slot without a sample, so clients
+        with tiny budgets cannot shrink the limit for everyone else.
+
+        Raises:
+            OverloadedError: If the queue is full or the wait times out
+        """
+        waiting_since = self._clock()
+        await self._acquire()
+        started = self._clock()
+        record_stage(STAGE_ADMISSION, started - waiting_since)
+        dropped: Optional[bool] = None
+        try:
+            yield
+            dropped = False
+        except DeadlineExceeded as e:
+            dropped = None if e.client else True
+            raise
+        except asyncio.TimeoutError:
+            dropped = True
+            raise
+        finally:
+            if dropped is not None:
+                self._on_sample(started, (self._clock() - started) / max(cost, 1), dropped)
+            self._release_slot()
@@ -0,0 +1,255 @@
+"""
+Micro-Batching Scheduler - Application Tier
+Coalesces concurrent single-text requests into batched model calls
+"""
+import logging
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from concurrent.futures import Executor
+
+from prometheus_client import Histogram
+
+from services.deadlines import DEADLINE_DROPPED, DeadlineExceeded, is_client_deadline
+from utils.timing import STAGE_INFERENCE, STAGE_QUEUE, record_stage
+
+logger = logging.getLogger(__name__)
+
+# Metrics
+BATCH_FILL_RATIO = Histogram(
+    'inference_batch_fill_ratio',
+    'Dispatched micro-batch size as a fraction of the max batch size',
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+)
+BATCH_QUEUE_WAIT = Histogram(
+    'inference_batch_queue_wait_seconds',
+    'Time a request spends queued before its micro-batch is dispatched',
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+
+
+@dataclass
+class _PendingItem:
+    """A queued request waiting to be placed in a batch"""
+    text: str
+    future: asyncio.Future
+    deadline: Optional[float] = None
+    model: Any = None
+    aggregation: Optional[str] = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+    dispatched_at: Optional[float] = None
+
+    def expired(self, now: float) -> bool:
+        return self.deadline is not None and now >= self.deadline
+
+
+class MicroBatcher:
+    """
+    Merges concurrent single-item predictions into batched calls.
+
+    A batch is dispatched as soon as it holds ``max_batch_size`` items or
+    ``max_wait_ms`` has passed since its first item arrived, whichever
+    comes first. At most ``max_concurrent_batches`` batches run at once;
+    while they are all busy, new requests keep accumulating in the queue
+    so the next batch comes out fuller.
+    """
+
+    def __init__(
+        self,
+        predict_batch: Callable[[List[str]], List[Dict[str, Any]]],
+        executor: Executor,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        max_concurrent_batches: int = 1
+    ):
+        self._predict_batch = predict_batch
+        self._executor = executor
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._max_concurrent_batches = max(1, max_concurrent_batches)
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight: set = set()
+
+    def _ensure_started(self) -> None:
+        """Start the collector task if it is not already running"""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self._max_concurrent_batches)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._collect())
+
+    async def submit(
+        self,
+        text: str,
+        deadline: Optional[float] = None,
+        model: Any = None,
+        aggregation: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Queue a single text and wait for its prediction.
+
+        Args:
+            text: Preprocessed input text
+            deadline: Absolute monotonic deadline; the text is dropped
+                instead of inferred if it passes while queued
+            model: Model to run the text on, passed to ``predict_batch``
+                as a second argument; items for different models share a
+                dispatch but never a model call
+            aggregation: Long-document aggregation, passed to
+                ``predict_batch`` as a third argument; like ``model`` it
+                splits model calls, so long documents are packed together
+
+        Returns:
+            Prediction dictionary for this text
+        """
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        item = _PendingItem(text=text, future=future, deadline=deadline, model=model, aggregation=aggregation)
+        self._queue.put_nowait(item)
+        result = await future
+
+        # Recorded here, in the caller's context, so it reaches its Server-Timing
+        inference_seconds = time.monotonic() - item.dispatched_at
+        record_stage(STAGE_QUEUE, item.dispatched_at - item.enqueued_at, time.perf_counter() - inference_seconds)
+        record_stage(STAGE_INFERENCE, inference_seconds)
+        return result
+
+    async def _collect(self) -> None:
+        """
+        Collector loop: form batches and hand them to the executor.
+
+        Exits once the queue is drained so an idle service holds no
+        background task; the next submit starts a new collector.
+        """
+        loop = asyncio.get_running_loop()
+
+        while not self._queue.empty():
+            await self._slots.acquire()
+
+            try:
+                batch = [self._queue.get_nowait()]
+                flush_at = loop.time() + self.max_wait
+
+                while len(batch) < self.max_batch_size:
+                    # Take whatever is already queued without waiting
+                    if not self._queue.empty():
+                        batch.append(self._queue.get_nowait())
+                        continue
+
+                    remaining = flush_at - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+            except BaseException:
+                self._slots.release()
+                raise
+
+            task = loop.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    @staticmethod
+    def _expire(items: List[_PendingItem], stage: str) -> None:
+        """Fail expired items without running them"""
+        DEADLINE_DROPPED.labels(stage=stage).inc(len(items))
+        for item in items:
+            if not item.future.done():
+                item.future.set_exception(DeadlineExceeded(stage, is_client_deadline(item.deadline)))
+
+    def _predict_live(
+        self,
+        batch: List[_PendingItem]
+    ) -> Tuple[List[_PendingItem], List[Dict[str, Any]]]:
+        """
+        Executor side of a dispatch: drop items that expired while waiting
+        for a thread, then run the rest (blocking operation)
+        """
+        now = time.monotonic()
+        live = [item for item in batch if not item.expired(now)]
+        if not live:
+            return live, []
+
+        groups: Dict[Tuple[int, Optional[str]], List[int]] = {}
+        for i, item in enumerate(live):
+            groups.setdefault((id(item.model), item.aggregation), []).append(i)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(live)
+        for indexes in groups.values():
+            model, aggregation = live[indexes[0]].model, live[indexes[0]].aggregation
+            texts = [live[i].text for i in indexes]
+            if aggregation is not None:
+                predicted = self._predict_batch(texts, model, aggregation)
+            elif model is None:
+                predicted = self._predict_batch(texts)
+            else:
+                predicted = self._predict_batch(texts, model)
+            for i, result in zip(indexes, predicted):
+                results[i] = result
+        return live, results
+
+    async def _dispatch(self, batch: List[_PendingItem]) -> None:
+        """Run one batch and resolve each caller's future with its own result"""
+        try:
+            # Callers that timed out or disconnected no longer need a result
+            batch = [item for item in batch if not item.future.done()]
+
+            now = time.monotonic()
+            expired = [item for item in batch if item.expired(now)]
+            if expired:
+                self._expire(expired, 'queue')
+                batch = [item for item in batch if not item.expired(now)]
+            if not batch:
+                return
+
+            for item in batch:
+                item.dispatched_at = now
+                BATCH_QUEUE_WAIT.observe(now - item.enqueued_at)
+            BATCH_FILL_RATIO.observe(len(batch) / self.max_batch_size)
+
+            loop = asyncio.get_running_loop()
+            try:
+                live, results = await loop.run_in_executor(
+                    self._executor,
+                    self._predict_live,
+                    batch
+                )
+            except Exception as e:
+                logger.error(f"Micro-batch of {len(batch)} failed: {str(e)}")
+                for item in batch:
+                    if not item.future.done():
+                        item.future.set_exception(e)
+                return
+
+            if len(live) < len(batch):
+                live_ids = {id(item) for item in live}
+                self._expire([item for item in batch if id(item) not in live_ids], 'model')
+
+            for item, result in zip(live, results):
+                if not item.future.done():
+                    item.future.set_result(result)
+        finally:
+            self._slots.release()
+
+    async def stop(self) -> None:
+        """Stop the collector and fail any requests still queued"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+        while self._queue is not None and not self._queue.empty():
+            item = self._queue.get_nowait()
+            if not item.future.done():
+                item.future.set_exception(RuntimeError("Inference service is shutting down"))
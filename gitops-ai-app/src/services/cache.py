@@ -0,0 +1,144 @@
+"""
+Prediction Cache - Application Tier
+Bounded LRU cache with TTL for repeated inference inputs
+"""
+import logging
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Any, Optional, Tuple
+
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+# Metrics
+CACHE_HITS = Counter(
+    'prediction_cache_hits_total',
+    'Predictions served from the cache'
+)
+CACHE_MISSES = Counter(
+    'prediction_cache_misses_total',
+    'Cache lookups that required model inference'
+)
+CACHE_EVICTIONS = Counter(
+    'prediction_cache_evictions_total',
+    'Entries removed from the prediction cache',
+    ['reason']
+)
+CACHE_ENTRIES = Gauge(
+    'prediction_cache_entries',
+    'Entries currently held in the prediction cache'
+)
+CACHE_BYTES = Gauge(
+    'prediction_cache_bytes',
+    'Approximate memory held by the prediction cache'
+)
+
+
+def _entry_size(key: str, value: Dict[str, Any]) -> int:
+    """Approximate memory footprint of one cache entry"""
+    size = sys.getsizeof(key) + sys.getsizeof(value)
+    for k, v in value.items():
+        size += sys.getsizeof(k) + sys.getsizeof(v)
+    return size
+
+
+class PredictionCache:
+    """
+    Size-bounded LRU cache of model predictions with a TTL.
+
+    Entries are keyed by a hash of the model name and the preprocessed
+    text, so raw inputs that normalize to the same string share an entry
+    and a model change never serves stale results. The cache is bounded
+    both by entry count and by approximate bytes.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: int = 16 * 1024 * 1024,
+        ttl_seconds: float = 300.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model_name: str, text: str) -> str:
+        """Build the cache key for a preprocessed text"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(model_name.encode('utf-8'))
+        digest.update(b'\x00')
+        digest.update(text.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached prediction, or None on miss or expiry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                CACHE_MISSES.inc()
+                return None
+
+            expires_at, _, value = entry
+            if expires_at <= self._clock():
+                self._remove(key, reason='expired')
+                CACHE_MISSES.inc()
+                return None
+
+            self._entries.move_to_end(key)
+            CACHE_HITS.inc()
+            return value
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a prediction, evicting least recently used entries as needed"""
+        size = _entry_size(key, value)
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key, reason=None)
+
+            self._entries[key] = (self._clock() + self.ttl_seconds, size, value)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest, reason='capacity')
+
+            CACHE_ENTRIES.set(len(self._entries))
+            CACHE_BYTES.set(self._bytes)
+
+    def _remove(self, key: str, reason: Optional[str]) -> None:
+        """Drop one entry (caller holds the lock)"""
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+        if reason:
+            CACHE_EVICTIONS.labels(reason=reason).inc()
+        CACHE_ENTRIES.set(len(self._entries))
+        CACHE_BYTES.set(self._bytes)
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            CACHE_ENTRIES.set(0)
+            CACHE_BYTES.set(0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        """Approximate bytes currently held"""
+        return self._bytes
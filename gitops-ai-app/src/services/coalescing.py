@@ -0,0 +1,70 @@
+"""
+In-Flight Coalescing - Application Tier
+Identical computations running at the same time share one result (singleflight)
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Dict, Hashable, List, Optional, Sequence, Set
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Registry of computations in progress, by key.
+
+    ``start`` runs an awaitable as its own task and publishes one result
+    future per key until it finishes; ``join`` hands a later caller with
+    the same key that future instead of a second computation. Because the
+    computation is a separate task, a caller that gives up (timeout,
+    disconnect) does not cancel it for the others. Keys are forgotten as
+    soon as their computation finishes - keeping finished results is the
+    prediction cache's job.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, asyncio.Future] = {}
+        self._tasks: Set[asyncio.Future] = set()
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def join(self, key: Hashable) -> Optional[asyncio.Future]:
+        """The result future of the computation in flight for ``key``, or None"""
+        flight = self._flights.get(key)
+        if flight is None or flight.done():
+            return None
+        return flight
+
+    def start(self, keys: Sequence[Hashable], computation: Awaitable[Sequence[Any]]) -> List[asyncio.Future]:
+        """
+        Run ``computation``, whose i-th result answers ``keys[i]``.
+
+        Returns:
+            One result future per key; await them through ``asyncio.shield``
+            so cancelling a caller leaves the shared future intact
+        """
+        loop = asyncio.get_running_loop()
+        task = asyncio.ensure_future(computation)
+        flights = [loop.create_future() for _ in keys]
+        for key, flight in zip(keys, flights):
+            self._flights[key] = flight
+
+        def settle(task: asyncio.Future) -> None:
+            self._tasks.discard(task)
+            for i, (key, flight) in enumerate(zip(keys, flights)):
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                if task.cancelled():
+                    flight.cancel()
+                elif task.exception() is not None:
+                    flight.set_exception(task.exception())
+                    # Waiters still see it; unwaited flights must not log it
+                    flight.exception()
+                else:
+                    flight.set_result(task.result()[i])
+
+        # The event loop only keeps weak references to tasks
+        self._tasks.add(task)
+        task.add_done_callback(settle)
+        return flights
@@ -0,0 +1,94 @@
+"""
+Request Deadlines - Application Tier
+Absolute per-request deadlines carried from the API down to the model call
+"""
+import asyncio
+import time
+from typing import Awaitable, Optional, TypeVar
+
+from prometheus_client import Counter
+
+T = TypeVar('T')
+
+# Metrics
+DEADLINE_DROPPED = Counter(
+    'inference_deadline_dropped_total',
+    'Texts dropped without running because their deadline had passed',
+    ['stage']
+)
+
+
+class Deadline(float):
+    """
+    Absolute monotonic deadline that remembers whether the client set it.
+
+    A float, so it compares and subtracts like one; ``client`` is True
+    when X-Request-Timeout-Ms made it earlier than the server default.
+    """
+
+    client: bool
+
+    def __new__(cls, at: float, client: bool = False) -> "Deadline":
+        deadline = super().__new__(cls, at)
+        deadline.client = client
+        return deadline
+
+
+class DeadlineExceeded(Exception):
+    """
+    Raised when a request's deadline passes before its work runs.
+
+    Not a TimeoutError: admission control only counts it as a sign of
+    overload when the deadline was the server default (``client`` is False).
+    Work cut off by a client's own shorter budget says nothing about load.
+    """
+
+    def __init__(self, stage: str, client: bool = False):
+        super().__init__(f"Deadline exceeded before {stage}")
+        self.stage = stage
+        self.client = client
+
+
+def deadline_after(seconds: float, client: bool = False) -> Deadline:
+    """Absolute deadline ``seconds`` from now on the monotonic clock"""
+    return Deadline(time.monotonic() + seconds, client)
+
+
+def is_client_deadline(deadline: Optional[float]) -> bool:
+    """Whether ``deadline`` was shortened by the client's own budget"""
+    return getattr(deadline, 'client', False)
+
+
+def remaining(deadline: float) -> float:
+    """Seconds left until ``deadline`` (negative once passed)"""
+    return deadline - time.monotonic()
+
+
+def check(deadline: Optional[float], stage: str, count: int = 1) -> None:
+    """
+    Drop the work if its deadline has passed.
+
+    Args:
+        deadline: Absolute monotonic deadline, or None for no deadline
+        stage: Stage about to run (metric label)
+        count: Texts dropped with this request
+
+    Raises:
+        DeadlineExceeded: If the deadline has passed
+    """
+    if deadline is not None and time.monotonic() >= deadline:
+        DEADLINE_DROPPED.labels(stage=stage).inc(count)
+        raise DeadlineExceeded(stage, is_client_deadline(deadline))
+
+
+async def wait_until(awaitable: Awaitable[T], deadline: float) -> T:
+    """
+    Await ``awaitable``, cancelling it when ``deadline`` passes.
+
+    Raises:
+        DeadlineExceeded: If the deadline passes first (stage ``inference``)
+    """
+    try:
+        return await asyncio.wait_for(awaitable, timeout=remaining(deadline))
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded('inference', is_client_deadline(deadline))
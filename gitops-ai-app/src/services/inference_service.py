@@ -4,41 +4,248 @@ Handles business logic for AI inference
 """
 import logging
 import asyncio
+import math
+import multiprocessing
 import time
-from typing import Dict, Any, List, Optional
+from contextlib import asynccontextmanager, nullcontext
+from typing import AsyncIterator, Awaitable, Dict, Any, List, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor
 
+from prometheus_client import Counter, Gauge, Histogram
+
 from config import settings
 from models.sentiment_model import SentimentModel
 from utils.preprocessing import TextPreprocessor
+from utils.timing import STAGE_INFERENCE, STAGE_PREPROCESS, timed_stage
+from utils.tracing import span
+from services.admission import AdmissionController, OverloadedError
+from services.batching import MicroBatcher
+from services.cache import PredictionCache
+from services.coalescing import SingleFlight
+from services.deadlines import DeadlineExceeded, check, deadline_after, is_client_deadline, remaining, wait_until
+from services.model_registry import ModelEntry, ModelNotFoundError, ModelRegistry
+from services.process_backend import ProcessPoolModel
+from services.swap_sync import SwapState
 
 logger = logging.getLogger(__name__)
 
+# Longer single texts are preprocessed in the executor, off the event loop
+INLINE_PREPROCESS_MAX_CHARS = 2000
+
+# Vocabulary for synthetic warm-up inputs
+WARMUP_WORDS = ("the", "movie", "was", "great", "but", "the", "ending", "felt", "bad")
+
+# Metrics
+STARTUP_PHASE_SECONDS = Gauge(
+    'startup_phase_duration_seconds',
+    'Time spent in each startup phase (import, load, warmup, total)',
+    ['phase']
+)
+DOCUMENT_WINDOWS = Histogram(
+    'inference_document_windows',
+    'Token windows scored per long-document prediction',
+    buckets=(1, 2, 3, 4, 6, 8, 12, 16, 24, 32, 64)
+)
+COALESCED = Counter(
+    'inference_coalesced_total',
+    'Texts answered by another identical prediction instead of their own',
+    ['scope']
+)
+
+
+def warmup_text(words: int) -> str:
+    """Synthetic text of roughly ``words`` tokens"""
+    return " ".join(WARMUP_WORDS[i % len(WARMUP_WORDS)] for i in range(max(1, words)))
+
+
+# Shared with offline scoring (tools.score) so both paths produce the same scores
+
+def format_result(result: Dict[str, Any], processing_time: float, model_name: str) -> Dict[str, Any]:
+    """Service result for one prediction; ``windows`` only in long-document mode"""
+    formatted = {
+        'label': result['label'],
+        'confidence': result['confidence'],
+        'sentiment_score': result['score'],
+        'processing_time_ms': processing_time,
+        'model': model_name
+    }
+    if 'windows' in result:
+        formatted['windows'] = result['windows']
+        DOCUMENT_WINDOWS.observe(result['windows'])
+    return formatted
+
+
+def model_kwargs(model_name: Optional[str] = None, version: Optional[str] = None) -> Dict[str, Any]:
+    """SentimentModel arguments derived from settings; the default model gets MODEL_VERSION"""
+    if model_name is None or model_name == settings.MODEL_NAME:
+        version = version or settings.MODEL_VERSION
+    return {
+        'model_name': model_name or settings.MODEL_NAME,
+        'cache_dir': settings.MODEL_CACHE_DIR,
+        'batch_size': settings.BATCH_SIZE,
+        'backend': settings.MODEL_BACKEND,
+        'quantize': settings.ONNX_QUANTIZE,
+        'max_length': settings.MAX_SEQUENCE_LENGTH,
+        'intra_op_threads': settings.ONNX_INTRA_OP_THREADS,
+        'lexicon_path': settings.LEXICON_PATH,
+        'version': version,
+        'offline': settings.MODEL_OFFLINE,
+        'verify': settings.MODEL_ARTIFACT_VERIFY
+    }
+
+
+# Model backends that keep working in a process forked after loading;
+# ONNX Runtime sessions own thread pools that do not survive fork()
+FORK_SAFE_BACKENDS = ("transformers", "pipeline", "mock")
+
+# Models loaded by the pre-fork master (see ``prefork``) for its workers to
+# inherit, with the SentimentModel arguments they were loaded with
+_preloaded: List[Tuple[Dict[str, Any], SentimentModel]] = []
+
+
+def preload_model(model_name: Optional[str] = None, version: Optional[str] = None) -> Optional[SentimentModel]:
+    """
+    Load a model in this process before it forks, so every forked worker
+    serves this copy instead of loading its own (blocking operation).
+    
+    Returns:
+        The model, or None when the configured backends cannot be shared
+        across fork() and each worker has to load its own
+    """
+    if settings.INFERENCE_BACKEND != "thread" or settings.MODEL_BACKEND not in FORK_SAFE_BACKENDS:
+        logger.warning(
+            f"Not preloading: {settings.MODEL_BACKEND} models on the {settings.INFERENCE_BACKEND} "
+            "backend are loaded by each worker"
+        )
+        return None
+    kwargs = model_kwargs(model_name, version)
+    model = SentimentModel(**kwargs)
+    _preloaded.append((kwargs, model))
+    return model
+
+
+def preloaded_model(kwargs: Dict[str, Any]) -> Optional[SentimentModel]:
+    """The model ``preload_model`` loaded with these arguments, if any"""
+    for preloaded_kwargs, model in _preloaded:
+        if preloaded_kwargs == kwargs:
+            return model
+    return None
+
+
+def build_preprocessors() -> Tuple[TextPreprocessor, TextPreprocessor]:
+    """Preprocessors for truncated inputs and for long documents, from settings"""
+    return (
+        TextPreprocessor(max_length=settings.PREPROCESS_MAX_CHARS),
+        # Long documents keep enough text for every window
+        TextPreprocessor(max_length=settings.PREPROCESS_MAX_CHARS * max(1, settings.LONG_DOC_MAX_WINDOWS))
+    )
+
+
+def predict_many(
+    model: SentimentModel,
+    texts: List[str],
+    aggregation: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Run preprocessed texts through the model, windowed when ``aggregation`` is set (blocking operation)"""
+    if aggregation is not None:
+        return model.predict_documents(
+            texts, aggregation, settings.LONG_DOC_MAX_WINDOWS, settings.LONG_DOC_STRIDE
+        )
+    if len(texts) == 1:
+        return [model.predict(texts[0])]
+    return model.predict_batch(texts)
+
 
 class InferenceService:
     """
     Core inference service that orchestrates:
+    - Admission control (adaptive concurrency limit, 429 on overload)
+    - Model selection (registry of loaded models, hot swap)
     - Text preprocessing
-    - Model inference
+    - Prediction caching
+    - Coalescing of identical predictions in flight and within a batch
+    - Model inference (single requests are micro-batched)
     - Response formatting
     """
     
     def __init__(self):
-        self.model: Optional[SentimentModel] = None
         self.preprocessor: Optional[TextPreprocessor] = None
+        self.document_preprocessor: Optional[TextPreprocessor] = None
         self._is_ready: bool = False
         self._executor = ThreadPoolExecutor(max_workers=settings.WORKERS)
         self.model_name = settings.MODEL_NAME
+        self._registry = ModelRegistry(
+            loader=self._load_registry_model,
+            memory_budget_bytes=settings.MODEL_MEMORY_BUDGET_MB * 2**20,
+            allowed=[self.model_name, *settings.MODEL_NAMES],
+            pinned=[self.model_name],
+            executor=self._executor
+        )
+        self._batcher: Optional[MicroBatcher] = None
+        self._cache: Optional[PredictionCache] = None
+        self._admission: Optional[AdmissionController] = None
+        self._flights: Optional[SingleFlight] = None
+        self._swap_state: Optional[SwapState] = None
+        self._swap_watcher: Optional[asyncio.Task] = None
+        # Sequence number of the last shared swap applied per model
+        self._applied_swaps: Dict[str, int] = {}
+        # Keeps the watcher from re-applying a swap this worker is publishing
+        self._swap_lock = asyncio.Lock()
+        self.startup_report: Dict[str, float] = {}
+        
+        if settings.MODEL_SWAP_STATE_FILE:
+            self._swap_state = SwapState(settings.MODEL_SWAP_STATE_FILE)
+        
+        if settings.ADMISSION_CONTROL_ENABLED:
+            self._admission = AdmissionController(
+                initial_limit=settings.ADMISSION_INITIAL_LIMIT,
+                min_limit=settings.ADMISSION_MIN_LIMIT,
+                max_limit=settings.ADMISSION_MAX_LIMIT,
+                latency_target_ms=settings.ADMISSION_LATENCY_TARGET_MS,
+                max_queue=settings.ADMISSION_MAX_QUEUE,
+                queue_timeout_ms=settings.ADMISSION_QUEUE_TIMEOUT_MS
+            )
+        
+        if settings.PREDICTION_CACHE_ENABLED:
+            self._cache = PredictionCache(
+                max_entries=settings.PREDICTION_CACHE_MAX_ENTRIES,
+                max_bytes=settings.PREDICTION_CACHE_MAX_BYTES,
+                ttl_seconds=settings.PREDICTION_CACHE_TTL_SECONDS
+            )
+        
+        if settings.INFLIGHT_COALESCING_ENABLED:
+            self._flights = SingleFlight()
         
+        if settings.MICRO_BATCH_ENABLED:
+            self._batcher = MicroBatcher(
+                predict_batch=self._predict_many,
+                executor=self._executor,
+                max_batch_size=settings.MICRO_BATCH_MAX_SIZE,
+                max_wait_ms=settings.MICRO_BATCH_MAX_WAIT_MS,
+                max_concurrent_batches=settings.WORKERS
+            )
+        
+    @property
+    def model(self) -> Optional[SentimentModel]:
+        """The default model"""
+        entry = self._registry.peek(self.model_name)
+        return entry.model if entry else None
+    
+    @model.setter
+    def model(self, model: Optional[SentimentModel]) -> None:
+        if model is None:
+            self._registry.remove(self.model_name)
+        else:
+            self._registry.install(self.model_name, model, settings.MODEL_VERSION)
+    
     async def initialize(self) -> None:
         """Initialize the inference service with model and preprocessor"""
         try:
             logger.info(f"Initializing inference service with model: {self.model_name}")
+            started = time.perf_counter()
             
-            # Initialize preprocessor
-            self.preprocessor = TextPreprocessor(
-                max_length=settings.MAX_SEQUENCE_LENGTH
-            )
+            # Initialize preprocessors
+            self.preprocessor, self.document_preprocessor = build_preprocessors()
             
             # Initialize model (run in executor to avoid blocking)
             loop = asyncio.get_event_loop()
@@ -46,6 +253,21 @@ class InferenceService:
                 self._executor,
                 self._load_model
             )
+            report = dict(getattr(self.model, 'load_timings', {}))
+            
+            # Pay one-time allocation costs before reporting ready
+            if settings.WARMUP_ENABLED:
+                warmup_start = time.perf_counter()
+                await loop.run_in_executor(self._executor, self._warm_up)
+                report['warmup'] = time.perf_counter() - warmup_start
+            
+            # A restarted worker catches up with swaps made before it started
+            if self._swap_state is not None:
+                await self._apply_shared_swaps()
+                self._swap_watcher = asyncio.create_task(self._watch_swaps())
+            
+            report['total'] = time.perf_counter() - started
+            self._record_startup(report)
             
             self._is_ready = True
             logger.info("Inference service initialized successfully")
@@ -55,118 +277,471 @@ class InferenceService:
             self._is_ready = False
             raise
     
-    def _load_model(self) -> SentimentModel:
-        """Load the ML model (blocking operation)"""
-        return SentimentModel(
-            model_name=self.model_name,
-            cache_dir=settings.MODEL_CACHE_DIR
-        )
+    def _model_kwargs(self, model_name: Optional[str] = None, version: Optional[str] = None) -> Dict[str, Any]:
+        """SentimentModel arguments derived from settings"""
+        return model_kwargs(model_name or self.model_name, version)
+    
+    def _load_model(self, model_name: Optional[str] = None, version: Optional[str] = None) -> SentimentModel:
+        """Load the ML model for the configured execution backend (blocking operation)"""
+        if settings.INFERENCE_BACKEND == "process":
+            logger.info(f"Using process backend with {settings.INFERENCE_PROCESSES} worker(s)")
+            return ProcessPoolModel(
+                workers=settings.INFERENCE_PROCESSES,
+                **self._model_kwargs(model_name, version)
+            )
+        
+        kwargs = self._model_kwargs(model_name, version)
+        model = preloaded_model(kwargs)
+        if model is not None:
+            logger.info(f"Using model {kwargs['model_name']} preloaded before fork")
+            return model
+        return SentimentModel(**kwargs)
+    
+    def _load_registry_model(self, model_name: str, version: Optional[str]) -> SentimentModel:
+        """Load and warm up a model before the registry serves it (blocking operation)"""
+        model = self._load_model(model_name, version)
+        if settings.WARMUP_ENABLED:
+            self._warm_up(model)
+        return model
+    
+    def _warm_up(self, model: Optional[SentimentModel] = None) -> None:
+        """
+        Run synthetic inputs at each warm-up sequence length through
+        preprocessing, the single-text path and the batch path (blocking
+        operation)
+        """
+        batch_size = max(1, settings.WARMUP_BATCH_SIZE)
+        # Preprocessing truncates long inputs, so distinct lengths can collapse
+        texts = list(dict.fromkeys(
+            self.preprocessor.preprocess(warmup_text(length))
+            for length in sorted(settings.WARMUP_SEQUENCE_LENGTHS)
+        ))
+        
+        for text in texts:
+            for _ in range(max(1, settings.WARMUP_ROUNDS)):
+                self._predict_many([text], model)
+                self._predict_many([text] * batch_size, model)
+        
+        lengths = [len(text.split()) for text in texts]
+        logger.info(f"Warm-up ran {lengths} word inputs at batch sizes 1 and {batch_size}")
+    
+    def _record_startup(self, report: Dict[str, float]) -> None:
+        """Publish and log the startup timing breakdown"""
+        self.startup_report = report
+        for phase, seconds in report.items():
+            STARTUP_PHASE_SECONDS.labels(phase=phase).set(seconds)
+        
+        breakdown = " ".join(f"{phase}={seconds:.2f}s" for phase, seconds in report.items())
+        logger.info(f"Startup report: {breakdown}")
     
     async def cleanup(self) -> None:
         """Cleanup resources"""
         logger.info("Cleaning up inference service")
         self._is_ready = False
+        if self._swap_watcher is not None:
+            self._swap_watcher.cancel()
+            await asyncio.gather(self._swap_watcher, return_exceptions=True)
+        if self._batcher:
+            await self._batcher.stop()
+        if self._cache is not None:
+            self._cache.clear()
+        await self._registry.close()
         self._executor.shutdown(wait=True)
         
     def is_ready(self) -> bool:
         """Check if service is ready to handle requests"""
         return self._is_ready and self.model is not None and self.model.is_loaded()
     
-    async def run(self, text: str) -> Dict[str, Any]:
+    def _predict_many(
+        self,
+        texts: List[str],
+        model: Optional[SentimentModel] = None,
+        aggregation: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Run one micro-batch through the model, windowed when ``aggregation`` is set (blocking operation)"""
+        return predict_many(model or self.model, texts, aggregation)
+    
+    @staticmethod
+    def _before_deadline(deadline: float, count: int, fn, *args):
+        """
+        Executor job that drops itself if it only starts after the deadline
+        (blocking operation)
+        """
+        check(deadline, 'model', count)
+        return fn(*args)
+    
+    async def _predict_one(
+        self,
+        text: str,
+        deadline: Optional[float] = None,
+        model: Optional[SentimentModel] = None,
+        aggregation: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Predict a single preprocessed text, micro-batched when enabled"""
+        model = model or self.model
+        if self._batcher:
+            return await self._batcher.submit(text, deadline, model, aggregation)
+        
+        with timed_stage(STAGE_INFERENCE, batch_size=1):
+            results = await self._run_model([text], deadline, model, aggregation)
+            return results[0]
+    
+    def _run_model(
+        self,
+        texts: List[str],
+        deadline: float,
+        model: SentimentModel,
+        aggregation: Optional[str]
+    ) -> Awaitable[List[Dict[str, Any]]]:
+        """One model batch in the executor, dropped if it starts after the deadline"""
+        return asyncio.get_event_loop().run_in_executor(
+            self._executor,
+            self._before_deadline,
+            deadline,
+            len(texts),
+            self._predict_many,
+            texts,
+            model,
+            aggregation
+        )
+    
+    async def _predict_shared(
+        self,
+        namespace: str,
+        text: str,
+        deadline: float,
+        model: SentimentModel,
+        aggregation: Optional[str]
+    ) -> Dict[str, Any]:
+        """``_predict_one``, joining an identical prediction already in flight"""
+        if self._flights is None:
+            return await self._predict_one(text, deadline, model, aggregation)
+        
+        key = (namespace, text)
+        flight = self._flights.join(key)
+        if flight is None:
+            async def predict() -> List[Dict[str, Any]]:
+                return [await self._predict_one(text, deadline, model, aggregation)]
+            
+            flight, = self._flights.start([key], predict())
+            return await asyncio.shield(flight)
+        
+        COALESCED.labels(scope='in_flight').inc()
+        try:
+            return await asyncio.shield(flight)
+        except DeadlineExceeded:
+            # The request that started it had an earlier deadline than ours
+            check(deadline, 'model')
+            return await self._predict_shared(namespace, text, deadline, model, aggregation)
+    
+    async def _predict_unique(
+        self,
+        namespace: str,
+        texts: List[str],
+        deadline: float,
+        model: SentimentModel,
+        aggregation: Optional[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Predictions for distinct preprocessed texts. Texts already in flight
+        for other requests join those predictions; the rest run as one
+        model batch that later identical requests can join in turn.
+        """
+        joined: Dict[str, asyncio.Future] = {}
+        if self._flights is not None:
+            for text in texts:
+                flight = self._flights.join((namespace, text))
+                if flight is not None:
+                    joined[text] = flight
+            COALESCED.labels(scope='in_flight').inc(len(joined))
+        
+        predicted: Dict[str, Dict[str, Any]] = {}
+        to_run = [text for text in texts if text not in joined]
+        if to_run:
+            batch = self._run_model(to_run, deadline, model, aggregation)
+            if self._flights is None:
+                predicted.update(zip(to_run, await batch))
+            else:
+                flights = self._flights.start([(namespace, text) for text in to_run], batch)
+                predicted.update(zip(to_run, await asyncio.shield(asyncio.gather(*flights))))
+        
+        retry = []
+        for text, flight in joined.items():
+            try:
+                predicted[text] = await asyncio.shield(flight)
+            except DeadlineExceeded:
+                # That request's deadline was earlier than ours
+                retry.append(text)
+        if retry:
+            check(deadline, 'model', len(retry))
+            predicted.update(zip(retry, await self._run_model(retry, deadline, model, aggregation)))
+        return predicted
+    
+    def _require_model(self, model_name: Optional[str]) -> None:
+        """
+        Reject an unknown model before admission, so it gets a 404 rather
+        than a 429 or 504 while the service is overloaded
+        
+        Raises:
+            ModelNotFoundError: If ``model_name`` is not an available model
+        """
+        name = model_name or self.model_name
+        if not self._registry.is_allowed(name):
+            raise ModelNotFoundError(name)
+    
+    def _admit(self, cost: int = 1):
+        """Admission slot for one request (no-op when admission control is off)"""
+        if self._admission is None:
+            return nullcontext()
+        return self._admission.admit(cost)
+    
+    @staticmethod
+    def _cache_namespace(entry: ModelEntry, aggregation: Optional[str]) -> str:
+        """Cache key prefix; long-document results never answer truncated lookups"""
+        return entry.key if aggregation is None else f"{entry.key}#{aggregation}"
+    
+    @asynccontextmanager
+    async def _use_model(self, model_name: Optional[str], deadline: float) -> AsyncIterator[ModelEntry]:
+        """
+        Hold the named model (default when None) for one request, loading it if needed.
+        
+        Raises:
+            DeadlineExceeded: If the deadline passes while the model loads
+            ModelNotFoundError: If ``model_name`` is not an available model
+        """
+        try:
+            entry = await self._registry.acquire(model_name or self.model_name, remaining(deadline))
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded('model_load', is_client_deadline(deadline))
+        try:
+            yield entry
+        finally:
+            self._registry.release(entry)
+    
+    async def run(
+        self,
+        text: str,
+        deadline: Optional[float] = None,
+        model: Optional[str] = None,
+        aggregation: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Run inference on a single text input.
         
         Args:
             text: Input text for sentiment analysis
+            deadline: Absolute ``time.monotonic()`` deadline; defaults to
+                INFERENCE_TIMEOUT from now. Work still queued when it
+                passes is dropped.
+            model: Registry model name; defaults to MODEL_NAME
+            aggregation: Long-document mode: score overlapping token
+                windows and combine them with this method (see
+                ``SentimentModel.predict_documents``) instead of truncating
             
         Returns:
             Dictionary with prediction results
+        
+        Raises:
+            DeadlineExceeded: If the deadline passes before the result is ready
+            ModelNotFoundError: If ``model`` is not an available model
         """
         if not self.is_ready():
             raise RuntimeError("Inference service is not ready")
         
         start_time = time.time()
+        if deadline is None:
+            deadline = deadline_after(settings.INFERENCE_TIMEOUT)
+        self._require_model(model)
         
         try:
-            # Preprocess text
-            processed_text = self.preprocessor.preprocess(text)
-            
-            # Run inference in executor to avoid blocking
-            loop = asyncio.get_event_loop()
-            result = await asyncio.wait_for(
-                loop.run_in_executor(
-                    self._executor,
-                    self.model.predict,
-                    processed_text
-                ),
-                timeout=settings.INFERENCE_TIMEOUT
-            )
+            async with span('inference.run', chars=len(text)) as run_span, \
+                    self._admit(), self._use_model(model, deadline) as entry:
+                run_span.set('model', entry.key)
+                check(deadline, 'preprocess')
+                
+                # Preprocess text
+                preprocessor = self.preprocessor if aggregation is None else self.document_preprocessor
+                with timed_stage(STAGE_PREPROCESS, chars=len(text)):
+                    if len(text) <= INLINE_PREPROCESS_MAX_CHARS:
+                        processed_text = preprocessor.preprocess(text)
+                    else:
+                        processed_text = await asyncio.get_event_loop().run_in_executor(
+                            self._executor,
+                            preprocessor.preprocess,
+                            text
+                        )
+                
+                cache_key = None
+                result = None
+                namespace = self._cache_namespace(entry, aggregation)
+                if self._cache is not None:
+                    cache_key = self._cache.make_key(namespace, processed_text)
+                    result = self._cache.get(cache_key)
+                run_span.set('cache_hit', result is not None)
+                
+                if result is None:
+                    # Run inference off the event loop, merged with concurrent requests
+                    # and shared with identical ones already in flight
+                    check(deadline, 'model')
+                    result = await wait_until(
+                        self._predict_shared(namespace, processed_text, deadline, entry.model, aggregation),
+                        deadline
+                    )
+                    if cache_key:
+                        self._cache.put(cache_key, result)
+                
+                processing_time = (time.time() - start_time) * 1000
+                
+                return format_result(result, processing_time, entry.name)
             
-            processing_time = (time.time() - start_time) * 1000
-            
-            return {
-                'label': result['label'],
-                'confidence': result['confidence'],
-                'sentiment_score': result['score'],
-                'processing_time_ms': processing_time
-            }
-            
-        except asyncio.TimeoutError:
-            logger.error(f"Inference timeout after {settings.INFERENCE_TIMEOUT}s")
-            raise RuntimeError("Inference timeout")
+        except DeadlineExceeded as e:
+            logger.warning(f"Inference dropped: {str(e)}")
+            raise
+        except (OverloadedError, ModelNotFoundError):
+            raise
         except Exception as e:
             logger.error(f"Inference failed: {str(e)}")
             raise
     
-    async def run_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+    async def run_batch(
+        self,
+        texts: List[str],
+        deadline: Optional[float] = None,
+        model: Optional[str] = None,
+        aggregation: Optional[str] = None,
+        use_cache: bool = True
+    ) -> List[Dict[str, Any]]:
         """
         Run inference on a batch of texts.
         
         Args:
             texts: List of input texts
+            deadline: Absolute ``time.monotonic()`` deadline; defaults to
+                twice INFERENCE_TIMEOUT from now
+            model: Registry model name; defaults to MODEL_NAME
+            aggregation: Long-document mode, as for ``run``; windows of
+                all texts are packed into shared model batches
+            use_cache: Consult and fill the prediction cache; bulk jobs
+                pass False so one-off texts do not evict interactive entries
             
         Returns:
             List of prediction results
+        
+        Raises:
+            DeadlineExceeded: If the deadline passes before the results are ready
+            ModelNotFoundError: If ``model`` is not an available model
+        """
+        start_time = time.time()
+        model_name, results = await self._predict_batch(texts, deadline, model, aggregation, use_cache)
+        
+        total_time = (time.time() - start_time) * 1000
+        per_item_time = total_time / len(texts)
+        
+        return [format_result(result, per_item_time, model_name) for result in results]
+    
+    async def run_batch_columns(
+        self,
+        texts: List[str],
+        deadline: Optional[float] = None,
+        model: Optional[str] = None,
+        aggregation: Optional[str] = None
+    ) -> Tuple[str, Dict[str, List[Any]]]:
         """
+        Run inference on a batch of texts, returning one list per output
+        field instead of one result dictionary per text.
+        
+        Same path as ``run_batch`` (cache, coalescing, admission); for
+        columnar encoders such as the Arrow batch endpoint.
+        
+        Returns:
+            The model name and ``label``, ``confidence`` and
+            ``sentiment_score`` lists in input order, plus ``windows`` in
+            long-document mode
+        
+        Raises:
+            DeadlineExceeded: If the deadline passes before the results are ready
+            ModelNotFoundError: If ``model`` is not an available model
+        """
+        model_name, results = await self._predict_batch(texts, deadline, model, aggregation)
+        columns = {
+            'label': [result['label'] for result in results],
+            'confidence': [result['confidence'] for result in results],
+            'sentiment_score': [result['score'] for result in results]
+        }
+        if aggregation is not None:
+            columns['windows'] = [result['windows'] for result in results]
+            for windows in columns['windows']:
+                DOCUMENT_WINDOWS.observe(windows)
+        return model_name, columns
+    
+    async def _predict_batch(
+        self,
+        texts: List[str],
+        deadline: Optional[float] = None,
+        model: Optional[str] = None,
+        aggregation: Optional[str] = None,
+        use_cache: bool = True
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """Model name and raw model results for ``run_batch`` and ``run_batch_columns``"""
         if not self.is_ready():
             raise RuntimeError("Inference service is not ready")
         
-        start_time = time.time()
+        if deadline is None:
+            deadline = deadline_after(settings.INFERENCE_TIMEOUT * 2)  # Allow more time for batches
+        self._require_model(model)
         
         try:
-            # Preprocess all texts
-            processed_texts = [
-                self.preprocessor.preprocess(text) 
-                for text in texts
-            ]
+            cost = math.ceil(len(texts) / settings.BATCH_SIZE)
+            async with span('inference.run_batch', batch_size=len(texts)) as run_span, \
+                    self._admit(cost), self._use_model(model, deadline) as entry:
+                run_span.set('model', entry.key)
+                check(deadline, 'preprocess', len(texts))
+                
+                # Preprocess all texts in one bulk pass, off the event loop
+                loop = asyncio.get_event_loop()
+                preprocessor = self.preprocessor if aggregation is None else self.document_preprocessor
+                with timed_stage(STAGE_PREPROCESS, batch_size=len(texts)):
+                    processed_texts = await loop.run_in_executor(
+                        self._executor,
+                        preprocessor.batch_preprocess,
+                        texts
+                    )
+                
+                # Look up each item; only cache misses go to the model
+                results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+                cache_keys: List[Optional[str]] = [None] * len(texts)
+                namespace = self._cache_namespace(entry, aggregation)
+                if self._cache is not None and use_cache:
+                    for i, processed_text in enumerate(processed_texts):
+                        cache_keys[i] = self._cache.make_key(namespace, processed_text)
+                        results[i] = self._cache.get(cache_keys[i])
+                
+                missing = [i for i, result in enumerate(results) if result is None]
+                run_span.set('cache_hits', len(texts) - len(missing))
+                
+                if missing:
+                    # Run batch inference once per distinct text, fanned back out below
+                    check(deadline, 'model', len(missing))
+                    unique = list(dict.fromkeys(processed_texts[i] for i in missing))
+                    COALESCED.labels(scope='batch').inc(len(missing) - len(unique))
+                    with timed_stage(STAGE_INFERENCE, batch_size=len(unique)):
+                        predicted = await wait_until(
+                            self._predict_unique(namespace, unique, deadline, entry.model, aggregation),
+                            deadline
+                        )
+                
+                    for i in missing:
+                        results[i] = predicted[processed_texts[i]]
+                        if cache_keys[i]:
+                            self._cache.put(cache_keys[i], results[i])
+                
+                return entry.name, results
             
-            # Run batch inference
-            loop = asyncio.get_event_loop()
-            results = await asyncio.wait_for(
-                loop.run_in_executor(
-                    self._executor,
-                    self.model.predict_batch,
-                    processed_texts
-                ),
-                timeout=settings.INFERENCE_TIMEOUT * 2  # Allow more time for batches
-            )
-            
-            total_time = (time.time() - start_time) * 1000
-            per_item_time = total_time / len(texts)
-            
-            return [
-                {
-                    'label': result['label'],
-                    'confidence': result['confidence'],
-                    'sentiment_score': result['score'],
-                    'processing_time_ms': per_item_time
-                }
-                for result in results
-            ]
-            
-        except asyncio.TimeoutError:
-            logger.error("Batch inference timeout")
-            raise RuntimeError("Batch inference timeout")
+        except DeadlineExceeded as e:
+            logger.warning(f"Batch inference dropped: {str(e)}")
+            raise
+        except (OverloadedError, ModelNotFoundError):
+            raise
         except Exception as e:
             logger.error(f"Batch inference failed: {str(e)}")
             raise
@@ -177,5 +752,103 @@ class InferenceService:
             'model_name': self.model_name,
             'is_ready': self.is_ready(),
             'max_sequence_length': settings.MAX_SEQUENCE_LENGTH,
-            'batch_size': settings.BATCH_SIZE
+            'batch_size': settings.BATCH_SIZE,
+            'micro_batching': settings.MICRO_BATCH_ENABLED,
+            'execution_backend': settings.INFERENCE_BACKEND,
+            'model_backend': settings.MODEL_BACKEND,
+            'prediction_cache_entries': len(self._cache) if self._cache is not None else 0,
+            'admission_limit': self._admission.limit if self._admission is not None else None,
+            'loaded_models': [entry.key for entry in self._registry.entries()],
+            'startup_seconds': self.startup_report
         }
+    
+    def list_models(self) -> List[Dict[str, Any]]:
+        """Every servable model: loaded ones first (least recently used first), then available ones"""
+        models = []
+        for entry in self._registry.entries():
+            info = entry.info()
+            info['status'] = 'loaded'
+            info['default'] = entry.name == self.model_name
+            models.append(info)
+        
+        loaded = {model['name'] for model in models}
+        for name in self._registry.allowed or []:
+            if name not in loaded:
+                models.append({'name': name, 'status': 'available', 'default': name == self.model_name})
+        return models
+    
+    def model_label(self, model_name: Optional[str] = None) -> str:
+        """
+        Metrics label for a requested model: its name when the registry
+        serves it, otherwise "unknown", so client input cannot add series
+        """
+        name = model_name or self.model_name
+        return name if self._registry.is_allowed(name) else 'unknown'
+    
+    def registry_usage(self) -> Dict[str, int]:
+        """Estimated weight memory against the registry budget"""
+        return {
+            'memory_used_bytes': self._registry.memory_used,
+            'memory_budget_bytes': self._registry.memory_budget
+        }
+    
+    @property
+    def swaps_reach_all_workers(self) -> bool:
+        """
+        Whether a swap reaches every worker serving the app: through the
+        swap state file, or because this process is the only worker.
+        ``uvicorn --workers`` (and ``--reload``) run the app in spawned
+        child processes that cannot see each other's swaps.
+        """
+        if self._swap_state is not None:
+            return True
+        return settings.WORKERS <= 1 or multiprocessing.parent_process() is None
+    
+    async def swap_model(self, model_name: Optional[str] = None, version: Optional[str] = None) -> ModelEntry:
+        """
+        Load a model version and atomically switch new requests to it;
+        requests already running finish on the previous version.
+        
+        With a swap state file the swap is also recorded there once it has
+        loaded here, and the other workers apply it within
+        ``MODEL_SWAP_POLL_SECONDS``; a version that fails to load is never
+        passed on.
+        
+        Raises:
+            ModelNotFoundError: If ``model_name`` is not an available model
+        """
+        name = model_name or self.model_name
+        if not self._registry.is_allowed(name):
+            raise ModelNotFoundError(name)
+        entry = await self._registry.swap(name, version)
+        if self._swap_state is not None:
+            async with self._swap_lock:
+                loop = asyncio.get_running_loop()
+                self._applied_swaps[name] = await loop.run_in_executor(
+                    self._executor, self._swap_state.publish, name, version
+                )
+        return entry
+    
+    async def _apply_shared_swaps(self) -> None:
+        """Swap to every version other workers requested since our last look"""
+        loop = asyncio.get_running_loop()
+        async with self._swap_lock:
+            wanted_swaps = await loop.run_in_executor(self._executor, self._swap_state.read)
+            for name, wanted in wanted_swaps.items():
+                if wanted['seq'] <= self._applied_swaps.get(name, 0):
+                    continue
+                # Marked first so a failing version is not retried on every poll
+                self._applied_swaps[name] = wanted['seq']
+                try:
+                    await self._registry.swap(name, wanted['version'])
+                except Exception as e:
+                    logger.error(f"Shared swap of {name} to {wanted['version']} failed: {str(e)}")
+    
+    async def _watch_swaps(self) -> None:
+        """Poll the swap state file for swaps made by other workers"""
+        while True:
+            await asyncio.sleep(settings.MODEL_SWAP_POLL_SECONDS)
+            try:
+                await self._apply_shared_swaps()
+            except Exception as e:
+                logger.error(f"Swap state check failed: {str(e)}")
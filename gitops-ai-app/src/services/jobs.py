@@ -0,0 +1,910 @@
+"""
+Bulk Jobs - Application Tier
+Background scoring of local JSONL/CSV files in bounded chunks, with
+checkpoints on disk so jobs resume after a restart
+"""
+import asyncio
+import csv
+import fcntl
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from dataclasses import dataclass, field, fields
+from itertools import islice
+from typing import Any, AsyncIterator, BinaryIO, Dict, Iterator, List, Optional, Set, TextIO, Tuple
+
+from prometheus_client import Counter, Gauge
+
+from services.admission import OverloadedError
+from services.model_registry import ModelNotFoundError
+
+logger = logging.getLogger(__name__)
+
+JOB_FORMATS = ("jsonl", "csv")
+FORMAT_EXTENSIONS = {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv"}
+
+# Job states; queued and running jobs are picked up again on start()
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+RESUMABLE = (QUEUED, RUNNING)
+FINISHED = (COMPLETED, FAILED, CANCELLED)
+
+JOB_FILE = "job.json"
+RESULTS_FILE = "results.jsonl"
+# Held (flock) by the one worker process running the job; released when it exits
+LEASE_FILE = "job.lock"
+# Asks the worker holding the lease to cancel the job
+CANCEL_FILE = "cancel.request"
+
+# How long a cancel waits for another worker to stop the job
+CANCEL_WAIT_SECONDS = 10.0
+
+# Stands in for an input line over the size limit so the CSV reader stays in step
+_OVERSIZED = "\uffff"
+
+# Metrics
+JOB_RECORDS = Counter(
+    'job_records_total',
+    'Records written by bulk jobs',
+    ['status']
+)
+JOBS_RUNNING = Gauge(
+    'jobs_running',
+    'Bulk jobs currently being processed'
+)
+
+
+class JobNotFoundError(LookupError):
+    """Raised for an unknown job id"""
+
+    def __init__(self, job_id: str):
+        super().__init__(f"Job {job_id!r} not found")
+        self.job_id = job_id
+
+
+class JobStateError(Exception):
+    """Raised when a job cannot be cancelled, resumed or deleted in its current state"""
+
+
+@dataclass(eq=False)
+class Job:
+    """
+    One bulk job and its checkpoint.
+
+    ``input_offset`` and ``output_offset`` only move together, after a
+    chunk's results are on disk, so a restart truncates the output back to
+    ``output_offset`` and continues reading at ``input_offset``.
+    """
+    id: str
+    input_path: str
+    output_path: str
+    format: str
+    text_field: str = "text"
+    id_field: Optional[str] = "id"
+    model: Optional[str] = None
+    aggregation: Optional[str] = None
+    status: str = QUEUED
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    input_bytes: int = 0
+    input_offset: int = 0
+    output_offset: int = 0
+    records: int = 0
+    failed: int = 0
+    # Throughput of the current run, persisted so every worker reports it
+    run_started: Optional[float] = None
+    run_records: int = 0
+    run_bytes: int = 0
+    # Not persisted: a pending cancellation in the owning process
+    cancel_requested: bool = field(default=False, init=False)
+
+    def state(self) -> Dict[str, Any]:
+        """Persisted fields"""
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+
+    def progress(self) -> Dict[str, Any]:
+        """
+        Completion by input bytes, with throughput and ETA measured since
+        the job was last started (or resumed)
+        """
+        percent = 100.0 if self.status == COMPLETED else 0.0
+        if self.input_bytes and self.status != COMPLETED:
+            percent = 100.0 * self.input_offset / self.input_bytes
+
+        items_per_second = None
+        eta_seconds = None
+        if self.status == RUNNING and self.run_started is not None:
+            elapsed = time.time() - self.run_started
+            if elapsed > 0 and self.run_records:
+                items_per_second = self.run_records / elapsed
+                eta_seconds = (self.input_bytes - self.input_offset) * elapsed / max(1, self.run_bytes)
+
+        return {
+            'percent': round(percent, 2),
+            'items_per_second': items_per_second,
+            'eta_seconds': eta_seconds
+        }
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'status': self.status,
+            'format': self.format,
+            'model': self.model,
+            'aggregation': self.aggregation,
+            'records': self.records,
+            'failed': self.failed,
+            'bytes_done': self.input_offset,
+            'bytes_total': self.input_bytes,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            **self.progress()
+        }
+
+
+class _LineReader:
+    """
+    Decoded lines of a binary file from ``offset``, tracking the byte
+    offset just past the last line handed out. Lines longer than
+    ``max_line_bytes`` are skipped without being held in memory and come
+    out as ``None``.
+    """
+
+    def __init__(self, handle: BinaryIO, offset: int, max_line_bytes: int):
+        handle.seek(offset)
+        self.handle = handle
+        self.offset = offset
+        self.max_line_bytes = max_line_bytes
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        while True:
+            raw = self.handle.readline(self.max_line_bytes + 1)
+            if not raw:
+                return
+            self.offset += len(raw)
+
+            if len(raw) > self.max_line_bytes and not raw.endswith(b"\n"):
+                while raw and not raw.endswith(b"\n"):
+                    raw = self.handle.readline(self.max_line_bytes)
+                    self.offset += len(raw)
+                yield None
+                continue
+
+            if self.offset == len(raw) and raw.startswith(b"\xef\xbb\xbf"):
+                raw = raw[3:]
+            yield raw.decode("utf-8", errors="replace")
+
+
+def _record(text: Any, record_id: Any = None) -> Dict[str, Any]:
+    """Validated input record, or one carrying the reason it was rejected"""
+    if not isinstance(text, str) or not text.strip():
+        return {'id': record_id, 'error': "Invalid record: expected non-empty text"}
+    return {'id': record_id, 'text': text.strip()}
+
+
+def _jsonl_records(
+    handle: BinaryIO,
+    offset: int,
+    text_field: str,
+    id_field: Optional[str],
+    max_line_bytes: int
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    lines = _LineReader(handle, offset, max_line_bytes)
+    for line in lines:
+        if line is None:
+            yield lines.offset, {'error': "Line exceeds maximum length"}
+            continue
+        if not line.strip():
+            continue
+
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            yield lines.offset, {'error': f"Invalid record: {str(e)}"}
+            continue
+
+        if isinstance(data, dict):
+            yield lines.offset, _record(data.get(text_field), data.get(id_field) if id_field else None)
+        else:
+            yield lines.offset, _record(data)
+
+
+def _csv_lines(lines: _LineReader) -> Iterator[str]:
+    for line in lines:
+        yield _OVERSIZED + "\n" if line is None else line
+
+
+def _csv_records(
+    handle: BinaryIO,
+    offset: int,
+    text_field: str,
+    id_field: Optional[str],
+    max_line_bytes: int
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    # The header is read from the start every time, so a resumed job maps columns the same way
+    lines = _LineReader(handle, 0, max_line_bytes)
+    header = next(csv.reader(_csv_lines(lines)), None)
+    if not header or text_field not in header:
+        raise ValueError(f"CSV input has no {text_field!r} column")
+    text_column = header.index(text_field)
+    id_column = header.index(id_field) if id_field in header else None
+
+    lines = _LineReader(handle, max(offset, lines.offset), max_line_bytes)
+    reader = csv.reader(_csv_lines(lines))
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            yield lines.offset, {'error': f"Invalid record: {str(e)}"}
+            continue
+
+        if not row:
+            continue
+        if row == [_OVERSIZED]:
+            yield lines.offset, {'error': "Line exceeds maximum length"}
+            continue
+
+        record_id = row[id_column] if id_column is not None and id_column < len(row) else None
+        text = row[text_column] if text_column < len(row) else None
+        yield lines.offset, _record(text, record_id)
+
+
+def read_records(
+    handle: BinaryIO,
+    format: str,
+    offset: int = 0,
+    text_field: str = "text",
+    id_field: Optional[str] = "id",
+    max_line_bytes: int = 1024 * 1024
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Lazily read input records from a binary file.
+
+    JSONL lines are JSON strings or objects with a ``text_field`` key; CSV
+    needs a header row with a ``text_field`` column. Blank lines are
+    skipped.
+
+    Args:
+        handle: Input opened in binary mode
+        format: "jsonl" or "csv"
+        offset: Byte offset to continue from (0 or a previously yielded offset)
+        text_field: JSON key or CSV column holding the text
+        id_field: JSON key or CSV column echoed back as ``id``
+        max_line_bytes: Longer lines become error records without being read into memory
+
+    Returns:
+        Iterator of ``(offset after the record, record)``. A record has
+        ``id`` and either ``text`` or the ``error`` that rejected it.
+
+    Raises:
+        ValueError: If a CSV header has no ``text_field`` column
+    """
+    read = _csv_records if format == "csv" else _jsonl_records
+    return read(handle, offset, text_field, id_field, max_line_bytes)
+
+
+def output_record(
+    index: int,
+    record: Dict[str, Any],
+    result: Optional[Dict[str, Any]] = None,
+    error: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    One NDJSON result: the record's ``index`` and ``id`` with either the
+    service ``result`` fields or an ``error`` (the record's own first)
+    """
+    output: Dict[str, Any] = {'index': index}
+    if record.get('id') is not None:
+        output['id'] = record['id']
+
+    if 'error' in record:
+        output['error'] = record['error']
+    elif error:
+        output['error'] = error
+    else:
+        output['label'] = result['label']
+        output['confidence'] = result['confidence']
+        output['sentiment_score'] = result['sentiment_score']
+        if 'windows' in result:
+            output['windows'] = result['windows']
+    return output
+
+
+def _take(records: Iterator[Tuple[int, Dict[str, Any]]], count: int) -> List[Tuple[int, Dict[str, Any]]]:
+    """Next ``count`` records (blocking file read)"""
+    return list(islice(records, count))
+
+
+def encode_output(output: Dict[str, Any]) -> bytes:
+    """Serialize one result record as an NDJSON line"""
+    return json.dumps(output, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+async def _uncancellable(fn, *args):
+    """
+    Run a blocking call in a thread. Cancelling the caller still waits for
+    the call to finish, so a checkpoint is never left half-written.
+    """
+    future = asyncio.get_running_loop().run_in_executor(None, fn, *args)
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        await future
+        raise
+
+
+class JobManager:
+    """
+    Runs bulk jobs in the background through ``InferenceService.run_batch``.
+
+    Each job lives in its own directory under ``jobs_dir`` (``job.json``
+    and ``results.jsonl``, plus the input for uploads). Input is read
+    ``chunk_size`` records at a time and results are appended as NDJSON in
+    input order, so memory use does not grow with the file. Jobs go through
+    admission control like any request and back off when rejected, so
+    interactive traffic keeps priority.
+
+    Every worker process of a server runs its own manager over the same
+    ``jobs_dir``. A job is run only by the process holding the flock on its
+    ``job.lock``; the others read its state from ``job.json`` and pass a
+    cancellation through a ``cancel.request`` file. Each manager polls
+    ``jobs_dir`` every ``poll_seconds``, so the jobs of a worker that exits
+    are picked up by another one. Finished jobs are only read again when
+    their ``job.json`` changes, and are deleted ``retention_seconds``
+    after they finish (kept forever when 0).
+    """
+
+    def __init__(
+        self,
+        service: Any,
+        jobs_dir: str,
+        input_dir: Optional[str] = None,
+        chunk_size: int = 256,
+        max_concurrent: int = 1,
+        max_line_bytes: int = 1024 * 1024,
+        poll_seconds: float = 1.0,
+        retention_seconds: float = 0
+    ):
+        self.service = service
+        self.jobs_dir = jobs_dir
+        self.input_dir = input_dir
+        self.chunk_size = max(1, chunk_size)
+        self.max_line_bytes = max_line_bytes
+        self.poll_seconds = poll_seconds
+        self.retention_seconds = retention_seconds
+        self._slots = asyncio.Semaphore(max(1, max_concurrent))
+        self._jobs: Dict[str, Job] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._leases: Dict[str, TextIO] = {}
+        self._unreadable: Set[str] = set()
+        # job.json modification time and finish time of finished jobs, so polls skip them
+        self._finished: Dict[str, Tuple[int, float]] = {}
+        self._watcher: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Resume the jobs a restart interrupted and watch for jobs other workers leave behind"""
+        os.makedirs(self.jobs_dir, exist_ok=True)
+        await self._check()
+        self._watcher = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        """
+        Stop running jobs at their last checkpoint. They stay queued on
+        disk and resume on the next start(), or in another worker.
+        """
+        if self._watcher:
+            self._watcher.cancel()
+            await asyncio.gather(self._watcher, return_exceptions=True)
+            self._watcher = None
+
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _job_dir(self, job_id: str) -> str:
+        return os.path.join(self.jobs_dir, job_id)
+
+    def _cancel_path(self, job_id: str) -> str:
+        return os.path.join(self._job_dir(job_id), CANCEL_FILE)
+
+    def _clear_cancel(self, job_id: str) -> None:
+        try:
+            os.remove(self._cancel_path(job_id))
+        except FileNotFoundError:
+            pass
+
+    def _lease(self, job_id: str) -> bool:
+        """Take the job's lease without blocking; False while another process holds it"""
+        if job_id in self._leases:
+            return True
+        handle = open(os.path.join(self._job_dir(job_id), LEASE_FILE), "a")
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            handle.close()
+            return False
+        self._leases[job_id] = handle
+        return True
+
+    def _release(self, job_id: str) -> None:
+        """Give up the job's lease (closing the file drops the lock)"""
+        handle = self._leases.pop(job_id, None)
+        if handle is not None:
+            handle.close()
+
+    def _load(self, job_id: str) -> Optional[Job]:
+        """Job state from disk, or None if there is no readable job by that id"""
+        if job_id in ("", ".", "..") or os.path.basename(job_id) != job_id:
+            return None
+        path = os.path.join(self._job_dir(job_id), JOB_FILE)
+        try:
+            with open(path) as handle:
+                return Job(**json.load(handle))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            if job_id not in self._unreadable:
+                self._unreadable.add(job_id)
+                logger.warning(f"Skipping unreadable job state {path}: {str(e)}")
+            return None
+
+    def _scan(self, owned: Set[str]) -> Tuple[List[Job], List[str], List[str]]:
+        """
+        One pass over ``jobs_dir`` (blocking operation).
+
+        Returns:
+            Queued or running jobs this process does not run, oldest
+            first; ids in ``owned`` with a cancel request; finished jobs
+            past their retention
+        """
+        waiting = []
+        cancelled = []
+        expired = []
+        now = time.time()
+        for name in os.listdir(self.jobs_dir):
+            if name in owned:
+                if os.path.exists(self._cancel_path(name)):
+                    cancelled.append(name)
+                continue
+
+            try:
+                mtime = os.stat(os.path.join(self._job_dir(name), JOB_FILE)).st_mtime_ns
+            except OSError:
+                continue
+            finished = self._finished.get(name)
+            if finished is None or finished[0] != mtime:
+                job = self._load(name)
+                if job is None or job.id != name:
+                    continue
+                if job.status in RESUMABLE:
+                    self._finished.pop(name, None)
+                    waiting.append(job)
+                    continue
+                finished = self._finished[name] = (mtime, job.finished_at or now)
+
+            if self.retention_seconds and now - finished[1] > self.retention_seconds:
+                expired.append(name)
+        return sorted(waiting, key=lambda j: j.created_at), cancelled, expired
+
+    async def _check(self) -> None:
+        """Pass on cancellations from other workers, run jobs nobody runs and drop expired ones"""
+        loop = asyncio.get_running_loop()
+        waiting, cancelled, expired = await loop.run_in_executor(None, self._scan, set(self._tasks))
+
+        for job_id in cancelled:
+            task = self._tasks.get(job_id)
+            if task is not None:
+                self._jobs[job_id].cancel_requested = True
+                task.cancel()
+
+        for job in waiting:
+            self._adopt(job.id)
+
+        for job_id in expired:
+            try:
+                await self.delete(job_id)
+                logger.info(f"Deleted job {job_id} after its retention period")
+            except (JobNotFoundError, JobStateError):
+                continue
+
+    def _adopt(self, job_id: str) -> None:
+        """Run a queued or running job if no worker holds its lease"""
+        if job_id in self._tasks or not self._lease(job_id):
+            return
+        # Re-read under the lease: the previous owner may have finished it meanwhile
+        try:
+            job = self.get(job_id)
+        except JobNotFoundError:
+            self._release(job_id)
+            return
+        if job.status not in RESUMABLE:
+            self._release(job_id)
+            return
+
+        if os.path.exists(self._cancel_path(job_id)):
+            job.status = CANCELLED
+            job.finished_at = time.time()
+            self._save(job)
+            self._clear_cancel(job_id)
+            self._release(job_id)
+            logger.info(f"Cancelled job {job_id} after {job.records} records")
+            return
+
+        logger.info(f"Resuming job {job_id} at record {job.records}")
+        job.status = QUEUED
+        self._schedule(job)
+
+    async def _watch(self) -> None:
+        """Check ``jobs_dir`` every ``poll_seconds``"""
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                await self._check()
+            except Exception as e:
+                logger.error(f"Job directory check failed: {str(e)}")
+
+    def _save(self, job: Job) -> None:
+        """Write the job state atomically"""
+        path = os.path.join(self._job_dir(job.id), JOB_FILE)
+        with open(path + ".tmp", "w") as handle:
+            json.dump(job.state(), handle)
+        os.replace(path + ".tmp", path)
+
+    def _resolve_input(self, input_path: str) -> str:
+        """Absolute input path, which must lie inside ``input_dir``"""
+        if not self.input_dir:
+            raise PermissionError("Local input paths are disabled (JOBS_INPUT_DIR is not set)")
+        root = os.path.realpath(self.input_dir)
+        path = os.path.realpath(os.path.join(root, input_path))
+        if os.path.commonpath([root, path]) != root:
+            raise PermissionError(f"Input path must be inside {self.input_dir}")
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Input file {input_path!r} not found")
+        return path
+
+    @staticmethod
+    def _format(path: str, format: Optional[str]) -> str:
+        """Explicit format, or the one implied by the file extension"""
+        if format is None:
+            format = FORMAT_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+            if format is None:
+                raise ValueError("Cannot infer the input format from the file name; pass format")
+        if format not in JOB_FORMATS:
+            raise ValueError(f"Unsupported format {format!r}; expected one of {', '.join(JOB_FORMATS)}")
+        return format
+
+    def _create(self, job_id: str, input_path: str, format: str, **options: Any) -> Job:
+        job = Job(
+            id=job_id,
+            input_path=input_path,
+            output_path=os.path.join(self._job_dir(job_id), RESULTS_FILE),
+            format=format,
+            input_bytes=os.path.getsize(input_path),
+            **options
+        )
+        os.makedirs(self._job_dir(job_id), exist_ok=True)
+        open(job.output_path, "ab").close()
+        self._lease(job.id)
+        self._save(job)
+        self._jobs[job.id] = job
+        self._schedule(job)
+        logger.info(f"Queued job {job.id} over {job.input_bytes} bytes of {format}")
+        return job
+
+    def submit(self, input_path: str, format: Optional[str] = None, **options: Any) -> Job:
+        """
+        Queue a job over a file inside ``input_dir``.
+
+        Args:
+            input_path: Path relative to ``input_dir`` (or absolute inside it)
+            format: "jsonl" or "csv"; inferred from the extension when None
+            **options: ``text_field``, ``id_field``, ``model`` and
+                ``aggregation`` for the new Job
+
+        Raises:
+            PermissionError: If local paths are disabled or the path escapes ``input_dir``
+            FileNotFoundError: If the file does not exist
+            ValueError: If the format is unknown
+        """
+        path = self._resolve_input(input_path)
+        return self._create(uuid.uuid4().hex, path, self._format(path, format), **options)
+
+    async def upload(
+        self,
+        chunks: AsyncIterator[bytes],
+        format: str,
+        max_bytes: Optional[int] = None,
+        **options: Any
+    ) -> Job:
+        """
+        Store an uploaded input in the job's directory, then queue the job.
+
+        Raises:
+            ValueError: If the format is unknown or the upload exceeds ``max_bytes``
+        """
+        format = self._format("", format)
+        job_id = uuid.uuid4().hex
+        os.makedirs(self._job_dir(job_id))
+        path = os.path.join(self._job_dir(job_id), f"input.{format}")
+        loop = asyncio.get_running_loop()
+        size = 0
+
+        try:
+            with open(path, "wb") as handle:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if max_bytes is not None and size > max_bytes:
+                        raise ValueError(f"Upload exceeds {max_bytes} bytes")
+                    await loop.run_in_executor(None, handle.write, chunk)
+        except BaseException:
+            os.remove(path)
+            os.rmdir(self._job_dir(job_id))
+            raise
+
+        return self._create(job_id, path, format, **options)
+
+    def get(self, job_id: str) -> Job:
+        """
+        A job run by this process, or its latest checkpoint on disk when
+        another worker (or nobody) runs it.
+
+        Raises:
+            JobNotFoundError: If there is no such job
+        """
+        if job_id in self._tasks:
+            return self._jobs[job_id]
+
+        loaded = self._load(job_id)
+        if loaded is None:
+            raise JobNotFoundError(job_id)
+        job = self._jobs.get(job_id)
+        if job is None:
+            job = self._jobs[job_id] = loaded
+        else:
+            for name, value in loaded.state().items():
+                setattr(job, name, value)
+        return job
+
+    def jobs(self) -> List[Job]:
+        """All jobs, newest first"""
+        jobs = []
+        for name in os.listdir(self.jobs_dir):
+            try:
+                jobs.append(self.get(name))
+            except JobNotFoundError:
+                continue
+        return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+    async def cancel(self, job_id: str) -> Job:
+        """
+        Stop a queued or running job at its last checkpoint. The chunk in
+        flight is dropped; results already written stay available.
+
+        A job run by another worker is asked to stop through its
+        ``cancel.request`` file; this waits up to ``CANCEL_WAIT_SECONDS``
+        for that worker to checkpoint it and returns the state it reached.
+
+        Raises:
+            JobNotFoundError: If there is no such job
+            JobStateError: If the job has already finished
+        """
+        job = self.get(job_id)
+        task = self._tasks.get(job_id)
+        if task is not None:
+            job.cancel_requested = True
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            return job
+
+        if job.status not in RESUMABLE:
+            raise JobStateError(f"Job {job_id} is already {job.status}")
+
+        if self._lease(job_id):
+            # Nobody runs the job (its worker exited before another picked it up)
+            try:
+                job = self.get(job_id)
+                if job.status not in RESUMABLE:
+                    raise JobStateError(f"Job {job_id} is already {job.status}")
+                job.status = CANCELLED
+                job.finished_at = time.time()
+                self._save(job)
+            finally:
+                self._release(job_id)
+            logger.info(f"Cancelled job {job.id} after {job.records} records")
+            return job
+
+        open(self._cancel_path(job_id), "a").close()
+        loop = asyncio.get_running_loop()
+        end = loop.time() + CANCEL_WAIT_SECONDS
+        while job.status in RESUMABLE and loop.time() < end:
+            await asyncio.sleep(min(0.05, self.poll_seconds))
+            job = self.get(job_id)
+        return job
+
+    async def delete(self, job_id: str) -> None:
+        """
+        Remove a finished job with its results (and its input, if uploaded).
+
+        Raises:
+            JobNotFoundError: If there is no such job
+            JobStateError: If the job is queued or running, or another
+                worker is resuming it
+        """
+        job = self.get(job_id)
+        if job.status not in FINISHED:
+            raise JobStateError(f"Job {job_id} is {job.status}; cancel it before deleting it")
+        if not self._lease(job_id):
+            raise JobStateError(f"Job {job_id} is being resumed by another worker")
+
+        try:
+            # Re-read under the lease in case another worker resumed it first
+            job = self.get(job_id)
+            if job.status not in FINISHED:
+                raise JobStateError(f"Job {job_id} is {job.status}; cancel it before deleting it")
+            await asyncio.get_running_loop().run_in_executor(None, shutil.rmtree, self._job_dir(job_id))
+        finally:
+            self._release(job_id)
+        self._jobs.pop(job_id, None)
+        self._finished.pop(job_id, None)
+
+    def resume(self, job_id: str) -> Job:
+        """
+        Queue a cancelled or failed job again from its last checkpoint.
+
+        Raises:
+            JobNotFoundError: If there is no such job
+            JobStateError: If the job is not cancelled or failed
+        """
+        job = self.get(job_id)
+        if job.status not in (CANCELLED, FAILED):
+            raise JobStateError(f"Job {job_id} is {job.status}; only cancelled or failed jobs can resume")
+        if not self._lease(job_id):
+            raise JobStateError(f"Job {job_id} is being resumed by another worker")
+
+        # Re-read under the lease in case another worker resumed it first
+        job = self.get(job_id)
+        if job.status not in (CANCELLED, FAILED):
+            self._release(job_id)
+            raise JobStateError(f"Job {job_id} is {job.status}; only cancelled or failed jobs can resume")
+
+        job.status = QUEUED
+        job.error = None
+        job.finished_at = None
+        self._save(job)
+        self._schedule(job)
+        return job
+
+    def _schedule(self, job: Job) -> None:
+        """Run a job this process holds the lease on"""
+        job.cancel_requested = False
+        self._clear_cancel(job.id)
+        self._tasks[job.id] = asyncio.create_task(self._execute(job))
+
+    async def _execute(self, job: Job) -> None:
+        try:
+            async with self._slots:
+                await self._run(job)
+        except asyncio.CancelledError:
+            # On shutdown the job stays queued/running on disk and resumes later
+            if job.cancel_requested:
+                job.status = CANCELLED
+                job.finished_at = time.time()
+                self._save(job)
+                self._clear_cancel(job.id)
+                logger.info(f"Cancelled job {job.id} after {job.records} records")
+        finally:
+            self._tasks.pop(job.id, None)
+            self._release(job.id)
+
+    async def _run(self, job: Job) -> None:
+        """Process a job from its checkpoint to the end of the input"""
+        job.status = RUNNING
+        job.started_at = job.started_at or time.time()
+        job.run_started = time.time()
+        job.run_records = 0
+        job.run_bytes = 0
+        self._save(job)
+        JOBS_RUNNING.inc()
+
+        try:
+            job.input_bytes = os.path.getsize(job.input_path)
+            with open(job.input_path, "rb") as source, open(job.output_path, "ab") as sink:
+                # Drop output written after the last checkpoint
+                sink.truncate(job.output_offset)
+                records = read_records(
+                    source, job.format, job.input_offset, job.text_field, job.id_field, self.max_line_bytes
+                )
+
+                while True:
+                    chunk = await _uncancellable(_take, records, self.chunk_size)
+                    if not chunk:
+                        break
+                    outputs = await self._score(job, [record for _, record in chunk])
+                    await _uncancellable(self._commit, job, sink, outputs, chunk[-1][0])
+
+            job.status = COMPLETED
+            job.finished_at = time.time()
+            self._save(job)
+            logger.info(f"Completed job {job.id}: {job.records} records, {job.failed} failed")
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {str(e)}")
+            job.status = FAILED
+            job.error = str(e)
+            job.finished_at = time.time()
+            self._save(job)
+        finally:
+            JOBS_RUNNING.dec()
+
+    async def _run_batch(self, job: Job, texts: List[str]) -> List[Dict[str, Any]]:
+        """Score one chunk, waiting out admission rejections instead of failing"""
+        while True:
+            try:
+                return await self.service.run_batch(
+                    texts, model=job.model, aggregation=job.aggregation, use_cache=False
+                )
+            except OverloadedError as e:
+                await asyncio.sleep(e.retry_after)
+
+    async def _score(self, job: Job, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Output records for one chunk in input order. A failed model call
+        marks the chunk's records as errors; an unknown model fails the job.
+        """
+        valid = [record for record in records if 'error' not in record]
+        results: List[Dict[str, Any]] = []
+        batch_error = None
+
+        if valid:
+            try:
+                results = await self._run_batch(job, [record['text'] for record in valid])
+            except ModelNotFoundError:
+                raise
+            except Exception as e:
+                logger.error(f"Job {job.id} chunk at record {job.records} failed: {str(e)}")
+                batch_error = f"Prediction failed: {str(e)}"
+
+        scored = iter(results)
+        return [
+            output_record(
+                job.records + i,
+                record,
+                None if 'error' in record or batch_error else next(scored),
+                batch_error
+            )
+            for i, record in enumerate(records)
+        ]
+
+    def _commit(self, job: Job, sink: BinaryIO, outputs: List[Dict[str, Any]], input_offset: int) -> None:
+        """Append a chunk's results durably, then advance the checkpoint (blocking operation)"""
+        data = b"".join(encode_output(output) for output in outputs)
+        sink.write(data)
+        sink.flush()
+        os.fsync(sink.fileno())
+
+        failed = sum(1 for output in outputs if 'error' in output)
+        job.run_bytes += input_offset - job.input_offset
+        job.run_records += len(outputs)
+        job.input_offset = input_offset
+        job.output_offset += len(data)
+        job.records += len(outputs)
+        job.failed += failed
+        self._save(job)
+
+        JOB_RECORDS.labels(status='success').inc(len(outputs) - failed)
+        JOB_RECORDS.labels(status='error').inc(failed)
@@ -0,0 +1,296 @@
+"""
+Model Registry - Application Tier
+Loaded models by name, LRU-evicted under a memory budget, with atomic hot swap
+"""
+import logging
+import asyncio
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional
+
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+# Metrics
+REGISTRY_LOADED_MODELS = Gauge(
+    'model_registry_loaded_models',
+    'Models currently held by the registry'
+)
+REGISTRY_MEMORY_BYTES = Gauge(
+    'model_registry_memory_bytes',
+    'Estimated weight memory of the models held by the registry'
+)
+REGISTRY_EVENTS = Counter(
+    'model_registry_events_total',
+    'Model registry loads, evictions and swaps',
+    ['event']
+)
+
+
+class ModelNotFoundError(LookupError):
+    """Raised when a request names a model that may not be served"""
+
+    def __init__(self, name: str):
+        super().__init__(f"Model {name!r} is not available")
+        self.name = name
+
+
+def model_memory_bytes(model: Any) -> int:
+    """Weight memory reported by the model, 0 when it cannot tell"""
+    memory_bytes = getattr(model, 'memory_bytes', None)
+    if not callable(memory_bytes):
+        return 0
+    try:
+        size = memory_bytes()
+    except Exception as e:
+        logger.warning(f"Could not measure model memory: {str(e)}")
+        return 0
+    return size if isinstance(size, int) else 0
+
+
+@dataclass(eq=False)
+class ModelEntry:
+    """One loaded model version and the requests currently using it"""
+    name: str
+    model: Any
+    version: Optional[str] = None
+    generation: int = 0
+    size_bytes: int = 0
+    loaded_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    in_flight: int = 0
+    retired: bool = False
+
+    @property
+    def key(self) -> str:
+        """Identifies this exact load, e.g. for cache keys across swaps"""
+        return f"{self.name}@{self.version or self.generation}"
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'version': self.version,
+            'generation': self.generation,
+            'memory_bytes': self.size_bytes,
+            'in_flight': self.in_flight,
+            'loaded_at': self.loaded_at,
+            'last_used': self.last_used,
+        }
+
+
+class ModelRegistry:
+    """
+    Holds several loaded models, picked per request by name.
+
+    Models not yet loaded are loaded on first use (one load per name, no
+    matter how many requests wait for it). After each load, least recently
+    used models are evicted until the estimated weight memory fits
+    ``memory_budget_bytes``; pinned models are never evicted. Sizes seen in
+    earlier loads are used to make room before loading, so peak memory
+    stays near the budget.
+
+    ``swap`` loads a new version off to the side and then replaces the
+    entry in one step. Requests hold the entry they acquired, so in-flight
+    work finishes on the old version; a replaced or evicted model is closed
+    once its last request releases it.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str, Optional[str]], Any],
+        memory_budget_bytes: int,
+        allowed: Optional[Iterable[str]] = None,
+        pinned: Iterable[str] = (),
+        executor: Optional[Executor] = None
+    ):
+        self._loader = loader
+        self.memory_budget = max(0, memory_budget_bytes)
+        self.allowed = list(dict.fromkeys(allowed)) if allowed is not None else None
+        self.pinned = set(pinned)
+        self._executor = executor
+        self._entries: "OrderedDict[str, ModelEntry]" = OrderedDict()
+        self._loading: Dict[str, asyncio.Future] = {}
+        self._size_hints: Dict[str, int] = {}
+        # Last installed version per name, so an evicted model comes back
+        # on the version it was swapped to rather than on CURRENT
+        self._versions: Dict[str, Optional[str]] = {}
+        self._generation = 0
+
+    @property
+    def memory_used(self) -> int:
+        return sum(entry.size_bytes for entry in self._entries.values())
+
+    def is_allowed(self, name: str) -> bool:
+        return self.allowed is None or name in self.allowed or name in self._entries
+
+    def peek(self, name: str) -> Optional[ModelEntry]:
+        """Loaded entry for ``name`` without counting it as a use"""
+        return self._entries.get(name)
+
+    def entries(self) -> List[ModelEntry]:
+        """Loaded entries, least recently used first"""
+        return list(self._entries.values())
+
+    def _update_gauges(self) -> None:
+        REGISTRY_LOADED_MODELS.set(len(self._entries))
+        REGISTRY_MEMORY_BYTES.set(self.memory_used)
+
+    def install(self, name: str, model: Any, version: Optional[str] = None) -> ModelEntry:
+        """
+        Make ``model`` the entry served for ``name``, replacing any
+        previous one, then evict down to the budget.
+        """
+        self._generation += 1
+        entry = ModelEntry(
+            name=name,
+            model=model,
+            version=version,
+            generation=self._generation,
+            size_bytes=model_memory_bytes(model)
+        )
+        self._size_hints[name] = entry.size_bytes
+        self._versions[name] = version
+
+        previous = self._entries.pop(name, None)
+        self._entries[name] = entry
+        if previous is not None:
+            self._retire(previous)
+
+        self._evict(keep=name)
+        self._update_gauges()
+        return entry
+
+    def remove(self, name: str) -> None:
+        """Stop serving ``name``; its model is closed once idle"""
+        entry = self._entries.pop(name, None)
+        if entry is not None:
+            self._retire(entry)
+            self._update_gauges()
+
+    def _evict(self, keep: str, reserve: int = 0) -> None:
+        """Evict LRU entries until the budget has ``reserve`` bytes to spare"""
+        for name in list(self._entries):
+            if self.memory_used + reserve <= self.memory_budget:
+                return
+            if name == keep or name in self.pinned:
+                continue
+            entry = self._entries.pop(name)
+            self._retire(entry)
+            REGISTRY_EVENTS.labels(event='evict').inc()
+            logger.info(f"Evicted model {entry.key} ({entry.size_bytes / 2**20:.0f} MiB)")
+
+        if self.memory_used + reserve > self.memory_budget:
+            logger.warning(
+                f"Models need {(self.memory_used + reserve) / 2**20:.0f} MiB, "
+                f"over the {self.memory_budget / 2**20:.0f} MiB budget"
+            )
+
+    def _retire(self, entry: ModelEntry) -> None:
+        entry.retired = True
+        if entry.in_flight == 0:
+            self._close(entry)
+
+    @staticmethod
+    def _close(entry: ModelEntry) -> None:
+        close = getattr(entry.model, 'close', None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                logger.warning(f"Failed to close model {entry.key}: {str(e)}")
+        logger.info(f"Released model {entry.key}")
+
+    async def _load(self, name: str, version: Optional[str]) -> Any:
+        """Run the blocking loader off the event loop"""
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        model = await loop.run_in_executor(self._executor, self._loader, name, version)
+        logger.info(f"Loaded model {name} in {time.perf_counter() - started:.2f}s")
+        return model
+
+    async def _load_and_install(self, name: str, version: Optional[str], event: str) -> ModelEntry:
+        hint = self._size_hints.get(name, 0)
+        if hint:
+            self._evict(keep=name, reserve=hint)
+        model = await self._load(name, version)
+        REGISTRY_EVENTS.labels(event=event).inc()
+        return self.install(name, model, version)
+
+    def _start_load(self, name: str, version: Optional[str], event: str) -> asyncio.Future:
+        """Single shared load per name; later callers await the same task"""
+        task = self._loading.get(name)
+        if task is None:
+            task = asyncio.ensure_future(self._load_and_install(name, version, event))
+            self._loading[name] = task
+            task.add_done_callback(lambda _: self._loading.pop(name, None))
+        return task
+
+    async def acquire(self, name: str, timeout: Optional[float] = None) -> ModelEntry:
+        """
+        Take a reference to the entry for ``name``, loading it if needed.
+
+        Every acquire must be paired with ``release``; ``use`` does both.
+
+        Raises:
+            ModelNotFoundError: If ``name`` is not an allowed model
+            asyncio.TimeoutError: If loading takes longer than ``timeout``;
+                the load itself carries on for later requests
+        """
+        entry = self._entries.get(name)
+        if entry is None:
+            if not self.is_allowed(name):
+                raise ModelNotFoundError(name)
+            REGISTRY_EVENTS.labels(event='miss').inc()
+            task = self._start_load(name, self._versions.get(name), 'load')
+            await asyncio.wait_for(asyncio.shield(task), timeout)
+            entry = self._entries.get(name) or task.result()
+
+        if self._entries.get(name) is entry:
+            self._entries.move_to_end(name)
+        entry.last_used = time.time()
+        entry.in_flight += 1
+        return entry
+
+    def release(self, entry: ModelEntry) -> None:
+        entry.in_flight -= 1
+        if entry.retired and entry.in_flight == 0:
+            self._close(entry)
+
+    @asynccontextmanager
+    async def use(self, name: str, timeout: Optional[float] = None) -> AsyncIterator[ModelEntry]:
+        """Hold the entry for ``name`` for the duration of the block"""
+        entry = await self.acquire(name, timeout)
+        try:
+            yield entry
+        finally:
+            self.release(entry)
+
+    async def swap(self, name: str, version: Optional[str] = None) -> ModelEntry:
+        """
+        Load ``version`` of ``name`` and atomically replace the served
+        entry. The current entry keeps serving until the new one is ready.
+
+        Raises:
+            ModelNotFoundError: If ``name`` is not an allowed model
+        """
+        if not self.is_allowed(name):
+            raise ModelNotFoundError(name)
+
+        # Never race two loads of one name; swap after the current one
+        while name in self._loading:
+            await asyncio.wait([self._loading[name]])
+
+        entry = await asyncio.shield(self._start_load(name, version, 'swap'))
+        logger.info(f"Swapped model {name} to {entry.key}")
+        return entry
+
+    async def close(self) -> None:
+        """Wait for pending loads, then release every model"""
+        if self._loading:
+            await asyncio.gather(*self._loading.values(), return_exceptions=True)
+        for name in list(self._entries):
+            self.remove(name)
@@ -0,0 +1,166 @@
+"""
+Process-Pool Inference Backend - Application Tier
+Runs model inference in worker processes to avoid GIL contention
+"""
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from models.sentiment_model import SentimentModel
+
+logger = logging.getLogger(__name__)
+
+# Compact wire format for one prediction: (label, confidence, score)
+_WirePrediction = Tuple[str, float, float]
+
+# Per-process model, loaded once by the pool initializer
+_worker_model: Optional[SentimentModel] = None
+
+
+def _init_worker(model_kwargs: Dict[str, Any]) -> None:
+    """Pool initializer: load the model once in each worker process"""
+    global _worker_model
+    _worker_model = SentimentModel(**model_kwargs)
+    logger.info(f"Worker {os.getpid()} loaded model {model_kwargs['model_name']}")
+
+
+def _worker_ping() -> Tuple[int, int]:
+    """Report the worker pid (0 until its model is loaded) and the model's weight memory"""
+    if _worker_model is None or not _worker_model.is_loaded():
+        return 0, 0
+    return os.getpid(), _worker_model.memory_bytes()
+
+
+def _worker_predict_batch(texts: List[str]) -> List[_WirePrediction]:
+    """Run a batch in the worker and return compact tuples"""
+    results = _worker_model.predict_batch(texts) if len(texts) > 1 else [
+        _worker_model.predict(texts[0])
+    ]
+    return [(r['label'], r['confidence'], r['score']) for r in results]
+
+
+def _worker_predict_documents(
+    texts: List[str],
+    aggregation: str,
+    max_windows: int,
+    stride: int
+) -> List[Tuple[str, float, float, int]]:
+    """Run a long-document batch in the worker; tuples carry the window count"""
+    results = _worker_model.predict_documents(texts, aggregation, max_windows, stride)
+    return [(r['label'], r['confidence'], r['score'], r['windows']) for r in results]
+
+
+def _from_wire(prediction: _WirePrediction) -> Dict[str, Any]:
+    """Rebuild the model's prediction dictionary"""
+    label, confidence, score = prediction
+    return {'label': label, 'confidence': confidence, 'score': score}
+
+
+class ProcessPoolModel:
+    """
+    Drop-in replacement for SentimentModel that runs inference in a pool
+    of worker processes.
+
+    Each worker loads its own model in the pool initializer, so only the
+    preprocessed texts and compact result tuples cross the process
+    boundary. Large batches are sorted by length and sharded across
+    workers so they run in parallel.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        cache_dir: str = "/app/models",
+        batch_size: int = 32,
+        workers: int = 2,
+        start_method: str = "spawn",
+        **model_kwargs: Any
+    ):
+        self.model_name = model_name
+        self.batch_size = max(1, batch_size)
+        self.workers = max(1, workers)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_worker,
+            initargs=({
+                'model_name': model_name,
+                'cache_dir': cache_dir,
+                'batch_size': self.batch_size,
+                **model_kwargs
+            },)
+        )
+        self._is_loaded = False
+        self._memory_bytes = 0
+        self.load_timings: Dict[str, float] = {'import': 0.0, 'load': 0.0}
+        
+        start = time.perf_counter()
+        self._start_workers()
+        # Workers import and load in parallel; only the wall time is visible here
+        self.load_timings['load'] = time.perf_counter() - start
+
+    def _start_workers(self) -> None:
+        """Spawn every worker and wait until each has loaded its model"""
+        futures = [self._pool.submit(_worker_ping) for _ in range(self.workers)]
+        done, _ = wait(futures)
+        pings = [f.result() for f in done]
+        pids = {pid for pid, _ in pings}
+        self._is_loaded = 0 not in pids
+        # Measured here, off the event loop; memory_bytes() must not wait on a busy worker
+        self._memory_bytes = max(size for _, size in pings) * self.workers
+        logger.info(f"Process backend ready with {len(pids)} worker(s) for {self.model_name}")
+
+    def is_loaded(self) -> bool:
+        """Check if the worker pool is up and models are loaded"""
+        return self._is_loaded
+
+    def memory_bytes(self) -> int:
+        """Weight memory across all workers (each holds its own copy), measured at startup"""
+        return self._memory_bytes
+
+    def predict(self, text: str) -> Dict[str, Any]:
+        """Predict sentiment for a single text in a worker process"""
+        return _from_wire(self._pool.submit(_worker_predict_batch, [text]).result()[0])
+
+    def _sharded(self, fn: Callable, texts: List[str], *args: Any) -> List[tuple]:
+        """Run ``fn(texts, *args)`` over length-sorted shards in parallel workers"""
+        if len(texts) <= self.batch_size:
+            return self._pool.submit(fn, texts, *args).result()
+
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        shards = [order[start:start + self.batch_size] for start in range(0, len(order), self.batch_size)]
+        futures = [
+            self._pool.submit(fn, [texts[i] for i in shard], *args)
+            for shard in shards
+        ]
+
+        predictions: List[Optional[tuple]] = [None] * len(texts)
+        for shard, future in zip(shards, futures):
+            for i, prediction in zip(shard, future.result()):
+                predictions[i] = prediction
+        return predictions
+
+    def predict_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Predict sentiment for a batch, sharded across worker processes"""
+        return [_from_wire(p) for p in self._sharded(_worker_predict_batch, texts)]
+
+    def predict_documents(
+        self,
+        texts: List[str],
+        aggregation: str = "mean",
+        max_windows: int = 16,
+        stride: int = 64
+    ) -> List[Dict[str, Any]]:
+        """Long-document predictions (see SentimentModel.predict_documents), sharded across workers"""
+        return [
+            dict(_from_wire(p[:3]), windows=p[3])
+            for p in self._sharded(_worker_predict_documents, texts, aggregation, max_windows, stride)
+        ]
+
+    def close(self) -> None:
+        """Shut down the worker processes"""
+        self._is_loaded = False
+        self._pool.shutdown(wait=True, cancel_futures=True)
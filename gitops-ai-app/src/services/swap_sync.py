@@ -0,0 +1,69 @@
+"""
+Swap Sync - Application Tier
+Hot swaps shared by the worker processes of one server through a state file
+"""
+import fcntl
+import json
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SwapState:
+    """
+    Model versions requested through /models/swap, shared by every worker
+    of one server.
+
+    The file maps each swapped model to its requested version and a
+    sequence number that grows with every swap, so repeating a swap (e.g.
+    to reload CURRENT) is seen as new. Updates take an exclusive lock on a
+    sidecar lock file and replace the state atomically; readers never see
+    a partial write.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock_path = f"{path}.lock"
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with open(self._lock_path, "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def read(self) -> Dict[str, Dict[str, Any]]:
+        """Requested ``{'version', 'seq'}`` per model name; empty before any swap"""
+        try:
+            with open(self.path, encoding="utf-8") as handle:
+                return json.load(handle).get("models", {})
+        except FileNotFoundError:
+            return {}
+        except (ValueError, OSError) as e:
+            logger.error(f"Unreadable swap state {self.path}: {str(e)}")
+            return {}
+
+    def publish(self, model_name: str, version: Optional[str]) -> int:
+        """
+        Record a swap of ``model_name`` to ``version`` for every worker.
+
+        Returns:
+            Sequence number of this swap
+        """
+        directory = os.path.dirname(self.path) or "."
+        with self._locked():
+            models = self.read()
+            seq = max((wanted["seq"] for wanted in models.values()), default=0) + 1
+            models[model_name] = {"version": version, "seq": seq}
+
+            fd, tmp_path = tempfile.mkstemp(prefix=".swaps-", dir=directory)
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump({"models": models}, handle)
+            os.replace(tmp_path, self.path)
+        return seq
@@ -0,0 +1,211 @@
+"""
+ONNX Export Tool
+Exports a sentiment model from the local model cache to ONNX, optionally
+quantizes it to int8, and validates it against the PyTorch model.
+
+Usage:
+    python -m tools.export_onnx --model distilbert-base-uncased-finetuned-sst-2-english \
+        --cache-dir /app/models --quantize
+"""
+import argparse
+import inspect
+import logging
+import os
+import shutil
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+from config import settings
+from models.sentiment_model import (
+    ONNX_MODEL_FILE,
+    ONNX_QUANTIZED_MODEL_FILE,
+    onnx_model_dir,
+    resolve_model_source,
+)
+
+logger = logging.getLogger(__name__)
+
+VALIDATION_TEXTS = [
+    "This is a great product, I love it!",
+    "Terrible experience, the worst support I have ever dealt with.",
+    "It arrived on Tuesday.",
+    "Not bad at all, though the battery could be better and the screen is a bit dim.",
+]
+
+
+def export_model(
+    model_name: str,
+    cache_dir: str,
+    output_dir: Optional[str] = None,
+    quantize: bool = False,
+    opset: int = 17
+) -> str:
+    """
+    Export a sequence-classification model to ONNX.
+
+    The model and tokenizer are read from ``cache_dir`` only (no network),
+    preferring the artifact store's CURRENT version over the HF cache.
+    Tokenizer and config files are saved next to the ONNX graph so the
+    runtime backend can load everything from one directory.
+
+    Returns:
+        Directory containing the exported artifacts
+    """
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    output_dir = output_dir or onnx_model_dir(cache_dir, model_name)
+    os.makedirs(output_dir, exist_ok=True)
+
+    source, source_kwargs = resolve_model_source(model_name, cache_dir, offline=True)
+    tokenizer = AutoTokenizer.from_pretrained(source, **source_kwargs)
+    model = AutoModelForSequenceClassification.from_pretrained(
+        source,
+        attn_implementation="eager",
+        **source_kwargs
+    )
+    model.eval()
+
+    input_names = list(tokenizer.model_input_names)
+    sample = tokenizer(VALIDATION_TEXTS[:2], padding=True, return_tensors="pt")
+    args = tuple(sample[name] for name in input_names)
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    export_kwargs = {}
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        export_kwargs["dynamo"] = False
+
+    model_path = os.path.join(output_dir, ONNX_MODEL_FILE)
+    logger.info(f"Exporting {model_name} to {model_path}")
+
+    with torch.inference_mode():
+        torch.onnx.export(
+            model,
+            args,
+            model_path,
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            do_constant_folding=True,
+            **export_kwargs
+        )
+
+    tokenizer.save_pretrained(output_dir)
+    model.config.save_pretrained(output_dir)
+
+    if quantize:
+        quantize_model(output_dir)
+
+    return output_dir
+
+
+def quantize_model(model_dir: str) -> str:
+    """Apply dynamic int8 quantization to an exported model"""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    source = os.path.join(model_dir, ONNX_MODEL_FILE)
+    target = os.path.join(model_dir, ONNX_QUANTIZED_MODEL_FILE)
+    logger.info(f"Quantizing {source} to int8")
+
+    quantize_dynamic(source, target, weight_type=QuantType.QInt8)
+    return target
+
+
+def validate_model(
+    model_name: str,
+    cache_dir: str,
+    model_dir: str,
+    quantized: bool = False,
+    texts: Optional[List[str]] = None,
+    tolerance: Optional[float] = None
+) -> Dict[str, float]:
+    """
+    Compare ONNX Runtime predictions with the PyTorch model.
+
+    Raises:
+        ValueError: If any label disagrees or the max probability
+            difference exceeds the tolerance (0.02 for fp32, 0.1 for int8)
+    """
+    import torch
+    from transformers import AutoModelForSequenceClassification
+
+    from models.sentiment_model import OnnxSentimentBackend
+
+    texts = texts or VALIDATION_TEXTS
+    tolerance = tolerance if tolerance is not None else (0.1 if quantized else 0.02)
+
+    backend = OnnxSentimentBackend(model_dir, quantized=quantized)
+    source, source_kwargs = resolve_model_source(model_name, cache_dir, offline=True)
+    reference = AutoModelForSequenceClassification.from_pretrained(source, **source_kwargs)
+    reference.eval()
+
+    encoded = backend.tokenizer(texts, padding=True, truncation=True, return_tensors="pt")
+    with torch.inference_mode():
+        probs = torch.softmax(reference(**encoded).logits, dim=-1).numpy()
+
+    expected_ids = probs.argmax(axis=-1)
+    actual = backend(texts)
+
+    label_matches = 0
+    max_diff = 0.0
+    for row, (label_id, result) in enumerate(zip(expected_ids, actual)):
+        expected_label = reference.config.id2label[int(label_id)]
+        if result['label'] == expected_label:
+            label_matches += 1
+        max_diff = max(max_diff, abs(float(probs[row, label_id]) - result['score']))
+
+    report = {
+        'label_agreement': label_matches / len(texts),
+        'max_score_diff': max_diff,
+    }
+    logger.info(f"Validation report for {model_dir}: {report}")
+
+    if label_matches != len(texts) or max_diff > tolerance:
+        raise ValueError(f"ONNX model does not match PyTorch within tolerance {tolerance}: {report}")
+
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export a sentiment model to ONNX")
+    parser.add_argument("--model", default=settings.MODEL_NAME, help="Model name or local path")
+    parser.add_argument("--cache-dir", default=settings.MODEL_CACHE_DIR)
+    parser.add_argument("--output-dir", default=None, help="Defaults to <cache-dir>/onnx/<model>")
+    parser.add_argument("--quantize", action="store_true", help="Also write a dynamic int8 model")
+    parser.add_argument("--opset", type=int, default=17)
+    parser.add_argument("--skip-validation", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    staging_dir = tempfile.mkdtemp(prefix="onnx-export-")
+    output_dir = args.output_dir or onnx_model_dir(args.cache_dir, args.model)
+
+    try:
+        # Export to a staging directory so a failed validation never
+        # replaces a working model
+        export_model(args.model, args.cache_dir, staging_dir, args.quantize, args.opset)
+
+        if not args.skip_validation:
+            validate_model(args.model, args.cache_dir, staging_dir)
+            if args.quantize:
+                validate_model(args.model, args.cache_dir, staging_dir, quantized=True)
+
+        if os.path.isdir(output_dir):
+            shutil.rmtree(output_dir)
+        os.makedirs(os.path.dirname(os.path.abspath(output_dir)), exist_ok=True)
+        shutil.move(staging_dir, output_dir)
+        logger.info(f"ONNX model written to {output_dir}")
+        return 0
+
+    except Exception as e:
+        logger.error(f"ONNX export failed: {str(e)}")
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
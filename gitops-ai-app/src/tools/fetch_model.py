@@ -0,0 +1,116 @@
+"""
+Model Fetch Tool
+Publishes a model into the local artifact store so the service can load it
+offline. Intended for an init container that fills MODEL_CACHE_DIR before
+the server starts.
+
+Usage:
+    # Download from the HuggingFace Hub and publish as safetensors
+    python -m tools.fetch_model --model distilbert-base-uncased-finetuned-sst-2-english \
+        --cache-dir /app/models
+
+    # Publish a local directory under an explicit version
+    python -m tools.fetch_model --model my-org/sentiment --source-dir ./export --version v3
+
+    # Inspect or clean up the store
+    python -m tools.fetch_model --model my-org/sentiment --list
+    python -m tools.fetch_model --model my-org/sentiment --prune 2
+"""
+import argparse
+import logging
+import sys
+import tempfile
+from typing import List, Optional
+
+from config import settings
+from models.artifacts import Artifact, ArtifactError, ArtifactStore
+
+logger = logging.getLogger(__name__)
+
+
+def download_model(model_name: str, target_dir: str, revision: Optional[str] = None) -> None:
+    """
+    Download a model and tokenizer and save them to ``target_dir`` with
+    weights in safetensors format, which the service memory-maps on load.
+    """
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    with tempfile.TemporaryDirectory(prefix="hf-download-") as download_cache:
+        tokenizer = AutoTokenizer.from_pretrained(model_name, revision=revision, cache_dir=download_cache)
+        model = AutoModelForSequenceClassification.from_pretrained(
+            model_name, revision=revision, cache_dir=download_cache
+        )
+        tokenizer.save_pretrained(target_dir)
+        model.save_pretrained(target_dir, safe_serialization=True)
+
+
+def fetch(
+    store: ArtifactStore,
+    model_name: str,
+    source_dir: Optional[str] = None,
+    version: Optional[str] = None,
+    revision: Optional[str] = None,
+    make_current: bool = True
+) -> Artifact:
+    """
+    Publish ``source_dir``, or a fresh download when it is not given.
+
+    Returns:
+        The published artifact
+    """
+    if source_dir:
+        return store.publish(model_name, source_dir, version, make_current)
+
+    with tempfile.TemporaryDirectory(prefix="fetch-model-") as download_dir:
+        download_model(model_name, download_dir, revision)
+        return store.publish(model_name, download_dir, version, make_current)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Publish a model into the local artifact store")
+    parser.add_argument("--model", default=settings.MODEL_NAME, help="Model id")
+    parser.add_argument("--cache-dir", default=settings.MODEL_CACHE_DIR, help="Model cache directory")
+    parser.add_argument("--source-dir", help="Publish this directory instead of downloading")
+    parser.add_argument("--version", help="Version label (default: content hash)")
+    parser.add_argument("--revision", help="Hub revision to download (branch, tag or commit)")
+    parser.add_argument("--no-current", action="store_true", help="Publish without making it CURRENT")
+    parser.add_argument("--skip-existing", action="store_true",
+                        help="Do nothing if the model already has a CURRENT version")
+    parser.add_argument("--list", action="store_true", help="List published versions and exit")
+    parser.add_argument("--prune", type=int, metavar="KEEP", help="Delete all but the newest KEEP versions")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    store = ArtifactStore.for_cache_dir(args.cache_dir)
+
+    try:
+        if args.list:
+            current = store.current_version(args.model)
+            for version in store.versions(args.model):
+                print(f"{version}{' (current)' if version == current else ''}")
+            return 0
+
+        if args.prune is not None:
+            store.prune(args.model, keep=args.prune)
+            return 0
+
+        if args.skip_existing and store.current_version(args.model):
+            artifact = store.resolve(args.model)
+            store.verify(artifact)
+            logger.info(f"{args.model}@{artifact.version} already published")
+            return 0
+
+        artifact = fetch(
+            store, args.model, args.source_dir, args.version, args.revision,
+            make_current=not args.no_current
+        )
+    except ArtifactError as e:
+        logger.error(str(e))
+        return 1
+
+    print(f"{artifact.model_name}@{artifact.version} -> {artifact.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
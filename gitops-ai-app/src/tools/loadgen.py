@@ -0,0 +1,311 @@
+"""
+Open-Loop Load Generator
+Drives the inference API at fixed Poisson arrival rates and reports
+throughput, latency percentiles and error rate per rate step, to find the
+saturation knee of a single pod.
+
+Usage:
+    # In-process (app and generator share the interpreter)
+    python -m tools.loadgen --rates 20,50,100,200 --duration 20
+
+    # Against a running server
+    python -m tools.loadgen --url http://localhost:8000 --rates 50,100,200 \
+        --batch-ratio 0.1 --lengths short=0.7,medium=0.2,long=0.1 --slo-ms 250
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+PREDICT_PATH = "/api/v1/predict"
+BATCH_PATH = "/api/v1/predict/batch"
+
+# Text length buckets as (min_words, max_words)
+LENGTH_BUCKETS: Dict[str, Tuple[int, int]] = {
+    'short': (5, 30),
+    'medium': (30, 120),
+    'long': (120, 400),
+}
+
+WORDS = (
+    "the product arrived on time and works great but the battery is poor customer "
+    "service was awful although the screen looks amazing overall i would recommend "
+    "it to friends who love good value for money delivery packaging price quality"
+).split()
+
+
+def parse_lengths(spec: str) -> Dict[str, float]:
+    """
+    Parse a length mix such as ``short=0.7,medium=0.2,long=0.1``.
+
+    Raises:
+        ValueError: On unknown buckets or non-positive total weight
+    """
+    weights: Dict[str, float] = {}
+    for part in spec.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in LENGTH_BUCKETS:
+            raise ValueError(f"Unknown length bucket {name!r}; expected one of {sorted(LENGTH_BUCKETS)}")
+        weights[name] = float(weight) if weight else 1.0
+    if sum(weights.values()) <= 0:
+        raise ValueError("Length mix weights must sum to a positive number")
+    return weights
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list (0 when empty)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(-(-q * len(sorted_values) // 100)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+@dataclass
+class TrafficMix:
+    """Request mix: share of batch requests and text length distribution"""
+    batch_ratio: float = 0.0
+    batch_size: int = 16
+    lengths: Dict[str, float] = field(default_factory=lambda: {'short': 1.0})
+
+    def make_text(self, rng: random.Random) -> str:
+        bucket = rng.choices(list(self.lengths), weights=list(self.lengths.values()))[0]
+        low, high = LENGTH_BUCKETS[bucket]
+        return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high)))
+
+    def make_request(self, rng: random.Random) -> Tuple[str, Dict[str, Any], int]:
+        """Return (path, json body, number of texts) for the next request"""
+        if rng.random() < self.batch_ratio:
+            texts = [self.make_text(rng) for _ in range(self.batch_size)]
+            return BATCH_PATH, {'texts': texts}, len(texts)
+        return PREDICT_PATH, {'text': self.make_text(rng)}, 1
+
+
+@dataclass
+class StepResult:
+    """Outcome of one fixed-rate step"""
+    rate: float
+    duration: float
+    sent: int = 0
+    completed: int = 0
+    texts: int = 0
+    latencies: List[float] = field(default_factory=list)
+    errors: Counter = field(default_factory=Counter)
+    elapsed: float = 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        failed = sum(self.errors.values())
+        elapsed = self.elapsed or self.duration
+        return {
+            'offered_rps': self.rate,
+            'sent': self.sent,
+            'completed': self.completed,
+            'throughput_rps': self.completed / elapsed,
+            'throughput_texts_per_s': self.texts / elapsed,
+            'p50_ms': percentile(latencies, 50) * 1e3,
+            'p95_ms': percentile(latencies, 95) * 1e3,
+            'p99_ms': percentile(latencies, 99) * 1e3,
+            'max_ms': (latencies[-1] if latencies else 0.0) * 1e3,
+            'error_rate': failed / self.sent if self.sent else 0.0,
+            'errors': dict(self.errors),
+        }
+
+
+async def run_step(
+    client: httpx.AsyncClient,
+    rate: float,
+    duration: float,
+    mix: TrafficMix,
+    rng: random.Random,
+    max_in_flight: int = 1000,
+    headers: Optional[Dict[str, str]] = None
+) -> StepResult:
+    """
+    Send Poisson arrivals at ``rate`` requests/s for ``duration`` seconds.
+
+    The generator is open loop: send times are fixed in advance and never
+    wait for earlier responses, and latency is measured from the scheduled
+    send time so a stalled server cannot hide queueing delay. Arrivals that
+    find ``max_in_flight`` requests outstanding are counted as
+    ``client_overload`` errors instead of being sent.
+    """
+    result = StepResult(rate=rate, duration=duration)
+    in_flight: set = set()
+
+    async def send(scheduled: float, path: str, body: Dict[str, Any], texts: int) -> None:
+        try:
+            response = await client.post(path, json=body, headers=headers)
+            status = response.status_code
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        latency = time.perf_counter() - scheduled
+
+        if status == 200:
+            result.completed += 1
+            result.texts += texts
+            result.latencies.append(latency)
+        else:
+            result.errors[str(status)] += 1
+
+    start = time.perf_counter()
+    next_send = start
+    end = start + duration
+    while True:
+        next_send += rng.expovariate(rate)
+        if next_send >= end:
+            break
+        delay = next_send - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        result.sent += 1
+        if len(in_flight) >= max_in_flight:
+            result.errors['client_overload'] += 1
+            continue
+
+        task = asyncio.create_task(send(next_send, *mix.make_request(rng)))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+
+    if in_flight:
+        await asyncio.wait(in_flight)
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+async def run(
+    client: httpx.AsyncClient,
+    rates: List[float],
+    duration: float,
+    mix: TrafficMix,
+    seed: int = 0,
+    warmup: float = 2.0,
+    max_in_flight: int = 1000,
+    headers: Optional[Dict[str, str]] = None
+) -> List[Dict[str, Any]]:
+    """Run each rate step in order and return one summary per step"""
+    rng = random.Random(seed)
+    if warmup > 0:
+        await run_step(client, rates[0], warmup, mix, rng, max_in_flight, headers)
+
+    summaries = []
+    for rate in rates:
+        summary = (await run_step(client, rate, duration, mix, rng, max_in_flight, headers)).summary()
+        summaries.append(summary)
+        print(format_summary(summary), flush=True)
+    return summaries
+
+
+@asynccontextmanager
+async def open_client(url: Optional[str], timeout: float, max_in_flight: int) -> AsyncIterator[httpx.AsyncClient]:
+    """Client for a remote server, or for the app in-process with its lifespan"""
+    client_timeout = httpx.Timeout(timeout)
+    if url:
+        limits = httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+        async with httpx.AsyncClient(base_url=url, timeout=client_timeout, limits=limits) as client:
+            yield client
+        return
+
+    from main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadgen", timeout=client_timeout) as client:
+            yield client
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    """One report line per rate step"""
+    return (
+        f"{summary['offered_rps']:8.1f} {summary['throughput_rps']:10.1f} "
+        f"{summary['throughput_texts_per_s']:10.1f} {summary['p50_ms']:9.1f} "
+        f"{summary['p95_ms']:9.1f} {summary['p99_ms']:9.1f} {summary['error_rate']:8.2%}"
+    )
+
+
+REPORT_HEADER = (
+    f"{'offered':>8s} {'req/s':>10s} {'texts/s':>10s} {'p50 ms':>9s} "
+    f"{'p95 ms':>9s} {'p99 ms':>9s} {'errors':>8s}"
+)
+
+
+def knee(summaries: List[Dict[str, Any]], slo_ms: float, max_error_rate: float) -> Optional[float]:
+    """Highest offered rate whose p99 and error rate stay within the SLO"""
+    passing = [
+        s['offered_rps'] for s in summaries
+        if s['p99_ms'] <= slo_ms and s['error_rate'] <= max_error_rate
+    ]
+    return max(passing) if passing else None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Open-loop load generator for the inference API")
+    parser.add_argument("--url", help="Target server; omit to run the app in-process")
+    parser.add_argument("--rates", default="10,20,50,100", help="Comma-separated requests/s per step")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per rate step")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Seconds at the first rate before measuring")
+    parser.add_argument("--batch-ratio", type=float, default=0.0, help="Share of requests sent to /predict/batch")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--lengths", default="short=1", help="Length mix, e.g. short=0.7,medium=0.2,long=0.1")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Client timeout per request (seconds)")
+    parser.add_argument("--deadline-ms", type=float, help="Send this budget as X-Request-Timeout-Ms")
+    parser.add_argument("--max-in-flight", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--slo-ms", type=float, help="p99 target used to report the saturation knee")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--output", help="Write the per-step report as JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+
+    try:
+        rates = [float(r) for r in args.rates.split(',')]
+        mix = TrafficMix(
+            batch_ratio=args.batch_ratio,
+            batch_size=args.batch_size,
+            lengths=parse_lengths(args.lengths)
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    headers = {'X-Request-Timeout-Ms': f"{args.deadline_ms:g}"} if args.deadline_ms else None
+
+    async def drive() -> List[Dict[str, Any]]:
+        async with open_client(args.url, args.timeout, args.max_in_flight) as client:
+            print(REPORT_HEADER, flush=True)
+            return await run(
+                client, rates, args.duration, mix, args.seed, args.warmup, args.max_in_flight, headers
+            )
+
+    summaries = asyncio.run(drive())
+
+    report: Dict[str, Any] = {
+        'target': args.url or 'in-process',
+        'mix': {'batch_ratio': mix.batch_ratio, 'batch_size': mix.batch_size, 'lengths': mix.lengths},
+        'steps': summaries,
+    }
+    if args.slo_ms is not None:
+        report['knee_rps'] = knee(summaries, args.slo_ms, args.max_error_rate)
+        print(f"Highest rate within p99 <= {args.slo_ms:.0f}ms and errors <= "
+              f"{args.max_error_rate:.0%}: {report['knee_rps']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump(report, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
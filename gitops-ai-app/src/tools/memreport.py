@@ -0,0 +1,204 @@
+"""
+Memory Report Tool
+Per-process RSS, PSS and USS of a multi-worker server (Linux), to compare
+``uvicorn --workers`` with pre-fork serving (``python -m prefork``), where
+the workers share one copy of the model weights.
+
+PSS splits every shared page between the processes mapping it, so the sum
+of PSS over the master and its workers is what the pod actually uses. USS
+is what each worker holds on its own.
+
+Usage:
+    # A running server: its master pid
+    python -m tools.memreport 1234
+
+    # Start the app both ways with 4 workers, wait until it is ready and idle, report both
+    MODEL_NAME=/app/models/my-model python -m tools.memreport --compare --workers 4 --output memory.json
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from utils.memory import child_pids, process_memory
+
+# Server launch commands for --compare, run from the src directory
+MODES = {
+    'uvicorn': lambda port, workers: [
+        sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+        "--port", str(port), "--workers", str(workers)
+    ],
+    'prefork': lambda port, workers: [sys.executable, "-m", "prefork"],
+}
+
+MIB = 2 ** 20
+
+
+def _role(pid: int) -> str:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as handle:
+            cmdline = handle.read()
+    except OSError:
+        return "gone"
+    # uvicorn's spawned workers start multiprocessing's resource tracker too
+    return "helper" if b"multiprocessing.resource_tracker" in cmdline else "worker"
+
+
+def snapshot(master: int) -> Dict[str, Any]:
+    """Memory of ``master`` and each direct child, plus totals, in bytes"""
+    processes = []
+    for pid, role in [(master, "master")] + [(pid, _role(pid)) for pid in child_pids(master)]:
+        try:
+            processes.append({'pid': pid, 'role': role, **process_memory(pid)})
+        except OSError:
+            continue
+    totals = {
+        key: sum(p[key] for p in processes)
+        for key in ('rss', 'pss', 'uss', 'shared')
+    }
+    return {'processes': processes, 'total': totals}
+
+
+def format_snapshot(title: str, report: Dict[str, Any]) -> str:
+    lines = [
+        title,
+        f"  {'pid':>8}  {'role':<7} {'RSS MiB':>9} {'PSS MiB':>9} {'USS MiB':>9} {'shared MiB':>11}",
+    ]
+    for p in report['processes']:
+        lines.append(
+            f"  {p['pid']:>8}  {p['role']:<7} {p['rss'] / MIB:>9.1f} {p['pss'] / MIB:>9.1f} "
+            f"{p['uss'] / MIB:>9.1f} {p['shared'] / MIB:>11.1f}"
+        )
+    total = report['total']
+    lines.append(
+        f"  {'total':>8}  {'':<7} {total['rss'] / MIB:>9.1f} {total['pss'] / MIB:>9.1f} "
+        f"{total['uss'] / MIB:>9.1f} {total['shared'] / MIB:>11.1f}"
+    )
+    return "\n".join(lines)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _total_rss(master: int, workers: int) -> Optional[int]:
+    """Total RSS once ``workers`` workers are up; None until then"""
+    report = snapshot(master)
+    if sum(p['role'] == "worker" for p in report['processes']) < workers:
+        return None
+    return report['total']['rss']
+
+
+def measure(mode: str, workers: int, timeout: float = 300.0, settle: float = 3.0) -> Dict[str, Any]:
+    """
+    Start the server in ``mode`` with the current environment, wait until
+    every worker is up, /ready answers and memory stops growing, then
+    snapshot it and shut it down.
+
+    Raises:
+        TimeoutError: If the server does not settle within ``timeout`` seconds
+        RuntimeError: If the server exits early
+    """
+    port = _free_port()
+    env = dict(os.environ, HOST="127.0.0.1", PORT=str(port), WORKERS=str(workers))
+    src = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.Popen(MODES[mode](port, workers), cwd=src, env=env)
+    url = f"http://127.0.0.1:{port}/ready"
+    try:
+        deadline = time.monotonic() + timeout
+        stable_since = None
+        last_rss = None
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"{mode} server exited with code {process.returncode}")
+            time.sleep(0.5)
+            rss = _total_rss(process.pid, workers)
+            try:
+                ready = httpx.get(url, timeout=5).status_code == 200
+            except httpx.HTTPError:
+                ready = False
+            if rss is None or not ready or last_rss is None or abs(rss - last_rss) > 0.01 * last_rss:
+                stable_since = None
+            elif stable_since is None:
+                stable_since = time.monotonic()
+            elif time.monotonic() - stable_since >= settle:
+                report = snapshot(process.pid)
+                report['mode'] = mode
+                report['workers'] = workers
+                return report
+            last_rss = rss
+        raise TimeoutError(f"{mode} server did not settle within {timeout:.0f}s")
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def format_comparison(before: Dict[str, Any], after: Dict[str, Any]) -> str:
+    def worker_mean(report: Dict[str, Any], key: str) -> float:
+        values = [p[key] for p in report['processes'] if p['role'] == "worker"]
+        return sum(values) / len(values) / MIB if values else 0.0
+
+    saved = 1 - after['total']['pss'] / before['total']['pss'] if before['total']['pss'] else 0.0
+    return (
+        f"Per worker: RSS {worker_mean(before, 'rss'):.1f} -> {worker_mean(after, 'rss'):.1f} MiB, "
+        f"USS {worker_mean(before, 'uss'):.1f} -> {worker_mean(after, 'uss'):.1f} MiB\n"
+        f"Total (sum of PSS): {before['total']['pss'] / MIB:.1f} -> {after['total']['pss'] / MIB:.1f} MiB "
+        f"({saved:.0%} less)"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Per-worker memory of a multi-worker inference server")
+    parser.add_argument("pid", type=int, nargs="?", help="Master pid of a running server")
+    parser.add_argument("--compare", action="store_true",
+                        help="Start uvicorn --workers, then python -m prefork, and report both")
+    parser.add_argument("--workers", type=int, default=4, help="Workers per server for --compare")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Seconds to wait for each server")
+    parser.add_argument("--output", help="Also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists("/proc/self/smaps_rollup") and not os.path.exists("/proc/self/smaps"):
+        parser.error("memory reports need Linux /proc")
+    if args.compare == (args.pid is not None):
+        parser.error("pass either a master pid or --compare")
+
+    if args.pid is not None:
+        try:
+            process_memory(args.pid)
+            report = snapshot(args.pid)
+        except OSError as e:
+            print(f"Cannot read process {args.pid}: {str(e)}", file=sys.stderr)
+            return 1
+        print(format_snapshot(f"Process {args.pid} and its children", report))
+        reports = {'server': report}
+    else:
+        try:
+            reports = {mode: measure(mode, args.workers, args.timeout) for mode in MODES}
+        except (RuntimeError, TimeoutError) as e:
+            print(str(e), file=sys.stderr)
+            return 1
+        for mode, report in reports.items():
+            print(format_snapshot(f"{mode} ({args.workers} workers)", report))
+        print(format_comparison(reports['uvicorn'], reports['prefork']))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump(reports, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+"""
+Offline Scoring Tool
+Scores a JSONL or CSV file without the HTTP server, for backfills. Chunks
+of the input are scored in parallel worker processes and the results are
+written in input order. Workers use the service's Settings, preprocessors
+and model code (``services.inference_service``), so offline scores match
+what the API returns for the same text.
+
+Usage:
+    python -m tools.score reviews.jsonl -o scores.jsonl --workers 4
+
+    # CSV with custom columns, long-document mode, stats as JSON
+    python -m tools.score reviews.csv --text-field body --id-field review_id \
+        --long-document --aggregation max_confidence --stats-json stats.json > scores.jsonl
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from config import Settings, settings
+from models.sentiment_model import AGGREGATIONS, SentimentModel
+from services.inference_service import build_preprocessors, format_result, model_kwargs, predict_many
+from services.jobs import FORMAT_EXTENSIONS, JOB_FORMATS, encode_output, output_record, read_records
+from tools.loadgen import percentile
+
+logger = logging.getLogger(__name__)
+
+# Chunks queued per worker, so workers never wait on the reader
+IN_FLIGHT_PER_WORKER = 2
+
+# Per-process scorer, built once by the pool initializer
+_worker_scorer: Optional["Scorer"] = None
+
+
+class Scorer:
+    """Preprocess and score texts exactly as ``InferenceService.run_batch`` does"""
+
+    def __init__(self, model_name: Optional[str] = None, version: Optional[str] = None):
+        self.preprocessor, self.document_preprocessor = build_preprocessors()
+        kwargs = model_kwargs(model_name, version)
+        self.model_name = kwargs['model_name']
+        self.model = SentimentModel(**kwargs)
+
+    def score(self, texts: List[str], aggregation: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Service results for raw texts (blocking operation)"""
+        if not texts:
+            return []
+        preprocessor = self.preprocessor if aggregation is None else self.document_preprocessor
+        results = predict_many(self.model, preprocessor.batch_preprocess(texts), aggregation)
+        return [format_result(result, 0.0, self.model_name) for result in results]
+
+
+def settings_snapshot() -> Dict[str, Any]:
+    """Current settings, including overrides made after import"""
+    return {name: getattr(settings, name) for name in dir(Settings) if name.isupper()}
+
+
+def _init_worker(
+    snapshot: Dict[str, Any],
+    model_name: Optional[str],
+    version: Optional[str],
+    threads: int
+) -> None:
+    """Pool initializer: adopt the parent's settings and load the model once"""
+    global _worker_scorer
+    for name, value in snapshot.items():
+        setattr(settings, name, value)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    _worker_scorer = Scorer(model_name, version)
+    logger.info(f"Worker {os.getpid()} loaded model {_worker_scorer.model_name}")
+
+
+def _worker_ping() -> int:
+    return os.getpid()
+
+
+def _score_chunk(texts: List[str], aggregation: Optional[str]) -> Tuple[List[Dict[str, Any]], float]:
+    """Score one chunk in a worker; returns results and compute seconds"""
+    start = time.perf_counter()
+    results = _worker_scorer.score(texts, aggregation)
+    return results, time.perf_counter() - start
+
+
+class _InlineFuture(Future):
+    """Completed future for scoring without worker processes (``--workers 0``)"""
+
+    def __init__(self, fn, *args):
+        super().__init__()
+        try:
+            self.set_result(fn(*args))
+        except Exception as e:
+            self.set_exception(e)
+
+
+def score_file(
+    source: BinaryIO,
+    sink: BinaryIO,
+    format: str,
+    workers: int = 1,
+    chunk_size: int = 256,
+    text_field: str = "text",
+    id_field: Optional[str] = "id",
+    model: Optional[str] = None,
+    version: Optional[str] = None,
+    aggregation: Optional[str] = None,
+    threads: Optional[int] = None,
+    max_line_bytes: int = 1024 * 1024
+) -> Dict[str, Any]:
+    """
+    Score every record of ``source`` and write NDJSON results to ``sink``
+    in input order, in the same record format as bulk jobs.
+
+    The reader keeps ``IN_FLIGHT_PER_WORKER`` chunks per worker queued and
+    results are written as soon as the oldest chunk is done, so memory
+    stays bounded whatever the input size.
+
+    Args:
+        workers: Worker processes; 0 scores in this process
+        threads: Intra-op threads per worker; CPU count / workers when None
+
+    Returns:
+        Throughput and latency statistics
+
+    Raises:
+        BrokenProcessPool: If a worker process dies
+    """
+    global _worker_scorer
+    snapshot = settings_snapshot()
+    threads = threads or max(1, (os.cpu_count() or 1) // max(1, workers))
+    pool = None
+
+    load_start = time.perf_counter()
+    if workers > 0:
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(snapshot, model, version, threads)
+        )
+        wait([pool.submit(_worker_ping) for _ in range(workers)])
+        submit = pool.submit
+    else:
+        _worker_scorer = Scorer(model, version)
+        submit = _InlineFuture
+    load_seconds = time.perf_counter() - load_start
+
+    records = read_records(source, format, 0, text_field, id_field, max_line_bytes)
+    pending: deque = deque()
+    chunk_seconds: List[float] = []
+    chunk_sizes: List[int] = []
+    total = 0
+    failed = 0
+
+    def write_oldest() -> None:
+        nonlocal total, failed
+        chunk, future = pending.popleft()
+        results: List[Dict[str, Any]] = []
+        error = None
+        try:
+            results, seconds = future.result()
+            chunk_seconds.append(seconds)
+            chunk_sizes.append(len(results))
+        except BrokenProcessPool:
+            raise
+        except Exception as e:
+            logger.error(f"Chunk at record {total} failed: {str(e)}")
+            error = f"Prediction failed: {str(e)}"
+
+        scored = iter(results)
+        for record in chunk:
+            output = output_record(
+                total, record, None if 'error' in record or error else next(scored), error
+            )
+            failed += 'error' in output
+            total += 1
+            sink.write(encode_output(output))
+
+    start = time.perf_counter()
+    try:
+        while True:
+            chunk = [record for _, record in islice(records, chunk_size)]
+            if not chunk:
+                break
+            texts = [record['text'] for record in chunk if 'error' not in record]
+            pending.append((chunk, submit(_score_chunk, texts, aggregation)))
+            while len(pending) >= max(1, workers) * IN_FLIGHT_PER_WORKER:
+                write_oldest()
+        while pending:
+            write_oldest()
+        sink.flush()
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+    elapsed = time.perf_counter() - start
+
+    chunk_seconds.sort()
+    scored_records = sum(chunk_sizes)
+    return {
+        'records': total,
+        'failed': failed,
+        'workers': workers,
+        'chunk_size': chunk_size,
+        'load_seconds': load_seconds,
+        'elapsed_seconds': elapsed,
+        'records_per_second': total / elapsed if elapsed > 0 else 0.0,
+        'chunk_ms': {
+            'p50': percentile(chunk_seconds, 50) * 1000,
+            'p95': percentile(chunk_seconds, 95) * 1000,
+            'p99': percentile(chunk_seconds, 99) * 1000,
+            'max': chunk_seconds[-1] * 1000 if chunk_seconds else 0.0,
+        },
+        'record_ms_mean': sum(chunk_seconds) * 1000 / scored_records if scored_records else 0.0,
+    }
+
+
+def format_stats(stats: Dict[str, Any]) -> str:
+    """Human-readable summary of ``score_file`` statistics"""
+    chunk = stats['chunk_ms']
+    return (
+        f"Scored {stats['records']} records ({stats['failed']} failed) in "
+        f"{stats['elapsed_seconds']:.1f}s with {stats['workers']} worker(s): "
+        f"{stats['records_per_second']:.1f} records/s\n"
+        f"Model load: {stats['load_seconds']:.1f}s\n"
+        f"Chunk latency ({stats['chunk_size']} records): p50 {chunk['p50']:.1f}ms "
+        f"p95 {chunk['p95']:.1f}ms p99 {chunk['p99']:.1f}ms max {chunk['max']:.1f}ms\n"
+        f"Compute per record: {stats['record_ms_mean']:.2f}ms"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Score a JSONL or CSV file offline with the service's model")
+    parser.add_argument("input", help="Input file (.jsonl/.ndjson or .csv)")
+    parser.add_argument("-o", "--output", default="-", help="NDJSON results file (default: stdout)")
+    parser.add_argument("--format", choices=JOB_FORMATS, help="Input format (default: from the extension)")
+    parser.add_argument("--text-field", default="text", help="JSON key or CSV column holding the text")
+    parser.add_argument("--id-field", default="id", help="JSON key or CSV column echoed back as id")
+    parser.add_argument("--workers", type=int, default=settings.INFERENCE_PROCESSES,
+                        help="Worker processes (0 scores in this process)")
+    parser.add_argument("--threads", type=int, help="Intra-op threads per worker (default: CPUs / workers)")
+    parser.add_argument("--chunk-size", type=int, default=settings.JOBS_CHUNK_SIZE, help="Records per work item")
+    parser.add_argument("--model", help="Model id (default: MODEL_NAME)")
+    parser.add_argument("--version", help="Artifact version (default: MODEL_VERSION or CURRENT)")
+    parser.add_argument("--long-document", action="store_true", help="Score overlapping windows instead of truncating")
+    parser.add_argument("--aggregation", choices=AGGREGATIONS, help="Window aggregation (default: LONG_DOC_AGGREGATION)")
+    parser.add_argument("--stats-json", help="Also write the statistics to this file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s", stream=sys.stderr)
+
+    format = args.format or FORMAT_EXTENSIONS.get(os.path.splitext(args.input)[1].lower())
+    if format is None:
+        parser.error("cannot infer the input format from the file name; pass --format")
+    aggregation = (args.aggregation or settings.LONG_DOC_AGGREGATION) if args.long_document else None
+
+    sink = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    try:
+        with open(args.input, "rb") as source:
+            stats = score_file(
+                source, sink, format,
+                workers=max(0, args.workers),
+                chunk_size=max(1, args.chunk_size),
+                text_field=args.text_field,
+                id_field=args.id_field or None,
+                model=args.model,
+                version=args.version,
+                aggregation=aggregation,
+                threads=args.threads,
+                max_line_bytes=settings.STREAM_MAX_LINE_BYTES
+            )
+    except (OSError, ValueError, BrokenProcessPool) as e:
+        logger.error(str(e))
+        return 1
+    finally:
+        if sink is not sys.stdout.buffer:
+            sink.close()
+
+    print(format_stats(stats), file=sys.stderr)
+    if args.stats_json:
+        with open(args.stats_json, 'w', encoding='utf-8') as handle:
+            json.dump(stats, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Process Memory
+Resident, proportional and unique set sizes of processes, read from /proc (Linux)
+"""
+import os
+from typing import Dict, List, Union
+
+# smaps fields, in kB, behind each reported figure
+_SMAPS_FIELDS = {
+    'Rss': 'rss',
+    'Pss': 'pss',
+    'Shared_Clean': 'shared',
+    'Shared_Dirty': 'shared',
+    'Private_Clean': 'uss',
+    'Private_Dirty': 'uss',
+    'Swap': 'swap',
+}
+
+
+def parse_smaps(text: str) -> Dict[str, int]:
+    """
+    Memory figures in bytes from ``/proc/<pid>/smaps_rollup`` or
+    ``/proc/<pid>/smaps`` text (per-mapping fields are summed).
+    """
+    memory = dict.fromkeys(_SMAPS_FIELDS.values(), 0)
+    for line in text.splitlines():
+        parts = line.split()
+        if len(parts) == 3 and parts[2] == "kB":
+            name = _SMAPS_FIELDS.get(parts[0].rstrip(":"))
+            if name is not None:
+                memory[name] += int(parts[1]) * 1024
+    return memory
+
+
+def process_memory(pid: Union[int, str] = "self") -> Dict[str, int]:
+    """
+    Memory of one process, in bytes.
+
+    - ``rss``: resident pages, including pages shared with other processes
+    - ``pss``: resident pages with each shared page split evenly between
+      the processes mapping it; summed over processes it is their real
+      footprint
+    - ``uss``: pages no other process maps, freed if this process exits
+    - ``shared``: resident pages other processes map too
+    - ``swap``: swapped-out pages
+
+    Raises:
+        OSError: If /proc is not available (not Linux) or the process is gone
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", encoding="ascii") as handle:
+            return parse_smaps(handle.read())
+    except FileNotFoundError:
+        # Kernels before 4.14 only have the per-mapping file
+        with open(f"/proc/{pid}/smaps", encoding="ascii") as handle:
+            return parse_smaps(handle.read())
+
+
+def child_pids(pid: int) -> List[int]:
+    """Direct children of a process, lowest pid first"""
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding="ascii", errors="replace") as handle:
+                stat = handle.read()
+        except OSError:
+            continue
+        # The command name may contain spaces and parentheses; fields follow the last ')'
+        if int(stat[stat.rindex(")") + 2:].split()[1]) == pid:
+            children.append(int(entry))
+    return sorted(children)
@@ -0,0 +1,123 @@
+"""
+Sampling Profiler
+Periodically samples every thread's Python stack and folds the samples into
+collapsed stacks (``frame;frame;frame count``) for flame graph tools such as
+flamegraph.pl or speedscope.
+
+Nothing runs unless a profile is in progress; while it is, the cost is one
+stack walk per thread per interval on a background thread.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from types import CodeType, FrameType
+from typing import Dict, List, Optional, Tuple
+
+# Leaf frames of threads that are waiting for work rather than doing it
+IDLE_LEAVES = frozenset({
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+})
+
+_PATH_MARKERS = (os.sep + "site-packages" + os.sep, os.sep + "src" + os.sep)
+
+
+def _short_path(filename: str) -> str:
+    """Path relative to site-packages, src or the stdlib directory"""
+    for marker in _PATH_MARKERS:
+        index = filename.rfind(marker)
+        if index != -1:
+            return filename[index + len(marker):]
+    return os.path.join(os.path.basename(os.path.dirname(filename)), os.path.basename(filename))
+
+
+class SamplingProfiler:
+    """
+    Samples all threads except its own at a fixed interval.
+
+    Usage::
+
+        profiler = SamplingProfiler(interval=0.01)
+        profiler.start()
+        ...
+        profiler.stop()
+        text = profiler.collapsed()
+    """
+
+    def __init__(self, interval: float = 0.01, include_idle: bool = False):
+        """
+        Args:
+            interval: Seconds between samples
+            include_idle: Keep samples of threads blocked waiting for work
+        """
+        self.interval = interval
+        self.include_idle = include_idle
+        self.samples = 0
+        self.started: Optional[float] = None
+        self.stopped: Optional[float] = None
+        self._stacks: Counter = Counter()
+        self._labels: Dict[CodeType, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            raise RuntimeError("Profiler already started")
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self.stopped = time.perf_counter()
+
+    @property
+    def duration(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.stopped or time.perf_counter()) - self.started
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.sample(exclude=own)
+
+    def _label(self, code: CodeType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+    def _is_idle(self, frame: FrameType) -> bool:
+        code = frame.f_code
+        return (os.path.basename(code.co_filename), code.co_name) in IDLE_LEAVES
+
+    def sample(self, exclude: Optional[int] = None) -> None:
+        """Record the current stack of every thread but ``exclude``"""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == exclude or (not self.include_idle and self._is_idle(frame)):
+                continue
+            stack: List[str] = []
+            while frame is not None:
+                stack.append(self._label(frame.f_code))
+                frame = frame.f_back
+            stack.append(names.get(ident, f"thread-{ident}"))
+            self._stacks[tuple(reversed(stack))] += 1
+        self.samples += 1
+
+    def stacks(self) -> List[Tuple[Tuple[str, ...], int]]:
+        """(stack from thread name to leaf, count), most frequent first"""
+        return self._stacks.most_common()
+
+    def collapsed(self) -> str:
+        """Samples in collapsed stack format, one stack per line"""
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in self.stacks())
@@ -0,0 +1,94 @@
+"""
+Request Stage Timing
+Per-stage latency histograms plus a per-request breakdown for Server-Timing
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+from prometheus_client import Histogram
+
+from utils.tracing import emit_span, span
+
+# Stage names, in request order
+STAGE_ADMISSION = "admission"
+STAGE_QUEUE = "queue"
+STAGE_PREPROCESS = "preprocess"
+STAGE_INFERENCE = "inference"
+STAGE_SERIALIZE = "serialize"
+
+STAGE_LATENCY = Histogram(
+    'request_stage_duration_seconds',
+    'Time spent in each request stage',
+    ['stage'],
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+
+class RequestTimings:
+    """Stage durations of one request, summed when a stage repeats"""
+
+    __slots__ = ('stages', 'started', 'handler_done')
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, float] = {}
+        self.started = time.perf_counter()
+        self.handler_done: Optional[float] = None
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def server_timing(self, total: float) -> str:
+        """``Server-Timing`` header value, durations in milliseconds"""
+        parts = [f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in self.stages.items()]
+        parts.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(parts)
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar('request_timings', default=None)
+
+
+def start_request() -> RequestTimings:
+    """Begin collecting stage timings for the request running in this context"""
+    timings = RequestTimings()
+    _current.set(timings)
+    return timings
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+def _observe(stage: str, seconds: float) -> None:
+    STAGE_LATENCY.labels(stage=stage).observe(seconds)
+    timings = _current.get()
+    if timings is not None:
+        timings.add(stage, seconds)
+
+
+def record_stage(stage: str, seconds: float, end: Optional[float] = None, **attributes: Any) -> None:
+    """
+    Observe one stage duration, and add it to the current request if any.
+    ``end`` (``time.perf_counter()``, default now) only places the span.
+    """
+    _observe(stage, seconds)
+    emit_span(stage, seconds, end, **attributes)
+
+
+@contextmanager
+def timed_stage(stage: str, **attributes: Any) -> Iterator[None]:
+    """Record the duration of the block as ``stage``, as a span if hooks are registered"""
+    start = time.perf_counter()
+    try:
+        with span(stage, **attributes):
+            yield
+    finally:
+        _observe(stage, time.perf_counter() - start)
+
+
+def mark_handler_done() -> None:
+    """Note that the endpoint returned; the rest until the response starts is serialization"""
+    timings = _current.get()
+    if timings is not None:
+        timings.handler_done = time.perf_counter()
@@ -0,0 +1,153 @@
+"""
+Span Hooks
+Pluggable instrumentation around request stages (tracing, custom metrics)
+
+Register an object with ``on_start(span)`` and ``on_end(span)`` methods
+via ``add_span_hook`` to receive every span, e.g. to forward them to
+OpenTelemetry. With no hooks registered, ``span()`` returns a shared no-op
+object and costs one function call.
+"""
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Protocol, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """One timed operation; ``parent`` is the enclosing span, if any"""
+
+    __slots__ = ('name', 'attributes', 'parent', 'start', 'end', 'error', '_token')
+
+    def __init__(self, name: str, attributes: Dict[str, Any], parent: Optional["Span"] = None):
+        self.name = name
+        self.attributes = attributes
+        self.parent = parent
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.error: Optional[BaseException] = None
+        self._token = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        return None if self.end is None else self.end - self.start
+
+    def set(self, key: str, value: Any) -> None:
+        """Attach an attribute known only after the span started"""
+        self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        _notify('on_start', self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.end = time.perf_counter()
+        self.error = exc
+        _current_span.reset(self._token)
+        _notify('on_end', self)
+
+    async def __aenter__(self) -> "Span":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.__exit__(exc_type, exc, tb)
+
+
+class _NoopSpan:
+    """Stand-in returned while no hooks are registered"""
+
+    __slots__ = ()
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+    async def __aenter__(self) -> "_NoopSpan":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+class SpanHook(Protocol):
+    """Receives spans as they start and end; exceptions are logged and ignored"""
+
+    def on_start(self, span: Span) -> None:
+        ...
+
+    def on_end(self, span: Span) -> None:
+        ...
+
+
+_NOOP = _NoopSpan()
+_hooks: Tuple[SpanHook, ...] = ()
+_current_span: ContextVar[Optional[Span]] = ContextVar('current_span', default=None)
+
+
+def _notify(method: str, span: Span) -> None:
+    for hook in _hooks:
+        try:
+            getattr(hook, method)(span)
+        except Exception as e:
+            logger.warning(f"Span hook {type(hook).__name__}.{method} failed: {str(e)}")
+
+
+def add_span_hook(hook: SpanHook) -> None:
+    global _hooks
+    if hook not in _hooks:
+        _hooks = _hooks + (hook,)
+
+
+def remove_span_hook(hook: SpanHook) -> None:
+    global _hooks
+    _hooks = tuple(h for h in _hooks if h is not hook)
+
+
+def span_hooks() -> List[SpanHook]:
+    return list(_hooks)
+
+
+def tracing_enabled() -> bool:
+    return bool(_hooks)
+
+
+def span(name: str, **attributes: Any):
+    """
+    Sync or async context manager timing ``name`` for the span hooks.
+
+    Usage::
+
+        with span("inference.preprocess", chars=len(text)):
+            ...
+        async with span("inference.run") as run_span:
+            run_span.set("model", model_name)
+    """
+    if not _hooks:
+        return _NOOP
+    return Span(name, attributes, _current_span.get())
+
+
+def emit_span(name: str, seconds: float, end: Optional[float] = None, **attributes: Any) -> None:
+    """
+    Report an already finished operation, e.g. a measured queue wait.
+
+    Args:
+        name: Span name
+        seconds: Duration of the operation
+        end: ``time.perf_counter()`` when it ended; defaults to now
+        **attributes: Span attributes
+    """
+    if not _hooks:
+        return
+    finished = Span(name, attributes, _current_span.get())
+    finished.end = time.perf_counter() if end is None else end
+    finished.start = finished.end - seconds
+    _notify('on_start', finished)
+    _notify('on_end', finished)
@@ -0,0 +1,108 @@
+"""
+API Benchmarks
+The full FastAPI app driven in-process through httpx's ASGI transport,
+including middleware, validation and serialization; batches go through
+both the JSON and the Arrow IPC endpoint (skipped without pyarrow)
+
+Usage:
+    python tests/benchmarks/bench_api.py
+"""
+import asyncio
+import importlib.util
+import os
+import sys
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import corpora  # noqa: E402
+from harness import benchmark  # noqa: E402
+
+CONCURRENCY = 32
+SHORT = corpora.short_texts(count=CONCURRENCY, seed=7)
+BATCH = corpora.short_texts(count=100, seed=8)
+
+
+async def _client():
+    """Start the app lifespan and yield a client bound to it"""
+    from main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            yield client
+
+
+@benchmark("api.health", group="api")
+async def _health():
+    async for client in _client():
+        async def call():
+            response = await client.get("/health")
+            response.raise_for_status()
+
+        yield call
+
+
+@benchmark(f"api.predict.concurrent{CONCURRENCY}", group="api", items=CONCURRENCY)
+async def _predict():
+    async for client in _client():
+        async def post(text):
+            response = await client.post("/api/v1/predict", json={"text": text})
+            response.raise_for_status()
+
+        async def call():
+            await asyncio.gather(*(post(text) for text in SHORT))
+
+        yield call
+
+
+@benchmark("api.predict_batch.100", group="api", items=len(BATCH))
+async def _predict_batch():
+    async for client in _client():
+        async def call():
+            response = await client.post("/api/v1/predict/batch", json={"texts": BATCH})
+            response.raise_for_status()
+
+        yield call
+
+
+@benchmark("api.predict_batch.100x10", group="api", items=len(BATCH) * 10)
+async def _predict_batch_1000():
+    """1000 texts as ten 100-item JSON requests, the JSON endpoint's limit"""
+    async for client in _client():
+        async def post():
+            response = await client.post("/api/v1/predict/batch", json={"texts": BATCH})
+            response.raise_for_status()
+
+        async def call():
+            await asyncio.gather(*(post() for _ in range(10)))
+
+        yield call
+
+
+if importlib.util.find_spec("pyarrow"):
+    BIG_BATCH = corpora.short_texts(count=1000, seed=9)
+
+    def _arrow_benchmark(texts):
+        async def setup():
+            from api import arrow
+
+            body = arrow.write_texts(texts)
+            headers = {"Content-Type": arrow.ARROW_STREAM_MEDIA_TYPE}
+            async for client in _client():
+                async def call():
+                    response = await client.post("/api/v1/predict/batch/arrow", content=body, headers=headers)
+                    response.raise_for_status()
+
+                yield call
+
+        return setup
+
+    benchmark("api.predict_batch_arrow.100", group="api", items=len(BATCH))(_arrow_benchmark(BATCH))
+    benchmark("api.predict_batch_arrow.1000", group="api", items=len(BIG_BATCH))(_arrow_benchmark(BIG_BATCH))
+
+
+if __name__ == "__main__":
+    from run import main
+    sys.exit(main(["--filter", "api", *sys.argv[1:]]))
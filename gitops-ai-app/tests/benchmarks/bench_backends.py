@@ -0,0 +1,77 @@
+"""
+Execution Backend Benchmark
+Compares thread and process inference backends under concurrent batches
+
+Usage:
+    python tests/benchmarks/bench_backends.py --workers 4 --batches 400
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from models.sentiment_model import SentimentModel  # noqa: E402
+from services.process_backend import ProcessPoolModel  # noqa: E402
+
+WORDS = (
+    "the product arrived on time and works great but the battery is poor "
+    "customer service was awful although the screen looks amazing overall "
+    "i would recommend it to friends who love good value for money"
+).split()
+
+
+def make_corpus(count: int, seed: int = 7) -> list:
+    """Generate review-like texts of mixed length"""
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 120)))
+        for _ in range(count)
+    ]
+
+
+def run(model, batches: list, workers: int) -> float:
+    """Drive predict_batch from `workers` threads; return texts per second"""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(model.predict_batch, batches))
+    elapsed = time.perf_counter() - start
+    return sum(len(b) for b in batches) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--batches", type=int, default=400)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--model", default="distilbert-base-uncased-finetuned-sst-2-english")
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.batches * args.batch_size)
+    batches = [
+        corpus[i:i + args.batch_size] for i in range(0, len(corpus), args.batch_size)
+    ]
+
+    print(f"cpus={os.cpu_count()} workers={args.workers} "
+          f"batches={len(batches)} batch_size={args.batch_size}")
+
+    thread_model = SentimentModel(args.model, batch_size=args.batch_size)
+    thread_model.predict_batch(batches[0])
+    thread_rate = run(thread_model, batches, args.workers)
+    print(f"thread : {thread_rate:10.1f} texts/s")
+
+    process_model = ProcessPoolModel(args.model, batch_size=args.batch_size, workers=args.workers)
+    try:
+        process_model.predict_batch(batches[0])
+        process_rate = run(process_model, batches, args.workers)
+    finally:
+        process_model.close()
+    print(f"process: {process_rate:10.1f} texts/s ({process_rate / thread_rate:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
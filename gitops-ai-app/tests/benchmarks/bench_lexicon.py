@@ -0,0 +1,55 @@
+"""
+Lexicon Scorer Benchmarks
+Fallback-model throughput against the previous substring scorer
+
+Usage:
+    python tests/benchmarks/bench_lexicon.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import corpora  # noqa: E402
+from harness import benchmark  # noqa: E402
+from models.lexicon import DEFAULT_LEXICON, LexiconScorer  # noqa: E402
+
+CORPUS = corpora.short_texts(count=1000, seed=11)
+
+
+def substring_score(text: str) -> dict:
+    """Reference: per-call word lists and one substring scan per word"""
+    text_lower = text.lower()
+    positive_words = [w for w, weight in DEFAULT_LEXICON.items() if weight > 0]
+    negative_words = [w for w, weight in DEFAULT_LEXICON.items() if weight < 0]
+    pos_count = sum(1 for word in positive_words if word in text_lower)
+    neg_count = sum(1 for word in negative_words if word in text_lower)
+    total = pos_count + neg_count
+    if total == 0:
+        return {'label': 'NEUTRAL', 'confidence': 0.5, 'score': 0.0}
+    ratio = pos_count / total
+    if ratio > 0.5:
+        return {'label': 'POSITIVE', 'confidence': 0.5 + ratio * 0.5, 'score': 0.5 + ratio * 0.5}
+    return {'label': 'NEGATIVE', 'confidence': 1 - ratio * 0.5, 'score': ratio * 0.5 - 1}
+
+
+@benchmark("lexicon.substring_reference", group="lexicon", items=len(CORPUS))
+def _substring():
+    return lambda: [substring_score(text) for text in CORPUS]
+
+
+@benchmark("lexicon.score", group="lexicon", items=len(CORPUS))
+def _score():
+    score = LexiconScorer.default().score
+    return lambda: [score(text) for text in CORPUS]
+
+
+@benchmark("lexicon.score_batch", group="lexicon", items=len(CORPUS))
+def _score_batch():
+    scorer = LexiconScorer.default()
+    return lambda: scorer.score_batch(CORPUS)
+
+
+if __name__ == "__main__":
+    from run import main
+    sys.exit(main(["--filter", "lexicon", *sys.argv[1:]]))
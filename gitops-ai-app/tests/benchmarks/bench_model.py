@@ -0,0 +1,91 @@
+"""
+Model Benchmarks
+SentimentModel.predict and predict_batch on the mock (lexicon) backend, and
+the direct PyTorch forward path against the HF pipeline on a small randomly
+initialised BERT built locally (skipped without torch/transformers)
+
+Usage:
+    python tests/benchmarks/bench_model.py
+"""
+import functools
+import importlib.util
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import corpora  # noqa: E402
+from harness import benchmark  # noqa: E402
+from models.sentiment_model import SentimentModel  # noqa: E402
+
+SHORT = corpora.short_texts()
+LONG = corpora.long_texts()
+
+
+def _model() -> SentimentModel:
+    return SentimentModel("mock", batch_size=32, backend="mock")
+
+
+@benchmark("model.predict.short", group="model", items=len(SHORT))
+def _predict_short():
+    predict = _model().predict
+    return lambda: [predict(text) for text in SHORT]
+
+
+@benchmark("model.predict_batch.short", group="model", items=len(SHORT))
+def _predict_batch_short():
+    model = _model()
+    return lambda: model.predict_batch(SHORT)
+
+
+@benchmark("model.predict_batch.long", group="model", items=len(LONG))
+def _predict_batch_long():
+    model = _model()
+    return lambda: model.predict_batch(LONG)
+
+
+@functools.lru_cache(maxsize=None)
+def _torch_model_dir() -> str:
+    """Small BERT classifier over the corpus vocabulary, saved in HF format"""
+    import torch
+    import transformers
+
+    model_dir = tempfile.mkdtemp(prefix="bench-bert-")
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *sorted({w.strip("!,.").lower() for w in corpora.WORDS})]
+    vocab_file = os.path.join(model_dir, "vocab.txt")
+    with open(vocab_file, "w", encoding="utf-8") as handle:
+        handle.write("\n".join(vocab) + "\n")
+
+    tokenizer = transformers.BertTokenizerFast(vocab_file=vocab_file, do_lower_case=True)
+    config = transformers.BertConfig(
+        vocab_size=len(vocab), hidden_size=128, num_hidden_layers=2, num_attention_heads=2,
+        intermediate_size=256, max_position_embeddings=512, num_labels=2,
+        id2label={0: "NEGATIVE", 1: "POSITIVE"}, label2id={"NEGATIVE": 0, "POSITIVE": 1},
+    )
+    torch.manual_seed(0)
+    transformers.BertForSequenceClassification(config).save_pretrained(model_dir)
+    tokenizer.save_pretrained(model_dir)
+    return model_dir
+
+
+def _register_torch(backend: str) -> None:
+    @benchmark(f"model.{backend}.predict_batch.short", group="model.torch", items=len(SHORT))
+    def _short():
+        model = SentimentModel(_torch_model_dir(), batch_size=32, backend=backend)
+        return lambda: model.predict_batch(SHORT)
+
+    @benchmark(f"model.{backend}.predict_batch.long", group="model.torch", items=len(LONG))
+    def _long():
+        model = SentimentModel(_torch_model_dir(), batch_size=32, backend=backend)
+        return lambda: model.predict_batch(LONG)
+
+
+if importlib.util.find_spec("torch") and importlib.util.find_spec("transformers"):
+    for _backend in ("transformers", "pipeline"):
+        _register_torch(_backend)
+
+
+if __name__ == "__main__":
+    from run import main
+    sys.exit(main(["--filter", "model", *sys.argv[1:]]))
@@ -0,0 +1,37 @@
+"""
+Preprocessing Benchmarks
+TextPreprocessor.preprocess and batch_preprocess over each corpus
+
+Usage:
+    python tests/benchmarks/bench_preprocessing.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import corpora  # noqa: E402
+from harness import benchmark  # noqa: E402
+from utils.preprocessing import TextPreprocessor  # noqa: E402
+
+
+def _register(corpus_name: str, texts: list) -> None:
+    @benchmark(f"preprocess.{corpus_name}", group="preprocessing", items=len(texts))
+    def _single():
+        preprocessor = TextPreprocessor()
+        preprocess = preprocessor.preprocess
+        return lambda: [preprocess(text) for text in texts]
+
+    @benchmark(f"batch_preprocess.{corpus_name}", group="preprocessing", items=len(texts))
+    def _batch():
+        preprocessor = TextPreprocessor()
+        return lambda: preprocessor.batch_preprocess(texts)
+
+
+for _name, _texts in corpora.all_corpora().items():
+    _register(_name, _texts)
+
+
+if __name__ == "__main__":
+    from run import main
+    sys.exit(main(["--filter", "preprocessing", *sys.argv[1:]]))
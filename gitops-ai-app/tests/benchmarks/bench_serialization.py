@@ -0,0 +1,134 @@
+"""
+Serialization Benchmarks
+A 100-item batch response encoded the way FastAPI does for a
+``response_model`` route (models built per item, validated and serialized
+again) against the plain-dict FastJSONResponse path /predict/batch uses,
+and batch requests and responses as JSON against Arrow IPC
+(/predict/batch/arrow; skipped without pyarrow)
+
+Usage:
+    python tests/benchmarks/bench_serialization.py
+"""
+import asyncio
+import importlib.util
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import corpora  # noqa: E402
+from harness import benchmark  # noqa: E402
+
+BATCH = corpora.short_texts(count=100, seed=8)
+RESULTS = [
+    {'label': 'POSITIVE', 'confidence': 0.9731, 'sentiment_score': 0.9731, 'processing_time_ms': 0.42}
+    for _ in BATCH
+]
+ENVELOPE = {
+    'success': True,
+    'model': 'distilbert-base-uncased-finetuned-sst-2-english',
+    'total_processing_time_ms': 42.0,
+    'timestamp': datetime(2024, 1, 1).isoformat(),
+    'request_id': '00000000-0000-0000-0000-000000000000',
+}
+
+
+@benchmark("serialize.batch100.response_model", group="serialization", items=len(BATCH))
+def _response_model():
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from api.predict import BatchPredictionResponse, PredictionResult
+    from main import app
+
+    field = next(r for r in app.routes if getattr(r, 'path', None) == "/api/v1/predict/batch").response_field
+    loop = asyncio.new_event_loop()
+
+    def call():
+        response = BatchPredictionResponse(
+            results=[PredictionResult(text=text, **result) for text, result in zip(BATCH, RESULTS)],
+            **ENVELOPE
+        )
+        content = loop.run_until_complete(serialize_response(field=field, response_content=response))
+        return JSONResponse(content).body
+
+    yield call
+    loop.close()
+
+
+@benchmark("serialize.batch100.fast", group="serialization", items=len(BATCH))
+def _fast():
+    from api.responses import FastJSONResponse
+
+    def call():
+        return FastJSONResponse({
+            'results': [
+                {
+                    'text': text,
+                    'label': str(result['label']),
+                    'confidence': float(result['confidence']),
+                    'sentiment_score': float(result['sentiment_score']),
+                    'processing_time_ms': float(result['processing_time_ms'])
+                }
+                for text, result in zip(BATCH, RESULTS)
+            ],
+            **ENVELOPE
+        }).body
+
+    return call
+
+
+@benchmark("parse.batch100.json", group="serialization", items=len(BATCH))
+def _parse_json():
+    from api.predict import BatchTextInput
+    from api.responses import dumps
+
+    body = dumps({'texts': BATCH})
+    return lambda: BatchTextInput.model_validate_json(body).texts
+
+
+def _columns(results):
+    return {
+        'label': [r['label'] for r in results],
+        'confidence': [r['confidence'] for r in results],
+        'sentiment_score': [r['sentiment_score'] for r in results],
+    }
+
+
+if importlib.util.find_spec("pyarrow"):
+    BIG_BATCH = corpora.short_texts(count=10000, seed=9)
+    BIG_RESULTS = [RESULTS[0]] * len(BIG_BATCH)
+
+    @benchmark("parse.batch100.arrow", group="serialization", items=len(BATCH))
+    def _parse_arrow():
+        from api import arrow
+
+        body = arrow.write_texts(BATCH)
+        return lambda: arrow.read_texts(body)
+
+    @benchmark("serialize.batch100.arrow", group="serialization", items=len(BATCH))
+    def _arrow():
+        from api import arrow
+
+        columns = _columns(RESULTS)
+        metadata = {k: str(v) for k, v in ENVELOPE.items()}
+        return lambda: arrow.write_results(columns, metadata)
+
+    @benchmark("parse.batch10000.arrow", group="serialization", items=len(BIG_BATCH))
+    def _parse_arrow_big():
+        from api import arrow
+
+        body = arrow.write_texts(BIG_BATCH)
+        return lambda: arrow.read_texts(body)
+
+    @benchmark("serialize.batch10000.arrow", group="serialization", items=len(BIG_BATCH))
+    def _arrow_big():
+        from api import arrow
+
+        columns = _columns(BIG_RESULTS)
+        return lambda: arrow.write_results(columns)
+
+
+if __name__ == "__main__":
+    from run import main
+    sys.exit(main(["--filter", "serialization", *sys.argv[1:]]))
@@ -0,0 +1,81 @@
+"""
+Service Benchmarks
+InferenceService.run and run_batch end to end on the mock model
+
+Usage:
+    python tests/benchmarks/bench_service.py
+"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import corpora  # noqa: E402
+from harness import benchmark  # noqa: E402
+from services.cache import PredictionCache  # noqa: E402
+from services.inference_service import InferenceService  # noqa: E402
+
+# Single requests are micro-batched, so they are driven concurrently the
+# way a loaded server would see them
+CONCURRENCY = 64
+SHORT = corpora.short_texts(count=CONCURRENCY)
+BATCH_SHORT = corpora.short_texts(count=100, seed=5)
+BATCH_LONG = corpora.long_texts(count=32, seed=6)
+
+
+async def _service(cache: bool = False) -> InferenceService:
+    service = InferenceService()
+    await service.initialize()
+    if cache:
+        service._cache = PredictionCache()
+    return service
+
+
+@benchmark(f"service.run.concurrent{CONCURRENCY}", group="service", items=CONCURRENCY)
+async def _run():
+    service = await _service()
+
+    async def run():
+        await asyncio.gather(*(service.run(text) for text in SHORT))
+
+    yield run
+    await service.cleanup()
+
+
+@benchmark(f"service.run.cached.concurrent{CONCURRENCY}", group="service", items=CONCURRENCY)
+async def _run_cached():
+    service = await _service(cache=True)
+
+    async def run():
+        await asyncio.gather(*(service.run(text) for text in SHORT))
+
+    yield run
+    await service.cleanup()
+
+
+@benchmark("service.run_batch.short", group="service", items=len(BATCH_SHORT))
+async def _run_batch_short():
+    service = await _service()
+
+    async def run():
+        await service.run_batch(BATCH_SHORT)
+
+    yield run
+    await service.cleanup()
+
+
+@benchmark("service.run_batch.long", group="service", items=len(BATCH_LONG))
+async def _run_batch_long():
+    service = await _service()
+
+    async def run():
+        await service.run_batch(BATCH_LONG)
+
+    yield run
+    await service.cleanup()
+
+
+if __name__ == "__main__":
+    from run import main
+    sys.exit(main(["--filter", "service", *sys.argv[1:]]))
@@ -0,0 +1,93 @@
+"""
+Benchmark Comparison
+Compares two result files from run.py and flags regressions
+
+Usage:
+    python tests/benchmarks/compare.py baseline.json current.json --threshold 10
+
+Exits with status 1 when any benchmark's median time grew by more than the
+threshold (in percent), so it can gate CI.
+"""
+import argparse
+import os
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from harness import load_results  # noqa: E402
+
+
+@dataclass
+class Comparison:
+    """One benchmark present in both result files"""
+    name: str
+    baseline_s: float
+    current_s: float
+
+    @property
+    def change(self) -> float:
+        """Relative change in time; positive means slower"""
+        return self.current_s / self.baseline_s - 1 if self.baseline_s > 0 else 0.0
+
+    def status(self, threshold: float) -> str:
+        if self.change > threshold:
+            return "REGRESSION"
+        if self.change < -threshold:
+            return "improved"
+        return "ok"
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    metric: str = "median_s"
+) -> List[Comparison]:
+    """Pair up benchmarks present in both result sets"""
+    base, cur = baseline['benchmarks'], current['benchmarks']
+    return [
+        Comparison(name, base[name][metric], cur[name][metric])
+        for name in sorted(base.keys() & cur.keys())
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="Percent slowdown counted as a regression")
+    parser.add_argument("--metric", choices=("median_s", "min_s", "mean_s"), default="median_s")
+    args = parser.parse_args(argv)
+
+    baseline, current = load_results(args.baseline), load_results(args.current)
+    threshold = args.threshold / 100
+
+    for key in ('python', 'cpu_count', 'platform'):
+        before, after = baseline['environment'].get(key), current['environment'].get(key)
+        if before != after:
+            print(f"warning: {key} differs ({before} -> {after}); results may not be comparable")
+
+    rows = compare(baseline, current, args.metric)
+    regressions = 0
+    print(f"{'benchmark':40s} {'baseline ms':>12s} {'current ms':>12s} {'change':>8s}  status")
+    for row in rows:
+        status = row.status(threshold)
+        regressions += status == "REGRESSION"
+        print(f"{row.name:40s} {row.baseline_s * 1e3:12.3f} {row.current_s * 1e3:12.3f} "
+              f"{row.change:+8.1%}  {status}")
+
+    for name in sorted(current['benchmarks'].keys() - baseline['benchmarks'].keys()):
+        print(f"{name:40s} new")
+    for name in sorted(baseline['benchmarks'].keys() - current['benchmarks'].keys()):
+        print(f"{name:40s} missing")
+
+    if regressions:
+        print(f"{regressions} regression(s) above {args.threshold:.0f}%")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
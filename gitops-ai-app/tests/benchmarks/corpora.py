@@ -0,0 +1,82 @@
+"""
+Benchmark Corpora
+Seeded, review-like text sets shared by the benchmark modules
+"""
+import random
+from typing import Dict, List
+
+WORDS = (
+    "the product arrived on time and works great! but the battery, is poor customer "
+    "service was awful although the screen looks amazing overall i would recommend "
+    "it to friends who love good value for money"
+).split()
+
+HTML_SNIPPETS = [
+    "<p>", "</p>", "<br/>", "&amp;", "&lt;3", "&quot;", "&#39;", "&nbsp;",
+    "<b>", "</b>", "<a href=\"https://example.com/item?id=42&amp;ref=mail\">",
+    "</a>", "&hellip;", "&euro;",
+]
+
+UNICODE_WORDS = [
+    "café", "naïve", "Ｆｕｌｌｗｉｄｔｈ", "ﬁne", "über", "señor", "日本語", "良い",
+    "отлично", "плохо", "🙂", "👍🏽", "™", "①", "…", "–", "«", "»", "ß",
+]
+
+EXTRAS = ["@support", "#fail", "support@example.com", "https://shop.example.com/p/123", "!!", "..."]
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    parts = []
+    for _ in range(words):
+        roll = rng.random()
+        parts.append(rng.choice(EXTRAS) if roll < 0.03 else rng.choice(WORDS))
+    return " ".join(parts)
+
+
+def short_texts(count: int = 256, seed: int = 1) -> List[str]:
+    """Tweet-sized reviews of 5-30 words"""
+    rng = random.Random(seed)
+    return [_sentence(rng, rng.randint(5, 30)) for _ in range(count)]
+
+
+def long_texts(count: int = 32, seed: int = 2) -> List[str]:
+    """Multi-paragraph reviews past the 512-character truncation limit"""
+    rng = random.Random(seed)
+    return [
+        "\n\n".join(_sentence(rng, rng.randint(60, 120)) for _ in range(rng.randint(2, 5)))
+        for _ in range(count)
+    ]
+
+
+def html_texts(count: int = 128, seed: int = 3) -> List[str]:
+    """Reviews scraped with markup and entities left in"""
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        words = _sentence(rng, rng.randint(15, 60)).split()
+        for _ in range(len(words) // 4):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(HTML_SNIPPETS))
+        texts.append(" ".join(words))
+    return texts
+
+
+def unicode_texts(count: int = 128, seed: int = 4) -> List[str]:
+    """Reviews mixing accents, CJK, compatibility forms and emoji"""
+    rng = random.Random(seed)
+    return [
+        " ".join(
+            rng.choice(UNICODE_WORDS) if rng.random() < 0.4 else rng.choice(WORDS)
+            for _ in range(rng.randint(10, 50))
+        )
+        for _ in range(count)
+    ]
+
+
+def all_corpora() -> Dict[str, List[str]]:
+    """Every corpus by name"""
+    return {
+        'short': short_texts(),
+        'long': long_texts(),
+        'html': html_texts(),
+        'unicode': unicode_texts(),
+    }
@@ -0,0 +1,221 @@
+"""
+Benchmark Harness
+Registry, timer and JSON result format shared by the benchmark modules
+
+A benchmark is a setup function registered with ``@benchmark``. It either
+returns the callable to time, or yields it (generator) so that cleanup code
+after the ``yield`` runs once timing is done. Async benchmarks are async
+generator functions yielding a coroutine function; they run on a private
+event loop.
+"""
+import asyncio
+import inspect
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+# Benchmarks run against the mock model with the prediction cache off so
+# repeated calls measure real work; export these to override
+os.environ.setdefault("MODEL_BACKEND", "mock")
+os.environ.setdefault("PREDICTION_CACHE_ENABLED", "false")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+RESULTS_VERSION = 1
+
+
+@dataclass
+class Benchmark:
+    """A registered benchmark"""
+    name: str
+    group: str
+    setup: Callable[[], Any]
+    items: int = 1
+    is_async: bool = False
+
+
+REGISTRY: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, group: str, items: int = 1) -> Callable:
+    """
+    Register a benchmark setup function.
+
+    Args:
+        name: Unique dotted name, e.g. ``preprocess.short``
+        group: Group used for filtering, e.g. ``preprocessing``
+        items: Texts processed per call, used for the items/s figure
+    """
+    def decorator(setup: Callable) -> Callable:
+        if name in REGISTRY:
+            raise ValueError(f"Duplicate benchmark name: {name}")
+        REGISTRY[name] = Benchmark(
+            name=name,
+            group=group,
+            setup=setup,
+            items=items,
+            is_async=inspect.isasyncgenfunction(setup)
+        )
+        return setup
+    return decorator
+
+
+def _calibrate(measure: Callable[[int], float], min_time: float) -> int:
+    """Find a loop count whose round takes at least ``min_time`` seconds"""
+    number = 1
+    while True:
+        elapsed = measure(number)
+        if elapsed >= min_time or number >= 1 << 20:
+            return number
+        # Aim slightly past the target to avoid a second doubling pass
+        number = max(number * 2, int(number * min_time * 1.2 / max(elapsed, 1e-9)))
+
+
+def _summarize(bench: Benchmark, timings: List[float], number: int) -> Dict[str, Any]:
+    """Per-call statistics for one benchmark"""
+    per_call = [t / number for t in timings]
+    median = statistics.median(per_call)
+    return {
+        'group': bench.group,
+        'items': bench.items,
+        'rounds': len(per_call),
+        'loops': number,
+        'min_s': min(per_call),
+        'median_s': median,
+        'mean_s': statistics.fmean(per_call),
+        'stdev_s': statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+        'items_per_s': bench.items / median if median > 0 else 0.0,
+    }
+
+
+def _run_sync(bench: Benchmark, rounds: int, min_time: float) -> Dict[str, Any]:
+    setup = bench.setup()
+    generator = setup if inspect.isgenerator(setup) else None
+    fn = next(generator) if generator else setup
+
+    def measure(number: int) -> float:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        return time.perf_counter() - start
+
+    try:
+        fn()  # warm-up
+        number = _calibrate(measure, min_time)
+        timings = [measure(number) for _ in range(rounds)]
+    finally:
+        if generator:
+            next(generator, None)
+
+    return _summarize(bench, timings, number)
+
+
+def _run_async(bench: Benchmark, rounds: int, min_time: float) -> Dict[str, Any]:
+    loop = asyncio.new_event_loop()
+    generator = bench.setup()
+
+    async def repeat(fn: Callable, number: int) -> float:
+        start = time.perf_counter()
+        for _ in range(number):
+            await fn()
+        return time.perf_counter() - start
+
+    try:
+        fn = loop.run_until_complete(generator.__anext__())
+
+        def measure(number: int) -> float:
+            return loop.run_until_complete(repeat(fn, number))
+
+        try:
+            measure(1)  # warm-up
+            number = _calibrate(measure, min_time)
+            timings = [measure(number) for _ in range(rounds)]
+        finally:
+            try:
+                loop.run_until_complete(generator.__anext__())
+            except StopAsyncIteration:
+                pass
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+    return _summarize(bench, timings, number)
+
+
+def run_benchmark(bench: Benchmark, rounds: int = 7, min_time: float = 0.1) -> Dict[str, Any]:
+    """
+    Time one benchmark.
+
+    The loop count is calibrated so each round lasts at least ``min_time``
+    seconds; ``rounds`` rounds are then timed and summarized per call.
+    """
+    runner = _run_async if bench.is_async else _run_sync
+    return runner(bench, rounds, min_time)
+
+
+def select(patterns: Optional[List[str]] = None) -> List[Benchmark]:
+    """Registered benchmarks whose name or group contains any pattern"""
+    benches = sorted(REGISTRY.values(), key=lambda b: b.name)
+    if not patterns:
+        return benches
+    return [b for b in benches if any(p in b.name or p == b.group for p in patterns)]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(__file__)
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> Dict[str, Any]:
+    """Machine description stored with each result file"""
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'commit': _git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+    }
+
+
+def save_results(path: str, results: Dict[str, Dict[str, Any]]) -> None:
+    """Write results in the versioned JSON format read by compare.py"""
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump({
+            'version': RESULTS_VERSION,
+            'environment': environment(),
+            'benchmarks': results,
+        }, handle, indent=2, sort_keys=True)
+        handle.write('\n')
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    """Read a result file written by ``save_results``"""
+    with open(path, encoding='utf-8') as handle:
+        data = json.load(handle)
+    if data.get('version') != RESULTS_VERSION:
+        raise ValueError(f"{path}: unsupported results version {data.get('version')!r}")
+    return data
+
+
+def format_result(name: str, result: Dict[str, Any]) -> str:
+    """One human-readable line per benchmark"""
+    return (
+        f"{name:40s} {result['median_s'] * 1e3:10.3f} ms "
+        f"(+-{result['stdev_s'] * 1e3:.3f}) {result['items_per_s']:12.0f} items/s"
+    )
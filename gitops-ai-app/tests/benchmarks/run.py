@@ -0,0 +1,71 @@
+"""
+Benchmark Runner
+Runs the registered benchmarks and saves the results as JSON
+
+Usage:
+    python tests/benchmarks/run.py --output results.json
+    python tests/benchmarks/run.py --filter preprocessing --filter model.predict
+    python tests/benchmarks/run.py --list
+"""
+import argparse
+import glob
+import importlib
+import os
+import sys
+from typing import List, Optional
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import harness  # noqa: E402
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def discover() -> None:
+    """Import every bench_*.py module so its benchmarks register"""
+    # A bench module run as a script has already registered as __main__
+    script = os.path.abspath(getattr(sys.modules['__main__'], '__file__', '') or '')
+    for path in sorted(glob.glob(os.path.join(BENCH_DIR, "bench_*.py"))):
+        if path == script:
+            continue
+        importlib.import_module(os.path.splitext(os.path.basename(path))[0])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the inference microbenchmarks")
+    parser.add_argument("--filter", action="append", default=[],
+                        help="Benchmark group, or substring of the name (repeatable)")
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.1, help="Minimum seconds per round")
+    parser.add_argument("--quick", action="store_true", help="3 rounds of at least 20ms")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--list", action="store_true", help="List benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.rounds, args.min_time = 3, 0.02
+
+    discover()
+    benches = harness.select(args.filter)
+    if not benches:
+        print("No benchmarks match the filter", file=sys.stderr)
+        return 1
+
+    if args.list:
+        for bench in benches:
+            print(f"{bench.name:40s} {bench.group}")
+        return 0
+
+    results = {}
+    for bench in benches:
+        results[bench.name] = harness.run_benchmark(bench, rounds=args.rounds, min_time=args.min_time)
+        print(harness.format_result(bench.name, results[bench.name]), flush=True)
+
+    if args.output:
+        harness.save_results(args.output, results)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
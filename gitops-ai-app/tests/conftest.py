@@ -0,0 +1,53 @@
+"""
+Shared test fixtures
+"""
+import os
+import sys
+
+import pytest
+
+# Tests build their models locally; never reach the HuggingFace Hub
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+TINY_VOCAB = [
+    "[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]",
+    "this", "is", "a", "great", "terrible", "product", "the", "sky", "blue",
+    "love", "hate", "it", "awful", "amazing", "good", "bad", ".", "!", ",",
+]
+
+
+@pytest.fixture(scope="session")
+def tiny_model_dir(tmp_path_factory):
+    """
+    Build a tiny randomly initialised BERT classifier with a local
+    tokenizer, saved in HF format. Skips when torch/transformers are
+    not installed.
+    """
+    torch = pytest.importorskip("torch")
+    transformers = pytest.importorskip("transformers")
+
+    model_dir = tmp_path_factory.mktemp("tiny-model")
+    vocab_file = model_dir / "vocab.txt"
+    vocab_file.write_text("\n".join(TINY_VOCAB) + "\n")
+
+    tokenizer = transformers.BertTokenizerFast(vocab_file=str(vocab_file), do_lower_case=True)
+    config = transformers.BertConfig(
+        vocab_size=len(TINY_VOCAB),
+        hidden_size=32,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        intermediate_size=64,
+        max_position_embeddings=128,
+        num_labels=2,
+        id2label={0: "NEGATIVE", 1: "POSITIVE"},
+        label2id={"NEGATIVE": 0, "POSITIVE": 1},
+    )
+
+    torch.manual_seed(0)
+    model = transformers.BertForSequenceClassification(config)
+    model.save_pretrained(str(model_dir))
+    tokenizer.save_pretrained(str(model_dir))
+    return str(model_dir)
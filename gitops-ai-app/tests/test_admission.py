@@ -0,0 +1,197 @@
+"""
+Admission Control Tests - CI Test Layer
+Unit tests for the adaptive concurrency limiter and 429 responses
+"""
+import asyncio
+import pytest
+from unittest.mock import MagicMock, AsyncMock
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAdmissionController:
+    """Test slot accounting, queueing and limit adaptation"""
+
+    @pytest.mark.asyncio
+    async def test_admits_up_to_limit_then_rejects(self):
+        """Test requests over limit + queue are rejected immediately"""
+        from services.admission import AdmissionController, OverloadedError
+
+        controller = AdmissionController(initial_limit=2, max_queue=0)
+        async with controller.admit():
+            async with controller.admit():
+                assert controller.in_flight == 2
+                with pytest.raises(OverloadedError) as exc:
+                    async with controller.admit():
+                        pass
+        assert exc.value.reason == 'queue_full'
+        assert exc.value.retry_after >= 1
+        assert controller.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_queued_request_gets_freed_slot(self):
+        """Test a waiter is handed the slot when a request finishes"""
+        from services.admission import AdmissionController
+
+        controller = AdmissionController(initial_limit=1, max_queue=4, queue_timeout_ms=1000)
+        release = asyncio.Event()
+        order = []
+
+        async def holder():
+            async with controller.admit():
+                order.append('holder')
+                await release.wait()
+
+        async def waiter():
+            async with controller.admit():
+                order.append('waiter')
+
+        first = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        second = asyncio.create_task(waiter())
+        await asyncio.sleep(0)
+        assert controller.queued == 1
+
+        release.set()
+        await asyncio.gather(first, second)
+        assert order == ['holder', 'waiter']
+        assert controller.in_flight == 0
+        assert controller.queued == 0
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout(self):
+        """Test waiting longer than the queue timeout is rejected"""
+        from services.admission import AdmissionController, OverloadedError
+
+        controller = AdmissionController(initial_limit=1, max_queue=4, queue_timeout_ms=20)
+        async with controller.admit():
+            with pytest.raises(OverloadedError) as exc:
+                async with controller.admit():
+                    pass
+        assert exc.value.reason == 'queue_timeout'
+        assert controller.queued == 0
+        assert controller.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_requests_decrease_limit_once(self):
+        """Test concurrent slow requests back off once, not once each"""
+        from services.admission import AdmissionController
+
+        clock = FakeClock()
+        controller = AdmissionController(initial_limit=10, latency_target_ms=100, clock=clock)
+
+        async def slow():
+            async with controller.admit():
+                await asyncio.sleep(0)
+                clock.now += 0.5
+
+        await asyncio.gather(*(slow() for _ in range(5)))
+        assert controller.limit == 9
+
+    @pytest.mark.asyncio
+    async def test_fast_requests_increase_limit(self):
+        """Test the limit grows while it is in use and latency is low"""
+        from services.admission import AdmissionController
+
+        controller = AdmissionController(initial_limit=4, max_limit=100, latency_target_ms=1000)
+        for _ in range(5):
+            await asyncio.gather(*(_noop(controller) for _ in range(4)))
+        assert controller.limit > 4
+
+    @pytest.mark.asyncio
+    async def test_timeout_counts_as_drop(self):
+        """Test an inference timeout inside the block decreases the limit"""
+        from services.admission import AdmissionController
+
+        controller = AdmissionController(initial_limit=10)
+        with pytest.raises(asyncio.TimeoutError):
+            async with controller.admit():
+                raise asyncio.TimeoutError()
+        assert controller.limit == 9
+
+    @pytest.mark.asyncio
+    async def test_server_deadline_counts_as_drop(self):
+        """Test work cut off at the server-default deadline decreases the limit"""
+        from services.admission import AdmissionController
+        from services.deadlines import DeadlineExceeded
+
+        controller = AdmissionController(initial_limit=10)
+        with pytest.raises(DeadlineExceeded):
+            async with controller.admit():
+                raise DeadlineExceeded('model')
+        assert controller.limit == 9
+
+    @pytest.mark.asyncio
+    async def test_client_deadline_is_neutral(self):
+        """Test clients with tiny budgets cannot shrink the limit for everyone"""
+        from services.admission import AdmissionController
+        from services.deadlines import DeadlineExceeded
+
+        clock = FakeClock()
+        controller = AdmissionController(initial_limit=64, min_limit=4, clock=clock)
+        for _ in range(40):
+            with pytest.raises(DeadlineExceeded):
+                async with controller.admit():
+                    clock.now += 1
+                    raise DeadlineExceeded('model', client=True)
+
+        assert controller.limit == 64
+        assert controller.in_flight == 0
+
+
+async def _noop(controller):
+    async with controller.admit():
+        await asyncio.sleep(0)
+
+
+class TestOverloadResponses:
+    """Test rejected requests surface as 429 with Retry-After"""
+
+    @pytest.fixture
+    def client(self):
+        from main import app
+        from api.predict import get_inference_service
+        from services.admission import OverloadedError
+
+        mock = MagicMock()
+        mock.is_ready.return_value = True
+        mock.model_name = "test-model"
+        mock.model_label.return_value = "test-model"
+        mock.run = AsyncMock(side_effect=OverloadedError('queue_full', 3))
+        mock.run_batch = AsyncMock(side_effect=OverloadedError('queue_timeout', 2))
+
+        app.dependency_overrides[get_inference_service] = lambda: mock
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+
+    def test_predict_returns_429(self, client):
+        """Test single prediction is shed with 429"""
+        response = client.post("/api/v1/predict", json={"text": "great"})
+
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "3"
+
+    def test_batch_predict_returns_429(self, client):
+        """Test batch prediction is shed with 429"""
+        response = client.post("/api/v1/predict/batch", json={"texts": ["a", "b"]})
+
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "2"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
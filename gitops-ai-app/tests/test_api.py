@@ -2,6 +2,7 @@
 API Tests - CI Test Layer
 Unit tests for FastAPI endpoints
 """
+import json
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -57,6 +58,7 @@ class TestPredictEndpoint:
         mock = MagicMock()
         mock.is_ready.return_value = True
         mock.model_name = "test-model"
+        mock.model_label.return_value = "test-model"
         mock.run = AsyncMock(return_value={
             'label': 'POSITIVE',
             'confidence': 0.95,
@@ -135,6 +137,108 @@ class TestPredictEndpoint:
         assert len(data["results"]) == 2
 
 
+class TestStreamEndpoint:
+    """Test NDJSON streaming prediction endpoint"""
+    
+    @pytest.fixture
+    def mock_inference_service(self):
+        """Create mock inference service that scores each text"""
+        mock = MagicMock()
+        mock.is_ready.return_value = True
+        mock.model_name = "test-model"
+        mock.model_label.return_value = "test-model"
+        mock.run_batch = AsyncMock(side_effect=lambda texts: [
+            {
+                'label': 'POSITIVE' if 'great' in t else 'NEGATIVE',
+                'confidence': 0.9,
+                'sentiment_score': 0.9 if 'great' in t else -0.9
+            }
+            for t in texts
+        ])
+        return mock
+    
+    @pytest.fixture
+    def client(self, mock_inference_service):
+        """Create test client with the service dependency overridden"""
+        from main import app
+        from api.predict import get_inference_service
+        
+        app.dependency_overrides[get_inference_service] = lambda: mock_inference_service
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+    
+    def test_stream_results_in_order(self, client):
+        """Test every input line yields one output line in order"""
+        body = "\n".join([
+            '{"text": "great stuff", "id": "a"}',
+            '"awful stuff"',
+            '{"text": "great again"}'
+        ]) + "\n"
+        
+        response = client.post("/api/v1/predict/stream", content=body)
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line['index'] for line in lines] == [0, 1, 2]
+        assert lines[0]['id'] == "a"
+        assert [line['label'] for line in lines] == ['POSITIVE', 'NEGATIVE', 'POSITIVE']
+    
+    def test_stream_invalid_line_reports_error(self, client):
+        """Test a bad line yields an error record without aborting the stream"""
+        body = '{"text": "great"}\nnot json\n{"text": "   "}\n{"text": "great"}'
+        
+        response = client.post("/api/v1/predict/stream", content=body)
+        
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert len(lines) == 4
+        assert 'error' in lines[1] and 'error' in lines[2]
+        assert lines[3]['label'] == 'POSITIVE'
+    
+    def test_stream_batches_by_model_size(self, client, mock_inference_service):
+        """Test input is scored in BATCH_SIZE chunks"""
+        from config import settings
+        
+        count = settings.BATCH_SIZE * 2 + 1
+        body = "\n".join('"great"' for _ in range(count))
+        
+        response = client.post("/api/v1/predict/stream", content=body)
+        
+        assert len(response.text.splitlines()) == count
+        sizes = [len(c.args[0]) for c in mock_inference_service.run_batch.call_args_list]
+        assert sizes == [settings.BATCH_SIZE, settings.BATCH_SIZE, 1]
+
+
+class TestLineSplitting:
+    """Test incremental NDJSON line splitting"""
+    
+    @staticmethod
+    async def _chunks(*parts):
+        for part in parts:
+            yield part
+    
+    @pytest.mark.asyncio
+    async def test_lines_split_across_chunks(self):
+        """Test lines spanning chunk boundaries are reassembled"""
+        from api.streaming import iter_lines
+        
+        lines = [
+            line async for line in iter_lines(self._chunks(b'{"a"', b': 1}\n\n{"b": 2}'), 1024)
+        ]
+        
+        assert lines == [b'{"a": 1}', b'{"b": 2}']
+    
+    @pytest.mark.asyncio
+    async def test_oversized_line_is_skipped(self):
+        """Test an overlong line is reported once and the next line survives"""
+        from api.streaming import iter_lines
+        
+        chunks = self._chunks(b'x' * 20, b'x' * 20, b'\n"ok"\n')
+        lines = [line async for line in iter_lines(chunks, 16)]
+        
+        assert lines == [None, b'"ok"']
+
+
 class TestMetricsEndpoint:
     """Test Prometheus metrics endpoint"""
     
@@ -202,5 +306,68 @@ class TestInputValidation:
         assert response.status_code == 422
 
 
+class TestBatchResponseEncoding:
+    """Test /predict/batch encodes results without response_model re-validation"""
+    
+    @pytest.fixture
+    def mock_inference_service(self):
+        """Create mock inference service returning model-style results"""
+        mock = MagicMock()
+        mock.is_ready.return_value = True
+        mock.model_name = "test-model"
+        mock.model_label.return_value = "test-model"
+        mock.run_batch = AsyncMock(side_effect=lambda texts, **kwargs: [
+            {'label': 'POSITIVE', 'confidence': 0.9, 'sentiment_score': 0.9, 'processing_time_ms': 1}
+            for _ in texts
+        ])
+        return mock
+    
+    @pytest.fixture
+    def client(self, mock_inference_service):
+        """Create test client with the service dependency overridden"""
+        from main import app
+        from api.predict import get_inference_service
+        
+        app.dependency_overrides[get_inference_service] = lambda: mock_inference_service
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+    
+    def test_body_matches_response_model(self, client):
+        """Test the body validates against BatchPredictionResponse unchanged"""
+        from api.predict import BatchPredictionResponse
+        
+        texts = ["great", "x" * 150]
+        response = client.post("/api/v1/predict/batch", json={"texts": texts})
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert BatchPredictionResponse(**data).model_dump(mode='json', exclude_none=True) == data
+        assert 'windows' not in data["results"][0]
+        assert data["results"][1]["text"] == "x" * 100 + "..."
+        assert data["results"][0]["processing_time_ms"] == 1.0
+        assert isinstance(data["results"][0]["processing_time_ms"], float)
+    
+    def test_openapi_schema_kept(self, client):
+        """Test the documented response schema is still BatchPredictionResponse"""
+        schema = client.get("/openapi.json").json()
+        responses = schema["paths"]["/api/v1/predict/batch"]["post"]["responses"]
+        
+        assert responses["200"]["content"]["application/json"]["schema"] == {
+            "$ref": "#/components/schemas/BatchPredictionResponse"
+        }
+    
+    def test_stdlib_fallback_matches(self):
+        """Test the encoder without orjson produces the same JSON"""
+        import api.responses as responses
+        
+        content = {"text": "caf\u00e9", "score": 0.5, "items": [1, 2.5, None, True]}
+        fast = responses.dumps(content)
+        with patch.object(responses, 'orjson', None):
+            fallback = responses.dumps(content)
+        
+        assert json.loads(fast) == json.loads(fallback) == content
+        assert "café".encode("utf-8") in fallback
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
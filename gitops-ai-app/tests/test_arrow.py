@@ -0,0 +1,191 @@
+"""
+Arrow Batch Tests - CI Test Layer
+The columnar /predict/batch/arrow endpoint against the JSON batch endpoint
+"""
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+pa = pytest.importorskip("pyarrow")
+
+from api import arrow
+from api.arrow import ARROW_STREAM_MEDIA_TYPE
+
+TEXTS = ["this is great", "terrible product !", "meh", "great", "love it, love it"]
+
+
+def read_table(body):
+    return pa.ipc.open_stream(body).read_all()
+
+
+class TestArrowEncoding:
+    """Test reading request columns and writing result columns"""
+
+    def test_round_trip_texts(self):
+        assert arrow.read_texts(arrow.write_texts(TEXTS)) == TEXTS
+
+    def test_other_string_types(self):
+        table = pa.table({
+            'id': pa.array(range(3)),
+            'body': pa.array(["a", "b", "a"]).dictionary_encode()
+        })
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+
+        assert arrow.read_texts(sink.getvalue().to_pybytes(), "body") == ["a", "b", "a"]
+
+    @pytest.mark.parametrize("body,column,message", [
+        (b"not arrow", "text", "Invalid Arrow IPC stream"),
+        (None, "missing", "not found"),
+        ("ints", "text", "must hold strings"),
+        ("nulls", "text", "null at row 1"),
+        ("empty", "text", "at least one row"),
+    ])
+    def test_invalid(self, body, column, message):
+        if body is None:
+            body = arrow.write_texts(TEXTS)
+        elif body == "ints":
+            body = arrow._write(pa.record_batch({'text': pa.array([1, 2])}))
+        elif body == "nulls":
+            body = arrow._write(pa.record_batch({'text': pa.array(["a", None, None])}))
+        elif body == "empty":
+            body = arrow.write_texts([])
+
+        with pytest.raises(ValueError, match=message):
+            arrow.read_texts(body, column)
+
+    def test_max_rows(self):
+        with pytest.raises(ValueError, match="at most 3 rows"):
+            arrow.read_texts(arrow.write_texts(TEXTS), max_rows=3)
+
+    @pytest.mark.parametrize("texts,message", [
+        (["good", ""], "whitespace only at row 1"),
+        (["good", "ok", " \t\n"], "whitespace only at row 2"),
+        (["x" * 11, "good"], "exceeds 10 characters at row 0"),
+    ])
+    def test_invalid_rows(self, texts, message):
+        """Test rows get the checks a JSON text gets, naming the first bad row"""
+        with pytest.raises(ValueError, match=message):
+            arrow.read_texts(arrow.write_texts(texts), max_length=10)
+
+    def test_rows_stripped(self):
+        body = arrow._write(pa.record_batch({'text': pa.array(["  good ", "bad\n", "good "]).dictionary_encode()}))
+
+        assert arrow.read_texts(body, max_length=4) == ["good", "bad", "good"]
+
+    def test_write_results(self):
+        body = arrow.write_results(
+            {'label': ['POSITIVE', 'NEGATIVE', 'POSITIVE'], 'confidence': [0.9, 0.8, 0.7],
+             'sentiment_score': [0.9, -0.8, 0.7]},
+            {'model': 'm'}
+        )
+        table = read_table(body)
+
+        assert table.column_names == ['label', 'confidence', 'sentiment_score']
+        assert pa.types.is_dictionary(table.schema.field('label').type)
+        assert table.column('label').to_pylist() == ['POSITIVE', 'NEGATIVE', 'POSITIVE']
+        assert table.schema.metadata[b'model'] == b'm'
+
+
+class TestArrowEndpoint:
+    """Test /predict/batch/arrow end to end on the mock model"""
+
+    @pytest.fixture
+    async def client(self):
+        import httpx
+        from config import settings
+        from main import app
+
+        with patch.object(settings, 'MODEL_BACKEND', 'mock'), \
+                patch.object(settings, 'WARMUP_ENABLED', False), \
+                patch.object(settings, 'JOBS_ENABLED', False):
+            async with app.router.lifespan_context(app):
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                    yield client
+
+    async def post(self, client, body, **params):
+        return await client.post(
+            "/api/v1/predict/batch/arrow",
+            content=body,
+            params=params,
+            headers={'Content-Type': ARROW_STREAM_MEDIA_TYPE}
+        )
+
+    @pytest.mark.asyncio
+    async def test_matches_json_endpoint(self, client):
+        response = await self.post(client, arrow.write_texts(TEXTS))
+        expected = (await client.post("/api/v1/predict/batch", json={"texts": TEXTS})).json()['results']
+
+        assert response.status_code == 200
+        assert response.headers['content-type'] == ARROW_STREAM_MEDIA_TYPE
+        table = read_table(response.content)
+        assert table.column('label').to_pylist() == [r['label'] for r in expected]
+        assert table.column('confidence').to_pylist() == pytest.approx([r['confidence'] for r in expected])
+        assert table.column('sentiment_score').to_pylist() == pytest.approx([r['sentiment_score'] for r in expected])
+        assert table.schema.metadata[b'request_id'].decode() == response.headers['x-request-id']
+
+    @pytest.mark.asyncio
+    async def test_more_rows_than_json(self, client):
+        """Test batches beyond the JSON endpoint's 100 items"""
+        texts = [f"good review number {i}" for i in range(1000)]
+        response = await self.post(client, arrow.write_texts(texts, "review"), column="review")
+
+        assert response.status_code == 200
+        assert read_table(response.content).num_rows == 1000
+
+    @pytest.mark.asyncio
+    async def test_long_document(self, client):
+        response = await self.post(client, arrow.write_texts(TEXTS), long_document="true")
+
+        table = read_table(response.content)
+        assert table.column('windows').to_pylist() == [1] * len(TEXTS)
+
+    @pytest.mark.asyncio
+    async def test_invalid_body(self, client):
+        response = await self.post(client, b"{\"texts\": []}")
+
+        assert response.status_code == 422
+        assert "Invalid Arrow IPC stream" in response.json()['detail']
+
+    @pytest.mark.asyncio
+    async def test_limits(self, client):
+        from config import settings
+
+        with patch.object(settings, 'ARROW_BATCH_MAX_ROWS', 2):
+            assert (await self.post(client, arrow.write_texts(TEXTS))).status_code == 422
+        with patch.object(settings, 'ARROW_BATCH_MAX_BYTES', 100):
+            assert (await self.post(client, arrow.write_texts(TEXTS))).status_code == 413
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("texts,message", [
+        (["good", "   "], "whitespace only at row 1"),
+        (["good", "x" * 10001], "exceeds 10000 characters at row 1"),
+    ])
+    async def test_invalid_rows(self, client, texts, message):
+        response = await self.post(client, arrow.write_texts(texts))
+
+        assert response.status_code == 422
+        assert message in response.json()['detail']
+
+    @pytest.mark.asyncio
+    async def test_unknown_model(self, client):
+        response = await self.post(client, arrow.write_texts(TEXTS), model="no-such-model")
+
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_without_pyarrow(self, client):
+        with patch.object(arrow, 'pa', None):
+            response = await self.post(client, b"")
+
+        assert response.status_code == 501
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
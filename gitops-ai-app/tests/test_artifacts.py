@@ -0,0 +1,213 @@
+"""
+Tests for the local model artifact store and offline loading
+"""
+import os
+import sys
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models.artifacts import (
+    CURRENT_FILE,
+    VERIFY_NONE,
+    VERIFY_SIZE,
+    ArtifactError,
+    ArtifactStore,
+    model_slug,
+)
+from models.sentiment_model import SentimentModel, resolve_model_source
+
+
+MODEL_NAME = "test-org/tiny-sentiment"
+
+
+@pytest.fixture
+def source_dir(tmp_path):
+    """A small fake model directory"""
+    source = tmp_path / "source"
+    (source / "sub").mkdir(parents=True)
+    (source / "config.json").write_text('{"model_type": "bert"}')
+    (source / "model.safetensors").write_bytes(b"\x00" * 64)
+    (source / "sub" / "vocab.txt").write_text("a\nb\n")
+    (source / ".hidden").write_text("skipped")
+    return str(source)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArtifactStore.for_cache_dir(str(tmp_path / "cache"))
+
+
+class TestArtifactStore:
+    """Test cases for ArtifactStore"""
+
+    def test_model_slug(self):
+        assert model_slug("org/model") == "org--model"
+        assert model_slug("/model/") == "model"
+
+    def test_resolve_unpublished_returns_none(self, store):
+        assert store.resolve(MODEL_NAME) is None
+        assert store.versions(MODEL_NAME) == []
+
+    def test_publish_and_resolve(self, store, source_dir):
+        artifact = store.publish(MODEL_NAME, source_dir)
+
+        assert len(artifact.version) == 12
+        assert store.current_version(MODEL_NAME) == artifact.version
+        assert set(artifact.files) == {"config.json", "model.safetensors", "sub/vocab.txt"}
+        assert artifact.has_safetensors
+
+        resolved = store.resolve(MODEL_NAME)
+        assert resolved.path == artifact.path
+        store.verify(resolved)
+
+    def test_republish_identical_is_noop(self, store, source_dir):
+        first = store.publish(MODEL_NAME, source_dir)
+        second = store.publish(MODEL_NAME, source_dir)
+
+        assert first.version == second.version
+        assert store.versions(MODEL_NAME) == [first.version]
+        assert not any(e.startswith(".") for e in os.listdir(os.path.dirname(first.path)))
+
+    def test_explicit_version_conflict(self, store, source_dir):
+        store.publish(MODEL_NAME, source_dir, version="v1")
+        with open(os.path.join(source_dir, "config.json"), "w") as handle:
+            handle.write("{}")
+
+        with pytest.raises(ArtifactError, match="different files"):
+            store.publish(MODEL_NAME, source_dir, version="v1")
+
+    def test_pinned_version_and_current(self, store, source_dir):
+        store.publish(MODEL_NAME, source_dir, version="v1")
+        with open(os.path.join(source_dir, "config.json"), "w") as handle:
+            handle.write("{}")
+        store.publish(MODEL_NAME, source_dir, version="v2", make_current=False)
+
+        assert store.resolve(MODEL_NAME).version == "v1"
+        assert store.resolve(MODEL_NAME, "v2").version == "v2"
+
+        store.set_current(MODEL_NAME, "v2")
+        assert store.resolve(MODEL_NAME).version == "v2"
+
+    def test_missing_pinned_version_raises(self, store, source_dir):
+        store.publish(MODEL_NAME, source_dir)
+        with pytest.raises(ArtifactError):
+            store.resolve(MODEL_NAME, "nope")
+        with pytest.raises(ArtifactError):
+            store.set_current(MODEL_NAME, "nope")
+
+    @pytest.mark.parametrize("version", ["../other", "..", "/etc", "v1/../../x", ".staging-abc"])
+    def test_version_outside_store_rejected(self, store, source_dir, version):
+        """Test version labels cannot reach outside the model directory"""
+        store.publish(MODEL_NAME, source_dir, version="v1")
+        # A published model next to this one, reachable with "../"
+        store.publish("other", source_dir, version="v1")
+
+        with pytest.raises(ArtifactError, match="Invalid version"):
+            store.resolve(MODEL_NAME, version)
+        with pytest.raises(ArtifactError, match="Invalid version"):
+            store.set_current(MODEL_NAME, version)
+        with pytest.raises(ArtifactError, match="Invalid version"):
+            store.publish(MODEL_NAME, source_dir, version=version)
+
+    def test_verify_detects_corruption(self, store, source_dir):
+        artifact = store.publish(MODEL_NAME, source_dir)
+        weights = os.path.join(artifact.path, "model.safetensors")
+        with open(weights, "r+b") as handle:
+            handle.write(b"\x01")
+
+        store.verify(artifact, VERIFY_SIZE)
+        store.verify(artifact, VERIFY_NONE)
+        with pytest.raises(ArtifactError, match="checksum"):
+            store.verify(artifact)
+
+    def test_verify_detects_missing_file(self, store, source_dir):
+        artifact = store.publish(MODEL_NAME, source_dir)
+        os.remove(os.path.join(artifact.path, "sub", "vocab.txt"))
+
+        with pytest.raises(ArtifactError, match="missing"):
+            store.verify(artifact, VERIFY_SIZE)
+
+    def test_empty_source_raises(self, store, tmp_path):
+        empty = tmp_path / "empty"
+        empty.mkdir()
+        with pytest.raises(ArtifactError):
+            store.publish(MODEL_NAME, str(empty))
+
+    def test_prune_keeps_current(self, store, source_dir):
+        for version in ("v1", "v2", "v3"):
+            with open(os.path.join(source_dir, "config.json"), "w") as handle:
+                handle.write(version)
+            store.publish(MODEL_NAME, source_dir, version=version, make_current=version == "v1")
+
+        assert store.prune(MODEL_NAME, keep=1) == ["v2"]
+        assert store.versions(MODEL_NAME) == ["v1", "v3"]
+        assert open(os.path.join(store.root, model_slug(MODEL_NAME), CURRENT_FILE)).read().strip() == "v1"
+
+
+class TestModelSource:
+    """Test cases for resolving where a model is loaded from"""
+
+    def test_local_directory(self, source_dir, tmp_path):
+        source, kwargs = resolve_model_source(source_dir, str(tmp_path))
+        assert source == source_dir
+        assert kwargs == {'local_files_only': True}
+
+    def test_falls_back_to_hf_cache(self, tmp_path):
+        source, kwargs = resolve_model_source(MODEL_NAME, str(tmp_path), offline=True)
+        assert source == MODEL_NAME
+        assert kwargs == {'cache_dir': str(tmp_path), 'local_files_only': True}
+
+    def test_published_artifact(self, source_dir, tmp_path):
+        artifact = ArtifactStore.for_cache_dir(str(tmp_path)).publish(MODEL_NAME, source_dir)
+
+        source, kwargs = resolve_model_source(MODEL_NAME, str(tmp_path))
+        assert source == artifact.path
+        assert kwargs == {'local_files_only': True, 'use_safetensors': True}
+
+    def test_corrupted_artifact_raises(self, source_dir, tmp_path):
+        artifact = ArtifactStore.for_cache_dir(str(tmp_path)).publish(MODEL_NAME, source_dir)
+        with open(os.path.join(artifact.path, "config.json"), "w") as handle:
+            handle.write("{}")
+
+        with pytest.raises(ArtifactError):
+            resolve_model_source(MODEL_NAME, str(tmp_path))
+
+
+class TestOfflineLoading:
+    """Load a locally generated tiny model through the artifact store"""
+
+    def test_loads_published_model_offline(self, tiny_model_dir, tmp_path):
+        cache_dir = str(tmp_path / "cache")
+        artifact = ArtifactStore.for_cache_dir(cache_dir).publish(MODEL_NAME, tiny_model_dir)
+        assert artifact.has_safetensors
+
+        model = SentimentModel(model_name=MODEL_NAME, cache_dir=cache_dir, offline=True)
+
+        assert model._use_mock is False
+        result = model.predict("this is a great product")
+        assert result['label'] in ("POSITIVE", "NEGATIVE")
+        assert model.load_timings['load'] > 0
+
+    def test_pinned_version(self, tiny_model_dir, tmp_path):
+        cache_dir = str(tmp_path / "cache")
+        ArtifactStore.for_cache_dir(cache_dir).publish(MODEL_NAME, tiny_model_dir, version="v1")
+
+        model = SentimentModel(model_name=MODEL_NAME, cache_dir=cache_dir, version="v1", offline=True)
+        assert model._use_mock is False
+
+    def test_corrupted_artifact_is_not_served_as_mock(self, tiny_model_dir, tmp_path):
+        cache_dir = str(tmp_path / "cache")
+        artifact = ArtifactStore.for_cache_dir(cache_dir).publish(MODEL_NAME, tiny_model_dir)
+        with open(os.path.join(artifact.path, "model.safetensors"), "r+b") as handle:
+            handle.seek(-1, os.SEEK_END)
+            handle.write(b"\xff")
+
+        with pytest.raises(ArtifactError):
+            SentimentModel(model_name=MODEL_NAME, cache_dir=cache_dir, offline=True)
+
+    def test_offline_without_artifact_falls_back_to_mock(self, tmp_path):
+        model = SentimentModel(model_name=MODEL_NAME, cache_dir=str(tmp_path), offline=True)
+        assert model._use_mock is True
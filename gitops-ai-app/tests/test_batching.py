@@ -0,0 +1,122 @@
+"""
+Micro-Batching Tests - CI Test Layer
+Unit tests for the micro-batching scheduler
+"""
+import pytest
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+
+class RecordingModel:
+    """Fake batch predictor that records the size of every call"""
+
+    def __init__(self, fail: bool = False):
+        self.batch_sizes = []
+        self.fail = fail
+        self._lock = threading.Lock()
+
+    def predict_batch(self, texts):
+        with self._lock:
+            self.batch_sizes.append(len(texts))
+        if self.fail:
+            raise ValueError("model exploded")
+        return [{'label': 'POSITIVE', 'confidence': 0.9, 'score': 0.9, 'text': t} for t in texts]
+
+
+class TestMicroBatcher:
+    """Test request coalescing behaviour"""
+
+    @pytest.fixture
+    def executor(self):
+        executor = ThreadPoolExecutor(max_workers=2)
+        yield executor
+        executor.shutdown(wait=True)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_are_merged(self, executor):
+        """Test concurrent submits share a batch and get their own results"""
+        from services.batching import MicroBatcher
+
+        model = RecordingModel()
+        batcher = MicroBatcher(model.predict_batch, executor, max_batch_size=8, max_wait_ms=50)
+
+        texts = [f"text {i}" for i in range(8)]
+        results = await asyncio.gather(*(batcher.submit(t) for t in texts))
+        await batcher.stop()
+
+        assert [r['text'] for r in results] == texts
+        assert model.batch_sizes == [8]
+
+    @pytest.mark.asyncio
+    async def test_batches_respect_max_size(self, executor):
+        """Test no batch exceeds the configured max size"""
+        from services.batching import MicroBatcher
+
+        model = RecordingModel()
+        batcher = MicroBatcher(model.predict_batch, executor, max_batch_size=4, max_wait_ms=20)
+
+        results = await asyncio.gather(*(batcher.submit(f"t{i}") for i in range(10)))
+        await batcher.stop()
+
+        assert len(results) == 10
+        assert sum(model.batch_sizes) == 10
+        assert max(model.batch_sizes) <= 4
+
+    @pytest.mark.asyncio
+    async def test_lone_request_flushes_after_max_wait(self, executor):
+        """Test a single request is not held longer than needed"""
+        from services.batching import MicroBatcher
+
+        model = RecordingModel()
+        batcher = MicroBatcher(model.predict_batch, executor, max_batch_size=32, max_wait_ms=10)
+
+        result = await asyncio.wait_for(batcher.submit("alone"), timeout=1)
+        await batcher.stop()
+
+        assert result['text'] == "alone"
+        assert model.batch_sizes == [1]
+
+    @pytest.mark.asyncio
+    async def test_model_error_propagates_to_callers(self, executor):
+        """Test a failing batch rejects every caller in it"""
+        from services.batching import MicroBatcher
+
+        batcher = MicroBatcher(
+            RecordingModel(fail=True).predict_batch, executor, max_batch_size=4, max_wait_ms=10
+        )
+
+        results = await asyncio.gather(
+            batcher.submit("a"), batcher.submit("b"), return_exceptions=True
+        )
+        await batcher.stop()
+
+        assert all(isinstance(r, ValueError) for r in results)
+
+
+    @pytest.mark.asyncio
+    async def test_items_for_different_models_run_separately(self, executor):
+        """Test a dispatch never mixes texts for different models in one call"""
+        from services.batching import MicroBatcher
+
+        first, second = RecordingModel(), RecordingModel()
+        batcher = MicroBatcher(
+            lambda texts, model: model.predict_batch(texts), executor, max_batch_size=8, max_wait_ms=50
+        )
+
+        models = [first, second, first, second, first]
+        results = await asyncio.gather(*(batcher.submit(f"t{i}", model=m) for i, m in enumerate(models)))
+        await batcher.stop()
+
+        assert [r['text'] for r in results] == [f"t{i}" for i in range(5)]
+        assert first.batch_sizes == [3]
+        assert second.batch_sizes == [2]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,135 @@
+"""
+Prediction Cache Tests - CI Test Layer
+Unit tests for the LRU/TTL prediction cache
+"""
+import pytest
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+RESULT = {'label': 'POSITIVE', 'confidence': 0.9, 'score': 0.9}
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestPredictionCache:
+    """Test cache bounds and expiry"""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    def test_hit_after_put(self, clock):
+        """Test stored predictions are returned"""
+        from services.cache import PredictionCache
+
+        cache = PredictionCache(max_entries=10, ttl_seconds=60, clock=clock)
+        key = cache.make_key("model", "hello")
+        cache.put(key, RESULT)
+
+        assert cache.get(key) == RESULT
+        assert cache.get(cache.make_key("model", "other")) is None
+
+    def test_key_depends_on_model(self):
+        """Test the same text under different models gets different keys"""
+        from services.cache import PredictionCache
+
+        assert PredictionCache.make_key("a", "text") != PredictionCache.make_key("b", "text")
+
+    def test_lru_eviction_by_entries(self, clock):
+        """Test least recently used entry is evicted first"""
+        from services.cache import PredictionCache
+
+        cache = PredictionCache(max_entries=2, ttl_seconds=60, clock=clock)
+        cache.put("a", RESULT)
+        cache.put("b", RESULT)
+        cache.get("a")
+        cache.put("c", RESULT)
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert len(cache) == 2
+
+    def test_eviction_by_bytes(self, clock):
+        """Test byte budget bounds the cache"""
+        from services.cache import PredictionCache, _entry_size
+
+        budget = _entry_size("k0", RESULT) * 3
+        cache = PredictionCache(max_entries=100, max_bytes=budget, clock=clock)
+        for i in range(10):
+            cache.put(f"k{i}", RESULT)
+
+        assert len(cache) == 3
+        assert cache.size_bytes <= budget
+
+    def test_ttl_expiry(self, clock):
+        """Test entries expire after the TTL"""
+        from services.cache import PredictionCache
+
+        cache = PredictionCache(max_entries=10, ttl_seconds=5, clock=clock)
+        cache.put("a", RESULT)
+        clock.now = 6
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+
+class TestServiceCaching:
+    """Test InferenceService uses the cache on both paths"""
+
+    @pytest.fixture
+    def service(self):
+        from services.inference_service import InferenceService
+        from services.cache import PredictionCache
+
+        service = InferenceService()
+        service._batcher = None
+        service._cache = PredictionCache(max_entries=100)
+
+        model = MagicMock()
+        model.is_loaded.return_value = True
+        model.predict.return_value = RESULT
+        model.predict_batch.side_effect = lambda texts: [RESULT for _ in texts]
+        service.model = model
+
+        preprocessor = MagicMock()
+        preprocessor.preprocess.side_effect = lambda text: text.strip().lower()
+        preprocessor.batch_preprocess.side_effect = lambda texts: [t.strip().lower() for t in texts]
+        service.preprocessor = preprocessor
+        service._is_ready = True
+
+        yield service
+        service._executor.shutdown(wait=True)
+
+    @pytest.mark.asyncio
+    async def test_run_uses_cache(self, service):
+        """Test repeated single requests hit the model once"""
+        await service.run("Great product")
+        result = await service.run("  great product ")
+
+        assert result['label'] == 'POSITIVE'
+        assert service.model.predict.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_run_batch_only_infers_misses(self, service):
+        """Test batch path looks up per item"""
+        await service.run("cached")
+        results = await service.run_batch(["cached", "new one", "another"])
+
+        assert len(results) == 3
+        service.model.predict_batch.assert_called_once_with(["new one", "another"])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
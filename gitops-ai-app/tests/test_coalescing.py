@@ -0,0 +1,231 @@
+"""
+Coalescing Tests - CI Test Layer
+Singleflight sharing of identical in-flight predictions and intra-batch dedup
+"""
+import pytest
+import asyncio
+import time
+from contextlib import contextmanager
+from unittest.mock import patch
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services.coalescing import SingleFlight
+from services.deadlines import DeadlineExceeded, deadline_after
+
+
+class TestSingleFlight:
+    """Test the in-flight registry"""
+
+    @pytest.mark.asyncio
+    async def test_join_shares_result(self):
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            return ["a-result", "b-result"]
+
+        a, b = flights.start(["a", "b"], compute())
+        assert flights.join("a") is a
+        assert flights.join("c") is None
+        assert len(flights) == 2
+
+        release.set()
+        assert await asyncio.shield(flights.join("b")) == "b-result"
+        assert await a == "a-result"
+        # Finished keys are forgotten
+        assert flights.join("a") is None
+        assert len(flights) == 0
+
+    @pytest.mark.asyncio
+    async def test_error_reaches_every_waiter(self):
+        flights = SingleFlight()
+
+        async def compute():
+            await asyncio.sleep(0.01)
+            raise ValueError("bad")
+
+        flight, = flights.start(["a"], compute())
+        joined = flights.join("a")
+
+        for future in (flight, joined):
+            with pytest.raises(ValueError):
+                await asyncio.shield(future)
+
+    @pytest.mark.asyncio
+    async def test_waiter_cancellation_keeps_computation(self):
+        """Test a caller giving up does not cancel the result for others"""
+        flights = SingleFlight()
+
+        async def compute():
+            await asyncio.sleep(0.05)
+            return ["done"]
+
+        flight, = flights.start(["a"], compute())
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(asyncio.shield(flight), timeout=0.01)
+
+        assert await asyncio.shield(flights.join("a")) == "done"
+
+
+@pytest.fixture
+async def service():
+    from config import settings
+    from services.inference_service import InferenceService
+
+    with patch.object(settings, 'MODEL_BACKEND', 'mock'), \
+            patch.object(settings, 'WARMUP_ENABLED', False), \
+            patch.object(settings, 'PREDICTION_CACHE_ENABLED', False):
+        service = InferenceService()
+        await service.initialize()
+        yield service
+        await service.cleanup()
+
+
+class ModelSpy:
+    """Records every text that reaches the model, optionally slowly"""
+
+    def __init__(self, service, delay=0.0, fail_first=None):
+        self.texts = []
+        self.delay = delay
+        self.fail_first = fail_first
+        self._predict_many = service._predict_many
+
+    def __call__(self, texts, model=None, aggregation=None):
+        self.texts.extend(texts)
+        time.sleep(self.delay)
+        if self.fail_first is not None:
+            error, self.fail_first = self.fail_first, None
+            raise error
+        return self._predict_many(texts, model, aggregation)
+
+
+@contextmanager
+def spying(service, spy):
+    """Route the service's model calls, micro-batched or not, through ``spy``"""
+    with patch.object(service, '_predict_many', spy):
+        if service._batcher is None:
+            yield spy
+        else:
+            with patch.object(service._batcher, '_predict_batch', spy):
+                yield spy
+
+
+class TestInFlightCoalescing:
+    """Test identical concurrent requests share one prediction"""
+
+    @pytest.mark.asyncio
+    async def test_viral_text_predicted_once(self, service):
+        spy = ModelSpy(service, delay=0.05)
+        with spying(service, spy):
+            results = await asyncio.gather(*(service.run("this went viral, love it") for _ in range(50)))
+
+        assert spy.texts == ["this went viral, love it"]
+        assert len({(r['label'], r['confidence']) for r in results}) == 1
+
+    @pytest.mark.asyncio
+    async def test_normalized_duplicates_share(self, service):
+        """Test raw texts that preprocess to the same string coalesce"""
+        spy = ModelSpy(service, delay=0.05)
+        with spying(service, spy):
+            await asyncio.gather(service.run("great   product"), service.run("great product"))
+
+        assert spy.texts == ["great product"]
+
+    @pytest.mark.asyncio
+    async def test_leader_timeout_does_not_fail_followers(self, service):
+        """Test the shared prediction finishes after the first caller gives up"""
+        spy = ModelSpy(service, delay=0.2)
+        with spying(service, spy):
+            leader = asyncio.ensure_future(service.run("good", deadline=deadline_after(0.05)))
+            await asyncio.sleep(0.01)
+            follower = await service.run("good")
+
+            with pytest.raises(DeadlineExceeded):
+                await leader
+
+        assert follower['label'] == 'POSITIVE'
+        assert spy.texts == ["good"]
+
+    @pytest.mark.asyncio
+    async def test_follower_retries_after_leader_deadline(self, service):
+        """Test a follower with time left computes itself when the shared prediction is dropped"""
+        spy = ModelSpy(service, delay=0.05, fail_first=DeadlineExceeded('model'))
+        with spying(service, spy):
+            leader = asyncio.ensure_future(service.run("good"))
+            await asyncio.sleep(0.01)
+            follower = await service.run("good")
+
+            with pytest.raises(DeadlineExceeded):
+                await leader
+
+        assert follower['label'] == 'POSITIVE'
+        assert spy.texts == ["good", "good"]
+
+    @pytest.mark.asyncio
+    async def test_models_do_not_share(self, service):
+        """Test long-document and truncated predictions of a text stay apart"""
+        spy = ModelSpy(service, delay=0.05)
+        with spying(service, spy):
+            plain, long = await asyncio.gather(service.run("good"), service.run("good", aggregation="mean"))
+
+        assert spy.texts == ["good", "good"]
+        assert 'windows' in long and 'windows' not in plain
+
+    @pytest.mark.asyncio
+    async def test_disabled(self):
+        from config import settings
+        from services.inference_service import InferenceService
+
+        with patch.object(settings, 'MODEL_BACKEND', 'mock'), \
+                patch.object(settings, 'WARMUP_ENABLED', False), \
+                patch.object(settings, 'PREDICTION_CACHE_ENABLED', False), \
+                patch.object(settings, 'INFLIGHT_COALESCING_ENABLED', False):
+            service = InferenceService()
+            await service.initialize()
+            try:
+                spy = ModelSpy(service, delay=0.02)
+                with spying(service, spy):
+                    await asyncio.gather(*(service.run("good") for _ in range(3)))
+            finally:
+                await service.cleanup()
+
+        assert spy.texts == ["good"] * 3
+
+
+class TestBatchDedup:
+    """Test run_batch predicts each distinct text once"""
+
+    @pytest.mark.asyncio
+    async def test_duplicates_fanned_out(self, service):
+        spy = ModelSpy(service)
+        texts = ["good", "awful", "good", "  good  ", "awful"]
+        with spying(service, spy):
+            results = await service.run_batch(texts)
+
+        assert spy.texts == ["good", "awful"]
+        assert [r['label'] for r in results] == ['POSITIVE', 'NEGATIVE', 'POSITIVE', 'POSITIVE', 'NEGATIVE']
+
+    @pytest.mark.asyncio
+    async def test_batch_joins_single_in_flight(self, service):
+        """Test a batch reuses a single prediction already running, and vice versa"""
+        spy = ModelSpy(service, delay=0.1)
+        with spying(service, spy):
+            single = asyncio.ensure_future(service.run("good"))
+            await asyncio.sleep(0.02)
+            batch = asyncio.ensure_future(service.run_batch(["good", "awful"]))
+            await asyncio.sleep(0.02)
+            late = await service.run("awful")
+            single, batch = await single, await batch
+
+        assert sorted(spy.texts) == ["awful", "good"]
+        assert batch[0]['label'] == single['label']
+        assert batch[1]['label'] == late['label'] == 'NEGATIVE'
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,232 @@
+"""
+Deadline Propagation Tests - CI Test Layer
+Expired work must be dropped before preprocessing and before the model
+"""
+import asyncio
+import threading
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, AsyncMock
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+RESULT = {'label': 'POSITIVE', 'confidence': 0.9, 'score': 0.9}
+
+
+def dropped(stage):
+    return REGISTRY.get_sample_value('inference_deadline_dropped_total', {'stage': stage}) or 0.0
+
+
+class TestBatcherDeadlines:
+    """Test the micro-batcher drops expired items"""
+
+    @pytest.fixture
+    def executor(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        yield executor
+        executor.shutdown(wait=True)
+
+    @pytest.mark.asyncio
+    async def test_expired_in_queue_is_not_inferred(self, executor):
+        """Test an item past its deadline at dispatch never reaches the model"""
+        from services.batching import MicroBatcher
+        from services.deadlines import DeadlineExceeded
+
+        seen = []
+        batcher = MicroBatcher(lambda texts: seen.extend(texts) or [RESULT] * len(texts),
+                               executor, max_batch_size=8, max_wait_ms=20)
+        before = dropped('queue')
+
+        expired = batcher.submit("late", deadline=time.monotonic() - 1)
+        live = batcher.submit("on time", deadline=time.monotonic() + 10)
+        results = await asyncio.gather(expired, live, return_exceptions=True)
+        await batcher.stop()
+
+        assert isinstance(results[0], DeadlineExceeded)
+        assert results[1] == RESULT
+        assert seen == ["on time"]
+        assert dropped('queue') == before + 1
+
+    @pytest.mark.asyncio
+    async def test_expired_waiting_for_thread_is_not_inferred(self, executor):
+        """Test an item that expires while the executor is busy is dropped"""
+        from services.batching import MicroBatcher
+        from services.deadlines import DeadlineExceeded
+
+        gate = threading.Event()
+        executor.submit(gate.wait)  # occupy the only thread
+
+        seen = []
+        batcher = MicroBatcher(lambda texts: seen.extend(texts) or [RESULT] * len(texts),
+                               executor, max_batch_size=8, max_wait_ms=1)
+        before = dropped('model')
+
+        task = asyncio.ensure_future(batcher.submit("slow", deadline=time.monotonic() + 0.05))
+        await asyncio.sleep(0.1)
+        gate.set()
+
+        with pytest.raises(DeadlineExceeded):
+            await task
+        await batcher.stop()
+
+        assert seen == []
+        assert dropped('model') == before + 1
+
+
+class TestServiceDeadlines:
+    """Test InferenceService checks deadlines between stages"""
+
+    @pytest.fixture
+    def service(self):
+        from services.inference_service import InferenceService
+
+        service = InferenceService()
+        service._batcher = None
+        service._cache = None
+
+        model = MagicMock()
+        model.is_loaded.return_value = True
+        model.predict.return_value = RESULT
+        model.predict_batch.side_effect = lambda texts: [RESULT for _ in texts]
+        service.model = model
+
+        preprocessor = MagicMock()
+        preprocessor.preprocess.side_effect = lambda text: text
+        preprocessor.batch_preprocess.side_effect = lambda texts: list(texts)
+        service.preprocessor = preprocessor
+        service._is_ready = True
+
+        yield service
+        service._executor.shutdown(wait=True)
+
+    @pytest.mark.asyncio
+    async def test_run_drops_before_preprocessing(self, service):
+        """Test an already expired request does no work"""
+        from services.deadlines import DeadlineExceeded
+
+        before = dropped('preprocess')
+        with pytest.raises(DeadlineExceeded):
+            await service.run("great", deadline=time.monotonic() - 1)
+
+        service.preprocessor.preprocess.assert_not_called()
+        service.model.predict.assert_not_called()
+        assert dropped('preprocess') == before + 1
+
+    @pytest.mark.asyncio
+    async def test_run_batch_drops_before_model(self, service):
+        """Test a batch that expires during preprocessing skips the model"""
+        from services.deadlines import DeadlineExceeded
+
+        def slow_preprocess(texts):
+            time.sleep(0.05)
+            return list(texts)
+
+        service.preprocessor.batch_preprocess.side_effect = slow_preprocess
+        before = dropped('model')
+
+        with pytest.raises(DeadlineExceeded):
+            await service.run_batch(["a", "b", "c"], deadline=time.monotonic() + 0.02)
+
+        service.model.predict_batch.assert_not_called()
+        assert dropped('model') == before + 3
+
+    @pytest.mark.asyncio
+    async def test_client_deadline_leaves_admission_limit(self, service):
+        """Test requests expiring on the client's own budget do not shrink the limit"""
+        from services.admission import AdmissionController
+        from services.deadlines import DeadlineExceeded, deadline_after
+
+        service._admission = AdmissionController(initial_limit=64, min_limit=4)
+        for _ in range(40):
+            with pytest.raises(DeadlineExceeded) as exc:
+                await service.run("great", deadline=deadline_after(-1, client=True))
+            assert exc.value.client
+
+        assert service._admission.limit == 64
+
+    @pytest.mark.asyncio
+    async def test_run_within_deadline(self, service):
+        """Test normal requests are unaffected"""
+        result = await service.run("great", deadline=time.monotonic() + 5)
+
+        assert result['label'] == 'POSITIVE'
+
+
+class TestDeadlineHeader:
+    """Test the API takes deadlines from X-Request-Timeout-Ms"""
+
+    @pytest.fixture
+    def mock_service(self):
+        mock = MagicMock()
+        mock.is_ready.return_value = True
+        mock.model_name = "test-model"
+        mock.model_label.return_value = "test-model"
+        mock.run = AsyncMock(return_value={
+            'label': 'POSITIVE', 'confidence': 0.9, 'sentiment_score': 0.9, 'processing_time_ms': 1.0
+        })
+        return mock
+
+    @pytest.fixture
+    def client(self, mock_service):
+        from main import app
+        from api.predict import get_inference_service
+
+        app.dependency_overrides[get_inference_service] = lambda: mock_service
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+
+    def test_header_shortens_deadline(self, client, mock_service):
+        """Test the client budget becomes the service deadline"""
+        now = time.monotonic()
+        response = client.post("/api/v1/predict", json={"text": "great"},
+                               headers={"X-Request-Timeout-Ms": "250"})
+
+        assert response.status_code == 200
+        deadline = mock_service.run.call_args.kwargs['deadline']
+        assert now < deadline <= time.monotonic() + 0.25
+
+    def test_only_shortened_deadline_is_client_set(self, client, mock_service):
+        """Test admission can tell the client's budget from the server default"""
+        from services.deadlines import is_client_deadline
+
+        client.post("/api/v1/predict", json={"text": "great"}, headers={"X-Request-Timeout-Ms": "250"})
+        assert is_client_deadline(mock_service.run.call_args.kwargs['deadline'])
+
+        client.post("/api/v1/predict", json={"text": "great"})
+        assert not is_client_deadline(mock_service.run.call_args.kwargs['deadline'])
+
+    def test_header_cannot_extend_deadline(self, client, mock_service):
+        """Test budgets above INFERENCE_TIMEOUT are capped"""
+        from config import settings
+
+        client.post("/api/v1/predict", json={"text": "great"},
+                    headers={"X-Request-Timeout-Ms": str(settings.INFERENCE_TIMEOUT * 10_000)})
+
+        deadline = mock_service.run.call_args.kwargs['deadline']
+        assert deadline <= time.monotonic() + settings.INFERENCE_TIMEOUT
+
+    def test_invalid_header_rejected(self, client):
+        """Test non-positive budgets fail validation"""
+        response = client.post("/api/v1/predict", json={"text": "great"},
+                               headers={"X-Request-Timeout-Ms": "0"})
+
+        assert response.status_code == 422
+
+    def test_deadline_exceeded_returns_504(self, client, mock_service):
+        """Test dropped requests surface as gateway timeouts"""
+        from services.deadlines import DeadlineExceeded
+
+        mock_service.run.side_effect = DeadlineExceeded('model')
+        response = client.post("/api/v1/predict", json={"text": "great"})
+
+        assert response.status_code == 504
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
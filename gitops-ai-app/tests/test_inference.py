@@ -150,6 +150,70 @@ class TestSentimentModel:
     def test_is_loaded(self, mock_model):
         """Test model loaded status"""
         assert mock_model.is_loaded() is True
+    
+    def test_mock_backend_skips_transformers(self):
+        """Test backend="mock" never builds a pipeline"""
+        from models.sentiment_model import SentimentModel
+        
+        with patch.dict('sys.modules', {'transformers': None}):
+            model = SentimentModel(model_name="test-model", backend="mock")
+        
+        assert model.is_loaded() is True
+        assert model._pipeline is None
+        assert model.predict("great")['label'] == 'POSITIVE'
+
+
+class FakePipeline:
+    """Pipeline stand-in that records each call's texts"""
+    
+    def __init__(self):
+        self.calls = []
+        self.tokenizer = lambda texts, add_special_tokens=False: {
+            'input_ids': [text.split() for text in texts]
+        }
+    
+    def __call__(self, texts, batch_size=1):
+        self.calls.append(list(texts))
+        return [
+            {'label': 'POSITIVE' if 'good' in text else 'NEGATIVE', 'score': 0.9}
+            for text in texts
+        ]
+
+
+class TestLengthBucketing:
+    """Test length-bucketed sub-batching in predict_batch"""
+    
+    @pytest.fixture
+    def pipeline_model(self):
+        """Create model backed by a fake pipeline"""
+        from models.sentiment_model import SentimentModel
+        
+        with patch.object(SentimentModel, '_load_model'):
+            model = SentimentModel(model_name="test-model", batch_size=2)
+            model._pipeline = FakePipeline()
+            model._is_loaded = True
+            return model
+    
+    def test_sub_batches_grouped_by_length(self, pipeline_model):
+        """Test texts of similar length share a sub-batch"""
+        texts = ["good " * 50, "bad", "good " * 40, "bad day"]
+        
+        pipeline_model.predict_batch(texts)
+        
+        calls = pipeline_model._pipeline.calls
+        assert [len(c) for c in calls] == [2, 2]
+        assert set(calls[0]) == {"bad", "bad day"}
+    
+    def test_results_in_input_order(self, pipeline_model):
+        """Test output order matches input order after bucketing"""
+        texts = ["good " * 30, "bad", "good", "bad " * 20, "good one"]
+        
+        results = pipeline_model.predict_batch(texts)
+        
+        assert [r['label'] for r in results] == [
+            'POSITIVE', 'NEGATIVE', 'POSITIVE', 'NEGATIVE', 'POSITIVE'
+        ]
+        assert results[1]['score'] < 0
 
 
 class TestInferenceService:
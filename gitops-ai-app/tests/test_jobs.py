@@ -0,0 +1,609 @@
+"""
+Bulk Job Tests - CI Test Layer
+Chunked background scoring of JSONL/CSV files, checkpoints, cancel and resume
+"""
+import pytest
+import asyncio
+import json
+from unittest.mock import patch
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services.admission import OverloadedError
+from services.jobs import CANCELLED, COMPLETED, FAILED, RUNNING, JobManager, JobNotFoundError, JobStateError
+
+
+@pytest.fixture
+async def service():
+    from config import settings
+    from services.inference_service import InferenceService
+
+    with patch.object(settings, 'MODEL_BACKEND', 'mock'), \
+            patch.object(settings, 'WARMUP_ENABLED', False):
+        service = InferenceService()
+        await service.initialize()
+        yield service
+        await service.cleanup()
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    path = tmp_path / "inputs"
+    path.mkdir()
+    return path
+
+
+# Managers made by the current test, stopped when it ends
+_managers = []
+
+
+@pytest.fixture(autouse=True)
+async def stop_managers():
+    yield
+    while _managers:
+        await _managers.pop().stop()
+
+
+def make_manager(service, tmp_path, inputs, **kwargs):
+    manager = JobManager(service, jobs_dir=str(tmp_path / "jobs"), input_dir=str(inputs), **kwargs)
+    _managers.append(manager)
+    return manager
+
+
+def write_jsonl(path, records):
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+
+
+def read_results(job):
+    with open(job.output_path) as handle:
+        return [json.loads(line) for line in handle]
+
+
+async def wait_for(job, *statuses, timeout=5.0):
+    """Poll until the job reaches one of ``statuses``"""
+    loop = asyncio.get_running_loop()
+    end = loop.time() + timeout
+    while job.status not in statuses:
+        assert loop.time() < end, f"job stuck in {job.status}"
+        await asyncio.sleep(0.01)
+
+
+class GatedBatches:
+    """run_batch wrapper that lets ``open`` calls through, then waits for release()"""
+
+    def __init__(self, run_batch, open=1):
+        self.run_batch = run_batch
+        self.open = open
+        self.calls = []
+        self.gate = asyncio.Event()
+
+    def release(self):
+        self.gate.set()
+
+    async def __call__(self, texts, **kwargs):
+        self.calls.append((len(texts), kwargs))
+        if len(self.calls) > self.open:
+            await self.gate.wait()
+        return await self.run_batch(texts, **kwargs)
+
+
+class TestJobProcessing:
+    """Test a job from input file to ordered results"""
+
+    @pytest.mark.asyncio
+    async def test_jsonl_job(self, service, tmp_path, inputs):
+        """Test strings, objects and bad lines all get a result in input order"""
+        (inputs / "reviews.jsonl").write_text(
+            '"this is great"\n'
+            '{"id": "r2", "text": "terrible product"}\n'
+            '\n'
+            'not json\n'
+            '{"id": "r4", "text": "   "}\n'
+            '{"id": 5, "text": "love it"}\n'
+        )
+        manager = make_manager(service, tmp_path, inputs, chunk_size=2)
+        await manager.start()
+
+        job = manager.submit("reviews.jsonl")
+        await wait_for(job, COMPLETED)
+
+        results = read_results(job)
+        assert [r['index'] for r in results] == [0, 1, 2, 3, 4]
+        assert [r.get('id') for r in results] == [None, "r2", None, "r4", 5]
+        assert results[0]['label'] == 'POSITIVE'
+        assert results[1]['label'] == 'NEGATIVE'
+        assert 'error' in results[2] and 'error' in results[3]
+        assert job.records == 5 and job.failed == 2
+        info = job.info()
+        assert info['percent'] == 100.0
+        assert info['bytes_done'] == info['bytes_total']
+
+    @pytest.mark.asyncio
+    async def test_csv_job(self, service, tmp_path, inputs):
+        """Test header mapping, quoted multi-line fields and custom columns"""
+        (inputs / "reviews.csv").write_text(
+            'review_id,stars,body\n'
+            'a,5,"great, really great"\n'
+            'b,1,"bad\nvery bad"\n'
+            'c,3,\n'
+        )
+        manager = make_manager(service, tmp_path, inputs, chunk_size=2)
+        await manager.start()
+
+        job = manager.submit("reviews.csv", text_field="body", id_field="review_id")
+        await wait_for(job, COMPLETED)
+
+        results = read_results(job)
+        assert [r['id'] for r in results] == ["a", "b", "c"]
+        assert results[0]['label'] == 'POSITIVE'
+        assert results[1]['label'] == 'NEGATIVE'
+        assert 'error' in results[2]
+
+    @pytest.mark.asyncio
+    async def test_csv_without_text_column_fails(self, service, tmp_path, inputs):
+        (inputs / "reviews.csv").write_text("id,body\n1,good\n")
+        manager = make_manager(service, tmp_path, inputs)
+        await manager.start()
+
+        job = manager.submit("reviews.csv")
+        await wait_for(job, FAILED)
+
+        assert "'text' column" in job.error
+
+    @pytest.mark.asyncio
+    async def test_chunks_bypass_cache(self, service, tmp_path, inputs):
+        """Test input is scored in chunk_size batches without touching the cache"""
+        write_jsonl(inputs / "reviews.jsonl", ["good"] * 5)
+        manager = make_manager(service, tmp_path, inputs, chunk_size=2)
+        await manager.start()
+
+        batches = GatedBatches(service.run_batch, open=10)
+        with patch.object(service, 'run_batch', batches):
+            job = manager.submit("reviews.jsonl")
+            await wait_for(job, COMPLETED)
+
+        assert [size for size, _ in batches.calls] == [2, 2, 1]
+        assert all(kwargs['use_cache'] is False for _, kwargs in batches.calls)
+        assert len(service._cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_oversized_line(self, service, tmp_path, inputs):
+        """Test a line over the limit becomes an error and reading carries on"""
+        (inputs / "reviews.jsonl").write_text('"' + "x" * 500 + '"\n"good"\n')
+        manager = make_manager(service, tmp_path, inputs, max_line_bytes=100)
+        await manager.start()
+
+        job = manager.submit("reviews.jsonl")
+        await wait_for(job, COMPLETED)
+
+        results = read_results(job)
+        assert results[0]['error'] == "Line exceeds maximum length"
+        assert results[1]['label'] == 'POSITIVE'
+
+    @pytest.mark.asyncio
+    async def test_overload_backs_off(self, service, tmp_path, inputs):
+        """Test admission rejections are retried instead of failing records"""
+        write_jsonl(inputs / "reviews.jsonl", ["good", "bad"])
+        manager = make_manager(service, tmp_path, inputs)
+        await manager.start()
+        run_batch = service.run_batch
+        attempts = []
+
+        async def overloaded_once(texts, **kwargs):
+            attempts.append(len(texts))
+            if len(attempts) == 1:
+                raise OverloadedError("queue full", 0)
+            return await run_batch(texts, **kwargs)
+
+        with patch.object(service, 'run_batch', overloaded_once):
+            job = manager.submit("reviews.jsonl")
+            await wait_for(job, COMPLETED)
+
+        assert attempts == [2, 2]
+        assert job.failed == 0
+
+
+class TestJobControl:
+    """Test progress, cancellation and resume"""
+
+    @pytest.mark.asyncio
+    async def test_progress_while_running(self, service, tmp_path, inputs):
+        write_jsonl(inputs / "reviews.jsonl", ["good"] * 6)
+        manager = make_manager(service, tmp_path, inputs, chunk_size=2)
+        await manager.start()
+
+        batches = GatedBatches(service.run_batch)
+        with patch.object(service, 'run_batch', batches):
+            job = manager.submit("reviews.jsonl")
+            while job.records < 2:
+                await asyncio.sleep(0.01)
+
+            info = job.info()
+            assert info['status'] == RUNNING
+            assert 0 < info['percent'] < 100
+            assert info['items_per_second'] > 0
+            assert info['eta_seconds'] > 0
+
+            batches.release()
+            await wait_for(job, COMPLETED)
+
+    @pytest.mark.asyncio
+    async def test_cancel_and_resume(self, service, tmp_path, inputs):
+        """Test a cancelled job keeps its results and resumes where it stopped"""
+        write_jsonl(inputs / "reviews.jsonl", [f"good {i}" for i in range(6)])
+        manager = make_manager(service, tmp_path, inputs, chunk_size=2)
+        await manager.start()
+
+        batches = GatedBatches(service.run_batch)
+        with patch.object(service, 'run_batch', batches):
+            job = manager.submit("reviews.jsonl")
+            while len(batches.calls) < 2:
+                await asyncio.sleep(0.01)
+
+            await manager.cancel(job.id)
+            assert job.status == CANCELLED
+            assert [r['index'] for r in read_results(job)] == [0, 1]
+            with pytest.raises(JobStateError):
+                await manager.cancel(job.id)
+
+            batches.release()
+            manager.resume(job.id)
+            await wait_for(job, COMPLETED)
+
+        assert [r['index'] for r in read_results(job)] == list(range(6))
+
+    @pytest.mark.asyncio
+    async def test_resume_after_restart(self, service, tmp_path, inputs):
+        """Test a new manager resumes from the checkpoint, dropping unfinished output"""
+        write_jsonl(inputs / "reviews.jsonl", [{"id": i, "text": "great"} for i in range(7)])
+        first = make_manager(service, tmp_path, inputs, chunk_size=2)
+        await first.start()
+
+        batches = GatedBatches(service.run_batch, open=2)
+        with patch.object(service, 'run_batch', batches):
+            job = first.submit("reviews.jsonl")
+            while len(batches.calls) < 3:
+                await asyncio.sleep(0.01)
+            await first.stop()
+
+        assert job.records == 4
+        # A write that never reached the checkpoint
+        with open(job.output_path, "a") as handle:
+            handle.write('{"index": 4, "partial"')
+
+        second = make_manager(service, tmp_path, inputs, chunk_size=2)
+        await second.start()
+        resumed = second.get(job.id)
+        await wait_for(resumed, COMPLETED)
+
+        results = read_results(resumed)
+        assert [r['id'] for r in results] == list(range(7))
+        assert [r['index'] for r in results] == list(range(7))
+        assert resumed.records == 7
+
+    @pytest.mark.asyncio
+    async def test_finished_jobs_not_rerun(self, service, tmp_path, inputs):
+        write_jsonl(inputs / "reviews.jsonl", ["good"])
+        first = make_manager(service, tmp_path, inputs)
+        await first.start()
+        job = first.submit("reviews.jsonl")
+        await wait_for(job, COMPLETED)
+
+        second = make_manager(service, tmp_path, inputs)
+        await second.start()
+
+        assert second.get(job.id).status == COMPLETED
+        assert not second._tasks
+        with pytest.raises(JobStateError):
+            second.resume(job.id)
+
+
+class TestJobWorkers:
+    """Test several worker processes sharing one JOBS_DIR (one manager per worker)"""
+
+    @pytest.mark.asyncio
+    async def test_restart_runs_each_job_once(self, service, tmp_path, inputs):
+        """Test workers restarting together resume an interrupted job in one of them only"""
+        write_jsonl(inputs / "reviews.jsonl", [{"id": i, "text": "great"} for i in range(6)])
+        first = make_manager(service, tmp_path, inputs, chunk_size=2)
+        await first.start()
+
+        batches = GatedBatches(service.run_batch)
+        with patch.object(service, 'run_batch', batches):
+            job = first.submit("reviews.jsonl")
+            while len(batches.calls) < 2:
+                await asyncio.sleep(0.01)
+            await first.stop()
+
+        workers = [make_manager(service, tmp_path, inputs, chunk_size=2) for _ in range(3)]
+        for worker in workers:
+            await worker.start()
+
+        assert sum(len(worker._tasks) for worker in workers) == 1
+        owner = next(worker for worker in workers if worker._tasks)
+        await wait_for(owner.get(job.id), COMPLETED)
+        for worker in workers:
+            await worker.stop()
+
+        assert [r['id'] for r in read_results(job)] == list(range(6))
+
+    @pytest.mark.asyncio
+    async def test_other_worker_reads_job(self, service, tmp_path, inputs):
+        write_jsonl(inputs / "reviews.jsonl", ["good"] * 4)
+        owner = make_manager(service, tmp_path, inputs, chunk_size=2)
+        other = make_manager(service, tmp_path, inputs, chunk_size=2)
+        await owner.start()
+        await other.start()
+
+        batches = GatedBatches(service.run_batch)
+        with patch.object(service, 'run_batch', batches):
+            job = owner.submit("reviews.jsonl")
+            while job.records < 2:
+                await asyncio.sleep(0.01)
+
+            seen = other.get(job.id)
+            assert seen.status == RUNNING
+            assert seen.records == 2
+            assert seen.info()['items_per_second'] > 0
+            assert [j.id for j in other.jobs()] == [job.id]
+            assert not other._tasks
+
+            batches.release()
+            await wait_for(job, COMPLETED)
+
+        assert other.get(job.id).status == COMPLETED
+        assert other.get(job.id).output_offset == job.output_offset
+        await owner.stop()
+        await other.stop()
+
+    @pytest.mark.asyncio
+    async def test_cancel_and_resume_through_other_worker(self, service, tmp_path, inputs):
+        write_jsonl(inputs / "reviews.jsonl", [f"good {i}" for i in range(6)])
+        owner = make_manager(service, tmp_path, inputs, chunk_size=2, poll_seconds=0.01)
+        other = make_manager(service, tmp_path, inputs, chunk_size=2, poll_seconds=0.01)
+        await owner.start()
+        await other.start()
+
+        batches = GatedBatches(service.run_batch)
+        with patch.object(service, 'run_batch', batches):
+            job = owner.submit("reviews.jsonl")
+            while len(batches.calls) < 2:
+                await asyncio.sleep(0.01)
+
+            cancelled = await other.cancel(job.id)
+            assert cancelled.status == CANCELLED
+            assert job.status == CANCELLED
+            assert not owner._tasks
+            assert [r['index'] for r in read_results(job)] == [0, 1]
+
+            batches.release()
+            resumed = other.resume(job.id)
+            await wait_for(resumed, COMPLETED)
+            assert not owner._tasks
+
+        assert [r['index'] for r in read_results(job)] == list(range(6))
+        await owner.stop()
+        await other.stop()
+
+    @pytest.mark.asyncio
+    async def test_job_of_exited_worker_picked_up(self, service, tmp_path, inputs):
+        write_jsonl(inputs / "reviews.jsonl", ["good"] * 4)
+        first = make_manager(service, tmp_path, inputs, chunk_size=2)
+        second = make_manager(service, tmp_path, inputs, chunk_size=2, poll_seconds=0.01)
+        await first.start()
+        await second.start()
+
+        batches = GatedBatches(service.run_batch)
+        with patch.object(service, 'run_batch', batches):
+            job = first.submit("reviews.jsonl")
+            while len(batches.calls) < 2:
+                await asyncio.sleep(0.01)
+            await first.stop()
+            batches.release()
+
+            # The first worker is gone, so only the second can finish the job
+            await wait_for(second.get(job.id), COMPLETED)
+
+        assert [r['index'] for r in read_results(job)] == list(range(4))
+        await second.stop()
+
+    @pytest.mark.asyncio
+    async def test_finished_jobs_not_reread(self, service, tmp_path, inputs):
+        """Test polls skip finished jobs until their job.json changes"""
+        write_jsonl(inputs / "reviews.jsonl", ["good"] * 4)
+        first = make_manager(service, tmp_path, inputs, chunk_size=2)
+        second = make_manager(service, tmp_path, inputs, chunk_size=2)
+        await first.start()
+        await second.start()
+
+        batches = GatedBatches(service.run_batch)
+        with patch.object(service, 'run_batch', batches):
+            job = first.submit("reviews.jsonl")
+            while len(batches.calls) < 2:
+                await asyncio.sleep(0.01)
+            await first.cancel(job.id)
+
+            with patch.object(second, '_load', wraps=second._load) as load:
+                await second._check()
+                await second._check()
+            assert [c.args for c in load.call_args_list] == [(job.id,)]
+
+            # Resumed and left behind by a worker that stops: read again and picked up
+            first.resume(job.id)
+            await first.stop()
+            batches.release()
+            await second._check()
+            assert job.id in second._tasks
+            await wait_for(second.get(job.id), COMPLETED)
+
+    def test_unknown_ids(self, tmp_path, inputs):
+        manager = make_manager(None, tmp_path, inputs)
+        (tmp_path / "jobs").mkdir()
+
+        for job_id in ("missing", "..", "../jobs", ""):
+            with pytest.raises(JobNotFoundError):
+                manager.get(job_id)
+
+
+class TestJobRetention:
+    """Test finished jobs are deleted on request and after the retention period"""
+
+    @pytest.mark.asyncio
+    async def test_delete(self, service, tmp_path, inputs):
+        write_jsonl(inputs / "reviews.jsonl", ["good"] * 4)
+        manager = make_manager(service, tmp_path, inputs, chunk_size=2)
+        await manager.start()
+
+        batches = GatedBatches(service.run_batch)
+        with patch.object(service, 'run_batch', batches):
+            job = manager.submit("reviews.jsonl")
+            while len(batches.calls) < 2:
+                await asyncio.sleep(0.01)
+            with pytest.raises(JobStateError):
+                await manager.delete(job.id)
+
+            batches.release()
+            await wait_for(job, COMPLETED)
+
+        await manager.delete(job.id)
+        assert not (tmp_path / "jobs" / job.id).exists()
+        with pytest.raises(JobNotFoundError):
+            manager.get(job.id)
+
+    @pytest.mark.asyncio
+    async def test_expired_jobs_removed(self, service, tmp_path, inputs):
+        write_jsonl(inputs / "reviews.jsonl", ["good"])
+        manager = make_manager(service, tmp_path, inputs, retention_seconds=3600)
+        await manager.start()
+        old = manager.submit("reviews.jsonl")
+        new = manager.submit("reviews.jsonl")
+        await wait_for(old, COMPLETED)
+        await wait_for(new, COMPLETED)
+
+        old.finished_at -= 7200
+        manager._save(old)
+        await manager._check()
+
+        assert [job.id for job in manager.jobs()] == [new.id]
+        assert (inputs / "reviews.jsonl").exists()
+
+
+class TestJobInputs:
+    """Test which inputs a job may read"""
+
+    def test_path_must_stay_inside_input_dir(self, tmp_path, inputs):
+        (tmp_path / "secret.jsonl").write_text('"x"\n')
+        manager = make_manager(None, tmp_path, inputs)
+
+        with pytest.raises(PermissionError):
+            manager.submit("../secret.jsonl")
+        with pytest.raises(PermissionError):
+            manager.submit(str(tmp_path / "secret.jsonl"))
+
+    def test_paths_disabled_without_input_dir(self, tmp_path):
+        manager = JobManager(None, jobs_dir=str(tmp_path / "jobs"))
+
+        with pytest.raises(PermissionError):
+            manager.submit("reviews.jsonl")
+
+    def test_missing_file_and_unknown_format(self, tmp_path, inputs):
+        (inputs / "reviews.txt").write_text("good\n")
+        manager = make_manager(None, tmp_path, inputs)
+
+        with pytest.raises(FileNotFoundError):
+            manager.submit("missing.jsonl")
+        with pytest.raises(ValueError):
+            manager.submit("reviews.txt")
+
+
+class TestJobEndpoints:
+    """Test the /jobs API over a live manager"""
+
+    @pytest.fixture
+    async def client(self, service, tmp_path, inputs):
+        import httpx
+        from main import app
+        from api.jobs import get_job_manager
+
+        manager = make_manager(service, tmp_path, inputs)
+        await manager.start()
+        app.dependency_overrides[get_job_manager] = lambda: manager
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+        await manager.stop()
+        app.dependency_overrides.clear()
+
+    async def wait_done(self, client, job_id):
+        for _ in range(500):
+            info = (await client.get(f"/api/v1/jobs/{job_id}")).json()
+            if info['status'] not in ("queued", "running"):
+                return info
+            await asyncio.sleep(0.01)
+        raise AssertionError("job did not finish")
+
+    @pytest.mark.asyncio
+    async def test_upload_and_fetch_results(self, client):
+        body = b'{"id": "a", "text": "this is great"}\n{"id": "b", "text": "awful"}\n'
+        response = await client.post("/api/v1/jobs/upload?format=jsonl", content=body)
+
+        assert response.status_code == 202
+        job_id = response.json()['id']
+        info = await self.wait_done(client, job_id)
+        assert info['status'] == COMPLETED
+        assert info['records'] == 2
+
+        results = await client.get(f"/api/v1/jobs/{job_id}/results")
+        assert results.headers['content-type'].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in results.text.splitlines()]
+        assert [line['id'] for line in lines] == ["a", "b"]
+
+        listing = (await client.get("/api/v1/jobs")).json()
+        assert [job['id'] for job in listing['jobs']] == [job_id]
+
+    @pytest.mark.asyncio
+    async def test_submit_local_file(self, client, inputs):
+        (inputs / "reviews.csv").write_text("text\ngood\n")
+        response = await client.post("/api/v1/jobs", json={"input_path": "reviews.csv", "long_document": True})
+
+        assert response.status_code == 202
+        assert response.json()['aggregation'] == "mean"
+        info = await self.wait_done(client, response.json()['id'])
+        assert info['status'] == COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_errors(self, client):
+        assert (await client.get("/api/v1/jobs/nope")).status_code == 404
+        assert (await client.post("/api/v1/jobs/nope/cancel")).status_code == 404
+        assert (await client.post("/api/v1/jobs", json={"input_path": "../x.jsonl"})).status_code == 403
+        assert (await client.post("/api/v1/jobs", json={"input_path": "missing.jsonl"})).status_code == 404
+        response = await client.post("/api/v1/jobs", json={"input_path": "x.jsonl", "model": "unknown"})
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_delete(self, client):
+        response = await client.post("/api/v1/jobs/upload?format=jsonl", content=b'"good"\n')
+        job_id = response.json()['id']
+        await self.wait_done(client, job_id)
+
+        response = await client.delete(f"/api/v1/jobs/{job_id}")
+        assert response.status_code == 200
+        assert response.json()['status'] == "deleted"
+        assert (await client.get(f"/api/v1/jobs/{job_id}")).status_code == 404
+        assert (await client.delete(f"/api/v1/jobs/{job_id}")).status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_upload_limit(self, client):
+        from config import settings
+
+        with patch.object(settings, 'JOBS_MAX_UPLOAD_BYTES', 10):
+            response = await client.post("/api/v1/jobs/upload?format=jsonl", content=b'"good"\n' * 10)
+
+        assert response.status_code == 413
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
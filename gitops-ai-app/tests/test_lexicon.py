@@ -0,0 +1,93 @@
+"""
+Lexicon Scorer Tests - CI Test Layer
+Unit tests for the fallback lexicon model
+"""
+import pytest
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+
+class TestLexiconScorer:
+    """Test weighted lexicon scoring"""
+
+    @pytest.fixture
+    def scorer(self):
+        from models.lexicon import LexiconScorer
+        return LexiconScorer.default()
+
+    def test_positive(self, scorer):
+        """Test positive words give a positive label"""
+        result = scorer.score("This is GREAT, and amazing!")
+
+        assert result == {'label': 'POSITIVE', 'confidence': 1.0, 'score': 1.0}
+
+    def test_mixed(self, scorer):
+        """Test confidence reflects the share of positive weight"""
+        result = scorer.score("good, great but awful")
+
+        assert result['label'] == 'POSITIVE'
+        assert result['confidence'] == pytest.approx(0.5 + (2 / 3) * 0.5)
+
+    def test_repeated_word_counts_once(self, scorer):
+        """Test each distinct word contributes once"""
+        assert scorer.score("bad bad bad good")['label'] == 'NEGATIVE'
+
+    def test_neutral(self, scorer):
+        """Test no lexicon words gives neutral"""
+        assert scorer.score("The sky is blue") == {'label': 'NEUTRAL', 'confidence': 0.5, 'score': 0.0}
+
+    def test_batch_matches_single(self, scorer):
+        """Test batch scoring equals per-text scoring"""
+        texts = ["Great!", "terrible... awful", "", "neutral text", "love it\nhate it", "sad\x00happy"]
+
+        assert scorer.score_batch(texts) == [scorer.score(t) for t in texts]
+
+    def test_load_weighted_file(self, tmp_path):
+        """Test weights from a lexicon file are applied"""
+        from models.lexicon import LexiconScorer
+
+        path = tmp_path / "lexicon.tsv"
+        path.write_text("# custom lexicon\nsuperb\t3\nmeh\t-1\n")
+        scorer = LexiconScorer.from_file(str(path))
+
+        result = scorer.score("superb but meh")
+        assert result['label'] == 'POSITIVE'
+        assert result['confidence'] == pytest.approx(0.875)
+
+    def test_invalid_file_rejected(self, tmp_path):
+        """Test malformed lexicon lines raise"""
+        from models.lexicon import LexiconScorer
+
+        path = tmp_path / "lexicon.tsv"
+        path.write_text("superb three\n")
+
+        with pytest.raises(ValueError):
+            LexiconScorer.from_file(str(path))
+
+    @pytest.mark.parametrize("entry", ["well-made\t2", "can't\t-1", "not bad\t1", "--\t1"])
+    def test_multi_token_entry_rejected(self, tmp_path, entry):
+        """Test entries that tokenize to several words (or none) raise instead of never matching"""
+        from models.lexicon import LexiconScorer
+
+        path = tmp_path / "lexicon.tsv"
+        path.write_text(f"superb\t3\n{entry}\n")
+
+        with pytest.raises(ValueError, match="lexicon.tsv:2"):
+            LexiconScorer.from_file(str(path))
+
+    def test_entries_normalized_like_text(self):
+        """Test keys are matched after the same tokenization as texts"""
+        from models.lexicon import LexiconScorer
+
+        scorer = LexiconScorer({'Superb!': 2.0, 'meh': -1.0})
+
+        assert scorer.score("SUPERB, really")['label'] == 'POSITIVE'
+        with pytest.raises(ValueError, match="not a single word"):
+            LexiconScorer({'well-made': 1.0})
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
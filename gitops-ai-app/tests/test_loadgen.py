@@ -0,0 +1,111 @@
+"""
+Load Generator Tests - CI Test Layer
+Unit tests for the open-loop load generator
+"""
+import random
+import pytest
+import sys
+import os
+
+import httpx
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+
+def make_client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://test")
+
+
+class TestHelpers:
+    """Test parsing and statistics helpers"""
+
+    def test_parse_lengths(self):
+        """Test length mix parsing"""
+        from tools.loadgen import parse_lengths
+
+        assert parse_lengths("short=0.7,long=0.3") == {'short': 0.7, 'long': 0.3}
+        with pytest.raises(ValueError):
+            parse_lengths("huge=1")
+
+    def test_percentile_nearest_rank(self):
+        """Test nearest-rank percentiles"""
+        from tools.loadgen import percentile
+
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 99) == 99.0
+        assert percentile([], 99) == 0.0
+
+    def test_mix_respects_batch_ratio(self):
+        """Test batch requests are generated at the configured share"""
+        from tools.loadgen import BATCH_PATH, TrafficMix
+
+        mix = TrafficMix(batch_ratio=0.25, batch_size=4)
+        rng = random.Random(0)
+        requests = [mix.make_request(rng) for _ in range(2000)]
+        batches = [r for r in requests if r[0] == BATCH_PATH]
+
+        assert 0.2 < len(batches) / len(requests) < 0.3
+        assert all(len(body['texts']) == 4 == count for _, body, count in batches)
+
+    def test_knee(self):
+        """Test the highest passing rate is reported"""
+        from tools.loadgen import knee
+
+        steps = [
+            {'offered_rps': 10, 'p99_ms': 20, 'error_rate': 0.0},
+            {'offered_rps': 50, 'p99_ms': 80, 'error_rate': 0.0},
+            {'offered_rps': 100, 'p99_ms': 900, 'error_rate': 0.2},
+        ]
+        assert knee(steps, slo_ms=100, max_error_rate=0.01) == 50
+        assert knee(steps, slo_ms=5, max_error_rate=0.01) is None
+
+
+class TestRunStep:
+    """Test fixed-rate steps against a mock transport"""
+
+    @pytest.mark.asyncio
+    async def test_open_loop_rate_and_errors(self):
+        """Test arrivals follow the offered rate and errors are counted"""
+        from tools.loadgen import TrafficMix, run_step
+
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.path)
+            status = 429 if len(calls) % 10 == 0 else 200
+            return httpx.Response(status, json={})
+
+        async with make_client(handler) as client:
+            result = await run_step(client, rate=400, duration=0.5, mix=TrafficMix(), rng=random.Random(1))
+
+        summary = result.summary()
+        assert 120 < result.sent < 280
+        assert result.sent == len(calls)
+        assert summary['errors'] == {'429': result.sent // 10}
+        assert summary['completed'] == result.sent - result.sent // 10
+        assert summary['p50_ms'] >= 0
+
+    @pytest.mark.asyncio
+    async def test_client_overload(self):
+        """Test arrivals beyond max_in_flight are not sent"""
+        import asyncio
+        from tools.loadgen import TrafficMix, run_step
+
+        async def slow_handler(request):
+            await asyncio.sleep(0.3)
+            return httpx.Response(200, json={})
+
+        async with make_client(slow_handler) as client:
+            result = await run_step(
+                client, rate=200, duration=0.2, mix=TrafficMix(),
+                rng=random.Random(2), max_in_flight=5
+            )
+
+        assert result.completed == 5
+        assert result.errors['client_overload'] == result.sent - 5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,300 @@
+"""
+Long-Document Tests - CI Test Layer
+Sliding-window scoring, aggregation and the long_document request option
+"""
+import pytest
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models.sentiment_model import spread_indexes
+
+DOCUMENT = "this is a great product . " * 40 + "the sky is blue , i hate it ! " * 30
+
+
+@pytest.fixture(scope="module")
+def model(tiny_model_dir):
+    pytest.importorskip("torch")
+    from models.sentiment_model import SentimentModel
+
+    return SentimentModel(model_name=tiny_model_dir, backend="transformers", batch_size=4)
+
+
+class TestSpreadIndexes:
+    """Test window selection under the per-document cap"""
+
+    def test_under_cap_keeps_all(self):
+        assert spread_indexes(3, 5) == [0, 1, 2]
+
+    def test_over_cap_spans_document(self):
+        """Test capped windows still cover the start and the end"""
+        assert spread_indexes(10, 4) == [0, 3, 6, 9]
+        assert spread_indexes(10, 1) == [0]
+
+
+class TestWindows:
+    """Test token windowing in the PyTorch backend"""
+
+    def test_windows_overlap_by_stride(self, model):
+        """Test consecutive windows share ``stride`` content tokens"""
+        backend = model._pipeline
+        windows, owners = backend.windows([DOCUMENT], stride=16, max_windows=100)
+
+        assert len(windows) > 2
+        assert set(owners) == {0}
+        assert all(len(w) <= backend.max_length for w in windows)
+        first, second = windows[0][1:-1], windows[1][1:-1]
+        assert first[-16:] == second[:16]
+
+    def test_cost_grows_linearly(self, model):
+        """Test window count is proportional to document length"""
+        backend = model._pipeline
+        one, _ = backend.windows([DOCUMENT], stride=16, max_windows=1000)
+        four, _ = backend.windows([DOCUMENT * 4], stride=16, max_windows=1000)
+
+        assert 3.5 <= len(four) / len(one) <= 4.5
+
+    def test_window_cap(self, model):
+        """Test no document produces more than max_windows windows"""
+        windows, owners = model._pipeline.windows([DOCUMENT * 4, "good"], stride=16, max_windows=3)
+
+        assert owners == [0, 0, 0, 1]
+
+
+class TestPredictDocuments:
+    """Test aggregation of window scores into document scores"""
+
+    def test_short_text_matches_truncated(self, model):
+        """Test a text that fits one window scores like predict_batch"""
+        documents = model.predict_documents(["this is great", "i hate it"])
+        batch = model.predict_batch(["this is great", "i hate it"])
+
+        for doc, plain in zip(documents, batch):
+            assert doc['windows'] == 1
+            assert doc['label'] == plain['label']
+            assert doc['confidence'] == pytest.approx(plain['confidence'], abs=1e-5)
+
+    def test_aggregations(self, model):
+        """Test each aggregation against window probabilities computed directly"""
+        import torch
+
+        backend = model._pipeline
+        windows, _ = backend.windows([DOCUMENT], stride=16, max_windows=100)
+        probs = backend.probabilities(windows)
+        lengths = torch.tensor([len(w) - 2 for w in windows], dtype=probs.dtype)
+        expected = {
+            'mean': probs.mean(dim=0).max().item(),
+            'max_confidence': probs.max(dim=-1).values.max().item(),
+            'length_weighted': ((probs * lengths[:, None]).sum(dim=0) / lengths.sum()).max().item(),
+        }
+
+        for aggregation, confidence in expected.items():
+            result = model.predict_documents([DOCUMENT], aggregation, max_windows=100, stride=16)[0]
+            assert result['windows'] == len(windows)
+            assert result['confidence'] == pytest.approx(confidence, abs=1e-5), aggregation
+
+    def test_windows_packed_across_documents(self, model):
+        """Test windows of all documents share model batches"""
+        backend = model._pipeline
+        texts = [DOCUMENT, "good", DOCUMENT]
+        windows, _ = backend.windows(texts, stride=64, max_windows=16)
+        widths = []
+        forward = backend.forward
+
+        def spy(ids):
+            widths.append(len(ids))
+            return forward(ids)
+
+        backend.forward = spy
+        try:
+            results = model.predict_documents(texts)
+        finally:
+            del backend.forward
+
+        assert sum(widths) == len(windows)
+        assert len(widths) == -(-len(windows) // model.batch_size)
+        assert [r['windows'] for r in results] == [len(windows) // 2, 1, len(windows) // 2]
+
+    def test_unknown_aggregation(self, model):
+        with pytest.raises(ValueError):
+            model.predict_documents(["good"], "median")
+
+    def test_pipeline_backend_windows(self, tiny_model_dir, model):
+        """Test the HF pipeline backend scores long documents in windows too"""
+        from models.sentiment_model import SentimentModel
+
+        pipeline_model = SentimentModel(model_name=tiny_model_dir, backend="pipeline", batch_size=4)
+        result = pipeline_model.predict_documents([DOCUMENT], stride=16)[0]
+        expected = model.predict_documents([DOCUMENT], stride=16)[0]
+
+        assert result['windows'] == expected['windows'] > 1
+        assert result['confidence'] == pytest.approx(expected['confidence'], abs=1e-5)
+
+    def test_mock_backend_scores_whole_text(self):
+        """Test the lexicon model reports a single window"""
+        from models.sentiment_model import SentimentModel
+
+        mock = SentimentModel(model_name="mock", backend="mock")
+        result = mock.predict_documents([DOCUMENT])[0]
+
+        assert result['windows'] == 1
+        assert result['label'] in ('POSITIVE', 'NEGATIVE', 'NEUTRAL')
+
+
+class TestLongDocumentBatching:
+    """Test long-document items are batched apart from truncated ones"""
+
+    @pytest.mark.asyncio
+    async def test_aggregation_splits_model_calls(self):
+        from services.batching import MicroBatcher
+
+        calls = []
+
+        def predict_batch(texts, model=None, aggregation=None):
+            calls.append((tuple(texts), aggregation))
+            return [{'label': 'POSITIVE', 'confidence': 0.9, 'score': 0.9} for _ in texts]
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            batcher = MicroBatcher(predict_batch, executor, max_batch_size=8, max_wait_ms=20)
+            model = object()
+            await asyncio.gather(
+                batcher.submit("a", model=model),
+                batcher.submit("b", model=model, aggregation="mean"),
+                batcher.submit("c", model=model, aggregation="mean"),
+            )
+            await batcher.stop()
+
+        assert set(calls) == {(("b", "c"), "mean"), (("a",), None)}
+
+
+class TestLongDocumentService:
+    """Test InferenceService long-document mode on the mock backend"""
+
+    @pytest.mark.asyncio
+    async def test_run_and_cache_namespace(self):
+        """Test windows are reported and cached apart from truncated results"""
+        from config import settings
+        from services.inference_service import InferenceService
+
+        with patch.object(settings, 'MODEL_BACKEND', 'mock'), \
+                patch.object(settings, 'WARMUP_ENABLED', False):
+            service = InferenceService()
+            await service.initialize()
+            try:
+                with patch.object(service.model, 'predict_documents', wraps=service.model.predict_documents) as spy:
+                    plain = await service.run(DOCUMENT)
+                    long = await service.run(DOCUMENT, aggregation="mean")
+                    await service.run(DOCUMENT, aggregation="mean")
+                    batch = await service.run_batch([DOCUMENT, "good"], aggregation="max_confidence")
+            finally:
+                await service.cleanup()
+
+        assert 'windows' not in plain
+        assert long['windows'] == 1
+        assert [r['windows'] for r in batch] == [1, 1]
+        # Second long run is a cache hit; the batch uses another aggregation
+        assert spy.call_count == 2
+
+    def test_document_preprocessor_keeps_long_text(self):
+        """Test long documents are not cut at PREPROCESS_MAX_CHARS"""
+        from config import settings
+        from services.inference_service import InferenceService
+
+        async def preprocess():
+            with patch.object(settings, 'MODEL_BACKEND', 'mock'), \
+                    patch.object(settings, 'WARMUP_ENABLED', False), \
+                    patch.object(settings, 'PREPROCESS_MAX_CHARS', 100):
+                service = InferenceService()
+                await service.initialize()
+                try:
+                    return service.preprocessor.preprocess(DOCUMENT), service.document_preprocessor.preprocess(DOCUMENT)
+                finally:
+                    await service.cleanup()
+
+        short, full = asyncio.run(preprocess())
+
+        assert len(short) <= 100
+        assert len(full) > 1000
+
+
+class TestLongDocumentEndpoint:
+    """Test the long_document request option"""
+
+    @pytest.fixture
+    def mock_service(self):
+        mock = MagicMock()
+        mock.is_ready.return_value = True
+        mock.model_name = "test-model"
+        mock.model_label.return_value = "test-model"
+        mock.run = AsyncMock(return_value={
+            'label': 'POSITIVE', 'confidence': 0.8, 'sentiment_score': 0.8, 'windows': 3
+        })
+        mock.run_batch = AsyncMock(side_effect=lambda texts, **kwargs: [
+            {'label': 'POSITIVE', 'confidence': 0.8, 'sentiment_score': 0.8, 'windows': 2}
+            for _ in texts
+        ])
+        return mock
+
+    @pytest.fixture
+    def client(self, mock_service):
+        from main import app
+        from api.predict import get_inference_service
+
+        app.dependency_overrides[get_inference_service] = lambda: mock_service
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+
+    def test_single(self, client, mock_service):
+        """Test long_document selects the configured default aggregation"""
+        from config import settings
+
+        response = client.post("/api/v1/predict", json={"text": DOCUMENT, "long_document": True})
+
+        assert response.status_code == 200
+        assert response.json()["result"]["windows"] == 3
+        assert mock_service.run.call_args.kwargs["aggregation"] == settings.LONG_DOC_AGGREGATION
+
+    def test_batch_with_aggregation(self, client, mock_service):
+        response = client.post("/api/v1/predict/batch", json={
+            "texts": [DOCUMENT, "good"], "long_document": True, "aggregation": "length_weighted"
+        })
+
+        assert response.status_code == 200
+        assert [r["windows"] for r in response.json()["results"]] == [2, 2]
+        assert mock_service.run_batch.call_args.kwargs["aggregation"] == "length_weighted"
+
+    def test_default_mode_truncates(self, client, mock_service):
+        """Test requests without long_document pass no aggregation"""
+        client.post("/api/v1/predict", json={"text": "good", "aggregation": "mean"})
+
+        assert mock_service.run.call_args.kwargs["aggregation"] is None
+
+    def test_default_mode_response_shape(self, client, mock_service):
+        """Test responses outside long-document mode carry no windows key"""
+        mock_service.run.return_value = {'label': 'POSITIVE', 'confidence': 0.8, 'sentiment_score': 0.8}
+        mock_service.run_batch.side_effect = lambda texts, **kwargs: [
+            {'label': 'POSITIVE', 'confidence': 0.8, 'sentiment_score': 0.8} for _ in texts
+        ]
+
+        single = client.post("/api/v1/predict", json={"text": "good"}).json()
+        batch = client.post("/api/v1/predict/batch", json={"texts": ["good", "bad"]}).json()
+
+        assert 'windows' not in single['result']
+        assert all('windows' not in result for result in batch['results'])
+
+    def test_unknown_aggregation_rejected(self, client):
+        response = client.post("/api/v1/predict", json={
+            "text": "good", "long_document": True, "aggregation": "median"
+        })
+
+        assert response.status_code == 422
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
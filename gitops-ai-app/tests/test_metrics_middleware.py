@@ -0,0 +1,171 @@
+"""
+Metrics Middleware Tests - CI Test Layer
+Unit tests for route-template request metrics and stage timings
+"""
+import pytest
+import asyncio
+from unittest.mock import patch
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from api.metrics import MetricsMiddleware, UNMATCHED_ROUTE, timed_endpoint
+from utils.timing import current_timings, record_stage, timed_stage
+
+
+def request_count(endpoint, status, method="GET"):
+    return REGISTRY.get_sample_value(
+        'http_requests_total', {'method': method, 'endpoint': endpoint, 'status': str(status)}
+    ) or 0.0
+
+
+def stage_count(stage):
+    return REGISTRY.get_sample_value('request_stage_duration_seconds_count', {'stage': stage}) or 0.0
+
+
+def make_app(server_timing=True):
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, server_timing=server_timing)
+
+    @app.get("/items/{item_id}")
+    @timed_endpoint
+    async def get_item(item_id: int):
+        with timed_stage("inference"):
+            await asyncio.sleep(0)
+        record_stage("queue", 0.002)
+        return {"id": item_id}
+
+    @app.get("/missing")
+    async def missing():
+        raise HTTPException(status_code=404)
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    return app
+
+
+class TestMetricsMiddleware:
+    """Test request metrics are labelled by route template"""
+
+    def test_labels_by_route_template(self):
+        """Test different path parameters share one label"""
+        client = TestClient(make_app())
+        before = request_count("/items/{item_id}", 200)
+
+        for item_id in range(5):
+            assert client.get(f"/items/{item_id}").status_code == 200
+
+        assert request_count("/items/{item_id}", 200) - before == 5
+        assert request_count("/items/3", 200) == 0
+
+    def test_unmatched_paths_share_one_label(self):
+        """Test scanner paths do not create new label values"""
+        client = TestClient(make_app())
+        before = request_count(UNMATCHED_ROUTE, 404)
+
+        for path in ("/wp-login.php", "/.env", "/a/b/c"):
+            assert client.get(path).status_code == 404
+
+        assert request_count(UNMATCHED_ROUTE, 404) - before == 3
+        assert request_count("/.env", 404) == 0
+
+    def test_handled_error_status(self):
+        """Test HTTPExceptions are counted with their status and route"""
+        client = TestClient(make_app())
+        before = request_count("/missing", 404)
+
+        client.get("/missing")
+
+        assert request_count("/missing", 404) - before == 1
+
+    def test_unhandled_error_counted_as_500(self):
+        """Test an exception escaping the app is still counted"""
+        client = TestClient(make_app(), raise_server_exceptions=False)
+        before = request_count("/boom", 500)
+
+        assert client.get("/boom").status_code == 500
+        assert request_count("/boom", 500) - before == 1
+
+    def test_unknown_method_folded(self):
+        """Test arbitrary methods do not create new label values"""
+        client = TestClient(make_app())
+        before = request_count("/items/{item_id}", 405, method="OTHER")
+
+        assert client.request("BREW", "/items/1").status_code == 405
+        assert request_count("/items/{item_id}", 405, method="OTHER") - before == 1
+        assert request_count("/items/{item_id}", 405, method="BREW") == 0
+
+    def test_installed_on_app(self):
+        """Test the service records request metrics, as it always has"""
+        from api.metrics import MetricsMiddleware
+        from main import app
+
+        assert any(middleware.cls is MetricsMiddleware for middleware in app.user_middleware)
+
+
+class TestServerTiming:
+    """Test the per-request stage breakdown"""
+
+    def test_header_lists_stages(self):
+        """Test recorded stages, serialization and total appear in order"""
+        client = TestClient(make_app())
+
+        header = client.get("/items/1").headers["server-timing"]
+        names = [part.split(";")[0] for part in header.split(", ")]
+
+        assert names == ["inference", "queue", "serialize", "total"]
+        assert "queue;dur=2.00" in header
+
+    def test_stage_histograms(self):
+        """Test stages are observed in the histogram"""
+        client = TestClient(make_app())
+        before = stage_count("serialize")
+
+        client.get("/items/1")
+
+        assert stage_count("serialize") - before == 1
+
+    def test_header_can_be_disabled(self):
+        """Test Server-Timing is omitted when turned off"""
+        client = TestClient(make_app(server_timing=False))
+
+        assert "server-timing" not in client.get("/items/1").headers
+
+    def test_record_outside_request(self):
+        """Test stages outside a request are still observed"""
+        before = stage_count("preprocess")
+
+        assert current_timings() is None
+        record_stage("preprocess", 0.001)
+
+        assert stage_count("preprocess") - before == 1
+
+    def test_predict_reports_service_stages(self):
+        """Test a real prediction reports its service stages"""
+        import httpx
+        from config import settings
+        from main import app
+
+        async def predict():
+            async with app.router.lifespan_context(app):
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                    return await client.post("/api/v1/predict", json={"text": "great product"})
+
+        with patch.object(settings, 'MODEL_BACKEND', 'mock'):
+            response = asyncio.run(predict())
+        names = {part.split(";")[0] for part in response.headers["server-timing"].split(", ")}
+
+        assert response.status_code == 200
+        assert {"preprocess", "inference", "serialize", "total"} <= names
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
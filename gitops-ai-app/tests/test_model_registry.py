@@ -0,0 +1,492 @@
+"""
+Model Registry Tests - CI Test Layer
+Unit tests for per-request model selection, LRU eviction and hot swap
+"""
+import pytest
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services.model_registry import ModelNotFoundError, ModelRegistry
+
+MB = 2**20
+
+
+class FakeModel:
+    """Model stand-in with a fixed size that records closing"""
+
+    def __init__(self, name, version=None, size=100 * MB):
+        self.name = name
+        self.version = version
+        self.size = size
+        self.closed = False
+
+    def memory_bytes(self):
+        return self.size
+
+    def close(self):
+        self.closed = True
+
+    def is_loaded(self):
+        return True
+
+    def predict(self, text):
+        return {'label': 'POSITIVE', 'confidence': 0.9, 'score': 0.9, 'model': self.name}
+
+    def predict_batch(self, texts):
+        return [self.predict(text) for text in texts]
+
+
+@pytest.fixture
+def executor():
+    executor = ThreadPoolExecutor(max_workers=2)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def make_registry(executor, budget_mb=250, allowed=("a", "b", "c"), pinned=("a",), loader=None):
+    loads = []
+
+    def default_loader(name, version):
+        loads.append((name, version))
+        return FakeModel(name, version)
+
+    registry = ModelRegistry(
+        loader=loader or default_loader,
+        memory_budget_bytes=budget_mb * MB,
+        allowed=allowed,
+        pinned=pinned,
+        executor=executor
+    )
+    return registry, loads
+
+
+class TestModelRegistry:
+    """Test loading, eviction and swapping"""
+
+    @pytest.mark.asyncio
+    async def test_loads_on_first_use(self, executor):
+        """Test a model is loaded once and reused"""
+        registry, loads = make_registry(executor)
+
+        async with registry.use("b") as entry:
+            assert entry.model.name == "b"
+        async with registry.use("b"):
+            pass
+
+        assert loads == [("b", None)]
+        assert registry.memory_used == 100 * MB
+
+    @pytest.mark.asyncio
+    async def test_unknown_model_rejected(self, executor):
+        """Test names outside the allowlist are never loaded"""
+        registry, loads = make_registry(executor)
+
+        with pytest.raises(ModelNotFoundError):
+            await registry.acquire("evil/model")
+        with pytest.raises(ModelNotFoundError):
+            await registry.swap("evil/model")
+        assert loads == []
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self, executor):
+        """Test waiting requests do not each load the model"""
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow_loader(name, version):
+            calls.append(name)
+            started.set()
+            release.wait(5)
+            return FakeModel(name)
+
+        registry, _ = make_registry(executor, loader=slow_loader)
+
+        async def use_once():
+            async with registry.use("b") as entry:
+                return entry
+
+        tasks = [asyncio.ensure_future(use_once()) for _ in range(5)]
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        release.set()
+        entries = await asyncio.gather(*tasks)
+
+        assert calls == ["b"]
+        assert len({id(entry) for entry in entries}) == 1
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_under_budget(self, executor):
+        """Test the least recently used unpinned model is evicted"""
+        registry, _ = make_registry(executor)
+        registry.install("a", FakeModel("a"))
+
+        async with registry.use("b") as b:
+            pass
+        async with registry.use("a"):
+            pass
+        async with registry.use("c"):
+            pass
+
+        assert [entry.name for entry in registry.entries()] == ["a", "c"]
+        assert b.retired and b.model.closed
+        assert registry.memory_used <= registry.memory_budget
+
+    @pytest.mark.asyncio
+    async def test_pinned_model_never_evicted(self, executor):
+        """Test the default model stays even when it is least recently used"""
+        registry, _ = make_registry(executor, budget_mb=150)
+        registry.install("a", FakeModel("a"))
+
+        async with registry.use("b"):
+            pass
+
+        assert registry.peek("a") is not None
+        assert registry.peek("b") is not None
+
+    @pytest.mark.asyncio
+    async def test_known_size_makes_room_before_loading(self, executor):
+        """Test a reload evicts first when its size is already known"""
+        sizes_during_load = []
+        registry, _ = make_registry(executor, budget_mb=200, pinned=())
+
+        def loader(name, version):
+            sizes_during_load.append(registry.memory_used)
+            return FakeModel(name)
+
+        registry._loader = loader
+        async with registry.use("a"):
+            pass
+        async with registry.use("b"):
+            pass
+        async with registry.use("c"):
+            pass
+        async with registry.use("a"):
+            pass
+
+        assert sizes_during_load[-1] <= 100 * MB
+
+    @pytest.mark.asyncio
+    async def test_swap_keeps_in_flight_on_old_version(self, executor):
+        """Test a swap only affects requests that start after it"""
+        registry, loads = make_registry(executor)
+        registry.install("a", FakeModel("a", "v1"), "v1")
+
+        old = await registry.acquire("a")
+        new = await registry.swap("a", "v2")
+
+        assert registry.peek("a") is new
+        assert new.model.version == "v2"
+        assert old.retired and not old.model.closed
+
+        async with registry.use("a") as entry:
+            assert entry is new
+
+        registry.release(old)
+        assert old.model.closed
+        assert loads == [("a", "v2")]
+
+    @pytest.mark.asyncio
+    async def test_evicted_model_reloads_swapped_version(self, executor):
+        """Test eviction does not silently revert a swap to CURRENT"""
+        registry, loads = make_registry(executor, budget_mb=250)
+        registry.install("a", FakeModel("a"))
+        await registry.swap("b", "v2")
+        async with registry.use("c"):
+            pass
+        async with registry.use("b") as entry:
+            assert entry.version == "v2"
+
+        assert loads == [("b", "v2"), ("c", None), ("b", "v2")]
+
+    @pytest.mark.asyncio
+    async def test_acquire_timeout_keeps_loading(self, executor):
+        """Test a request that gives up does not cancel the load"""
+        release = threading.Event()
+
+        def slow_loader(name, version):
+            release.wait(5)
+            return FakeModel(name)
+
+        registry, _ = make_registry(executor, loader=slow_loader)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await registry.acquire("b", timeout=0.05)
+        release.set()
+
+        async with registry.use("b", timeout=5) as entry:
+            assert entry.model.name == "b"
+
+    @pytest.mark.asyncio
+    async def test_close_releases_all(self, executor):
+        """Test shutdown closes every model"""
+        registry, _ = make_registry(executor)
+        async with registry.use("a") as a, registry.use("b") as b:
+            pass
+
+        await registry.close()
+
+        assert registry.entries() == []
+        assert a.model.closed and b.model.closed
+
+
+class TestServiceModelSelection:
+    """Test InferenceService routes requests to the named model"""
+
+    @pytest.fixture
+    async def service(self):
+        from config import settings
+        from services.inference_service import InferenceService
+
+        with patch.object(settings, 'MODEL_NAMES', ["other"]), \
+                patch.object(settings, 'WARMUP_ENABLED', False):
+            service = InferenceService()
+            with patch.object(service, '_load_model', side_effect=lambda name=None, version=None: FakeModel(
+                name or service.model_name, version
+            )):
+                await service.initialize()
+                yield service
+                await service.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_default_and_named_model(self, service):
+        """Test single and batch requests use the requested model"""
+        default = await service.run("good")
+        other = await service.run("good", model="other")
+        batch = await service.run_batch(["good", "fine"], model="other")
+
+        assert default['model'] == service.model_name
+        assert other['model'] == "other"
+        assert [r['model'] for r in batch] == ["other", "other"]
+
+    @pytest.mark.asyncio
+    async def test_unknown_model(self, service):
+        """Test an unknown name raises instead of loading"""
+        with pytest.raises(ModelNotFoundError):
+            await service.run("good", model="missing")
+
+    @pytest.mark.asyncio
+    async def test_unknown_model_checked_before_admission(self, service):
+        """Test an overloaded service still answers an unknown model with 404, not 429"""
+        from services.admission import OverloadedError
+
+        service._admission = MagicMock()
+        service._admission.admit.side_effect = OverloadedError('queue_full', 1)
+
+        with pytest.raises(ModelNotFoundError):
+            await service.run("good", model="missing")
+        with pytest.raises(ModelNotFoundError):
+            await service.run_batch(["good"], model="missing")
+        with pytest.raises(OverloadedError):
+            await service.run("good", model="other")
+
+    def test_model_label(self, service):
+        """Test metrics labels are registry names, never arbitrary client input"""
+        assert service.model_label() == service.model_name
+        assert service.model_label("other") == "other"
+        assert service.model_label("x" * 200) == "unknown"
+
+    @pytest.mark.asyncio
+    async def test_swap_default(self, service):
+        """Test swapping the default model changes service.model"""
+        entry = await service.swap_model(version="v2")
+
+        assert service.model is entry.model
+        assert entry.model.version == "v2"
+
+    @pytest.mark.asyncio
+    async def test_list_models(self, service):
+        """Test loaded and available models are listed"""
+        await service.run("good", model="other")
+        models = {m['name']: m for m in service.list_models()}
+
+        assert models[service.model_name]['default'] is True
+        assert models["other"]['status'] == 'loaded'
+        assert models["other"]['memory_bytes'] == 100 * MB
+
+
+class TestSharedSwaps:
+    """Test swaps reach every worker through the swap state file"""
+
+    def test_state_sequence(self, tmp_path):
+        from services.swap_sync import SwapState
+
+        state = SwapState(str(tmp_path / "swaps.json"))
+        assert state.read() == {}
+
+        assert state.publish("a", "v2") == 1
+        assert state.publish("b", None) == 2
+        assert state.publish("a", "v2") == 3
+        assert state.read() == {'a': {'version': 'v2', 'seq': 3}, 'b': {'version': None, 'seq': 2}}
+
+    @pytest.fixture
+    async def workers(self, tmp_path):
+        """Two services sharing one swap state file, as two workers would"""
+        from config import settings
+        from services.inference_service import InferenceService
+
+        services = []
+        with patch.object(settings, 'MODEL_NAMES', ["other"]), \
+                patch.object(settings, 'WARMUP_ENABLED', False), \
+                patch.object(settings, 'MODEL_SWAP_POLL_SECONDS', 0.01), \
+                patch.object(settings, 'MODEL_SWAP_STATE_FILE', str(tmp_path / "swaps.json")), \
+                patch.object(InferenceService, '_load_model', side_effect=lambda name=None, version=None: FakeModel(
+                    name or settings.MODEL_NAME, version
+                )):
+
+            async def start():
+                service = InferenceService()
+                await service.initialize()
+                services.append(service)
+                return service
+
+            yield start
+            for service in services:
+                await service.cleanup()
+
+    def test_which_processes_reach_all_workers(self):
+        """Test only spawned workers of a multi-worker server without state are limited"""
+        from config import settings
+        from services.inference_service import InferenceService
+
+        spawned = patch('multiprocessing.parent_process', return_value=MagicMock())
+        with patch.object(settings, 'MODEL_SWAP_STATE_FILE', None):
+            service = InferenceService()
+            try:
+                assert service.swaps_reach_all_workers
+                with spawned, patch.object(settings, 'WORKERS', 4):
+                    assert not service.swaps_reach_all_workers
+                with spawned, patch.object(settings, 'WORKERS', 1):
+                    assert service.swaps_reach_all_workers
+            finally:
+                service._executor.shutdown(wait=True)
+
+    @pytest.mark.asyncio
+    async def test_swap_reaches_other_worker(self, workers):
+        first, second = await workers(), await workers()
+        assert first.swaps_reach_all_workers
+
+        await first.swap_model(version="v2")
+        for _ in range(100):
+            if second.model.version == "v2":
+                break
+            await asyncio.sleep(0.01)
+
+        assert first.model.version == "v2"
+        assert second.model.version == "v2"
+
+    @pytest.mark.asyncio
+    async def test_restarted_worker_catches_up(self, workers):
+        """Test a worker started after a swap serves the swapped version once ready"""
+        first = await workers()
+        await first.swap_model("other", "v3")
+
+        second = await workers()
+        assert [m['version'] for m in second.list_models() if m['name'] == "other"] == ["v3"]
+
+    @pytest.mark.asyncio
+    async def test_unknown_model_not_published(self, workers):
+        first = await workers()
+
+        with pytest.raises(ModelNotFoundError):
+            await first.swap_model("missing")
+        assert first._swap_state.read() == {}
+
+    @pytest.mark.asyncio
+    async def test_failed_swap_not_published(self, workers):
+        """Test a version that fails to load here never reaches the other workers"""
+        from services.inference_service import InferenceService
+
+        first = await workers()
+        with patch.object(InferenceService, '_load_model', side_effect=RuntimeError("no such version")):
+            with pytest.raises(RuntimeError):
+                await first.swap_model(version="typo")
+
+        assert first._swap_state.read() == {}
+        assert first.model.version is None
+
+
+class TestModelsEndpoint:
+    """Test /models and /models/swap"""
+
+    @pytest.fixture
+    def mock_service(self):
+        mock = MagicMock()
+        mock.is_ready.return_value = True
+        mock.model_name = "test-model"
+        mock.model_label.return_value = "test-model"
+        mock.list_models.return_value = [
+            {'name': 'test-model', 'status': 'loaded', 'default': True, 'version': None},
+            {'name': 'other', 'status': 'available', 'default': False},
+        ]
+        mock.registry_usage.return_value = {'memory_used_bytes': 1, 'memory_budget_bytes': 2}
+        mock.run.side_effect = ModelNotFoundError("missing")
+        return mock
+
+    @pytest.fixture
+    def client(self, mock_service):
+        from main import app
+        from api.predict import get_inference_service
+
+        app.dependency_overrides[get_inference_service] = lambda: mock_service
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+
+    def test_list_models(self, client):
+        """Test the registry contents are returned"""
+        response = client.get("/api/v1/models")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data['default'] == "test-model"
+        assert [m['name'] for m in data['models']] == ["test-model", "other"]
+        assert data['memory_budget_bytes'] == 2
+
+    def test_unknown_model_is_404(self, client):
+        """Test predicting with an unknown model returns 404"""
+        response = client.post("/api/v1/predict", json={"text": "good", "model": "missing"})
+
+        assert response.status_code == 404
+
+    def test_swap_accepted(self, client, mock_service):
+        """Test a swap is started in the background"""
+        response = client.post("/api/v1/models/swap", json={"model": "other", "version": "v2"})
+
+        assert response.status_code == 202
+        mock_service.swap_model.assert_called_once_with("other", "v2")
+
+    @pytest.mark.parametrize("version", ["../other", "/abs/path", "..", "v1/v2"])
+    def test_swap_invalid_version(self, client, mock_service, version):
+        """Test versions that are not plain directory names are rejected"""
+        response = client.post("/api/v1/models/swap", json={"version": version})
+
+        assert response.status_code == 400
+        mock_service.swap_model.assert_not_called()
+
+    def test_swap_refused_for_one_of_several_workers(self, client, mock_service):
+        """Test a swap that would only reach one of several workers is refused"""
+        from config import settings
+
+        mock_service.swaps_reach_all_workers = False
+        response = client.post("/api/v1/models/swap", json={"version": "v2"})
+
+        assert response.status_code == 409
+        mock_service.swap_model.assert_not_called()
+
+    def test_swap_unknown_model(self, client, mock_service):
+        """Test swapping to an unknown model is rejected"""
+        response = client.post("/api/v1/models/swap", json={"model": "missing"})
+
+        assert response.status_code == 404
+        mock_service.swap_model.assert_not_called()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,107 @@
+"""
+ONNX Backend Tests - CI Test Layer
+Export, quantization and inference tests on a tiny local model
+"""
+import pytest
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("onnx")
+
+
+@pytest.mark.slow
+class TestOnnxBackend:
+    """Test ONNX export and the ONNX Runtime model backend"""
+
+    @pytest.fixture(scope="class")
+    def exported(self, tiny_model_dir, tmp_path_factory):
+        """Export the tiny model (fp32 and int8) into a fresh cache dir"""
+        from tools.export_onnx import export_model
+        from models.sentiment_model import onnx_model_dir
+
+        cache_dir = str(tmp_path_factory.mktemp("cache"))
+        export_model(tiny_model_dir, cache_dir, quantize=True)
+        return cache_dir, onnx_model_dir(cache_dir, tiny_model_dir)
+
+    def test_export_writes_artifacts(self, exported):
+        """Test export produces both graphs plus tokenizer and config"""
+        _, model_dir = exported
+        files = os.listdir(model_dir)
+
+        assert "model.onnx" in files
+        assert "model.int8.onnx" in files
+        assert "config.json" in files
+
+    def test_validation_matches_pytorch(self, exported, tiny_model_dir):
+        """Test fp32 ONNX output matches the PyTorch reference"""
+        from tools.export_onnx import validate_model
+
+        cache_dir, model_dir = exported
+        report = validate_model(tiny_model_dir, cache_dir, model_dir)
+
+        assert report['label_agreement'] == 1.0
+
+    @pytest.mark.parametrize("quantize", [False, True])
+    def test_sentiment_model_onnx_backend(self, exported, tiny_model_dir, quantize):
+        """Test SentimentModel serves predictions through ONNX Runtime"""
+        from models.sentiment_model import SentimentModel
+
+        cache_dir, _ = exported
+        model = SentimentModel(
+            model_name=tiny_model_dir,
+            cache_dir=cache_dir,
+            backend="onnx",
+            quantize=quantize
+        )
+
+        assert model._use_mock is False
+        results = model.predict_batch(["this is great", "terrible product", "the sky"])
+        assert len(results) == 3
+        assert all(r['label'] in ('POSITIVE', 'NEGATIVE') for r in results)
+        assert all(0.5 <= r['confidence'] <= 1.0 for r in results)
+
+    def test_long_documents(self, exported, tiny_model_dir):
+        """Test ONNX scores long documents over the same windows as PyTorch"""
+        from models.sentiment_model import SentimentModel, token_windows
+
+        cache_dir, _ = exported
+        document = "this is a great product . " * 40 + "the sky is blue , i hate it ! " * 30
+        model = SentimentModel(model_name=tiny_model_dir, cache_dir=cache_dir, backend="onnx", batch_size=4)
+        reference = SentimentModel(model_name=tiny_model_dir, backend="transformers", batch_size=4)
+
+        backend = model._pipeline
+        windows, _ = token_windows(backend.tokenizer, [document], backend.max_length, 16, 100)
+        probs = backend.probabilities(windows)
+        lengths = [len(w) - 2 for w in windows]
+        expected = {
+            'mean': probs.mean(axis=0).max(),
+            'max_confidence': probs.max(),
+            'length_weighted': ((probs * [[n] for n in lengths]).sum(axis=0) / sum(lengths)).max(),
+        }
+
+        for aggregation, confidence in expected.items():
+            results = model.predict_documents([document, "this is great"], aggregation, max_windows=100, stride=16)
+            torch_results = reference.predict_documents([document, "this is great"], aggregation, max_windows=100, stride=16)
+
+            assert [r['windows'] for r in results] == [r['windows'] for r in torch_results] == [len(windows), 1]
+            assert results[0]['confidence'] == pytest.approx(float(confidence), abs=1e-5), aggregation
+            # Packed with full windows, so padded; the traced graph moves slightly under padding
+            assert results[1]['confidence'] == pytest.approx(
+                model.predict_batch(["this is great"])[0]['confidence'], abs=1e-3
+            )
+
+    def test_missing_export_falls_back_to_mock(self, tmp_path):
+        """Test an absent ONNX export degrades to the mock model"""
+        from models.sentiment_model import SentimentModel
+
+        model = SentimentModel(model_name="missing", cache_dir=str(tmp_path), backend="onnx")
+
+        assert model._use_mock is True
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,250 @@
+"""
+Pre-fork Serving Tests - CI Test Layer
+Model preloading, the forking master and per-process memory reports
+"""
+import pytest
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from unittest.mock import patch
+
+import httpx
+
+# Add src to path
+SRC = os.path.join(os.path.dirname(__file__), '..', 'src')
+sys.path.insert(0, SRC)
+
+from utils.memory import child_pids, parse_smaps, process_memory
+
+pytestmark = pytest.mark.skipif(not os.path.exists("/proc/self/smaps"), reason="needs Linux /proc")
+
+SMAPS_ROLLUP = """\
+00400000-7ffc5f1ff000 ---p 00000000 00:00 0                              [rollup]
+Rss:              102400 kB
+Pss:               40960 kB
+Shared_Clean:      81920 kB
+Shared_Dirty:       4096 kB
+Private_Clean:      1024 kB
+Private_Dirty:     15360 kB
+Swap:                  0 kB
+"""
+
+
+class TestProcessMemory:
+    """Test reading RSS/PSS/USS from /proc"""
+
+    def test_parse_smaps(self):
+        memory = parse_smaps(SMAPS_ROLLUP)
+
+        assert memory['rss'] == 100 * 2**20
+        assert memory['pss'] == 40 * 2**20
+        assert memory['shared'] == 84 * 2**20
+        assert memory['uss'] == 16 * 2**20
+
+    def test_parse_per_mapping_smaps(self):
+        """Test per-mapping smaps (kernels without smaps_rollup) are summed"""
+        memory = parse_smaps(SMAPS_ROLLUP + SMAPS_ROLLUP)
+
+        assert memory['rss'] == 200 * 2**20
+
+    def test_own_process(self):
+        memory = process_memory()
+
+        assert 0 < memory['uss'] <= memory['pss'] <= memory['rss']
+
+    def test_children(self):
+        child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+        try:
+            assert child.pid in child_pids(os.getpid())
+            assert process_memory(child.pid)['rss'] > 0
+        finally:
+            child.kill()
+            child.wait()
+
+    def test_missing_process(self):
+        with pytest.raises(OSError):
+            process_memory(2**22 + 1)
+
+
+class TestPreload:
+    """Test workers reuse the model the master loaded"""
+
+    @pytest.fixture(autouse=True)
+    def empty_preloads(self):
+        from config import settings
+        from services import inference_service
+
+        with patch.object(inference_service, '_preloaded', []), \
+                patch.object(settings, 'MODEL_BACKEND', 'mock'), \
+                patch.object(settings, 'WARMUP_ENABLED', False):
+            yield
+
+    @pytest.mark.asyncio
+    async def test_service_uses_preloaded_model(self):
+        from services.inference_service import InferenceService, preload_model
+
+        model = preload_model()
+        service = InferenceService()
+        await service.initialize()
+        try:
+            assert service.model is model
+        finally:
+            await service.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_other_version_loads_its_own(self):
+        from config import settings
+        from services.inference_service import InferenceService, preload_model
+
+        model = preload_model()
+        with patch.object(settings, 'MODEL_VERSION', 'v2'):
+            service = InferenceService()
+            await service.initialize()
+        try:
+            assert service.model is not model
+        finally:
+            await service.cleanup()
+
+    @pytest.mark.parametrize("setting,value", [
+        ('MODEL_BACKEND', 'onnx'),
+        ('INFERENCE_BACKEND', 'process'),
+    ])
+    def test_fork_unsafe_backends_not_preloaded(self, setting, value):
+        from config import settings
+        from services.inference_service import preload_model
+
+        with patch.object(settings, setting, value):
+            assert preload_model() is None
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def workers_of(master):
+    return child_pids(master.pid)
+
+
+def wait_for(condition, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if condition():
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise AssertionError("condition not met in time")
+
+
+@pytest.fixture
+def prefork_server(tmp_path):
+    """Starts python -m prefork (2 workers unless overridden by env); returns the process and base url"""
+    started = []
+
+    def start(**env):
+        port = free_port()
+        environment = dict(
+            os.environ,
+            HOST="127.0.0.1",
+            PORT=str(port),
+            WORKERS="2",
+            MODEL_BACKEND="mock",
+            WARMUP_ENABLED="false",
+            JOBS_ENABLED="false",
+            MODEL_CACHE_DIR=str(tmp_path),
+            LOG_LEVEL="WARNING"
+        )
+        environment.update(env)
+        process = subprocess.Popen([sys.executable, "-m", "prefork"], cwd=SRC, env=environment)
+        started.append(process)
+        url = f"http://127.0.0.1:{port}"
+        workers = int(environment["WORKERS"])
+        wait_for(lambda: len(workers_of(process)) == workers and httpx.get(f"{url}/ready").status_code == 200)
+        return process, url
+
+    yield start
+    for process in started:
+        if process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+
+class TestPreforkServer:
+    """Test the forking master end to end"""
+
+    def test_serves_and_shuts_down(self, prefork_server):
+        process, url = prefork_server()
+
+        response = httpx.post(f"{url}/api/v1/predict", json={"text": "great product"})
+        assert response.status_code == 200
+        assert response.json()['result']['label'] == 'POSITIVE'
+
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(timeout=30) == 0
+
+    def test_workers_exit_with_master(self, prefork_server):
+        """Test workers do not outlive a master killed without shutdown"""
+        process, _ = prefork_server()
+        workers = workers_of(process)
+
+        process.kill()
+        process.wait()
+        wait_for(lambda: not any(os.path.exists(f"/proc/{pid}") for pid in workers), timeout=30)
+
+    def test_swap_reaches_every_worker(self, prefork_server):
+        """Test a swap taken by one worker is applied by all of them"""
+        process, url = prefork_server(WORKERS="3", MODEL_SWAP_POLL_SECONDS="0.1")
+
+        assert httpx.post(f"{url}/api/v1/models/swap", json={"version": "v2"}).status_code == 202
+
+        def default_versions():
+            # Fresh connections spread across the workers sharing the socket
+            versions = set()
+            for _ in range(30):
+                models = httpx.get(f"{url}/api/v1/models").json()['models']
+                versions.update(m['version'] for m in models if m['default'])
+            return versions
+
+        wait_for(lambda: default_versions() == {"v2"}, timeout=30)
+
+    def test_restarts_dead_worker(self, prefork_server):
+        process, url = prefork_server()
+        dead = workers_of(process)[0]
+
+        os.kill(dead, signal.SIGKILL)
+        wait_for(lambda: dead not in workers_of(process) and len(workers_of(process)) == 2)
+        assert httpx.get(f"{url}/ready").status_code == 200
+
+    def test_torch_model_works_in_workers(self, prefork_server, tiny_model_dir):
+        """Test a torch model loaded before fork still runs inference in every worker"""
+        pytest.importorskip("torch")
+        process, url = prefork_server(MODEL_NAME=tiny_model_dir, MODEL_BACKEND="transformers")
+
+        for _ in range(6):
+            response = httpx.post(f"{url}/api/v1/predict/batch", json={"texts": ["good", "bad movie"]})
+            assert response.status_code == 200
+            assert {r['label'] for r in response.json()['results']} <= {'POSITIVE', 'NEGATIVE'}
+
+    def test_memory_report(self, prefork_server):
+        from tools.memreport import format_snapshot, snapshot
+
+        process, _ = prefork_server()
+        report = snapshot(process.pid)
+
+        assert [p['role'] for p in report['processes']] == ['master', 'worker', 'worker']
+        assert report['total']['pss'] <= report['total']['rss']
+        assert "total" in format_snapshot("prefork", report)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
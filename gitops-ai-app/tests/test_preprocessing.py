@@ -0,0 +1,146 @@
+"""
+Preprocessing Equivalence Tests - CI Test Layer
+Differential tests: the fused TextPreprocessor must match the original
+step-by-step pipeline byte for byte
+"""
+import html
+import random
+import re
+import unicodedata
+import pytest
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+
+class ReferencePreprocessor:
+    """The original multi-pass pipeline, kept verbatim as the oracle"""
+
+    def __init__(self, max_length=512, lowercase=False):
+        self.max_length = max_length
+        self.lowercase = lowercase
+        self.url_pattern = re.compile(
+            r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
+        )
+        self.email_pattern = re.compile(
+            r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+        )
+        self.mention_pattern = re.compile(r'@\w+')
+        self.whitespace_pattern = re.compile(r'\s+')
+        self.special_chars_pattern = re.compile(r'[^\w\s.,!?\'"-]')
+
+    def preprocess(self, text):
+        if not text:
+            return ""
+        text = html.unescape(text)
+        text = unicodedata.normalize('NFKC', text)
+        text = ''.join(
+            char for char in text
+            if unicodedata.category(char) != 'Cc' or char in '\n\t '
+        )
+        text = self.url_pattern.sub(' ', text)
+        text = self.email_pattern.sub(' ', text)
+        text = self.mention_pattern.sub(' ', text)
+        text = text.replace('#', ' ')
+        text = self.special_chars_pattern.sub(' ', text)
+        text = self.whitespace_pattern.sub(' ', text)
+        if self.lowercase:
+            text = text.lower()
+        if len(text) > self.max_length:
+            truncated = text[:self.max_length]
+            last_space = truncated.rfind(' ')
+            text = truncated[:last_space] if last_space > 0 else truncated
+        return text.strip()
+
+
+FRAGMENTS = [
+    "great", "product", "Hello", "World", " ", "  ", "\t", "\n", "\r", "\r\n", "\x0b", "\x0c",
+    "\x00", "\x01", "\x1c", "\x1f", "\x7f", "\x85", "\x9f", "&amp;", "&lt;b&gt;", "&#0;",
+    "&#x41;", "&eacute;", "&nbsp;", "&", "&amp", "http://", "https://example.com/a?b=c&d=1",
+    "http://x.y/%41%zz", "www.site.org", "user@example.com", "a.b+c@mail.co.uk", "@", "@user_1",
+    "#tag", "#", ".", ",", "!", "?", "'", '"', "-", "_", ":", "/", "(", ")", "*", "$", "%",
+    "é", "é", "ﬁ", "Ａ", "＠user", "＃", " ", " ", "　", " ", "İ",
+    "😀", "​", "ß", "Ⅻ", "①", "٣", "中文", "‘quoted’", "…", "½", "™",
+]
+
+
+def random_corpus(count, seed):
+    """Random texts assembled from tricky fragments"""
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 40)))
+        for _ in range(count)
+    ]
+
+
+CURATED = [
+    "",
+    "   ",
+    "Hello World!",
+    "  leading and trailing  ",
+    "Check out https://example.com for more info",
+    "Contact us at test@example.com",
+    "Hello @user123, how are you?",
+    "This is #awesome",
+    "Hello &amp; World",
+    "café",
+    "ＦＵＬＬＷＩＤＴＨ ｔｅｘｔ",
+    "ctrl\x00chars\x07here\x7f and \x85nel",
+    "h\x00ttp://hidden.com and foo@http://bar.com",
+    "word " * 200,
+    " " + "x" * 600,
+    "y" * 600,
+    "<p>It&#39;s <b>great</b> &mdash; really!</p>",
+]
+
+
+class TestPreprocessorEquivalence:
+    """Fused pipeline vs reference pipeline"""
+
+    @pytest.mark.parametrize("max_length,lowercase", [(512, False), (512, True), (24, False)])
+    def test_curated_corpus(self, max_length, lowercase):
+        """Test hand-picked edge cases match exactly"""
+        from utils.preprocessing import TextPreprocessor
+
+        fused = TextPreprocessor(max_length=max_length, lowercase=lowercase)
+        reference = ReferencePreprocessor(max_length=max_length, lowercase=lowercase)
+
+        for text in CURATED:
+            assert fused.preprocess(text) == reference.preprocess(text), repr(text)
+
+    @pytest.mark.parametrize("max_length,lowercase", [(512, False), (512, True), (24, False)])
+    def test_random_corpus(self, max_length, lowercase):
+        """Test randomly assembled texts match exactly"""
+        from utils.preprocessing import TextPreprocessor
+
+        fused = TextPreprocessor(max_length=max_length, lowercase=lowercase)
+        reference = ReferencePreprocessor(max_length=max_length, lowercase=lowercase)
+
+        for text in random_corpus(3000, seed=max_length + lowercase):
+            assert fused.preprocess(text) == reference.preprocess(text), repr(text)
+
+    def test_batch_matches_reference(self):
+        """Test bulk preprocessing matches per-text reference output"""
+        from utils.preprocessing import TextPreprocessor
+
+        fused = TextPreprocessor(max_length=64)
+        reference = ReferencePreprocessor(max_length=64)
+        texts = CURATED + random_corpus(500, seed=99)
+
+        assert fused.batch_preprocess(texts) == [reference.preprocess(t) for t in texts]
+
+    def test_batch_ascii_only(self):
+        """Test the all-ASCII bulk path"""
+        from utils.preprocessing import TextPreprocessor
+
+        fused = TextPreprocessor()
+        reference = ReferencePreprocessor()
+        texts = ["Great #product!", "mail me: a@b.com", "  spaced\tout  ", "", "x\x00y"]
+
+        assert fused.batch_preprocess(texts) == [reference.preprocess(t) for t in texts]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
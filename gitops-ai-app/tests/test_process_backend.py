@@ -0,0 +1,59 @@
+"""
+Process Backend Tests - CI Test Layer
+Unit tests for the process-pool inference backend
+"""
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+
+@pytest.mark.slow
+class TestProcessPoolModel:
+    """Test inference in worker processes"""
+
+    @pytest.fixture(scope="class")
+    def pool_model(self):
+        """Start a small worker pool (uses the mock model without transformers)"""
+        from services.process_backend import ProcessPoolModel
+
+        model = ProcessPoolModel(model_name="no-such-model", cache_dir="/tmp/models",
+                                 batch_size=2, workers=2)
+        yield model
+        model.close()
+
+    def test_workers_load_model(self, pool_model):
+        """Test workers report a loaded model"""
+        assert pool_model.is_loaded() is True
+
+    def test_memory_measured_at_startup(self, pool_model):
+        """Test memory_bytes answers without waiting on a (possibly busy) worker"""
+        from models.sentiment_model import SentimentModel
+
+        expected = SentimentModel(model_name="no-such-model", cache_dir="/tmp/models").memory_bytes() * 2
+        with patch.object(pool_model._pool, 'submit', side_effect=AssertionError("blocked on a worker")):
+            assert pool_model.memory_bytes() == expected
+
+    def test_predict(self, pool_model):
+        """Test single prediction crosses the process boundary"""
+        result = pool_model.predict("This is great and amazing!")
+
+        assert result['label'] == 'POSITIVE'
+        assert result['score'] > 0
+
+    def test_sharded_batch_keeps_order(self, pool_model):
+        """Test batches larger than batch_size are sharded and reassembled in order"""
+        texts = ["terrible", "great and wonderful product", "awful", "the sky", "love it"]
+
+        results = pool_model.predict_batch(texts)
+
+        assert [r['label'] for r in results] == [
+            'NEGATIVE', 'POSITIVE', 'NEGATIVE', 'NEUTRAL', 'POSITIVE'
+        ]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,272 @@
+"""
+Profiling Tests - CI Test Layer
+Unit tests for span hooks and the on-demand sampling profiler
+"""
+import pytest
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.profiling import SamplingProfiler
+from utils.timing import record_stage, timed_stage
+from utils.tracing import add_span_hook, remove_span_hook, span, tracing_enabled
+
+
+class RecordingHook:
+    """Span hook that keeps every finished span"""
+
+    def __init__(self):
+        self.started = []
+        self.ended = []
+
+    def on_start(self, span):
+        self.started.append(span.name)
+
+    def on_end(self, span):
+        self.ended.append(span)
+
+    def names(self):
+        return [s.name for s in self.ended]
+
+
+class FailingHook:
+    def on_start(self, span):
+        raise RuntimeError("hook bug")
+
+    def on_end(self, span):
+        raise RuntimeError("hook bug")
+
+
+@pytest.fixture
+def hook():
+    hook = RecordingHook()
+    add_span_hook(hook)
+    yield hook
+    remove_span_hook(hook)
+
+
+def busy_loop(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class TestSpanHooks:
+    """Test spans reach registered hooks"""
+
+    def test_noop_without_hooks(self):
+        """Test span() returns the shared no-op object when nothing listens"""
+        assert not tracing_enabled()
+        assert span("a") is span("b")
+        with span("a") as s:
+            s.set("key", "value")
+
+    def test_nesting_and_attributes(self, hook):
+        """Test child spans link to their parent and keep attributes"""
+        with span("outer", kind="test") as outer:
+            with timed_stage("preprocess", chars=3):
+                pass
+            outer.set("model", "m")
+
+        preprocess, outer_span = hook.ended
+        assert hook.started == ["outer", "preprocess"]
+        assert preprocess.parent is outer_span
+        assert preprocess.attributes == {"chars": 3}
+        assert outer_span.attributes == {"kind": "test", "model": "m"}
+        assert outer_span.duration >= preprocess.duration >= 0
+
+    def test_error_recorded(self, hook):
+        """Test an exception is attached to the span and still raised"""
+        with pytest.raises(ValueError):
+            with span("failing"):
+                raise ValueError("bad")
+
+        assert isinstance(hook.ended[0].error, ValueError)
+
+    def test_emitted_span_placed_in_past(self, hook):
+        """Test record_stage reports a finished span ending at ``end``"""
+        end = time.perf_counter() - 1.0
+        record_stage("queue", 0.5, end)
+
+        queue = hook.ended[0]
+        assert queue.name == "queue"
+        assert queue.end == end
+        assert queue.duration == pytest.approx(0.5)
+
+    def test_failing_hook_is_isolated(self, hook):
+        """Test a broken hook neither raises nor starves other hooks"""
+        failing = FailingHook()
+        add_span_hook(failing)
+        try:
+            with span("work"):
+                pass
+        finally:
+            remove_span_hook(failing)
+
+        assert hook.names() == ["work"]
+
+    @pytest.mark.asyncio
+    async def test_service_spans(self, hook):
+        """Test run and run_batch emit a root span around their stages"""
+        from config import settings
+        from services.inference_service import InferenceService
+
+        with patch.object(settings, 'MODEL_BACKEND', 'mock'), \
+                patch.object(settings, 'WARMUP_ENABLED', False), \
+                patch.object(settings, 'PREDICTION_CACHE_ENABLED', False):
+            service = InferenceService()
+            await service.initialize()
+            try:
+                await service.run("great product")
+                hook.ended.clear()
+                await service.run("great product")
+                run_spans = list(hook.ended)
+                hook.ended.clear()
+                await service.run_batch(["good", "bad"])
+                batch_spans = list(hook.ended)
+            finally:
+                await service.cleanup()
+
+        root = run_spans[-1]
+        assert root.name == "inference.run"
+        assert root.attributes["model"].startswith(f"{service.model_name}@")
+        assert {"admission", "preprocess", "queue", "inference"} <= {s.name for s in run_spans}
+        assert all(s.parent is root for s in run_spans[:-1])
+
+        assert batch_spans[-1].name == "inference.run_batch"
+        assert batch_spans[-1].attributes["batch_size"] == 2
+        inference = [s for s in batch_spans if s.name == "inference"][0]
+        assert inference.attributes == {"batch_size": 2}
+
+
+class TestSamplingProfiler:
+    """Test stack sampling and collapsed output"""
+
+    def test_collapsed_stacks(self):
+        """Test a busy thread shows up with its call chain"""
+        stop = threading.Event()
+        worker = threading.Thread(target=busy_loop, args=(stop,), name="busy")
+        worker.start()
+        profiler = SamplingProfiler(interval=0.001)
+        try:
+            profiler.start()
+            time.sleep(0.2)
+            profiler.stop()
+        finally:
+            stop.set()
+            worker.join()
+
+        lines = profiler.collapsed().splitlines()
+        busy = [line for line in lines if line.startswith("busy;")]
+        assert profiler.samples > 10
+        assert busy
+        stack, count = busy[0].rsplit(" ", 1)
+        assert int(count) > 0
+        assert "busy_loop (" in stack and "test_profiling.py" in stack
+        assert not any(line.startswith("sampling-profiler;") for line in lines)
+
+    def test_idle_threads_skipped(self):
+        """Test threads waiting for work are left out by default"""
+        stop = threading.Event()
+        waiter = threading.Thread(target=stop.wait, name="waiter")
+        waiter.start()
+        try:
+            quiet = SamplingProfiler()
+            quiet.sample()
+            noisy = SamplingProfiler(include_idle=True)
+            noisy.sample()
+        finally:
+            stop.set()
+            waiter.join()
+
+        assert not any(s[0] == "waiter" for s, _ in quiet.stacks())
+        assert any(s[0] == "waiter" for s, _ in noisy.stacks())
+
+
+class TestProfileEndpoint:
+    """Test /debug/profile guards and output"""
+
+    @pytest.fixture
+    def client(self):
+        from main import app
+
+        return TestClient(app)
+
+    @pytest.fixture
+    def enabled(self):
+        from config import settings
+
+        with patch.object(settings, 'PROFILING_ENABLED', True), \
+                patch.object(settings, 'PROFILING_TOKEN', "secret"), \
+                patch.object(settings, 'PROFILING_MAX_SECONDS', 1.0):
+            yield
+
+    def test_disabled_is_404(self, client):
+        """Test the endpoint is hidden by default"""
+        assert client.get("/debug/profile?seconds=0.1").status_code == 404
+
+    def test_token_required(self, client, enabled):
+        """Test a missing or wrong token is rejected"""
+        assert client.get("/debug/profile?seconds=0.1").status_code == 403
+        response = client.get("/debug/profile?seconds=0.1", headers={"X-Debug-Token": "wrong"})
+        assert response.status_code == 403
+
+    def test_empty_token_refuses_everyone(self, client, enabled):
+        """Test enabling profiling without a token does not open it to any caller"""
+        from config import settings
+
+        with patch.object(settings, 'PROFILING_TOKEN', ""):
+            assert client.get("/debug/profile?seconds=0.1").status_code == 403
+            response = client.get("/debug/profile?seconds=0.1", headers={"X-Debug-Token": ""})
+            assert response.status_code == 403
+
+    def test_seconds_capped(self, client, enabled):
+        """Test requests longer than the maximum are rejected"""
+        response = client.get("/debug/profile?seconds=5", headers={"X-Debug-Token": "secret"})
+
+        assert response.status_code == 422
+
+    def test_returns_collapsed_stacks(self, client, enabled):
+        """Test a profile returns collapsed stacks and sample counts"""
+        stop = threading.Event()
+        worker = threading.Thread(target=busy_loop, args=(stop,), name="busy")
+        worker.start()
+        try:
+            response = client.get(
+                "/debug/profile?seconds=0.2&interval_ms=1", headers={"X-Debug-Token": "secret"}
+            )
+        finally:
+            stop.set()
+            worker.join()
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert int(response.headers["x-profile-samples"]) > 0
+        assert any(line.startswith("busy;") for line in response.text.splitlines())
+
+    @pytest.mark.asyncio
+    async def test_one_profile_at_a_time(self, enabled):
+        """Test a concurrent profile request gets 409"""
+        import httpx
+        from main import app
+
+        transport = httpx.ASGITransport(app=app)
+        headers = {"X-Debug-Token": "secret"}
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = asyncio.ensure_future(client.get("/debug/profile?seconds=0.3", headers=headers))
+            await asyncio.sleep(0.1)
+            second = await client.get("/debug/profile?seconds=0.1", headers=headers)
+            first = await first
+
+        assert second.status_code == 409
+        assert first.status_code == 200
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
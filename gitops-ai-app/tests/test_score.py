@@ -0,0 +1,180 @@
+"""
+Offline Scoring Tests - CI Test Layer
+The python -m tools.score backfill CLI against the online service path
+"""
+import pytest
+import io
+import json
+from unittest.mock import patch
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tools.score import format_stats, main, score_file
+
+TEXTS = [
+    "this is great",
+    "terrible product !",
+    "Check https://example.com &amp; tell @bob it's AMAZING",
+    "the sky is blue " * 200,
+    "love it",
+    "awful , bad , hate it",
+    "good",
+]
+
+
+def jsonl(records):
+    return io.BytesIO("".join(json.dumps(record) + "\n" for record in records).encode())
+
+
+def score(records, **kwargs):
+    sink = io.BytesIO()
+    stats = score_file(jsonl(records), sink, "jsonl", **kwargs)
+    return [json.loads(line) for line in sink.getvalue().splitlines()], stats
+
+
+async def online(texts, **kwargs):
+    """Scores from InferenceService.run_batch with the current settings"""
+    from config import settings
+    from services.inference_service import InferenceService
+
+    with patch.object(settings, 'WARMUP_ENABLED', False):
+        service = InferenceService()
+        await service.initialize()
+        try:
+            return await service.run_batch(texts, **kwargs)
+        finally:
+            await service.cleanup()
+
+
+def assert_same_scores(offline, expected):
+    assert [r['label'] for r in offline] == [r['label'] for r in expected]
+    for ours, theirs in zip(offline, expected):
+        assert ours['confidence'] == pytest.approx(theirs['confidence'], abs=1e-6)
+        assert ours['sentiment_score'] == pytest.approx(theirs['sentiment_score'], abs=1e-6)
+
+
+class TestScoreFile:
+    """Test ordering, error records and statistics"""
+
+    @pytest.fixture(autouse=True)
+    def mock_backend(self):
+        from config import settings
+
+        with patch.object(settings, 'MODEL_BACKEND', 'mock'):
+            yield
+
+    @pytest.mark.asyncio
+    async def test_matches_service(self):
+        """Test offline scores equal run_batch scores for the same texts"""
+        results, stats = score(TEXTS, workers=0, chunk_size=3)
+
+        assert_same_scores(results, await online(TEXTS))
+        assert stats['records'] == len(TEXTS) and stats['failed'] == 0
+
+    def test_order_and_errors(self):
+        """Test ids, indexes and invalid records survive chunking in order"""
+        records = [{"id": i, "text": "good" if i % 2 else "bad"} for i in range(10)]
+        records[4] = {"id": 4, "text": ""}
+        results, stats = score(records, workers=0, chunk_size=3)
+
+        assert [r['index'] for r in results] == list(range(10))
+        assert [r['id'] for r in results] == list(range(10))
+        assert 'error' in results[4]
+        assert results[1]['label'] == 'POSITIVE' and results[2]['label'] == 'NEGATIVE'
+        assert stats['failed'] == 1
+
+    def test_failed_chunk_marks_its_records(self):
+        """Test a model error fails only the chunk it happened in"""
+        from models.sentiment_model import SentimentModel
+
+        predict_batch = SentimentModel.predict_batch
+        calls = []
+
+        def flaky(self, texts):
+            calls.append(texts)
+            if len(calls) == 2:
+                raise RuntimeError("boom")
+            return predict_batch(self, texts)
+
+        with patch.object(SentimentModel, 'predict_batch', flaky):
+            results, stats = score(["good"] * 6, workers=0, chunk_size=2)
+
+        assert ['error' in r for r in results] == [False, False, True, True, False, False]
+        assert results[2]['error'] == "Prediction failed: boom"
+        assert stats['failed'] == 2
+
+    def test_stats(self):
+        _, stats = score(["good"] * 5, workers=0, chunk_size=2)
+        summary = format_stats(stats)
+
+        assert stats['records_per_second'] > 0
+        assert stats['chunk_ms']['p50'] <= stats['chunk_ms']['max']
+        assert "Scored 5 records (0 failed)" in summary
+        assert "p99" in summary
+
+    def test_cli(self, tmp_path, capsys):
+        """Test the command line end to end on a CSV file"""
+        source = tmp_path / "reviews.csv"
+        source.write_text("review_id,body\na,great\nb,awful\n")
+        output = tmp_path / "scores.jsonl"
+        stats_path = tmp_path / "stats.json"
+
+        code = main([
+            str(source), "-o", str(output), "--workers", "0",
+            "--text-field", "body", "--id-field", "review_id", "--stats-json", str(stats_path)
+        ])
+
+        assert code == 0
+        lines = [json.loads(line) for line in output.read_text().splitlines()]
+        assert [(r['id'], r['label']) for r in lines] == [("a", "POSITIVE"), ("b", "NEGATIVE")]
+        assert json.loads(stats_path.read_text())['records'] == 2
+        assert "records/s" in capsys.readouterr().err
+
+    def test_cli_unknown_format(self, tmp_path):
+        source = tmp_path / "reviews.txt"
+        source.write_text("good\n")
+
+        with pytest.raises(SystemExit):
+            main([str(source), "--workers", "0"])
+
+
+class TestWorkerProcesses:
+    """Test sharding across spawned workers on the tiny local model"""
+
+    @pytest.mark.asyncio
+    async def test_workers_match_service(self, tiny_model_dir):
+        """Test workers inherit settings and reproduce the online scores in order"""
+        pytest.importorskip("torch")
+        from config import settings
+
+        with patch.object(settings, 'MODEL_NAME', tiny_model_dir), \
+                patch.object(settings, 'MODEL_BACKEND', 'transformers'), \
+                patch.object(settings, 'MODEL_VERSION', None):
+            results, stats = score(TEXTS * 3, workers=2, chunk_size=4, threads=1)
+            expected = await online(TEXTS * 3)
+
+        assert [r['index'] for r in results] == list(range(len(TEXTS) * 3))
+        assert_same_scores(results, expected)
+        assert stats['workers'] == 2
+
+    @pytest.mark.asyncio
+    async def test_long_documents_match_service(self, tiny_model_dir):
+        pytest.importorskip("torch")
+        from config import settings
+
+        with patch.object(settings, 'MODEL_NAME', tiny_model_dir), \
+                patch.object(settings, 'MODEL_BACKEND', 'transformers'), \
+                patch.object(settings, 'MODEL_VERSION', None):
+            results, _ = score(TEXTS, workers=0, chunk_size=4, aggregation="length_weighted")
+            expected = await online(TEXTS, aggregation="length_weighted")
+
+        assert_same_scores(results, expected)
+        assert [r['windows'] for r in results] == [r['windows'] for r in expected]
+        assert max(r['windows'] for r in results) > 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
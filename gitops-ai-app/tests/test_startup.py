@@ -0,0 +1,107 @@
+"""
+Startup Tests - CI Test Layer
+Unit tests for model warm-up and the startup timing report
+"""
+import pytest
+from unittest.mock import MagicMock, patch
+from prometheus_client import REGISTRY
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+RESULT = {'label': 'POSITIVE', 'confidence': 0.9, 'score': 0.9}
+
+
+@pytest.fixture
+def fake_model():
+    model = MagicMock()
+    model.is_loaded.return_value = True
+    model.load_timings = {'import': 1.5, 'load': 2.5}
+    model.predict.return_value = RESULT
+    model.predict_batch.side_effect = lambda texts: [RESULT for _ in texts]
+    return model
+
+
+class TestWarmUp:
+    """Test the warm-up stage runs before the service reports ready"""
+
+    @pytest.mark.asyncio
+    async def test_warm_up_covers_each_length(self, fake_model):
+        """Test single and batch paths run once per distinct length"""
+        from config import settings
+        from services.inference_service import InferenceService
+
+        ready_during_warmup = []
+        fake_model.predict.side_effect = lambda text: ready_during_warmup.append(service.is_ready()) or RESULT
+
+        service = InferenceService()
+        with patch.object(service, '_load_model', return_value=fake_model), \
+                patch.object(settings, 'WARMUP_ENABLED', True), \
+                patch.object(settings, 'WARMUP_SEQUENCE_LENGTHS', [4, 32]), \
+                patch.object(settings, 'WARMUP_BATCH_SIZE', 8):
+            await service.initialize()
+
+        assert fake_model.predict.call_count == 2
+        assert [len(c.args[0]) for c in fake_model.predict_batch.call_args_list] == [8, 8]
+        assert ready_during_warmup == [False, False]
+        assert service.is_ready()
+        await service.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_warm_up_disabled(self, fake_model):
+        """Test no synthetic inference when warm-up is off"""
+        from config import settings
+        from services.inference_service import InferenceService
+
+        service = InferenceService()
+        with patch.object(service, '_load_model', return_value=fake_model), \
+                patch.object(settings, 'WARMUP_ENABLED', False):
+            await service.initialize()
+
+        fake_model.predict.assert_not_called()
+        assert 'warmup' not in service.startup_report
+        await service.cleanup()
+
+    def test_warmup_text_length(self):
+        """Test synthetic texts have the requested number of words"""
+        from services.inference_service import warmup_text
+
+        assert len(warmup_text(64).split()) == 64
+        assert warmup_text(0)
+
+
+class TestStartupReport:
+    """Test the startup breakdown is published"""
+
+    @pytest.mark.asyncio
+    async def test_report_metrics(self, fake_model):
+        """Test each phase is exported as a gauge and in model info"""
+        from config import settings
+        from services.inference_service import InferenceService
+
+        service = InferenceService()
+        with patch.object(service, '_load_model', return_value=fake_model), \
+                patch.object(settings, 'WARMUP_SEQUENCE_LENGTHS', [4]):
+            await service.initialize()
+
+        report = service.startup_report
+        assert report['import'] == 1.5
+        assert report['load'] == 2.5
+        assert set(report) == {'import', 'load', 'warmup', 'total'}
+        assert REGISTRY.get_sample_value('startup_phase_duration_seconds', {'phase': 'load'}) == 2.5
+        assert service.get_model_info()['startup_seconds'] == report
+        await service.cleanup()
+
+    def test_sentiment_model_records_timings(self):
+        """Test the mock backend reports zero import/load time"""
+        from models.sentiment_model import SentimentModel
+
+        model = SentimentModel("test-model", backend="mock")
+
+        assert model.load_timings == {'import': 0.0, 'load': 0.0}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
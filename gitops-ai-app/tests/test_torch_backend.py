@@ -0,0 +1,122 @@
+"""
+PyTorch Backend Tests - CI Test Layer
+Direct forward path against the HF pipeline on a tiny local model
+"""
+import pytest
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+torch = pytest.importorskip("torch")
+
+TEXTS = [
+    "this is great",
+    "terrible product !",
+    "the sky is blue " * 60,
+    "love it",
+    "awful , bad , hate it",
+    "good",
+    "amazing amazing product",
+]
+
+
+@pytest.fixture(scope="module")
+def direct(tiny_model_dir):
+    from models.sentiment_model import SentimentModel
+
+    return SentimentModel(model_name=tiny_model_dir, backend="transformers", batch_size=3)
+
+
+@pytest.fixture(scope="module")
+def reference(tiny_model_dir):
+    from models.sentiment_model import SentimentModel
+
+    return SentimentModel(model_name=tiny_model_dir, backend="pipeline", batch_size=3)
+
+
+class TestTorchBackend:
+    """Test the tokenize-once forward path"""
+
+    def test_uses_direct_backend(self, direct, reference):
+        """Test the transformers backend bypasses the pipeline"""
+        from models.sentiment_model import TorchSentimentBackend
+
+        assert isinstance(direct._pipeline, TorchSentimentBackend)
+        assert not isinstance(reference._pipeline, TorchSentimentBackend)
+        assert not direct._use_mock and not reference._use_mock
+
+    def test_batch_matches_pipeline(self, direct, reference):
+        """Test labels and scores match the pipeline within tolerance"""
+        ours = direct.predict_batch(TEXTS)
+        theirs = reference.predict_batch(TEXTS)
+
+        assert [r['label'] for r in ours] == [r['label'] for r in theirs]
+        for a, b in zip(ours, theirs):
+            assert a['confidence'] == pytest.approx(b['confidence'], abs=1e-5)
+            assert a['score'] == pytest.approx(b['score'], abs=1e-5)
+
+    def test_single_matches_pipeline(self, direct, reference):
+        """Test predict() agrees with the pipeline"""
+        ours = direct.predict("love it")
+        theirs = reference.predict("love it")
+
+        assert ours['label'] == theirs['label']
+        assert ours['confidence'] == pytest.approx(theirs['confidence'], abs=1e-5)
+
+    def test_truncates_at_token_level(self, direct):
+        """Test inputs longer than the position limit are cut to max_length tokens"""
+        backend = direct._pipeline
+        ids = backend.encode(["the sky is blue " * 60])[0]
+
+        assert backend.max_length == 128  # tiny model's max_position_embeddings
+        assert len(ids) == backend.max_length
+        assert ids[-1] == backend.tokenizer.sep_token_id
+
+    def test_tokenizes_once_in_length_sorted_sub_batches(self, direct):
+        """Test one tokenizer call per request and sub-batches sorted by length"""
+        backend = direct._pipeline
+        tokenizer_calls, widths = [], []
+        encode, forward = backend.encode, backend.forward
+
+        def spy_encode(texts):
+            tokenizer_calls.append(len(texts))
+            return encode(texts)
+
+        def spy_forward(ids):
+            widths.append([len(seq) for seq in ids])
+            return forward(ids)
+
+        backend.encode, backend.forward = spy_encode, spy_forward
+        try:
+            results = direct.predict_batch(TEXTS)
+        finally:
+            del backend.encode, backend.forward
+
+        assert tokenizer_calls == [len(TEXTS)]
+        assert [len(w) for w in widths] == [3, 3, 1]
+        flat = [n for w in widths for n in w]
+        assert flat == sorted(flat)
+        assert len(results) == len(TEXTS)
+
+    def test_runs_under_inference_mode(self, direct):
+        """Test the forward pass records no autograd state"""
+        seen = []
+        handle = direct._model.register_forward_hook(
+            lambda module, args, output: seen.append(torch.is_inference_mode_enabled())
+        )
+        try:
+            direct.predict_batch(["good", "bad"])
+        finally:
+            handle.remove()
+
+        assert seen == [True]
+
+    def test_empty_batch(self, direct):
+        """Test an empty batch returns no results"""
+        assert direct.predict_batch([]) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])